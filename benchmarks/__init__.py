@@ -0,0 +1,23 @@
+"""
+DiVERE 性能基准
+
+用确定性的合成 16-bit 负片（6 / 24 / 100 MP）测量：
+- 预览延迟：FilmPipelineProcessor.apply_preview_pipeline
+- 全精度导出：apply_full_precision_pipeline（分块 / 不分块）
+- 解码 / 编码：ImageManager.load_image / save_image（16-bit TIFF）
+- LUT 生成：3D 校色 LUT 与 1D 密度曲线 LUT（与导出 LUT 的路径一致）
+- CCM 优化：CMA-ES 每代耗时
+- 日志开销：改动前无条件 print 的路径与按级别过滤的路径（预览一帧、整幅加载）的耗时差
+
+用法：
+    python -m benchmarks run [--sizes 6,24,100] [--output results.json] [--save-baseline]
+    python -m benchmarks compare [--baseline PATH] results.json [--threshold 0.1]
+
+compare 在任一项中位耗时比基线慢超过阈值时以非零状态退出，可直接用于 CI。
+基线与当前结果来自不同机器（操作系统、架构、处理器或核数不同）时只输出对比，不判定回退；
+没有基线时跳过比较。
+
+基线 baselines/baseline.json 必须在 CI 机器上生成：手动运行 .github/workflows/benchmark.yml
+并勾选 save_baseline，下载产物 benchmark-baseline 中的 baseline.json 提交到 baselines/。
+更换 CI 机器或基准用例后同样重新生成。
+"""
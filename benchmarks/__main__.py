@@ -0,0 +1,78 @@
+"""
+python -m benchmarks run|compare
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 在仓库根目录外运行时也能导入 divere
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from benchmarks.runner import (DEFAULT_BASELINE, build_report, compare_reports, load_report,
+                               print_comparison, same_machine, save_report)
+
+
+def _cmd_run(args) -> int:
+    from benchmarks.cases import run_suite
+
+    sizes = [float(s) for s in args.sizes.split(",") if s.strip()]
+    cases = [c.strip() for c in args.cases.split(",")] if args.cases else None
+    results = run_suite(sizes, args.repeat, cases)
+    report = build_report(results, {"sizes_mp": sizes, "repeat": args.repeat, "cases": cases})
+    path = save_report(report, Path(args.output))
+    print(f"[BENCH] 结果已写入 {path}", flush=True)
+    if args.save_baseline:
+        baseline = save_report(report, Path(args.baseline))
+        print(f"[BENCH] 基线已更新 {baseline}", flush=True)
+        return 0
+    return _compare(Path(args.baseline), path, args.threshold)
+
+
+def _compare(baseline_path: Path, current_path: Path, threshold: float) -> int:
+    if not baseline_path.exists():
+        print(f"[BENCH] 没有基线 {baseline_path}，跳过比较（在 CI 机器上用 run --save-baseline 生成）", flush=True)
+        return 0
+    baseline = load_report(baseline_path)
+    current = load_report(current_path)
+    rows, regressed = compare_reports(baseline, current, threshold)
+    print_comparison(rows, baseline, current, threshold)
+    if not same_machine(baseline, current):
+        # 不同机器的耗时不可比：只输出对比，不判定回退
+        print(f"[BENCH] 基线来自其他机器 {baseline.get('machine')}，"
+              f"当前 {current.get('machine')}，跳过回退判定", flush=True)
+        return 0
+    if regressed:
+        print("[BENCH] 存在超过阈值的性能回退", flush=True)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="DiVERE 性能基准")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="运行基准并写入 JSON（存在基线时顺带比较）")
+    run.add_argument("--sizes", default="6,24,100", help="合成负片尺寸（百万像素，逗号分隔）")
+    run.add_argument("--cases", default=None, help="用例组：image,lut,ccm,logging（默认全部）")
+    run.add_argument("--repeat", type=int, default=3, help="每个用例的计时次数")
+    run.add_argument("--output", default="benchmark_results.json", help="结果文件")
+    run.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基线文件")
+    run.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    run.add_argument("--threshold", type=float, default=0.10, help="判定回退的变慢比例")
+
+    compare = sub.add_parser("compare", help="与基线比较，回退超过阈值时返回非零状态")
+    compare.add_argument("current", help="本次结果文件")
+    compare.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基线文件")
+    compare.add_argument("--threshold", type=float, default=0.10, help="判定回退的变慢比例")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return _cmd_run(args)
+    return _compare(Path(args.baseline), Path(args.current), args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+基准用例
+
+每个用例返回 measure() 的结果字典；无法运行的用例（内存不足、依赖缺失）返回 {"skipped": 原因}。
+用例名形如 preview@24MP，compare 按用例名对齐基线。
+"""
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .synthetic import synthetic_negative
+
+# 每个百万像素在各用例中的峰值内存估算（字节，含输入、输出与中间结果）
+_BYTES_PER_MP = {
+    "preview": 16e6,
+    "export_chunked": 28e6,
+    "export_unchunked": 60e6,
+    "encode_tiff16": 24e6,
+    "decode_tiff16": 12e6,
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1,
+            profile_source: Optional[Callable[[], Dict[str, float]]] = None) -> Dict[str, Any]:
+    """预热后重复执行 fn，记录耗时分布与（可选的）分阶段耗时中位数
+
+    Args:
+        fn: 被测函数
+        repeat: 计时次数
+        warmup: 预热次数（不计时）
+        profile_source: 每次执行后读取分阶段耗时的函数（如 FilmPipelineProcessor._last_profile）
+    """
+    for _ in range(warmup):
+        fn()
+    times: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+        if profile_source is not None:
+            for key, value in (profile_source() or {}).items():
+                if isinstance(value, (int, float)):
+                    stages.setdefault(key, []).append(float(value))
+    result: Dict[str, Any] = {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "max_ms": max(times),
+        "repeat": len(times),
+    }
+    if stages:
+        result["stages"] = {key: statistics.median(values) for key, values in stages.items()}
+    return result
+
+
+def _available_bytes() -> Optional[float]:
+    try:
+        import psutil
+        return float(psutil.virtual_memory().available)
+    except Exception:
+        return None
+
+
+def _benchmark_params():
+    """覆盖全部管线阶段的调色参数（密度矩阵、RGB 增益、曲线）"""
+    from divere.core.data_types import ColorGradingParams
+    params = ColorGradingParams()
+    params.density_gamma = 2.2
+    params.density_dmax = 2.3
+    params.enable_density_matrix = True
+    params.density_matrix = np.array([[1.08, -0.05, -0.03], [-0.04, 1.07, -0.03], [0.00, -0.09, 1.09]])
+    params.channel_gamma_r = 0.97
+    params.channel_gamma_b = 1.04
+    params.rgb_gains = (0.35, 0.05, -0.02)
+    params.curve_points = [(0.0, 0.0), (0.3, 0.26), (0.7, 0.76), (1.0, 1.0)]
+    params.screen_glare_compensation = 0.01
+    return params
+
+
+class _BenchmarkContext:
+    """CCM 优化器与 LUT 导出需要的最小上下文：reference colors 与色彩空间管理器（与 ApplicationContext 同源）"""
+
+    def __init__(self):
+        from divere.core.color_space import ColorSpaceManager
+        self.color_space_manager = ColorSpaceManager()
+
+    def get_reference_colors(self, filename: str):
+        from divere.utils.colorchecker_loader import load_colorchecker_reference
+        return load_colorchecker_reference(
+            filename, self.color_space_manager.get_current_working_space(), self.color_space_manager
+        )
+
+
+def run_image_cases(megapixels: Iterable[float], repeat: int, workdir: Path,
+                    log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """按图像尺寸运行的用例：预览、全精度导出（分块/不分块）、16-bit TIFF 编解码"""
+    from divere.core.data_types import ImageData
+    from divere.core.image_manager import ImageManager
+    from divere.core.pipeline_processor import FilmPipelineProcessor
+
+    processor = FilmPipelineProcessor()
+    image_manager = ImageManager()
+    params = _benchmark_params()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for mp in megapixels:
+        label = f"{mp:g}MP"
+        raw = synthetic_negative(mp)
+        h, w = raw.shape[:2]
+        image = ImageData(array=raw.astype(np.float32) * np.float32(1.0 / 65535.0),
+                          width=w, height=h, channels=3, dtype=np.float32)
+        tiff_path = workdir / f"negative_{label}.tif"
+        image_manager.save_image(image, str(tiff_path), bit_depth=16)
+        del raw
+
+        cases = {
+            "preview": (lambda: processor.apply_preview_pipeline(image, params),
+                        lambda: processor._last_profile),
+            "export_chunked": (lambda: processor.apply_full_precision_pipeline(image, params, chunked=True),
+                               lambda: processor._last_profile),
+            "export_unchunked": (lambda: processor.apply_full_precision_pipeline(image, params, chunked=False),
+                                 lambda: processor._last_profile),
+            "encode_tiff16": (lambda: image_manager.save_image(image, str(workdir / f"encode_{label}.tif"), bit_depth=16),
+                              None),
+            "decode_tiff16": (lambda: image_manager.load_image(str(tiff_path)), None),
+        }
+        for name, (fn, profile_source) in cases.items():
+            key = f"{name}@{label}"
+            available = _available_bytes()
+            needed = _BYTES_PER_MP[name] * mp
+            if available is not None and needed > available:
+                results[key] = {"skipped": f"需要约 {needed / 2**30:.1f} GiB 内存，可用 {available / 2**30:.1f} GiB"}
+                log(f"[BENCH] {key:<28} 跳过（内存不足）")
+                continue
+            try:
+                results[key] = measure(fn, repeat, profile_source=profile_source)
+                log(f"[BENCH] {key:<28} {results[key]['median_ms']:10.1f}ms")
+            except MemoryError:
+                results[key] = {"skipped": "MemoryError"}
+                log(f"[BENCH] {key:<28} 跳过（MemoryError）")
+        del image, cases
+        for path in workdir.glob(f"*_{label}.tif"):
+            path.unlink()
+    return results
+
+
+def run_lut_cases(repeat: int, workdir: Path, log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """LUT 生成：3D 校色 LUT（33³）与 1D 密度曲线 LUT（4096），与主窗口导出 LUT 的路径一致"""
+    from divere.core.the_enlarger import TheEnlarger
+    from divere.utils.lut_generator.interface import DiVERELUTInterface
+
+    params = _benchmark_params()
+    color_params = params.copy()
+    color_params.enable_density_curve = False
+    config = {"params": color_params, "context": _BenchmarkContext(), "the_enlarger": TheEnlarger()}
+    curves = {"R": params.curve_points, "G": params.curve_points, "B": params.curve_points}
+    interface = DiVERELUTInterface()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for key, fn in (
+        ("lut3d@33", lambda: interface.generate_pipeline_lut(config, str(workdir / "pipeline.cube"), "3D", 33)),
+        ("lut1d_curve@4096", lambda: interface.generate_density_curve_lut(
+            curves, str(workdir / "curve.cube"), 4096, params.screen_glare_compensation)),
+    ):
+        if not fn():
+            results[key] = {"skipped": "LUT 生成失败"}
+            log(f"[BENCH] {key:<28} 跳过（生成失败）")
+            continue
+        results[key] = measure(fn, repeat, warmup=0)
+        log(f"[BENCH] {key:<28} {results[key]['median_ms']:10.1f}ms")
+    return results
+
+
+def run_ccm_case(repeat: int, iterations: int = 10, log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """CCM 优化：固定代数的 CMA-ES，记录每代耗时（代数受收敛判据影响，总耗时不可比）"""
+    try:
+        from divere.utils.ccm_optimizer.optimizer import CCMOptimizer
+        import cma  # noqa: F401
+    except Exception as e:
+        log(f"[BENCH] ccm_optimize 跳过: {e}")
+        return {"ccm_optimize": {"skipped": str(e)}}
+
+    context = _BenchmarkContext()
+    optimizer = CCMOptimizer("original_color_cc24data.json", app_context=context, status_callback=lambda _m: None)
+    # 输入色块：参考值加确定性的偏移（模拟未校正的扫描仪）
+    rng = np.random.default_rng(7)
+    patches = {
+        patch_id: tuple(float(v) * float(s) for v, s in zip(rgb, rng.uniform(0.8, 1.2, size=3)))
+        for patch_id, rgb in optimizer.reference_values.items()
+    }
+
+    per_iteration: List[float] = []
+
+    def run():
+        t0 = time.perf_counter()
+        result = optimizer.optimize(patches, max_iter=iterations, status_callback=lambda _m: None)
+        per_iteration.append((time.perf_counter() - t0) * 1000.0 / max(1, int(result.get("iterations", 1))))
+
+    measure(run, repeat, warmup=0)
+    result = {
+        "median_ms": statistics.median(per_iteration),
+        "min_ms": min(per_iteration),
+        "max_ms": max(per_iteration),
+        "repeat": len(per_iteration),
+        "unit": "每代",
+    }
+    log(f"[BENCH] {'ccm_optimize':<28} {result['median_ms']:10.1f}ms/代")
+    return {"ccm_optimize": result}
+
+
+class _UnconditionalPrintLogger:
+    """还原 user-050 之前的日志方式：每条消息都格式化并 print，诊断统计（整幅 min/max 等）总是计算"""
+
+    debug_enabled = True
+    info_enabled = True
+
+    def __init__(self, tag: Optional[str]):
+        self.tag = tag
+
+    def _emit(self, level_name: str, message, args) -> None:
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
+        print(f"[{self.tag or level_name}] {message}", flush=True)
+
+    def debug(self, message, *args) -> None:
+        self._emit("DEBUG", message, args)
+
+    def info(self, message, *args) -> None:
+        self._emit("INFO", message, args)
+
+    def warning(self, message, *args) -> None:
+        self._emit("WARNING", message, args)
+
+    def error(self, message, *args) -> None:
+        self._emit("ERROR", message, args)
+
+
+def _unconditional_logging():
+    """在上下文内把热路径模块的 _log 换成无条件 print 的日志对象"""
+    import contextlib
+    from divere.core import app_context, image_manager
+
+    @contextlib.contextmanager
+    def swap():
+        targets = [(app_context, "_log"), (app_context, "_worker_log"), (image_manager, "_log")]
+        saved = [getattr(module, name) for module, name in targets]
+        try:
+            for (module, name), original in zip(targets, saved):
+                setattr(module, name, _UnconditionalPrintLogger(original.tag))
+            yield
+        finally:
+            for (module, name), original in zip(targets, saved):
+                setattr(module, name, original)
+
+    return swap()
+
+
+def run_logging_case(repeat: int, workdir: Path, megapixels: Iterable[float] = (24.0,),
+                     log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """日志开销：原先无条件 print 的路径（legacy）与按级别过滤的路径（gated，INFO 级别）对比
+
+    - preview_frame_log_*：线程模式的一帧预览（_PreviewWorker.run，2 MP proxy）
+    - load_log_*@N MP：ImageManager.load_image（legacy 每次加载都计算整幅 min/max），按 --sizes 逐一测量
+
+    legacy 把 app_context / image_manager 的 _log 换成无条件 print 的对象，还原改动前每条消息的
+    格式化、输出与只为打印而做的统计；两者之差即去掉的开销（输出重定向到 devnull，终端上的实际开销更大）。
+    """
+    import contextlib
+    import os
+    try:
+        from divere.core.app_context import _PreviewWorker
+    except Exception as e:
+        log(f"[BENCH] preview_frame_log 跳过: {e}")
+        return {"preview_frame_log": {"skipped": str(e)}}
+    from divere.core.color_space import ColorSpaceManager
+    from divere.core.data_types import ImageData
+    from divere.core.image_manager import ImageManager
+    from divere.core.the_enlarger import TheEnlarger
+    from divere.utils.debug_logger import get_log_level, set_log_level
+
+    raw = synthetic_negative(2.0)
+    h, w = raw.shape[:2]
+    proxy = raw.astype(np.float32) * np.float32(1.0 / 65535.0)
+    del raw
+    params = _benchmark_params()
+    params.input_color_space_name = "sRGB"
+    the_enlarger = TheEnlarger()
+    color_space_manager = ColorSpaceManager()
+
+    def frame():
+        image = ImageData(array=proxy.copy(), width=w, height=h, channels=3, dtype=np.float32)
+        _PreviewWorker(image, params, the_enlarger, color_space_manager).run()
+
+    image_manager = ImageManager()
+    tiff_path = workdir / "logging.tif"
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def measure_paths(name: str, fn: Callable[[], Any]) -> None:
+        # 两条路径交替计时（每轮交换先后顺序）：差值只有几个百分点，分开连测会被漂移淹没
+        fn()
+        times: Dict[str, List[float]] = {"legacy": [], "gated": []}
+        saved: List[float] = []
+        for i in range(max(7, repeat)):
+            elapsed = {}
+            for path in (("legacy", "gated") if i % 2 == 0 else ("gated", "legacy")):
+                with (_unconditional_logging() if path == "legacy" else contextlib.nullcontext()):
+                    t0 = time.perf_counter()
+                    fn()
+                    elapsed[path] = (time.perf_counter() - t0) * 1000.0
+                times[path].append(elapsed[path])
+            saved.append(elapsed["legacy"] - elapsed["gated"])
+        for path, values in times.items():
+            results[name.format(path=path)] = {
+                "median_ms": statistics.median(values),
+                "min_ms": min(values),
+                "max_ms": max(values),
+                "repeat": len(values),
+            }
+        # 同一轮内 legacy − gated 的中位数，即去掉的日志开销
+        results[name.format(path="gated")]["saved_ms"] = statistics.median(saved)
+
+    previous = get_log_level()
+    try:
+        set_log_level("INFO")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            measure_paths("preview_frame_log_{path}", frame)
+            for mp in megapixels:
+                name = f"load_log_{{path}}@{mp:g}MP"
+                needed = _BYTES_PER_MP["decode_tiff16"] * mp
+                available = _available_bytes()
+                if available is not None and needed > available:
+                    skipped = {"skipped": f"需要约 {needed / 2**30:.1f} GiB 内存，可用 {available / 2**30:.1f} GiB"}
+                    for path in ("legacy", "gated"):
+                        results[name.format(path=path)] = skipped
+                    continue
+                raw = synthetic_negative(mp)
+                image_manager.save_image(
+                    ImageData(array=raw.astype(np.float32) * np.float32(1.0 / 65535.0),
+                              width=raw.shape[1], height=raw.shape[0], channels=3, dtype=np.float32),
+                    str(tiff_path), bit_depth=16
+                )
+                del raw
+                measure_paths(name, lambda: image_manager.load_image(str(tiff_path)))
+                tiff_path.unlink()
+    finally:
+        set_log_level(previous)
+        if tiff_path.exists():
+            tiff_path.unlink()
+    for key, result in results.items():
+        if "skipped" in result:
+            log(f"[BENCH] {key:<28} 跳过（{result['skipped']}）")
+        elif "saved_ms" in result:
+            log(f"[BENCH] {key:<28} {result['median_ms']:10.1f}ms  （比 legacy 少 {result['saved_ms']:.1f}ms）")
+        else:
+            log(f"[BENCH] {key:<28} {result['median_ms']:10.1f}ms")
+    return results
+
+
+def run_suite(megapixels: Iterable[float], repeat: int, cases: Optional[Iterable[str]] = None,
+              log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """运行基准用例
+
+    Args:
+        megapixels: 合成图像尺寸（百万像素）
+        repeat: 每个用例的计时次数
+        cases: 用例组（"image", "lut", "ccm", "logging"），None 表示全部
+    """
+    groups = set(cases) if cases else {"image", "lut", "ccm", "logging"}
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="divere_bench_") as tmp:
+        workdir = Path(tmp)
+        if "image" in groups:
+            results.update(run_image_cases(megapixels, repeat, workdir, log))
+        if "lut" in groups:
+            results.update(run_lut_cases(repeat, workdir, log))
+        if "ccm" in groups:
+            results.update(run_ccm_case(repeat, log=log))
+        if "logging" in groups:
+            results.update(run_logging_case(repeat, workdir, megapixels, log=log))
+    return results
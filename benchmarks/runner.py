@@ -0,0 +1,128 @@
+"""
+基准结果的保存与比较
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+RESULT_FORMAT = 1
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "baseline.json"
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def machine_info() -> Dict[str, Any]:
+    """运行环境（比较不同机器的结果没有意义，compare 会提示）"""
+    return {
+        "os": f"{platform.system()} {platform.release()}",
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+# 决定耗时可比性的字段：内核小版本、numpy 版本等随 CI 镜像更新而变化，不作为换机判断依据
+_MACHINE_IDENTITY_KEYS = ("machine", "processor", "cpu_count")
+
+
+def same_machine(baseline: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """两份结果是否来自同一类机器（同一操作系统、架构、处理器与核数）"""
+    base_machine = baseline.get("machine") or {}
+    cur_machine = current.get("machine") or {}
+    if str(base_machine.get("os", "")).split(" ")[0] != str(cur_machine.get("os", "")).split(" ")[0]:
+        return False
+    return all(base_machine.get(key) == cur_machine.get(key) for key in _MACHINE_IDENTITY_KEYS)
+
+
+def build_report(results: Dict[str, Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "format": RESULT_FORMAT,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "revision": _git_revision(),
+        "machine": machine_info(),
+        "config": config,
+        "results": results,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get("format") != RESULT_FORMAT:
+        raise ValueError(f"基准结果格式不兼容: {path}")
+    return report
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10,
+                    min_delta_ms: float = 2.0) -> Tuple[List[Tuple[str, str, Optional[float], Optional[float]]], bool]:
+    """逐项比较中位耗时
+
+    Args:
+        threshold: 相对基线的允许变慢比例（0.10 = 10%）
+        min_delta_ms: 绝对差小于此值时不判定（避免毫秒级用例的噪声）
+
+    Returns:
+        (rows, regressed)：rows 为 (用例名, 状态, 基线ms, 当前ms)，状态为
+        regression / improvement / ok / new / missing / skipped
+    """
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    rows = []
+    regressed = False
+    for name in sorted(set(base_results) | set(cur_results)):
+        base = base_results.get(name, {}).get("median_ms")
+        cur = cur_results.get(name, {}).get("median_ms")
+        if name not in cur_results:
+            rows.append((name, "missing", base, None))
+        elif name not in base_results:
+            rows.append((name, "new", None, cur))
+        elif base is None or cur is None:
+            rows.append((name, "skipped", base, cur))
+        elif cur > base * (1.0 + threshold) and cur - base >= min_delta_ms:
+            rows.append((name, "regression", base, cur))
+            regressed = True
+        elif cur < base * (1.0 - threshold) and base - cur >= min_delta_ms:
+            rows.append((name, "improvement", base, cur))
+        else:
+            rows.append((name, "ok", base, cur))
+    return rows, regressed
+
+
+def print_comparison(rows, baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> None:
+    if not same_machine(baseline, current):
+        print("[BENCH] 注意：基线与当前结果来自不同的运行环境，比较结果仅供参考", flush=True)
+    print(f"[BENCH] 基线 {baseline.get('revision')} ({baseline.get('created')}) → "
+          f"当前 {current.get('revision')} ({current.get('created')})，阈值 {threshold:.0%}", flush=True)
+    for name, status, base, cur in rows:
+        base_text = "-" if base is None else f"{base:.1f}ms"
+        cur_text = "-" if cur is None else f"{cur:.1f}ms"
+        ratio = f"{(cur / base - 1.0):+.1%}" if base and cur else ""
+        marker = "✗" if status == "regression" else ("✓" if status == "improvement" else " ")
+        print(f"[BENCH] {marker} {name:<28} {base_text:>12} {cur_text:>12} {ratio:>8}  {status}", flush=True)
@@ -0,0 +1,82 @@
+"""
+确定性的合成 16-bit 彩色负片
+
+场景 = 平滑渐变 + 若干高斯光斑 + 24 色块网格（线性反射率），按胶片的特性曲线
+转为密度（含橙色片基），再按扫描曝光转为透射率并量化到 16-bit，最后叠加颗粒噪声。
+按行分块生成（100 MP 时峰值内存约为输出本身），每块的噪声种子由 (seed, 块序号) 决定，
+同样的参数在任何机器上生成逐位相同的图像。
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+# 橙色片基的最低密度（R, G, B）与各层反差
+_BASE_DENSITY = np.array([0.25, 0.55, 0.80], dtype=np.float32)
+_LAYER_GAMMA = np.array([0.62, 0.66, 0.70], dtype=np.float32)
+_ROWS_PER_BLOCK = 256
+
+
+def dimensions_for(megapixels: float, aspect: float = 1.5) -> Tuple[int, int]:
+    """指定像素数（百万）与宽高比的 (height, width)"""
+    height = int(round(math.sqrt(megapixels * 1e6 / aspect)))
+    width = int(round(height * aspect))
+    return height, width
+
+
+def _scene_block(y0: int, y1: int, height: int, width: int) -> np.ndarray:
+    """场景线性反射率 [y1-y0, width, 3]（只依赖坐标，分块结果与整幅生成一致）"""
+    ys = (np.arange(y0, y1, dtype=np.float32) / max(1, height - 1))[:, None]
+    xs = (np.arange(width, dtype=np.float32) / max(1, width - 1))[None, :]
+    scene = np.empty((y1 - y0, width, 3), dtype=np.float32)
+    scene[..., 0] = 0.05 + 0.55 * xs + 0.10 * np.sin(7.0 * ys + 3.0 * xs)
+    scene[..., 1] = 0.08 + 0.45 * ys + 0.10 * np.cos(5.0 * xs - 2.0 * ys)
+    scene[..., 2] = 0.06 + 0.35 * (1.0 - xs) * ys + 0.08 * np.sin(11.0 * xs * ys)
+
+    # 高斯光斑（高光与阴影细节）
+    for cx, cy, radius, gain in ((0.3, 0.3, 0.08, 0.8), (0.7, 0.6, 0.12, -0.04), (0.5, 0.85, 0.05, 1.5)):
+        blob = np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2.0 * radius ** 2))
+        scene += (gain * blob)[..., None]
+
+    # 24 色块网格（右下角 1/4 区域，4×6）
+    rng = np.random.default_rng(24)
+    patches = rng.uniform(0.03, 0.9, size=(4, 6, 3)).astype(np.float32)
+    row = np.floor((ys[:, 0] - 0.62) / 0.08).astype(np.int64)
+    col = np.floor((xs[0] - 0.55) / 0.07).astype(np.int64)
+    rows_in = (row >= 0) & (row < 4)
+    cols_in = (col >= 0) & (col < 6)
+    if rows_in.any() and cols_in.any():
+        r_idx = np.nonzero(rows_in)[0]
+        c_idx = np.nonzero(cols_in)[0]
+        scene[np.ix_(r_idx, c_idx)] = patches[row[r_idx]][:, col[c_idx]]
+
+    np.clip(scene, 0.002, 1.5, out=scene)
+    return scene
+
+
+def synthetic_negative(megapixels: float, seed: int = 0, aspect: float = 1.5) -> np.ndarray:
+    """生成合成 16-bit 负片扫描
+
+    Args:
+        megapixels: 像素数（百万），如 6 / 24 / 100
+        seed: 颗粒噪声种子
+        aspect: 宽高比
+
+    Returns:
+        [H, W, 3] uint16 数组
+    """
+    height, width = dimensions_for(megapixels, aspect)
+    out = np.empty((height, width, 3), dtype=np.uint16)
+    for block, y0 in enumerate(range(0, height, _ROWS_PER_BLOCK)):
+        y1 = min(height, y0 + _ROWS_PER_BLOCK)
+        scene = _scene_block(y0, y1, height, width)
+        # 特性曲线：密度 = 片基 + 反差 × log10(曝光)
+        density = _BASE_DENSITY + _LAYER_GAMMA * (np.log10(scene) + 2.7)
+        rng = np.random.default_rng((seed, block))
+        density += rng.normal(0.0, 0.012, size=density.shape).astype(np.float32)
+        # 扫描曝光：片基处约 90% 满量程
+        transmission = np.power(10.0, -(density - _BASE_DENSITY.min()), dtype=np.float32) * 0.9
+        np.clip(transmission * 65535.0 + 0.5, 0.0, 65535.0, out=transmission)
+        out[y0:y1] = transmission.astype(np.uint16)
+    return out
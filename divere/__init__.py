@@ -7,14 +7,24 @@ __version__ = "2025.12.01"
 __author__ = "V7"
 __email__ = "vanadis@yeah.net"
 
-from .core.image_manager import ImageManager
-from .core.color_space import ColorSpaceManager
-from .core.the_enlarger import TheEnlarger
-from .core.lut_processor import LUTProcessor
-
 __all__ = [
     "ImageManager",
     "ColorSpaceManager", 
     "TheEnlarger",
     "LUTProcessor",
-] 
\ No newline at end of file
+]
+
+# 核心类在首次访问时才导入：导入任意子模块（worker 进程、启动分析等）不再连带加载整个核心
+_LAZY_EXPORTS = {
+    "ImageManager": ".core.image_manager",
+    "ColorSpaceManager": ".core.color_space",
+    "TheEnlarger": ".core.the_enlarger",
+    "LUTProcessor": ".core.lut_processor",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -51,12 +51,77 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+# 清除 GPU 探测缓存后退出（驱动升级后设备/内核缓存失效时使用），无需启动 Qt
+if '--clear-gpu-cache' in sys.argv:
+    from divere.core.gpu_probe_cache import clear_gpu_probe_cache
+    removed = clear_gpu_probe_cache()
+    print(f"[DiVERE] GPU probe cache cleared ({removed} files)")
+    sys.exit(0)
+
+# 一次性校准调度参数（线程数、并行/GPU 阈值、分块尺寸）并写入本机缓存后退出，无需启动 Qt
+# --autotune --quick 使用更小的合成图像，几十秒内完成
+if '--autotune' in sys.argv:
+    from divere.core.autotune import run_autotune, save_tuning
+    results, timings = run_autotune(quick='--quick' in sys.argv)
+    path = save_tuning(results, timings)
+    print(f"[DiVERE] Autotune results: {results}")
+    print(f"[DiVERE] Saved to {path}")
+    sys.exit(0)
+
+# 结构化追踪：--trace out.json（或 DIVERE_TRACE=out.json），退出时写出 Chrome/Perfetto trace
+from divere.utils.tracing import tracer, start_from_environment
+if '--trace' in sys.argv and sys.argv.index('--trace') + 1 < len(sys.argv):
+    tracer.start(sys.argv[sys.argv.index('--trace') + 1], process_name="DiVERE")
+else:
+    start_from_environment()
+
+# 聚合指标导出：--metrics-port N 提供 http://127.0.0.1:N/metrics，--metrics-file path 在退出时写出
+# （未指定时读取 ui 设置 metrics_port / metrics_file）
+from divere.utils.metrics import start_exporters
+def _cli_value(flag):
+    if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv):
+        return sys.argv[sys.argv.index(flag) + 1]
+    return None
+start_exporters(
+    port=int(_cli_value('--metrics-port')) if _cli_value('--metrics-port') else None,
+    path=_cli_value('--metrics-file'),
+)
+
+# 日志级别（文件与控制台）：--debug / -v 输出全部 DEBUG；否则 DIVERE_LOG_LEVEL 或 ui 设置 log_level（默认 INFO）
+from divere.utils.debug_logger import set_log_level
+if '--debug' in sys.argv or '-v' in sys.argv:
+    set_log_level("DEBUG")
+elif 'DIVERE_LOG_LEVEL' not in os.environ:
+    from divere.utils.enhanced_config_manager import enhanced_config_manager
+    set_log_level(enhanced_config_manager.get_ui_setting("log_level", "INFO"))
+
+# 启动耗时分析：必须在导入 PySide6 和其余 divere 模块之前安装
+PROFILE_STARTUP = '--profile-startup' in sys.argv
+from divere.utils.startup_profiler import startup_profiler
+if PROFILE_STARTUP:
+    startup_profiler.install()
+
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 import multiprocessing
 
 from divere.ui.main_window import MainWindow
 from divere.i18n import initialize_language
+startup_profiler.mark("导入模块")
+
+
+def _startup_budget_ms() -> float:
+    """启动预算：--startup-budget-ms N 优先，其次配置项 ui.startup_budget_ms"""
+    if '--startup-budget-ms' in sys.argv:
+        try:
+            return float(sys.argv[sys.argv.index('--startup-budget-ms') + 1])
+        except (IndexError, ValueError):
+            print("[DiVERE] Warning: --startup-budget-ms 需要一个数值参数")
+    from divere.utils.enhanced_config_manager import enhanced_config_manager
+    try:
+        return float(enhanced_config_manager.get_ui_setting("startup_budget_ms", 2500))
+    except (TypeError, ValueError):
+        return 2500.0
 
 
 def main():
@@ -79,9 +144,30 @@ def main():
     # else:
     #     if '--debug' in sys.argv or '-v' in sys.argv:
     #         print(f"[DiVERE] Using default spawn method on {platform.system()}")
-    if multiprocessing.get_start_method(allow_none=True) != "spawn":
-        multiprocessing.set_start_method("spawn", force=True)
     # 2025.11.21：因为metal不支持fork，所以关闭这一特性。
+    # Linux（非打包环境）使用 forkserver 并预加载核心模块：worker 从已 import 好
+    # numpy/cv2/管线模块的 server 进程 fork 出来，省去每次启动 worker 的解释器与 import 开销。
+    # macOS（Metal）与 Windows 仍使用 spawn。
+    start_method = "spawn"
+    if platform.system() == 'Linux' and not getattr(sys, 'frozen', False):
+        try:
+            multiprocessing.set_start_method("forkserver", force=True)
+            multiprocessing.set_forkserver_preload([
+                'numpy',
+                'cv2',
+                'divere.core.color_space',
+                'divere.core.the_enlarger',
+                'divere.core.preview_worker_process',
+            ])
+            start_method = "forkserver"
+        except (RuntimeError, ValueError) as e:
+            print(f"[DiVERE] Warning: Failed to set forkserver start method: {e}")
+    if start_method == "spawn" and multiprocessing.get_start_method(allow_none=True) != "spawn":
+        multiprocessing.set_start_method("spawn", force=True)
+    if '--debug' in sys.argv or '-v' in sys.argv:
+        print(f"[DiVERE] multiprocessing start method: {start_method}")
+
+    startup_profiler.mark("multiprocessing 配置")
 
     # 创建Qt应用
     app = QApplication(sys.argv)
@@ -97,12 +183,26 @@ def main():
     # 设置应用程序图标（如果有的话）
     # app.setWindowIcon(QIcon("icons/app_icon.png"))
 
+    startup_profiler.mark("QApplication")
+
     # 初始化多语言支持（在创建UI之前）
     initialize_language()
+    startup_profiler.mark("多语言")
 
     # 创建主窗口
     window = MainWindow()
+    startup_profiler.mark("MainWindow()")
     window.show()
+    startup_profiler.mark("window.show()")
+
+    if PROFILE_STARTUP:
+        # 事件循环处理完首批事件（首帧绘制）后输出报告并退出；超出预算时退出码为 1
+        def _finish_startup_profile():
+            startup_profiler.mark("首帧绘制")
+            startup_profiler.uninstall()
+            within = startup_profiler.report(_startup_budget_ms())
+            app.exit(0 if within else 1)
+        QTimer.singleShot(0, _finish_startup_profile)
     
     # 运行应用程序
     sys.exit(app.exec())
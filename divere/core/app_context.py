@@ -1,9 +1,12 @@
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot, QThreadPool, QTimer
 from PySide6.QtGui import QPixmapCache
 from typing import Optional, List, Tuple
+from collections import OrderedDict, deque
+import json
+import threading
+import time
 import numpy as np
 from pathlib import Path
-from colour.temperature import CCT_to_xy_CIE_D
 
 from .data_types import ImageData, ColorGradingParams, Preset, CropInstance, PresetBundle, CropPresetEntry, InputTransformationDefinition, MatrixDefinition, CurveDefinition, PipelineConfig, UIStateConfig, ContactsheetProfile, CropAddDirection, PreviewConfig
 from .image_manager import ImageManager
@@ -13,9 +16,14 @@ from .film_type_controller import FilmTypeController
 from .folder_navigator import FolderNavigator
 from ..utils.auto_preset_manager import AutoPresetManager
 from ..utils.enhanced_config_manager import enhanced_config_manager
-from . import color_science
+from ..utils.tracing import traced, tracer
+from ..utils import metrics
+from ..utils.debug_logger import get_logger
 from ..i18n import tr
 
+_log = get_logger()
+_worker_log = get_logger("WORKER")
+
 
 class _PreviewWorkerSignals(QObject):
     result = Signal(ImageData)
@@ -23,10 +31,198 @@ class _PreviewWorkerSignals(QObject):
     finished = Signal()
 
 
+class _DetailTileSignals(QObject):
+    result = Signal(object)  # {'key': ..., 'source'/'rgb8': np.ndarray 或 None（已过时/失败）, ...}
+
+
+class _DetailTileWorker(QRunnable):
+    """为一个视口细节块取出全分辨率源区域（见 viewport_tiles）
+
+    进程模式：只切出（并降采样）源区域，由 GUI 线程转交预览 worker 进程渲染，
+    不触碰主进程的 the_enlarger / color_space_manager（二者不是线程安全的）。
+    线程模式（没有 worker 进程）：在本线程渲染，使用线程自己的 TheEnlarger/ColorSpaceManager。
+    """
+
+    def __init__(self, context, key, source_array: np.ndarray, crop_px: tuple, tile: dict,
+                 request: dict, params: ColorGradingParams, monochrome: bool, render_locally: bool):
+        super().__init__()
+        self.context = context
+        self.key = key
+        self.source_array = source_array
+        self.crop_px = crop_px
+        self.tile = tile
+        self.request = request
+        self.params = params
+        self.monochrome = monochrome
+        self.render_locally = render_locally
+        self.signals = _DetailTileSignals()
+
+    @Slot()
+    def run(self):
+        source = None
+        rgb8 = None
+        try:
+            # 视口已移走（块不再需要）时跳过
+            if self.key in self.context._detail_wanted:
+                from .viewport_tiles import detail_tile_source, render_detail_tile
+                source = detail_tile_source(self.source_array, self.crop_px, self.tile,
+                                            self.request.get('orientation', 0))
+                if self.render_locally:
+                    the_enlarger, color_space_manager = self.context._get_thread_detail_renderer()
+                    rgb8 = render_detail_tile(source, self.request, self.params,
+                                              the_enlarger, color_space_manager, monochrome=self.monochrome)
+                    source = None
+        except Exception as e:
+            source = None
+            _log.warning("DetailTileWorker.run(): 细节块渲染失败 %s: %s", self.tile.get('index'), e)
+        finally:
+            self.source_array = None
+            self.signals.result.emit({'key': self.key, 'source': source, 'rgb8': rgb8,
+                                      'request': self.request, 'params': self.params,
+                                      'monochrome': self.monochrome})
+
+
+class _PyramidSignals(QObject):
+    result = Signal(object)  # {'generation': int, 'levels': {level: np.ndarray}}
+
+
+class _PyramidWorker(QRunnable):
+    """后台构建原图的多分辨率金字塔（见 image_pyramid）"""
+
+    def __init__(self, context, generation: int, source_array: np.ndarray, proxy_size: Tuple[int, int]):
+        super().__init__()
+        self.context = context
+        self.generation = generation
+        self.source_array = source_array
+        self.proxy_size = proxy_size
+        self.signals = _PyramidSignals()
+
+    @Slot()
+    def run(self):
+        levels = {}
+        try:
+            from .image_pyramid import build_pyramid_levels
+            levels = build_pyramid_levels(
+                self.source_array, self.proxy_size,
+                should_continue=lambda: self.context._image_generation == self.generation
+            )
+        except Exception as e:
+            _log.warning("PyramidWorker.run(): 金字塔构建失败: %s", e)
+        finally:
+            self.source_array = None
+            self.signals.result.emit({'generation': self.generation, 'levels': levels})
+
+
+def _solve_neutral_point_gains(patch: np.ndarray, request: dict, params: ColorGradingParams,
+                               target: np.ndarray, the_enlarger: TheEnlarger,
+                               color_space_manager: ColorSpaceManager) -> Optional[Tuple[float, float, float]]:
+    """在proxy采样块上直接求解中性点的 rgb_gains
+
+    rgb_gains 在曲线之前以加法作用于密度，因此只需对选点处的小块像素重复执行
+    预览变换链，用有限差分 Newton 法反解曲线与显示矩阵的局部行为，不需要等待完整预览渲染。
+
+    Args:
+        patch: proxy 上与preview采样区域对应的小块（proxy 精度，只读）
+        request: 预览请求中的变换参数（idt_gamma/custom_colorspace_def）
+        params: 求解起点的参数（不会被修改）
+        target: DisplayP3 下 R/G、B/G 目标比值
+        the_enlarger / color_space_manager: 调用线程自己的渲染器
+
+    Returns:
+        (r_gain, g_gain, b_gain)，无法求解时返回 None
+    """
+    from .preview_worker_process import _render_preview_image
+
+    patch_image = ImageData(array=patch, metadata={})
+
+    def ratio_error(gains: np.ndarray) -> np.ndarray:
+        probe_params = params.shallow_copy()
+        probe_params.rgb_gains = (float(gains[0]), float(gains[1]), float(gains[2]))
+        rendered = _render_preview_image(patch_image, request, probe_params,
+                                         the_enlarger, color_space_manager)
+        rgb = np.mean(rendered.array.reshape(-1, rendered.array.shape[-1])[:, :3], axis=0, dtype=np.float64)
+        g_mean = max(float(rgb[1]), 1e-10)
+        return np.array([rgb[0] / g_mean, rgb[2] / g_mean]) - target
+
+    # Newton 迭代（仅调整R/B，G保持不变），Jacobian 用有限差分估计
+    # 曲线肩部/趾部非线性较强，使用回溯线搜索保证误差单调下降
+    gains = np.array(params.rgb_gains, dtype=float)
+    eps = 1e-3
+    err = ratio_error(gains)
+    for _ in range(12):
+        if np.max(np.abs(err)) < 1e-4:
+            break
+        jacobian = np.empty((2, 2))
+        for col, ch in enumerate((0, 2)):
+            probe = gains.copy()
+            probe[ch] += eps
+            jacobian[:, col] = (ratio_error(probe) - err) / eps
+        if abs(np.linalg.det(jacobian)) < 1e-12:
+            break
+        step = np.linalg.solve(jacobian, err)
+
+        step_scale = 1.0
+        improved = False
+        while step_scale > 1.0 / 64.0:
+            candidate = gains.copy()
+            candidate[0] = np.clip(gains[0] - step_scale * step[0], -3.0, 3.0)
+            candidate[2] = np.clip(gains[2] - step_scale * step[1], -3.0, 3.0)
+            candidate_err = ratio_error(candidate)
+            if np.linalg.norm(candidate_err) < np.linalg.norm(err):
+                gains, err = candidate, candidate_err
+                improved = True
+                break
+            step_scale *= 0.5
+        if not improved:
+            break
+
+    # 未达到收敛阈值时交给迭代模式处理
+    if not np.all(np.isfinite(gains)) or np.max(np.abs(err)) >= 0.001:
+        return None
+    return (float(gains[0]), float(gains[1]), float(gains[2]))
+
+
+class _NeutralPointSolveSignals(QObject):
+    result = Signal(object)  # {'token': int, 'params_key': tuple, 'gains': (r, g, b) 或 None}
+
+
+class _NeutralPointSolveWorker(QRunnable):
+    """后台直接求解中性点 gains（见 _solve_neutral_point_gains）
+
+    使用细节线程自己的 TheEnlarger/ColorSpaceManager，不与预览线程共享渲染器。
+    """
+
+    def __init__(self, context, token: int, job: dict):
+        super().__init__()
+        self.context = context
+        self.token = token
+        self.job = job
+        self.signals = _NeutralPointSolveSignals()
+
+    @Slot()
+    def run(self):
+        gains = None
+        try:
+            the_enlarger, color_space_manager = self.context._get_thread_detail_renderer()
+            gains = _solve_neutral_point_gains(
+                self.job['patch'], self.job['request'], self.job['params'], self.job['target'],
+                the_enlarger, color_space_manager
+            )
+        except Exception as e:
+            _log.debug("中性点直接求解失败，回退到迭代模式: %s", e)
+            gains = None
+        finally:
+            self.signals.result.emit({'token': self.token, 'params_key': self.job['params_key'],
+                                      'gains': gains})
+
+
 class _PreviewWorker(QRunnable):
     def __init__(self, image: ImageData, params: ColorGradingParams, the_enlarger: TheEnlarger,
                  color_space_manager: ColorSpaceManager, convert_to_monochrome_in_idt: bool = False,
-                 orientation: int = 0, idt_gamma: float = 1.0, custom_colorspace_def: dict = None):
+                 orientation: int = 0, idt_gamma: float = 1.0, custom_colorspace_def: dict = None,
+                 output_size: Optional[Tuple[int, int]] = None,
+                 analysis: Optional[dict] = None,
+                 stage_cache_key: Optional[tuple] = None):
         super().__init__()
         self.image = image
         self.params = params
@@ -36,11 +232,17 @@ class _PreviewWorker(QRunnable):
         self.orientation = orientation
         self.idt_gamma = idt_gamma
         self.custom_colorspace_def = custom_colorspace_def
+        self.output_size = output_size  # (w, h)：降采样渲染后放大回的全尺寸
+        self.analysis = analysis  # 随帧分析项（black cut-off 等）
+        self.stage_cache_key = stage_cache_key  # 输入标识：复用密度阶段中间结果
         self.signals = _PreviewWorkerSignals()
+        self.requested_at = time.time()  # 端到端延迟指标的起点
 
     @Slot()
+    @traced("preview_thread.run", cat="context")
     def run(self):
-        print("[DEBUG] PreviewWorker.run() 开始执行", flush=True)
+        _log.debug("PreviewWorker.run() 开始执行")
+        t_start = time.time()
         # —— 关键点：把大对象搬到局部变量，再把 self 上的引用清掉 ——
         image = self.image
         params = self.params
@@ -51,17 +253,10 @@ class _PreviewWorker(QRunnable):
         self.params = None
         self.idt_gamma = None
         self.custom_colorspace_def = None
-        print(f"[DEBUG] PreviewWorker.run(): 图像尺寸={image.width}x{image.height}, orientation={orientation}", flush=True)
+        _log.debug("PreviewWorker.run(): 图像尺寸=%sx%s, orientation=%s", image.width, image.height, orientation)
 
         try:
-            # === Step A: 应用 IDT Gamma（在旋转之前）===
-            if abs(idt_gamma - 1.0) > 1e-6:
-                print(f"[DEBUG] PreviewWorker.run(): 应用 IDT gamma={idt_gamma}", flush=True)
-                image.array = self.the_enlarger.pipeline_processor.math_ops.apply_power(
-                    image.array, idt_gamma, use_optimization=True
-                )
-
-            # === Step B: 注册自定义色彩空间（如果需要）===
+            # === Step A: 注册自定义色彩空间（如果需要）===
             if custom_colorspace_def:
                 try:
                     cs_name = custom_colorspace_def.get('name')
@@ -69,7 +264,7 @@ class _PreviewWorker(QRunnable):
                     white_point_xy = np.array(custom_colorspace_def.get('white_point_xy'), dtype=float)
                     gamma = float(custom_colorspace_def.get('gamma', 1.0))
 
-                    print(f"[DEBUG] PreviewWorker.run(): 注册自定义色彩空间 {cs_name}", flush=True)
+                    _log.debug("PreviewWorker.run(): 注册自定义色彩空间 %s", cs_name)
                     self.color_space_manager.register_custom_colorspace(
                         name=cs_name,
                         primaries_xy=primaries_xy,
@@ -78,64 +273,112 @@ class _PreviewWorker(QRunnable):
                     )
                 except Exception as e:
                     # 注册失败不应导致预览失败，记录错误并继续
-                    print(f"[WARNING] PreviewWorker.run(): 注册自定义色彩空间失败: {e}", flush=True)
+                    _log.warning("PreviewWorker.run(): 注册自定义色彩空间失败: %s", e)
 
-            # === Step C: 色彩空间转换 ===
-            print(f"[DEBUG] PreviewWorker.run(): 应用色彩空间转换 {params.input_color_space_name}", flush=True)
-            image = self.color_space_manager.set_image_color_space(
-                image, params.input_color_space_name
-            )
-            image = self.color_space_manager.convert_to_working_space(
-                image, skip_gamma_inverse=True
+            # === Step B: IDT Gamma + 色彩空间转换（融合为一次分块遍历）===
+            _log.debug("PreviewWorker.run(): 应用 IDT gamma=%s 与色彩空间转换 %s", idt_gamma, params.input_color_space_name)
+            working_image = self.color_space_manager.input_to_working_space(
+                image, params.input_color_space_name, idt_gamma
             )
+            if working_image is None:
+                # 不支持的通道布局：逐步变换
+                if abs(idt_gamma - 1.0) > 1e-6:
+                    image.array = self.the_enlarger.pipeline_processor.math_ops.apply_power(
+                        image.array, idt_gamma, use_optimization=True
+                    )
+                image = self.color_space_manager.set_image_color_space(
+                    image, params.input_color_space_name
+                )
+                working_image = self.color_space_manager.convert_to_working_space(
+                    image, skip_gamma_inverse=True
+                )
+            image = working_image
 
             # === Step D: Apply rotation if needed ===
             if orientation % 360 != 0:
                 k = (orientation // 90) % 4
                 if k != 0:
-                    print(f"[DEBUG] PreviewWorker.run(): 应用旋转 k={k} (orientation={orientation})", flush=True)
+                    _log.debug("PreviewWorker.run(): 应用旋转 k=%s (orientation=%s)", k, orientation)
                     image.array = np.rot90(image.array, k=int(k))
-                    print(f"[DEBUG] PreviewWorker.run(): 旋转后图像尺寸={image.width}x{image.height}", flush=True)
+                    _log.debug("PreviewWorker.run(): 旋转后图像尺寸=%sx%s", image.width, image.height)
+
+            # 密度直方图在胶片管线之前的工作空间数据上采样
+            density_histogram = None
+            if self.analysis and self.analysis.get('histogram'):
+                from .preview_analysis import density_histograms, histogram_stride
+                density_histogram = density_histograms(
+                    image.array, histogram_stride(*image.array.shape[:2])
+                )
 
-            print("[DEBUG] PreviewWorker.run(): 准备monochrome_converter", flush=True)
+            _log.debug("PreviewWorker.run(): 准备monochrome_converter")
             monochrome_converter = None
             if self.convert_to_monochrome_in_idt:
                 monochrome_converter = self.color_space_manager.convert_to_monochrome
-                print("[DEBUG] PreviewWorker.run(): 将使用monochrome转换", flush=True)
+                _log.debug("PreviewWorker.run(): 将使用monochrome转换")
 
-            print(f"[DEBUG] PreviewWorker.run(): params.enable_density_curve={params.enable_density_curve}, curve_name={params.density_curve_name}", flush=True)
-            print(f"[DEBUG] PreviewWorker.run(): 曲线点数: RGB={len(params.curve_points) if params.curve_points else 0}, R={len(params.curve_points_r) if params.curve_points_r else 0}", flush=True)
-            print("[DEBUG] PreviewWorker.run(): 开始apply_full_pipeline...", flush=True)
+            _log.debug("PreviewWorker.run(): params.enable_density_curve=%s, curve_name=%s", params.enable_density_curve, params.density_curve_name)
+            _log.debug("PreviewWorker.run(): 曲线点数: RGB=%s, R=%s", len(params.curve_points) if params.curve_points else 0, len(params.curve_points_r) if params.curve_points_r else 0)
+            _log.debug("PreviewWorker.run(): 开始apply_full_pipeline...")
             result_image = self.the_enlarger.apply_full_pipeline(
                 image,
                 params,
                 convert_to_monochrome_in_idt=self.convert_to_monochrome_in_idt,
                 monochrome_converter=monochrome_converter,
+                stage_cache_key=self.stage_cache_key,
             )
-            print(f"[DEBUG] PreviewWorker.run(): apply_full_pipeline完成，结果尺寸={result_image.width}x{result_image.height}", flush=True)
+            _log.debug("PreviewWorker.run(): apply_full_pipeline完成，结果尺寸=%sx%s", result_image.width, result_image.height)
 
-            print("[DEBUG] PreviewWorker.run(): 开始convert_to_display_space...", flush=True)
+            _log.debug("PreviewWorker.run(): 开始convert_to_display_space...")
             result_image = self.color_space_manager.convert_to_display_space(
                 result_image, "DisplayP3"
             )
-            print("[DEBUG] PreviewWorker.run(): convert_to_display_space完成", flush=True)
+            _log.debug("PreviewWorker.run(): convert_to_display_space完成")
+
+            # 随帧分析（在放大前的结果上计算，显示时按图像尺寸缩放）
+            if self.analysis:
+                from .preview_analysis import analyze_preview_frame
+                result_image.metadata['analysis'] = analyze_preview_frame(
+                    result_image.array, self.analysis, params, self.convert_to_monochrome_in_idt,
+                    density=density_histogram
+                )
 
-            print("[DEBUG] PreviewWorker.run(): 发射result信号", flush=True)
+            # 交互拖动期间的低分辨率渲染：放大回全尺寸，保证UI坐标一致
+            if self.output_size is not None:
+                out_w, out_h = self.output_size
+                if result_image.array.shape[:2] != (out_h, out_w):
+                    import cv2
+                    coarse = result_image.array
+                    # OpenCV 的 resize 不支持 float16
+                    src = coarse.astype(np.float32) if coarse.dtype == np.float16 else np.ascontiguousarray(coarse)
+                    result_image.array = cv2.resize(
+                        src, (out_w, out_h), interpolation=cv2.INTER_LINEAR
+                    ).astype(coarse.dtype, copy=False)
+                    result_image.width, result_image.height = out_w, out_h
+
+            # 在线程池中量化为显示用 8-bit 帧，GUI 线程只需上传 QPixmap
+            result_image.build_display_rgb8()
+
+            t_done = time.time()
+            metrics.preview_render_thread.observe(t_done - t_start)
+            metrics.preview_latency_thread.observe(t_done - self.requested_at)
+            metrics.preview_queue_wait_thread.observe(max(0.0, t_start - self.requested_at))
+
+            _log.debug("PreviewWorker.run(): 发射result信号")
             self.signals.result.emit(result_image)
-            print("[DEBUG] PreviewWorker.run(): result信号已发射", flush=True)
+            _log.debug("PreviewWorker.run(): result信号已发射")
 
         except Exception as e:
             import traceback
             tb = traceback.format_exc()
             error_msg = f"{e}\n{tb}"
-            print(f"[ERROR] PreviewWorker.run(): 处理失败: {error_msg}", flush=True)
+            _log.error("PreviewWorker.run(): 处理失败: %s", error_msg)
             self.signals.error.emit(error_msg)
 
         finally:
             # 不再依赖 del，只发 finished，实际引用已经在上面提前断掉了
-            print("[DEBUG] PreviewWorker.run(): 发射finished信号", flush=True)
+            _log.debug("PreviewWorker.run(): 发射finished信号")
             self.signals.finished.emit()
-            print("[DEBUG] PreviewWorker.run() 执行完成", flush=True)
+            _log.debug("PreviewWorker.run() 执行完成")
 
 
 class ApplicationContext(QObject):
@@ -161,6 +404,8 @@ class ApplicationContext(QObject):
     curves_config_reloaded = Signal()
     # 旋转完成信号
     rotation_completed = Signal()
+    # 视口细节块就绪：{'generation', 'key', 'display_rect', 'rgb8'}
+    detail_tile_ready = Signal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -190,6 +435,7 @@ class ApplicationContext(QObject):
         # =================
         self._current_image: Optional[ImageData] = None
         self._current_proxy: Optional[ImageData] = None # 应用输入变换和工作空间变换后的代理
+        self._proxy_generation = 0  # proxy 代次（线程模式密度阶段缓存的输入标识）
         self._current_params: ColorGradingParams = self._create_default_params()
         # 当前胶片类型
         self._current_film_type: str = "color_negative_c41"
@@ -207,11 +453,20 @@ class ApplicationContext(QObject):
 
         if self._use_process_isolation:
             # 进程模式相关字段
-            self._preview_worker_process = None  # PreviewWorkerProcess 实例
+            self._preview_worker_process = None  # PreviewWorkerProcess / PreviewWorkerPool 实例
             self._proxy_shared_memory = None  # shared_memory.SharedMemory 实例
             self._proxy_needs_reload = False  # Proxy 是否需要重载到 worker（优化标志）
             self._result_poll_timer = QTimer()
             self._result_poll_timer.timeout.connect(self._poll_preview_result)
+            # 事件驱动的结果通知（监听 worker 通知管道；不可用时回退到定时轮询）
+            self._result_notifier = None
+            # 已收到通知但数据尚未写入结果管道的消息数（稍后非阻塞重试）
+            self._result_backlog = 0
+            # 预先初始化好的备用 worker（切换/重启 worker 时直接启用，省去冷启动）
+            self._standby_worker_process = None
+            # 当前 worker 的获取方式与时间（'cold_start' / 'hot_swap', t0），用于统计首帧延迟
+            self._worker_acquire_info = None
+            self._worker_startup_stats: dict = {}
 
             # 注册 atexit handler 确保程序退出时清理 worker 进程
             import atexit
@@ -224,6 +479,30 @@ class ApplicationContext(QObject):
             # 这主要解决OpenBLAS在numpy.linalg.solve中的栈空间不足问题
             self.thread_pool.setStackSize(8 * 1024 * 1024)  # 8MB
 
+        # 交互式预览：拖动控件期间以较低分辨率渲染，松开后渲染全质量帧
+        self._interactive_preview: bool = False
+        self._interactive_proxy: Optional[ImageData] = None  # 线程模式的降采样proxy缓存
+        self._interactive_proxy_key = None
+
+        # 随预览帧在 worker 中计算的分析项（如 {'black_cutoff': True}）
+        self._preview_analysis: dict = {}
+
+        # 放大查看时的视口细节块（全分辨率原图按块渲染，LRU 按字节数限制）
+        self._image_generation = 0
+        self._detail_generation = 0
+        self._detail_wanted: dict = {}  # 当前视口需要的块 key → display_rect
+        self._detail_pending: set = set()
+        self._detail_tile_cache: "OrderedDict" = OrderedDict()
+        self._detail_tile_cache_bytes = 0
+        self._detail_thread_pool: Optional[QThreadPool] = None
+        self._detail_send_queue: deque = deque()  # 等待交给 worker 进程的块 (key, 源区域与参数)
+        self._detail_tickets: dict = {}  # 已交给 worker 的块 ticket → (key, 发送时间)
+        self._detail_ticket_seq = 0
+        self._detail_thread_local = threading.local()  # 线程模式下每个细节线程的渲染对象
+
+        # 原图的多分辨率金字塔 {level: float16 数组}，加载后在后台构建
+        self._image_pyramid: dict = {}
+
         # AI自动校色迭代状态
         self._auto_color_iterations = 0
         self._get_preview_for_auto_color_callback = None
@@ -233,6 +512,8 @@ class ApplicationContext(QObject):
         self._neutral_point_norm = None  # (x, y) 归一化坐标
         self._neutral_point_callback = None
         self._neutral_point_sample_size = 5
+        self._neutral_point_verify_only = False  # 直接求解后仅做一次验证渲染
+        self._neutral_point_solve_token = 0  # 后台直接求解的代次，过时的结果丢弃
 
         # 色卡优化状态管理
         self._ccm_optimization_active = False
@@ -877,6 +1158,7 @@ class ApplicationContext(QObject):
     # =================
     # 核心业务逻辑 (Actions)
     # =================
+    @traced("context.load_image", cat="context")
     def load_image(self, file_path: str):
         try:
             self._loading_image = True  # 设置加载标志，延迟预览更新
@@ -921,12 +1203,15 @@ class ApplicationContext(QObject):
             if self._use_process_isolation:
                 # 检查是否需要重启 worker（内存监控）
                 if self._should_restart_worker():
-                    print("[WORKER] Restarting worker process due to memory threshold or death")
+                    _worker_log.debug("Restarting worker process due to memory threshold or death")
                     self._shutdown_preview_worker_process()
                 # 否则 worker 会在预览时自动 reload proxy（热重载）
             # =========================================================
 
             self._current_image = self.image_manager.load_image(file_path)
+            self._image_generation += 1
+            self._image_pyramid = {}
+            self.clear_detail_tiles()
             
             # 更新文件夹导航状态
             self.folder_navigator.update_folder(file_path)
@@ -969,7 +1254,7 @@ class ApplicationContext(QObject):
                     
                     # DEBUG信息
                     try:
-                        print(f"[DEBUG] after load_preset(user): input={self._current_params.input_color_space_name}, gamma={self._current_params.density_gamma}, dmax={self._current_params.density_dmax}, rgb={self._current_params.rgb_gains}")
+                        _log.debug("after load_preset(user): input=%s, gamma=%s, dmax=%s, rgb=%s", self._current_params.input_color_space_name, self._current_params.density_gamma, self._current_params.density_dmax, self._current_params.rgb_gains)
                     except Exception:
                         pass
                 else:
@@ -987,15 +1272,16 @@ class ApplicationContext(QObject):
 
 
             # 清除加载标志并触发最终预览更新
-            print(f"[DEBUG] load_image(): 清除_loading_image标志，准备最终预览更新", flush=True)
-            print(f"[DEBUG] load_image(): 当前参数 enable_density_curve={self._current_params.enable_density_curve}, curve_name={self._current_params.density_curve_name}", flush=True)
-            print(f"[DEBUG] load_image(): 曲线点数: RGB={len(self._current_params.curve_points) if self._current_params.curve_points else 0}, R={len(self._current_params.curve_points_r) if self._current_params.curve_points_r else 0}", flush=True)
+            _log.debug("load_image(): 清除_loading_image标志，准备最终预览更新")
+            _log.debug("load_image(): 当前参数 enable_density_curve=%s, curve_name=%s", self._current_params.enable_density_curve, self._current_params.density_curve_name)
+            _log.debug("load_image(): 曲线点数: RGB=%s, R=%s", len(self._current_params.curve_points) if self._current_params.curve_points else 0, len(self._current_params.curve_points_r) if self._current_params.curve_points_r else 0)
             self._loading_image = False
             if self._current_image:
-                print(f"[DEBUG] load_image(): 调用_prepare_proxy()...", flush=True)
-                print("[DEBUG] Call for _prepare_proxy: load_image()"); self._prepare_proxy()
-                print(f"[DEBUG] load_image(): 调用_trigger_preview_update()...", flush=True)
+                _log.debug("load_image(): 调用_prepare_proxy()...")
+                _log.debug("Call for _prepare_proxy: load_image()"); self._prepare_proxy()
+                _log.debug("load_image(): 调用_trigger_preview_update()...")
                 self._trigger_preview_update()
+                self._start_pyramid_build()
 
             # 通知UI：图像已加载完成
             self.image_loaded.emit()
@@ -1324,8 +1610,10 @@ class ApplicationContext(QObject):
         
     def update_params(self, new_params: ColorGradingParams):
         """由UI调用以更新参数"""
-        print(f"[DEBUG] update_params(): enable_density_curve={new_params.enable_density_curve}, curve_name={new_params.density_curve_name}", flush=True)
-        print(f"[DEBUG] update_params(): 曲线点数: RGB={len(new_params.curve_points) if new_params.curve_points else 0}, R={len(new_params.curve_points_r) if new_params.curve_points_r else 0}", flush=True)
+        _log.debug("update_params(): enable_density_curve=%s, curve_name=%s",
+                   new_params.enable_density_curve, new_params.density_curve_name)
+        _log.debug(lambda: f"update_params(): 曲线点数: RGB={len(new_params.curve_points or ())}, "
+                           f"R={len(new_params.curve_points_r or ())}")
         self._current_params = new_params
         # 同步到当前 profile 存根
         try:
@@ -1626,10 +1914,54 @@ class ApplicationContext(QObject):
                 self.status_message_changed.emit(tr("app_context.auto_color.iterative_disabled"))
                 return
         
+        # 进程模式：整个不动点迭代在 worker 内完成，只返回收敛后的 gains
+        if self._use_process_isolation and self._current_proxy is not None:
+            if self._run_auto_color_with_process(max_iterations):
+                return
+
         self._auto_color_iterations = max_iterations
         self._get_preview_for_auto_color_callback = get_preview_callback
         self._perform_auto_color_iteration() # Start the first iteration
 
+    def _run_auto_color_with_process(self, max_iterations: int) -> bool:
+        """在 worker 进程内执行迭代式 AI 自动校色
+
+        Returns:
+            bool: 请求是否已发送（False 时调用方回退到逐帧迭代）
+        """
+        if not self._ensure_preview_worker_process():
+            return False
+
+        self._preview_worker_process.set_on_auto_color_result_callback(self._on_worker_auto_color_result)
+        if not self._preview_worker_process.request_auto_color(
+            self._current_params,
+            orientation=self.get_current_orientation(),
+            idt_gamma=self.get_current_idt_gamma(),
+            convert_to_monochrome=self.should_convert_to_monochrome(),
+            custom_colorspace_def=self._get_custom_colorspace_def(),
+            max_iterations=max_iterations,
+        ):
+            return False
+
+        self._start_result_polling()
+        return True
+
+    def _on_worker_auto_color_result(self, result_info: dict):
+        """worker 内自动校色迭代完成的回调：一次性写入收敛后的 gains"""
+        try:
+            new_gains = tuple(float(g) for g in result_info.get('rgb_gains', self._current_params.rgb_gains))
+            _worker_log.debug("worker auto_color: %s iterations, converged=%s, %.1fms",
+                              result_info.get('iterations'), result_info.get('converged'),
+                              result_info.get('elapsed_ms', 0.0))
+
+            new_params = self._current_params.shallow_copy()  # 优化：仅修改 rgb_gains (tuple)，使用 shallow_copy()
+            new_params.rgb_gains = new_gains
+            self.update_params(new_params)
+            self.status_message_changed.emit(tr("app_context.auto_color.converged"))
+            self._autosave_timer.start()
+        except Exception as e:
+            self.status_message_changed.emit(tr("app_context.auto_color.iterative_failed", error=e))
+
     def _perform_auto_color_iteration(self):
         if self._auto_color_iterations <= 0 or not self._get_preview_for_auto_color_callback:
             self._get_preview_for_auto_color_callback = None # Clean up
@@ -1738,30 +2070,7 @@ class ApplicationContext(QObject):
         try:
             # 使用保存的色温值
             white_point = self._neutral_point_white_point
-
-            # 将Kelvin色温转换为Display P3空间的RGB比值
-            # Step 1: Kelvin → xy色度坐标 (CIE 1931)
-            xy = CCT_to_xy_CIE_D(white_point+1000) # 以5500K为白点
-
-            # Step 2: xy → XYZ (Y=1)
-            xyz = color_science.xy_to_XYZ_unitY(xy)
-
-            # Step 3: XYZ → Display P3 Linear RGB
-            # 注意：Display P3的白点是D65 (6500K)
-            # 我们不做色适应，因为我们要的就是white_point在Display P3中的实际RGB表示
-            target_rgb = color_science.xyz_to_display_p3_linear_rgb(xyz)
-            # Step 3.5: 应用 Display P3 的 gamma 编码（2.2）                                                                                                                                                             │ │
-            # 因为preview图像已经过gamma编码，我们需要将线性target_rgb也编码                                                                                                                                             │ │
-            display_p3_gamma = 2.2
-            target_rgb = np.power(np.clip(target_rgb, 0, 1), 1.0 / display_p3_gamma)
-
-            # Step 4: 归一化为比值（以G通道为基准）
-            # 避免除以零
-            if target_rgb[1] < 1e-10:
-                target_rgb[1] = 1e-10
-            target_r_ratio = target_rgb[0] / target_rgb[1]
-            target_g_ratio = 1.0
-            target_b_ratio = target_rgb[2] / target_rgb[1]
+            target_r_ratio, target_b_ratio = self._neutral_point_target_ratios(white_point)
 
             # 从DisplayP3 preview采样5x5区域
             norm_x, norm_y = self._neutral_point_norm
@@ -1782,9 +2091,11 @@ class ApplicationContext(QObject):
             b_ratio_diff = abs(current_b_ratio - target_b_ratio)
             max_ratio_diff = max(r_ratio_diff, b_ratio_diff)
 
-            if max_ratio_diff < 0.001:  # 比值差异阈值0.001
+            # 直接求解后的验证渲染：只汇报残差，不再迭代
+            if self._neutral_point_verify_only or max_ratio_diff < 0.001:  # 比值差异阈值0.001
                 self.status_message_changed.emit(tr("app_context.neutral_color.converged", diff=max_ratio_diff))
                 self._neutral_point_iterations = 0
+                self._neutral_point_verify_only = False
                 self._neutral_point_callback = None
                 self._neutral_point_norm = None
                 self._autosave_timer.start()
@@ -1834,6 +2145,7 @@ class ApplicationContext(QObject):
 
         # 初始化迭代状态
         self._neutral_point_iterations = 8  # 最多8次
+        self._neutral_point_verify_only = False
         self._neutral_point_norm = (norm_x, norm_y)
         self._neutral_point_callback = get_preview_callback
         self._neutral_point_sample_size = 5
@@ -1841,9 +2153,109 @@ class ApplicationContext(QObject):
 
         self.status_message_changed.emit(tr("app_context.neutral_color.start_iteration", white_point=white_point))
 
+        # 优先直接求解：在后台线程的proxy采样块上求解gains，只需一次验证渲染
+        self._neutral_point_solve_token += 1
+        try:
+            job = self._neutral_point_solve_job(norm_x, norm_y, white_point)
+        except Exception as e:
+            _log.debug("中性点直接求解准备失败，回退到迭代模式: %s", e)
+            job = None
+
+        if job is not None:
+            # 求解期间暂停迭代（期间到达的预览结果不触发迭代），结果回到GUI线程后再决定
+            self._neutral_point_iterations = 0
+            worker = _NeutralPointSolveWorker(self, self._neutral_point_solve_token, job)
+            worker.signals.result.connect(self._on_neutral_point_solved)
+            self._get_detail_thread_pool().start(worker)
+            return
+
         # 开始第一次迭代
         self._perform_neutral_point_iteration()
 
+    def _on_neutral_point_solved(self, result: dict):
+        """直接求解完成（GUI线程）：收敛则应用并验证一次，否则回退到迭代模式"""
+        # 已开始新的选点，或迭代已被取消：丢弃
+        if result.get('token') != self._neutral_point_solve_token or not self._neutral_point_callback:
+            return
+        solved_gains = result.get('gains')
+        # 求解期间图片或参数已变化：解不再对应当前状态，交给基于实际预览的迭代模式
+        if solved_gains is None or result.get('params_key') != self._detail_params_key(False):
+            self._neutral_point_iterations = 8
+            self._perform_neutral_point_iteration()
+            return
+
+        self._neutral_point_iterations = 1  # 仅一次验证渲染
+        self._neutral_point_verify_only = True
+        new_params = self._current_params.shallow_copy()  # 优化：仅修改 rgb_gains (tuple)，使用 shallow_copy()
+        new_params.rgb_gains = solved_gains
+        self.update_params(new_params)  # 渲染完成后 _on_preview_result 触发验证
+
+    def _neutral_point_target_ratios(self, white_point: int) -> Tuple[float, float]:
+        """将中性色色温转换为 DisplayP3（gamma 编码后）的 R/G、B/G 目标比值"""
+        from colour.temperature import CCT_to_xy_CIE_D
+        from . import color_science
+
+        # Step 1: Kelvin → xy色度坐标 (CIE 1931)
+        xy = CCT_to_xy_CIE_D(white_point+1000) # 以5500K为白点
+
+        # Step 2: xy → XYZ (Y=1)
+        xyz = color_science.xy_to_XYZ_unitY(xy)
+
+        # Step 3: XYZ → Display P3 Linear RGB
+        # 注意：Display P3的白点是D65 (6500K)
+        # 我们不做色适应，因为我们要的就是white_point在Display P3中的实际RGB表示
+        target_rgb = color_science.xyz_to_display_p3_linear_rgb(xyz)
+        # Step 3.5: 应用 Display P3 的 gamma 编码（2.2）
+        # 因为preview图像已经过gamma编码，我们需要将线性target_rgb也编码
+        display_p3_gamma = 2.2
+        target_rgb = np.power(np.clip(target_rgb, 0, 1), 1.0 / display_p3_gamma)
+
+        # Step 4: 归一化为比值（以G通道为基准）
+        # 避免除以零
+        if target_rgb[1] < 1e-10:
+            target_rgb[1] = 1e-10
+        return float(target_rgb[0] / target_rgb[1]), float(target_rgb[2] / target_rgb[1])
+
+    def _neutral_point_solve_job(self, norm_x: float, norm_y: float, white_point: int) -> Optional[dict]:
+        """在GUI线程快照后台直接求解所需的输入（proxy采样块、参数、变换），无法求解时返回 None
+
+        Args:
+            norm_x: preview图像上的归一化X坐标 (0-1)
+            norm_y: preview图像上的归一化Y坐标 (0-1)
+            white_point: 中性色的色温 (Kelvin)
+        """
+        if self._current_proxy is None or self._current_proxy.array is None:
+            return None
+
+        # preview坐标 → proxy坐标（preview = 旋转后的proxy，逐次撤销逆时针90°旋转）
+        px, py = norm_x, norm_y
+        for _ in range((self.get_current_orientation() // 90) % 4):
+            px, py = 1.0 - py, px
+
+        # 采样proxy小块（与preview采样区域一致），保持proxy精度
+        proxy_array = self._current_proxy.array
+        height, width = proxy_array.shape[:2]
+        half_size = self._neutral_point_sample_size // 2
+        x_pixel = int(px * width)
+        y_pixel = int(py * height)
+        x_start, x_end = max(0, x_pixel - half_size), min(width, x_pixel + half_size + 1)
+        y_start, y_end = max(0, y_pixel - half_size), min(height, y_pixel + half_size + 1)
+        if x_end <= x_start or y_end <= y_start:
+            return None
+
+        return {
+            'patch': np.ascontiguousarray(proxy_array[y_start:y_end, x_start:x_end, :3]),
+            # 与预览链一致：IDT gamma → 色彩空间（裁剪与旋转不影响采样块均值）
+            'request': {
+                'idt_gamma': self.get_current_idt_gamma(),
+                'custom_colorspace_def': self._get_custom_colorspace_def(),
+            },
+            'params': self._current_params.shallow_copy(),
+            'target': np.array(self._neutral_point_target_ratios(white_point)),
+            'params_key': self._detail_params_key(False),
+        }
+
+    @traced("context.prepare_proxy", cat="context")
     def _prepare_proxy(self):
         """准备proxy图像：根据模式生成适当质量的proxy
 
@@ -1862,72 +2274,81 @@ class ApplicationContext(QObject):
         - Crop rect调整：需要重建
         - IDT/Rotate/Color修改：不需要重建（在worker中处理）
         """
-        print("[DEBUG] _prepare_proxy() 开始执行", flush=True)
+        _log.debug("_prepare_proxy() 开始执行")
 
         if not self._current_image:
-            print("[WARNING] _prepare_proxy(): 没有当前图像，提前返回", flush=True)
+            _log.debug("_prepare_proxy(): 没有当前图像，提前返回")
             return
 
         # 源图
         src_image = self._current_image
         orig_h, orig_w = src_image.height, src_image.width
-        print(f"[DEBUG] _prepare_proxy(): 源图尺寸={orig_w}x{orig_h}, crop_focused={self._crop_focused}", flush=True)
+        _log.debug("_prepare_proxy(): 源图尺寸=%sx%s, crop_focused=%s", orig_w, orig_h, self._crop_focused)
 
         # === 模式判断：是否需要预先crop ===
+        crop_rect_norm = None
         if self._crop_focused:
-            print("[DEBUG] _prepare_proxy(): Crop focused模式，准备crop后的proxy", flush=True)
+            _log.debug("_prepare_proxy(): Crop focused模式，准备crop后的proxy")
             # Crop focused模式：先crop再downsample（保证质量）
             crop_instance = self.get_active_crop_instance()
             if crop_instance and crop_instance.rect_norm and src_image.array is not None:
-                print("[DEBUG] _prepare_proxy(): 多裁剪聚焦模式", flush=True)
-                try:
-                    x, y, w, h = crop_instance.rect_norm
-                    x0 = int(round(x * orig_w))
-                    y0 = int(round(y * orig_h))
-                    x1 = int(round((x + w) * orig_w))
-                    y1 = int(round((y + h) * orig_h))
-                    x0 = max(0, min(orig_w - 1, x0))
-                    x1 = max(x0 + 1, min(orig_w, x1))
-                    y0 = max(0, min(orig_h - 1, y0))
-                    y1 = max(y0 + 1, min(orig_h, y1))
-                    cropped_arr = src_image.array[y0:y1, x0:x1, :].copy()
-                    src_image = src_image.copy_with_new_array(cropped_arr)
-                    print(f"[DEBUG] _prepare_proxy(): crop完成，新尺寸={(x1-x0)}x{(y1-y0)}", flush=True)
-                except Exception as e:
-                    print(f"[ERROR] _prepare_proxy(): crop失败: {e}", flush=True)
+                _log.debug("_prepare_proxy(): 多裁剪聚焦模式")
+                crop_rect_norm = crop_instance.rect_norm
             # 接触印相聚焦：无激活 crop，但存在 contactsheet 裁剪矩形
             elif (self._active_crop_id is None and
                   self._contactsheet_profile.crop_rect is not None and
                   src_image.array is not None):
-                print("[DEBUG] _prepare_proxy(): 单张裁剪聚焦模式", flush=True)
-                try:
-                    x, y, w, h = self._contactsheet_profile.crop_rect
-                    x0 = int(round(x * orig_w))
-                    y0 = int(round(y * orig_h))
-                    x1 = int(round((x + w) * orig_w))
-                    y1 = int(round((y + h) * orig_h))
-                    x0 = max(0, min(orig_w - 1, x0))
-                    x1 = max(x0 + 1, min(orig_w, x1))
-                    y0 = max(0, min(orig_h - 1, y0))
-                    y1 = max(y0 + 1, min(orig_h, y1))
-                    cropped_arr = src_image.array[y0:y1, x0:x1, :].copy()
-                    src_image = src_image.copy_with_new_array(cropped_arr)
-                    print(f"[DEBUG] _prepare_proxy(): contactsheet crop完成，新尺寸={(x1-x0)}x{(y1-y0)}", flush=True)
-                except Exception as e:
-                    print(f"[ERROR] _prepare_proxy(): contactsheet crop失败: {e}", flush=True)
+                _log.debug("_prepare_proxy(): 单张裁剪聚焦模式")
+                crop_rect_norm = self._contactsheet_profile.crop_rect
         else:
-            print("[DEBUG] _prepare_proxy(): Contactsheet模式（非聚焦），使用完整原图", flush=True)
+            _log.debug("_prepare_proxy(): Contactsheet模式（非聚焦），使用完整原图")
+
+        proxy_size = self.the_enlarger.preview_config.get_proxy_size_tuple()
+        pyramid_scale = 1.0
+
+        # 优先从金字塔切片：不触碰全分辨率原图
+        pyramid_slice = None
+        if self._image_pyramid and src_image.array is not None:
+            from .image_pyramid import select_pyramid_slice
+            from .viewport_tiles import crop_pixel_rect
+            try:
+                crop_px = crop_pixel_rect(crop_rect_norm, orig_w, orig_h)
+                pyramid_slice = select_pyramid_slice(self._image_pyramid, (orig_w, orig_h), crop_px, proxy_size)
+            except Exception as e:
+                _log.warning("_prepare_proxy(): 金字塔切片失败，回退到原图: %s", e)
+        if pyramid_slice is not None:
+            level, level_arr = pyramid_slice
+            pyramid_scale = 2.0 ** -level
+            src_image = src_image.copy_with_new_array(level_arr)
+            metrics.proxy_source.inc(source="pyramid")
+            _log.debug("_prepare_proxy(): 使用金字塔级别 1/%s，切片尺寸=%sx%s", 2 ** level, level_arr.shape[1], level_arr.shape[0])
+        elif crop_rect_norm is not None:
+            try:
+                x, y, w, h = crop_rect_norm
+                x0 = int(round(x * orig_w))
+                y0 = int(round(y * orig_h))
+                x1 = int(round((x + w) * orig_w))
+                y1 = int(round((y + h) * orig_h))
+                x0 = max(0, min(orig_w - 1, x0))
+                x1 = max(x0 + 1, min(orig_w, x1))
+                y0 = max(0, min(orig_h - 1, y0))
+                y1 = max(y0 + 1, min(orig_h, y1))
+                cropped_arr = src_image.array[y0:y1, x0:x1, :].copy()
+                src_image = src_image.copy_with_new_array(cropped_arr)
+                _log.debug("_prepare_proxy(): crop完成，新尺寸=%sx%s", (x1-x0), (y1-y0))
+            except Exception as e:
+                _log.error("_prepare_proxy(): crop失败: %s", e)
+        if pyramid_slice is None:
+            metrics.proxy_source.inc(source="full")
 
         # 生成downsampled proxy（基于crop后的图像，或完整图像）
-        print("[DEBUG] _prepare_proxy(): 开始生成proxy...", flush=True)
+        _log.debug("_prepare_proxy(): 开始生成proxy...")
         try:
-            proxy = self.image_manager.generate_proxy(
-                src_image,
-                self.the_enlarger.preview_config.get_proxy_size_tuple()
-            )
-            print(f"[DEBUG] _prepare_proxy(): proxy生成成功，尺寸={proxy.width}x{proxy.height}", flush=True)
+            proxy = self.image_manager.generate_proxy(src_image, proxy_size)
+            proxy.proxy_scale *= pyramid_scale
+            _log.debug("_prepare_proxy(): proxy生成成功，尺寸=%sx%s", proxy.width, proxy.height)
         except Exception as e:
-            print(f"[ERROR] _prepare_proxy(): proxy生成失败: {e}", flush=True)
+            _log.error("_prepare_proxy(): proxy生成失败: %s", e)
             return
 
         # 保存原图尺寸到metadata（供UI层使用）
@@ -1935,16 +2356,39 @@ class ApplicationContext(QObject):
 
         # 释放旧proxy并保存新proxy
         if self._current_proxy is not None:
-            print("[DEBUG] _prepare_proxy(): 释放旧proxy", flush=True)
+            _log.debug("_prepare_proxy(): 释放旧proxy")
             del self._current_proxy
         self._current_proxy = proxy
+        self._proxy_generation += 1
+        self.the_enlarger.pipeline_processor.math_ops.clear_density_stage_cache()
 
         # 标记 proxy 需要重载到 worker（进程模式专用）
         if self._use_process_isolation:
             self._proxy_needs_reload = True
-            print("[DEBUG] _prepare_proxy(): 标记 proxy 需要重载", flush=True)
+            _log.debug("_prepare_proxy(): 标记 proxy 需要重载")
 
-        print("[DEBUG] _prepare_proxy() 执行完成，proxy已更新", flush=True)
+        _log.debug("_prepare_proxy() 执行完成，proxy已更新")
+
+    def _start_pyramid_build(self):
+        """为当前原图在后台构建多分辨率金字塔（加载或恢复图片后调用）"""
+        self._image_pyramid = {}
+        image = self._current_image
+        if image is None or image.array is None:
+            return
+        if not enhanced_config_manager.get_ui_setting("preview_image_pyramid", True):
+            return
+        worker = _PyramidWorker(self, self._image_generation, image.array,
+                                self.the_enlarger.preview_config.get_proxy_size_tuple())
+        worker.signals.result.connect(self._on_pyramid_ready)
+        self._get_detail_thread_pool().start(worker)
+
+    def _on_pyramid_ready(self, result: dict):
+        # 构建期间已切换图片：丢弃
+        if result.get('generation') != self._image_generation:
+            return
+        self._image_pyramid = result.get('levels') or {}
+        if self._image_pyramid:
+            _log.debug("金字塔构建完成，级别: %s", sorted(self._image_pyramid))
 
     def get_current_idt_gamma(self) -> float:
         """读取当前输入色彩空间的IDT Gamma（无则返回1.0）。"""
@@ -1983,42 +2427,328 @@ class ApplicationContext(QObject):
         # 默认返回 sRGB primaries (与原始硬编码值保持一致)
         return np.array([0.64, 0.33, 0.30, 0.60, 0.15, 0.06], dtype=np.float64).reshape(3, 2)
 
+    @traced("context.trigger_preview", cat="context")
     def _trigger_preview_update(self):
         """触发预览更新（根据配置选择进程或线程模式）"""
-        print("[DEBUG] _trigger_preview_update() 开始执行", flush=True)
+        _log.debug("_trigger_preview_update() 开始执行")
 
         if not self._current_proxy:
-            print("[WARNING] _trigger_preview_update(): _current_proxy为None，提前返回", flush=True)
+            _log.debug("_trigger_preview_update(): _current_proxy为None，提前返回")
             return
 
         # 如果正在加载图片，延迟预览
         if self._loading_image:
-            print("[WARNING] _trigger_preview_update(): 正在加载图片（_loading_image=True），提前返回", flush=True)
+            _log.debug("_trigger_preview_update(): 正在加载图片（_loading_image=True），提前返回")
             return
 
         # 根据配置选择模式
-        print(f"[DEBUG] _trigger_preview_update(): 使用{'进程' if self._use_process_isolation else '线程'}模式", flush=True)
+        _log.debug("_trigger_preview_update(): 使用%s模式", '进程' if self._use_process_isolation else '线程')
         if self._use_process_isolation:
-            print("[DEBUG] _trigger_preview_update(): 调用_trigger_preview_with_process()", flush=True)
+            _log.debug("_trigger_preview_update(): 调用_trigger_preview_with_process()")
             self._trigger_preview_with_process()
         else:
-            print("[DEBUG] _trigger_preview_update(): 调用_trigger_preview_with_thread()", flush=True)
+            _log.debug("_trigger_preview_update(): 调用_trigger_preview_with_thread()")
             self._trigger_preview_with_thread()
-        print("[DEBUG] _trigger_preview_update() 执行完成", flush=True)
+        _log.debug("_trigger_preview_update() 执行完成")
+
+    def set_black_cutoff_analysis(self, enabled: bool):
+        """开启/关闭随预览帧计算 black cut-off 位图（屏幕反光补偿交互期间开启）
+
+        不主动触发重新渲染：补偿值变化本身会触发预览，新帧会附带位图。
+        """
+        if enabled:
+            self._preview_analysis['black_cutoff'] = True
+        else:
+            self._preview_analysis.pop('black_cutoff', None)
+
+    def set_histogram_analysis(self, enabled: bool):
+        """开启/关闭随预览帧计算 RGB/密度直方图（示波器面板可见时开启）
+
+        开启时立即触发一次预览，使面板马上得到数据。
+        """
+        if enabled == bool(self._preview_analysis.get('histogram')):
+            return
+        if enabled:
+            self._preview_analysis['histogram'] = True
+            if self._current_image is not None:
+                self._trigger_preview_update()
+        else:
+            self._preview_analysis.pop('histogram', None)
+
+    # =================
+    # 视口细节块
+    # =================
+    def _is_detail_tiles_enabled(self) -> bool:
+        return bool(enhanced_config_manager.get_ui_setting("preview_detail_tiles", True))
+
+    def _get_detail_thread_pool(self) -> QThreadPool:
+        """细节块专用线程池（与预览线程池分开，避免拖慢预览）"""
+        if self._detail_thread_pool is None:
+            self._detail_thread_pool = QThreadPool(self)
+            self._detail_thread_pool.setMaxThreadCount(self._default_detail_thread_count())
+            self._detail_thread_pool.setStackSize(8 * 1024 * 1024)  # 8MB
+        return self._detail_thread_pool
+
+    @staticmethod
+    def _default_detail_thread_count() -> int:
+        import os
+        return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+    def _get_detail_worker(self):
+        """渲染细节块的预览 worker（进程模式且 worker 存活时），否则返回 None"""
+        if not self._use_process_isolation:
+            return None
+        worker = getattr(self, '_preview_worker_process', None)
+        if worker is None or not worker.is_alive():
+            return None
+        return worker
+
+    def _get_thread_detail_renderer(self) -> tuple:
+        """线程模式下当前细节线程自己的 (TheEnlarger, ColorSpaceManager)，不与预览共享"""
+        local = self._detail_thread_local
+        if getattr(local, 'renderer', None) is None:
+            local.renderer = (TheEnlarger(), ColorSpaceManager())
+        return local.renderer
+
+    def _get_focus_crop_rect_norm(self) -> Optional[tuple]:
+        """聚焦模式下 proxy 所用的裁剪框（与 _prepare_proxy 的选择规则一致），非聚焦返回 None"""
+        if not self._crop_focused:
+            return None
+        crop_instance = self.get_active_crop_instance()
+        if crop_instance and crop_instance.rect_norm:
+            return tuple(crop_instance.rect_norm)
+        if self._active_crop_id is None and self._contactsheet_profile.crop_rect is not None:
+            return tuple(self._contactsheet_profile.crop_rect)
+        return None
+
+    def _detail_params_key(self, monochrome: bool) -> tuple:
+        """细节块缓存键中与参数相关的部分：任一变化都意味着块需要重新渲染"""
+        custom_colorspace_def = self._get_custom_colorspace_def()
+        return (
+            self._image_generation,
+            self._get_focus_crop_rect_norm(),
+            self.get_current_orientation() % 360,
+            float(self.get_current_idt_gamma()),
+            bool(self.should_convert_to_monochrome()),
+            bool(monochrome),
+            json.dumps(custom_colorspace_def, sort_keys=True, default=str) if custom_colorspace_def else None,
+            json.dumps(self._current_params.to_dict(), sort_keys=True, default=str),
+        )
+
+    def request_detail_tiles(self, view_rect: tuple, display_size: tuple, screen_zoom: float,
+                             monochrome: bool = False) -> Tuple[int, list]:
+        """按视口请求全分辨率细节块（放大超过 1:1 显示时使用）
 
+        已缓存的块直接返回；缺失的块提交到细节线程池，完成后经 detail_tile_ready 发出。
+        每次调用都会取代上一次请求，旧视口中尚未开始的块会被跳过。
+
+        Args:
+            view_rect: 视口在当前预览图像坐标中的范围 (x0, y0, x1, y1)
+            display_size: 当前预览图像尺寸 (width, height)
+            screen_zoom: 预览图像像素 → 屏幕像素的缩放
+            monochrome: 显示端是否转为黑白（与 MainWindow 的黑白预览一致）
+
+        Returns:
+            (generation, 已就绪的块列表)；proxy 已足够清晰时列表为空
+        """
+        from .viewport_tiles import crop_pixel_rect, detail_size, choose_detail_level, visible_tiles
+
+        self._detail_generation += 1
+        generation = self._detail_generation
+        self._detail_wanted = {}
+
+        image = self._current_image
+        if not self._is_detail_tiles_enabled() or image is None or image.array is None:
+            return generation, []
+
+        crop_px = crop_pixel_rect(self._get_focus_crop_rect_norm(), image.width, image.height)
+        orientation = self.get_current_orientation()
+        detail_wh = detail_size(crop_px, orientation)
+        level = choose_detail_level(screen_zoom, display_size[0], detail_wh[0])
+        if level is None:
+            return generation, []
+
+        tiles = visible_tiles(view_rect, display_size, detail_wh, level)
+        # 由视口中心向外渲染
+        cx = (view_rect[0] + view_rect[2]) / 2.0
+        cy = (view_rect[1] + view_rect[3]) / 2.0
+        tiles.sort(key=lambda t: (t['display_rect'][0] + t['display_rect'][2] / 2.0 - cx) ** 2 +
+                                 (t['display_rect'][1] + t['display_rect'][3] / 2.0 - cy) ** 2)
+
+        params_key = self._detail_params_key(monochrome)
+        request = {
+            'orientation': orientation,
+            'idt_gamma': self.get_current_idt_gamma(),
+            'convert_to_monochrome': self.should_convert_to_monochrome(),
+            'custom_colorspace_def': self._get_custom_colorspace_def(),
+        }
+        params = self._current_params.shallow_copy()
+        # 有 worker 进程时块在 worker 中渲染；否则在细节线程中渲染（限制为 1 个线程）
+        render_locally = self._get_detail_worker() is None
+        pool = self._get_detail_thread_pool()
+        pool.setMaxThreadCount(1 if render_locally else self._default_detail_thread_count())
+        ready = []
+        for tile in tiles:
+            key = (params_key, level, tile['index'])
+            self._detail_wanted[key] = tile['display_rect']
+            cached = self._detail_tile_cache.get(key)
+            if cached is not None:
+                self._detail_tile_cache.move_to_end(key)
+                ready.append({'generation': generation, 'key': key,
+                              'display_rect': tile['display_rect'], 'rgb8': cached})
+                continue
+            if key in self._detail_pending:
+                continue
+            self._detail_pending.add(key)
+            worker = _DetailTileWorker(self, key, image.array, crop_px, tile, request, params, monochrome,
+                                       render_locally)
+            worker.signals.result.connect(self._on_detail_tile_result)
+            pool.start(worker)
+        return generation, ready
+
+    def _on_detail_tile_result(self, result: dict):
+        key = result['key']
+        if result.get('source') is not None:
+            # 进程模式：源区域已取出，排队交给 worker 渲染
+            self._detail_send_queue.append((key, result))
+            self._pump_detail_tiles()
+            return
+        self._detail_pending.discard(key)
+        self._store_detail_tile(key, result.get('rgb8'))
+
+    def _pump_detail_tiles(self):
+        """把排队的细节块交给 worker（每个 worker 进程同时最多一块，不挤占预览请求）"""
+        worker = self._get_detail_worker()
+        if worker is None:
+            # worker 已不可用：丢弃排队的块，下次视口请求时在线程模式渲染
+            for key, _ in self._detail_send_queue:
+                self._detail_pending.discard(key)
+            self._detail_send_queue.clear()
+            return
+        now = time.time()
+        # 长时间没有返回的块（worker 重启、请求被丢弃）不再占用名额
+        for ticket, (key, sent_at) in list(self._detail_tickets.items()):
+            if now - sent_at > 10.0:
+                del self._detail_tickets[ticket]
+                self._detail_pending.discard(key)
+        worker.set_on_detail_tile_result_callback(self._on_worker_detail_tile_result)
+        limit = getattr(worker, 'num_workers', 1)
+        while self._detail_send_queue and len(self._detail_tickets) < limit:
+            key, item = self._detail_send_queue.popleft()
+            if key not in self._detail_wanted:
+                self._detail_pending.discard(key)
+                continue
+            self._detail_ticket_seq += 1
+            ticket = self._detail_ticket_seq
+            request = item['request']
+            if not worker.request_detail_tile(
+                ticket, item['source'], item['params'],
+                orientation=request.get('orientation', 0),
+                idt_gamma=request.get('idt_gamma', 1.0),
+                convert_to_monochrome=request.get('convert_to_monochrome', False),
+                custom_colorspace_def=request.get('custom_colorspace_def'),
+                monochrome=item['monochrome'],
+            ):
+                # 请求队列已满：等下一条 worker 结果到达后再发
+                self._detail_send_queue.appendleft((key, item))
+                break
+            self._detail_tickets[ticket] = (key, now)
+        if self._detail_tickets:
+            self._start_result_polling()
+
+    def _on_worker_detail_tile_result(self, result_info: dict):
+        """worker 渲染完一个细节块的回调"""
+        entry = self._detail_tickets.pop(result_info.get('ticket'), None)
+        if entry is None:
+            return  # 已清空（切换图片）或已超时
+        key = entry[0]
+        self._detail_pending.discard(key)
+        self._store_detail_tile(key, result_info.get('rgb8'))
+        self._pump_detail_tiles()
+
+    def _store_detail_tile(self, key, rgb8: Optional[np.ndarray]):
+        """渲染完成的块写入缓存，仍在视口内时发出 detail_tile_ready"""
+        if rgb8 is None:
+            return
+        # 图片或参数已变化的块不再入缓存（键不会再被请求，只会占用缓存预算）
+        params_key = key[0]
+        if params_key[0] != self._image_generation or params_key != self._detail_params_key(params_key[5]):
+            return
+        self._detail_tile_cache[key] = rgb8
+        self._detail_tile_cache_bytes += rgb8.nbytes
+        max_bytes = float(enhanced_config_manager.get_ui_setting("preview_detail_cache_mb", 128)) * 1024 * 1024
+        while self._detail_tile_cache_bytes > max_bytes and len(self._detail_tile_cache) > 1:
+            _, evicted = self._detail_tile_cache.popitem(last=False)
+            self._detail_tile_cache_bytes -= evicted.nbytes
+        display_rect = self._detail_wanted.get(key)
+        if display_rect is not None:
+            self.detail_tile_ready.emit({'generation': self._detail_generation, 'key': key,
+                                         'display_rect': display_rect, 'rgb8': rgb8})
+
+    def cancel_detail_tiles(self):
+        """放弃当前视口的细节请求（回到适应窗口等 proxy 已足够清晰的视图）"""
+        self._detail_generation += 1
+        self._detail_wanted = {}
+        for key, _ in self._detail_send_queue:
+            self._detail_pending.discard(key)
+        self._detail_send_queue.clear()
+
+    def clear_detail_tiles(self):
+        """清空细节块缓存（切换图片时调用）"""
+        self.cancel_detail_tiles()
+        for key, _ in self._detail_tickets.values():
+            self._detail_pending.discard(key)
+        self._detail_tickets.clear()
+        self._detail_tile_cache.clear()
+        self._detail_tile_cache_bytes = 0
+
+    def begin_interactive_preview(self):
+        """控件拖动开始：后续预览以较低分辨率渲染"""
+        self._interactive_preview = True
+
+    def end_interactive_preview(self):
+        """控件拖动结束：恢复全分辨率并渲染一帧全质量预览"""
+        if not self._interactive_preview:
+            return
+        self._interactive_preview = False
+        self._trigger_preview_update()
+
+    def _get_interactive_preview_scale(self) -> float:
+        """拖动期间预览的线性缩放比例（配置项为面积比例，默认1/4面积）"""
+        if not self._interactive_preview:
+            return 1.0
+        try:
+            area_fraction = float(enhanced_config_manager.get_ui_setting("interactive_preview_area_fraction", 0.25))
+        except (TypeError, ValueError):
+            area_fraction = 0.25
+        area_fraction = min(1.0, max(0.01, area_fraction))
+        return float(np.sqrt(area_fraction))
+
+    def _get_interactive_proxy(self, scale: float) -> ImageData:
+        """获取（缓存的）线程模式降采样proxy"""
+        key = (id(self._current_proxy), self._current_proxy.array.shape, scale)
+        if self._interactive_proxy is None or self._interactive_proxy_key != key:
+            long_edge = max(16, int(max(self._current_proxy.array.shape[:2]) * scale))
+            self._interactive_proxy = self.image_manager.generate_proxy(
+                self._current_proxy, (long_edge, long_edge)
+            )
+            self._interactive_proxy_key = key
+        return self._interactive_proxy
+
+    @traced("context.on_preview_result", cat="context")
     def _on_preview_result(self, result_image: ImageData):
         if result_image is not None:
-            print(f"[DEBUG] _on_preview_result(): 收到预览结果，尺寸={result_image.width}x{result_image.height}", flush=True)
-            print("[DEBUG] _on_preview_result(): 发射preview_updated信号", flush=True)
+            _log.debug("_on_preview_result(): 收到预览结果，尺寸=%sx%s", result_image.width, result_image.height)
+            _log.debug("_on_preview_result(): 发射preview_updated信号")
             self.preview_updated.emit(result_image)
-            print("[DEBUG] _on_preview_result(): preview_updated信号已发射", flush=True)
+            _log.debug("_on_preview_result(): preview_updated信号已发射")
             # If an iterative auto color is in progress, trigger the next step
             if self._auto_color_iterations > 0 and self._get_preview_for_auto_color_callback:
-                print("[DEBUG] _on_preview_result(): 触发下一次auto_color迭代", flush=True)
+                _log.debug("_on_preview_result(): 触发下一次auto_color迭代")
                 QTimer.singleShot(0, self._perform_auto_color_iteration)
             # If neutral point iteration is in progress, trigger the next step
             if self._neutral_point_iterations > 0 and self._neutral_point_callback:
-                print("[DEBUG] _on_preview_result(): 触发下一次neutral_point迭代", flush=True)
+                _log.debug("_on_preview_result(): 触发下一次neutral_point迭代")
                 QTimer.singleShot(0, self._perform_neutral_point_iteration)
         else:
             pass # print("[ERROR] _on_preview_result(): result_image is None")
@@ -2027,17 +2757,17 @@ class ApplicationContext(QObject):
     def _on_preview_error(self, message: str):
         # 如果是 proxy 重载失败，直接把进程干掉，避免后面用坏掉的 proxy 再跑一次
         if "Failed to reload proxy" in message:
-            print("[DEBUG] _on_preview_error(): 检测到 proxy 重载失败，重启 worker 进程", flush=True)
+            _log.warning("_on_preview_error(): 检测到 proxy 重载失败，重启 worker 进程")
             try:
                 self._shutdown_preview_worker_process()
             except Exception as e:
-                print(f"[DEBUG] _on_preview_error(): shutdown worker 失败: {e}", flush=True)
+                _log.warning("_on_preview_error(): shutdown worker 失败: %s", e)
 
         # 在色卡优化期间不发送预览错误消息，避免覆盖优化状态
         if not self._ccm_optimization_active:
             self.status_message_changed.emit(tr("app_context.preview.update_failed", message=message))
         else:
-            print(f"[DEBUG] 色卡优化期间忽略预览错误: {message}")
+            _log.debug("色卡优化期间忽略预览错误: %s", message)
         self._auto_color_iterations = 0 # Stop iteration on error
         self._get_preview_for_auto_color_callback = None
         
@@ -2045,9 +2775,9 @@ class ApplicationContext(QObject):
         """设置色卡优化状态"""
         self._ccm_optimization_active = active
         if active:
-            print(f"[DEBUG] CCM优化已激活，将忽略预览错误消息")
+            _log.debug("CCM优化已激活，将忽略预览错误消息")
         else:
-            print(f"[DEBUG] CCM优化已结束，恢复正常状态消息")
+            _log.debug("CCM优化已结束，恢复正常状态消息")
 
     def _on_preview_finished(self):
         """预览处理完成的回调
@@ -2063,7 +2793,7 @@ class ApplicationContext(QObject):
         - 每个 worker 完成后立即释放其信号连接
         - 防止 worker 对象和其持有的大型数据（~17MB/worker）累积
         """
-        print("[DEBUG] _on_preview_finished(): Preview worker完成", flush=True)
+        _log.debug("_on_preview_finished(): Preview worker完成")
         # 获取发出 finished 信号的 signals 对象（来自刚完成的 worker）
         sender_signals = self.sender()
 
@@ -2071,7 +2801,7 @@ class ApplicationContext(QObject):
         # 如果不断开，signals 对象会持有对 ApplicationContext 方法的引用，
         # 导致 worker 对象无法被 GC，其持有的图像副本也无法释放
         if sender_signals:
-            print("[DEBUG] _on_preview_finished(): 断开worker信号连接", flush=True)
+            _log.debug("_on_preview_finished(): 断开worker信号连接")
             try:
                 # 为每个信号独立处理断开，确保即使某个失败也不影响其他
                 try:
@@ -2092,20 +2822,20 @@ class ApplicationContext(QObject):
 
             except Exception as e:
                 # 记录意外异常，但不中断预览流程
-                print(f"[WARNING] 清理 preview worker 信号连接时出错: {e}", flush=True)
+                _log.warning("清理 preview worker 信号连接时出错: %s", e)
 
         # 重置预览忙碌状态
-        print("[DEBUG] _on_preview_finished(): 重置busy标志", flush=True)
+        _log.debug("_on_preview_finished(): 重置busy标志")
         self._preview_busy = False
 
         # 如果有 pending 的预览请求，触发它
         # 这确保了高频更新时的防抖机制正常工作
         if self._preview_pending:
-            print("[DEBUG] _on_preview_finished(): 有pending请求，触发preview更新", flush=True)
+            _log.debug("_on_preview_finished(): 有pending请求，触发preview更新")
             self._preview_pending = False
             self._trigger_preview_update()
         else:
-            print("[DEBUG] _on_preview_finished(): 没有pending请求", flush=True)
+            _log.debug("_on_preview_finished(): 没有pending请求")
 
     # =================
     # 方向与旋转（UI调用）
@@ -2122,38 +2852,38 @@ class ApplicationContext(QObject):
     def set_orientation(self, degrees: int):
         """设置当前profile的orientation"""
         try:
-            print(f"[DEBUG] set_orientation() 开始执行, degrees={degrees}", flush=True)
+            _log.debug("set_orientation() 开始执行, degrees=%s", degrees)
 
             deg = int(degrees) % 360
             # 规范到 0/90/180/270
             choices = [0, 90, 180, 270]
             normalized = min(choices, key=lambda x: abs(x - deg))
-            print(f"[DEBUG] set_orientation(): 规范化后的角度={normalized}, profile_kind={self._current_profile_kind}", flush=True)
+            _log.debug("set_orientation(): 规范化后的角度=%s, profile_kind=%s", normalized, self._current_profile_kind)
 
             # 直接写入对应的数据源
             if self._current_profile_kind == 'contactsheet':
-                print(f"[DEBUG] set_orientation(): 设置contactsheet orientation={normalized}", flush=True)
+                _log.debug("set_orientation(): 设置contactsheet orientation=%s", normalized)
                 self._contactsheet_profile.orientation = normalized
             elif self._active_crop_id:
                 crop = self.get_active_crop_instance()
-                print(f"[DEBUG] set_orientation(): crop模式, crop={'存在' if crop else '不存在'}", flush=True)
+                _log.debug("set_orientation(): crop模式, crop=%s", '存在' if crop else '不存在')
                 if crop:
-                    print(f"[DEBUG] set_orientation(): 设置crop orientation={normalized}", flush=True)
+                    _log.debug("set_orientation(): 设置crop orientation=%s", normalized)
                     crop.orientation = normalized
 
             # 触发预览更新（orientation在worker中处理，不需要prepare_proxy）
             if self._current_image:
-                print("[DEBUG] set_orientation(): 触发预览更新", flush=True)
+                _log.debug("set_orientation(): 触发预览更新")
                 self._trigger_preview_update()
                 self._autosave_timer.start()
             else:
-                print("[WARNING] set_orientation(): 没有当前图像，跳过预览更新", flush=True)
+                _log.warning("set_orientation(): 没有当前图像，跳过预览更新")
 
-            print("[DEBUG] set_orientation() 执行完成", flush=True)
+            _log.debug("set_orientation() 执行完成")
         except Exception as e:
             import traceback
             error_msg = tr("app_context.errors.set_orientation_failed", error=str(e), traceback=traceback.format_exc())
-            print(f"[ERROR] {error_msg}", flush=True)
+            _log.error("%s", error_msg)
             self.status_message_changed.emit(error_msg)
     
     def _ensure_ui_state_sync_for_monochrome(self):
@@ -2391,7 +3121,10 @@ class ApplicationContext(QObject):
 
             # 恢复核心状态
             self._current_image = backup.get('current_image')
+            self._image_generation += 1
+            self._start_pyramid_build()
             self._current_proxy = backup.get('current_proxy')
+            self._proxy_generation += 1
             if backup.get('current_params'):
                 self._current_params = backup['current_params'].shallow_copy()  # 优化：只读恢复，使用 shallow_copy()
             self._current_film_type = backup.get('current_film_type', 'color_negative_c41')
@@ -2619,11 +3352,12 @@ class ApplicationContext(QObject):
             bool: True 表示需要重启，False 表示可以复用
         """
         if not hasattr(self, '_preview_worker_process') or self._preview_worker_process is None:
-            print("[WORKER] No worker process, no need to restart")
+            _worker_log.debug("No worker process, no need to restart")
             return False  # 还没创建，不需要重启
 
         if not self._preview_worker_process.is_alive():
-            print("[WORKER] Worker process is dead, need to restart")
+            _worker_log.debug("Worker process is dead, need to restart")
+            metrics.worker_restarts.inc(reason="dead")
             return True  # 进程已死，需要重启
 
         # 检查内存使用量（从配置文件读取阈值）
@@ -2637,16 +3371,18 @@ class ApplicationContext(QObject):
 
             mem_mb = self._preview_worker_process.get_memory_usage()
             if mem_mb is not None:
-                print(f"[WORKER] PID {worker_pid} memory usage: {mem_mb:.1f} MB (threshold: {threshold_mb} MB)")
+                metrics.worker_memory.set(mem_mb * 1024 * 1024)
+                _worker_log.debug("PID %s memory usage: %.1f MB (threshold: %s MB)", worker_pid, mem_mb, threshold_mb)
                 if mem_mb > threshold_mb:
-                    print(f"[WORKER] ⚠️  Memory threshold exceeded ({mem_mb:.1f} MB > {threshold_mb} MB), will restart")
+                    _worker_log.warning("⚠️  Memory threshold exceeded (%.1f MB > %s MB), will restart", mem_mb, threshold_mb)
+                    metrics.worker_restarts.inc(reason="memory")
                     return True
                 else:
-                    print(f"[WORKER] ✓ Memory OK, will reuse worker")
+                    _worker_log.debug("✓ Memory OK, will reuse worker")
             else:
-                print(f"[WORKER] ⚠️  Failed to get memory usage for PID {worker_pid} (psutil not available?), will reuse worker")
+                _worker_log.warning("⚠️  Failed to get memory usage for PID %s (psutil not available?), will reuse worker", worker_pid)
         except Exception as e:
-            print(f"[WORKER] ⚠️  Exception getting memory usage: {e}, will reuse worker")
+            _worker_log.warning("⚠️  Exception getting memory usage: %s, will reuse worker", e)
             import traceback
             traceback.print_exc()
 
@@ -2670,6 +3406,7 @@ class ApplicationContext(QObject):
         # 清理 shared memory
         if self._proxy_shared_memory is not None:
             try:
+                metrics.shm_bytes.dec(self._proxy_shared_memory.size, kind="proxy")
                 self._proxy_shared_memory.close()
                 self._proxy_shared_memory.unlink()
             except Exception as e:
@@ -2678,9 +3415,10 @@ class ApplicationContext(QObject):
             finally:
                 self._proxy_shared_memory = None
 
-        # 停止轮询定时器
+        # 停止轮询定时器与结果通知
         if hasattr(self, '_result_poll_timer') and self._result_poll_timer is not None:
             self._result_poll_timer.stop()
+        self._teardown_result_notifier()
 
     def _create_preview_worker_process(self):
         """创建 worker 进程并传递 proxy（Lazy 创建）
@@ -2692,7 +3430,7 @@ class ApplicationContext(QObject):
 
         try:
             from multiprocessing import shared_memory
-            from divere.core.preview_worker_process import PreviewWorkerProcess
+            from divere.core.preview_worker_process import create_preview_worker
 
             # 1. 生成 proxy（如果还没有）
             proxy = self._current_proxy
@@ -2703,25 +3441,46 @@ class ApplicationContext(QObject):
                                    buffer=shm.buf)
             np.copyto(shm_array, proxy.array)
 
-            # 3. 创建 worker 进程
-            self._preview_worker_process = PreviewWorkerProcess(
-                proxy_shm_name=shm.name,
-                proxy_shape=proxy.array.shape,
-                proxy_dtype=str(proxy.array.dtype),
-                init_config={},  # 可选配置
-            )
-            self._preview_worker_process.start()
-
-            # 4. 验证进程启动成功
+            # 3. 获取 worker 进程：优先启用已初始化的备用 worker（热切换），否则冷启动
             import time
-            time.sleep(0.1)
-            if not self._preview_worker_process.is_alive():
-                raise RuntimeError("Worker process failed to start")
+            t_acquire = time.perf_counter()
+            standby = self._take_standby_worker()
+            if standby is not None:
+                standby.reload_proxy(
+                    proxy_shm_name=shm.name,
+                    proxy_shape=proxy.array.shape,
+                    proxy_dtype=str(proxy.array.dtype)
+                )
+                self._preview_worker_process = standby
+                self._worker_acquire_info = ('hot_swap', t_acquire)
+                _worker_log.debug("Promoted standby worker (hot swap)")
+            else:
+                self._preview_worker_process = create_preview_worker(
+                    proxy_shm_name=shm.name,
+                    proxy_shape=proxy.array.shape,
+                    proxy_dtype=str(proxy.array.dtype),
+                    init_config=self._worker_init_config(),
+                    num_workers=self._get_preview_worker_count(),
+                )
+                self._preview_worker_process.start()
+                self._worker_acquire_info = ('cold_start', t_acquire)
+
+                # 4. 验证进程启动成功
+                time.sleep(0.1)
+                if not self._preview_worker_process.is_alive():
+                    raise RuntimeError("Worker process failed to start")
 
             # 5. 保存 shared memory 引用并重置标志
             self._proxy_shared_memory = shm
+            metrics.shm_bytes.inc(shm.size, kind="proxy")
             self._proxy_needs_reload = False  # Worker 已加载 proxy
 
+            # 6. 监听结果通知管道（事件驱动，替代轮询）
+            self._setup_result_notifier()
+
+            # 7. 在后台准备下一个备用 worker
+            self._schedule_standby_worker()
+
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -2748,6 +3507,118 @@ class ApplicationContext(QObject):
             # 使用线程模式重新触发预览
             self._trigger_preview_with_thread()
 
+    def _get_preview_worker_count(self) -> int:
+        """预览分带渲染的进程数（配置项 preview_worker_count："auto" 或整数）
+
+        auto：少于 8 核时使用单进程；否则每 4 核一个进程，最多 4 个。
+        """
+        import os
+        try:
+            from divere.utils.enhanced_config_manager import enhanced_config_manager
+            setting = enhanced_config_manager.get_ui_setting("preview_worker_count", "auto")
+        except Exception:
+            setting = "auto"
+        if setting != "auto":
+            try:
+                return max(1, int(setting))
+            except (TypeError, ValueError):
+                pass
+        cpu_count = os.cpu_count() or 1
+        if cpu_count < 8:
+            return 1
+        return min(4, cpu_count // 4)
+
+    def _is_standby_worker_enabled(self) -> bool:
+        """是否启用备用 worker（配置项 preview_standby_worker，默认开启）"""
+        try:
+            from divere.utils.enhanced_config_manager import enhanced_config_manager
+            return bool(enhanced_config_manager.get_ui_setting("preview_standby_worker", True))
+        except Exception:
+            return True
+
+    def _schedule_standby_worker(self, delay_ms: int = 1000):
+        """延迟启动备用 worker（避开当前 worker 的首帧渲染，减少 CPU 竞争）"""
+        if not self._use_process_isolation or not self._is_standby_worker_enabled():
+            return
+        if self._standby_worker_process is not None:
+            return
+        QTimer.singleShot(delay_ms, self._spawn_standby_worker)
+
+    def _worker_init_config(self) -> dict:
+        """worker 启动参数：序列化的配置快照（worker 初始化时不再读取配置文件）与追踪开关"""
+        from divere.utils.config_snapshot import get_config_snapshot_bytes
+        blob = get_config_snapshot_bytes()
+        init_config = {'config_snapshot': blob} if blob is not None else {}
+        if tracer.enabled:
+            # worker 同样记录 span，随结果消息发回主进程合并导出
+            init_config['trace'] = True
+        return init_config
+
+    def _spawn_standby_worker(self):
+        """启动一个不带 proxy 的备用 worker，完成模块导入与初始化后待命"""
+        if not self._use_process_isolation or self._standby_worker_process is not None:
+            return
+        try:
+            from divere.core.preview_worker_process import create_preview_worker
+            standby = create_preview_worker(
+                proxy_shm_name=None,
+                proxy_shape=None,
+                proxy_dtype=None,
+                init_config=self._worker_init_config(),
+                num_workers=self._get_preview_worker_count(),
+            )
+            standby.start()
+            self._standby_worker_process = standby
+            _worker_log.debug("Standby worker started")
+        except Exception as e:
+            _worker_log.warning("⚠️  Failed to start standby worker: %s", e)
+            self._standby_worker_process = None
+
+    def _take_standby_worker(self):
+        """取出存活的备用 worker（取出后由调用方接管）；没有可用备用 worker 时返回 None"""
+        standby = getattr(self, '_standby_worker_process', None)
+        if standby is None:
+            return None
+        self._standby_worker_process = None
+        if standby.is_alive():
+            return standby
+        try:
+            standby.shutdown()
+        except Exception:
+            pass
+        return None
+
+    def _shutdown_standby_worker(self):
+        """销毁备用 worker（幂等操作）"""
+        standby = getattr(self, '_standby_worker_process', None)
+        if standby is None:
+            return
+        self._standby_worker_process = None
+        try:
+            standby.shutdown()
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Failed to shutdown standby worker: {e}")
+
+    def _record_worker_first_frame(self):
+        """记录 worker 获取后首帧到达的延迟（冷启动 vs 热切换）"""
+        info = self._worker_acquire_info
+        if info is None:
+            return
+        self._worker_acquire_info = None
+        import time
+        kind, t0 = info
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        stats = self._worker_startup_stats.setdefault(kind, {'last_ms': 0.0, 'total_ms': 0.0, 'count': 0})
+        stats['last_ms'] = elapsed_ms
+        stats['total_ms'] += elapsed_ms
+        stats['count'] += 1
+        worker = self._preview_worker_process
+        init_ms = worker.init_ms if worker is not None else None
+        init_str = f", worker init {init_ms:.0f}ms" if init_ms is not None else ""
+        _worker_log.debug("First frame after %s: %.0fms%s", kind, elapsed_ms, init_str)
+
     def _reload_worker_proxy(self):
         """重新加载 worker 的 proxy（不重启进程，热重载）
 
@@ -2782,11 +3653,12 @@ class ApplicationContext(QObject):
 
             # 4. 更新 shared memory 引用
             self._proxy_shared_memory = shm
+            metrics.shm_bytes.inc(shm.size, kind="proxy")
 
             # 5. 重置标志：proxy 已成功重载
             self._proxy_needs_reload = False
 
-            print(f"[WORKER] Reloaded proxy via hot-reload (shape={proxy.array.shape})")
+            _worker_log.debug("Reloaded proxy via hot-reload (shape=%s)", proxy.array.shape)
 
             # 6. 事件驱动的 shared memory 清理（替代延迟等待）
             # 当 worker 成功 reload 后，会触发 proxy_reloaded 信号，然后清理旧 shared memory
@@ -2796,6 +3668,7 @@ class ApplicationContext(QObject):
                     import threading
                     def do_cleanup():
                         try:
+                            metrics.shm_bytes.dec(old_shm.size, kind="proxy")
                             old_shm.close()
                             old_shm.unlink()
                         except Exception as e:
@@ -2817,35 +3690,59 @@ class ApplicationContext(QObject):
             # 重载失败，回退到重启 worker
             self._shutdown_preview_worker_process()
 
-    def _trigger_preview_with_process(self):
-        """使用进程模式触发预览"""
-        if not self._current_proxy:
-            return
-
-        # 进程模式也用 busy/pending
-        if self._preview_busy:
-            self._preview_pending = True
-            return
-        self._preview_busy = True
+    def _ensure_preview_worker_process(self) -> bool:
+        """确保 worker 进程可用（Lazy 创建、热重载 proxy 或重建已死进程）
 
-        # Lazy 创建或热重载 worker 进程
+        Returns:
+            bool: worker 是否可用（False 表示已回退到线程模式）
+        """
         if self._preview_worker_process is None:
             # 首次创建 worker 进程
             self._create_preview_worker_process()
         elif self._preview_worker_process.is_alive():
             # Worker 存活，检查是否需要重载 proxy
             if self._proxy_needs_reload:
-                print("[DEBUG] _trigger_preview_with_process(): proxy 已改变，重载 proxy", flush=True)
+                _log.debug("_ensure_preview_worker_process(): proxy 已改变，重载 proxy")
                 self._reload_worker_proxy()
             else:
-                print("[DEBUG] _trigger_preview_with_process(): proxy 未改变，跳过重载", flush=True)
+                _log.debug("_ensure_preview_worker_process(): proxy 未改变，跳过重载")
         else:
             # Worker 已死，需要重新创建
             self._shutdown_preview_worker_process()
             self._create_preview_worker_process()
 
+        return self._preview_worker_process is not None
+
+    def _get_custom_colorspace_def(self) -> Optional[dict]:
+        """获取当前输入色彩空间的自定义定义（传递给 worker 进程注册）"""
+        cs_name = self._current_params.input_color_space_name
+        if not self.color_space_manager.is_custom_color_space(cs_name):
+            return None
+        # 获取自定义色彩空间的完整定义（primaries, white_point, gamma）
+        custom_colorspace_def = self.color_space_manager.get_color_space_definition(cs_name)
+        if custom_colorspace_def:
+            # 添加色彩空间名称
+            custom_colorspace_def['name'] = cs_name
+        return custom_colorspace_def
+
+    @traced("context.dispatch_preview_process", cat="context")
+    def _trigger_preview_with_process(self):
+        """使用进程模式触发预览"""
+        if not self._current_proxy:
+            return
+
+        # 进程模式也用 busy/pending
+        if self._preview_busy:
+            # 事件驱动模式下 busy 只在收到结果时清除；请求丢失（队列满/进程崩溃）时超时解锁
+            worker = self._preview_worker_process
+            if worker is None or worker.seconds_since_last_request() < 10.0:
+                self._preview_pending = True
+                return
+        self._preview_busy = True
+
+        # Lazy 创建或热重载 worker 进程
         # 如果创建失败（已回退到线程模式），直接返回
-        if self._preview_worker_process is None:
+        if not self._ensure_preview_worker_process():
             return
 
         # Worker不需要crop（主进程在_prepare_proxy()中已处理）
@@ -2870,17 +3767,10 @@ class ApplicationContext(QObject):
             display_metadata['source_wh'] = (self._current_image.width, self._current_image.height)
 
         # 检测是否需要传递自定义色彩空间定义给worker进程
-        custom_colorspace_def = None
-        cs_name = self._current_params.input_color_space_name
-        if self.color_space_manager.is_custom_color_space(cs_name):
-            # 获取自定义色彩空间的完整定义（primaries, white_point, gamma）
-            custom_colorspace_def = self.color_space_manager.get_color_space_definition(cs_name)
-            if custom_colorspace_def:
-                # 添加色彩空间名称
-                custom_colorspace_def['name'] = cs_name
+        custom_colorspace_def = self._get_custom_colorspace_def()
 
         # 发送预览请求（非阻塞），传递完整的proxy准备参数和显示状态
-        print("[DEBUG] _trigger_preview_with_process: 发送预览请求（非阻塞）")
+        _log.debug("_trigger_preview_with_process: 发送预览请求（非阻塞）")
         self._preview_worker_process.request_preview(
             self._current_params,
             crop_rect_norm=crop_rect_norm,  # 始终为None
@@ -2888,42 +3778,54 @@ class ApplicationContext(QObject):
             idt_gamma=self.get_current_idt_gamma(),
             convert_to_monochrome=self.should_convert_to_monochrome(),
             display_metadata=display_metadata,
-            custom_colorspace_def=custom_colorspace_def
+            custom_colorspace_def=custom_colorspace_def,
+            preview_scale=self._get_interactive_preview_scale(),
+            analysis=self._preview_analysis or None
         )
 
-        # 启动结果轮询定时器
-        if not self._result_poll_timer.isActive():
-            self._result_poll_timer.start(16)  # ~60 FPS
+        # 等待结果：优先事件驱动，否则启动轮询定时器
+        self._start_result_polling()
 
+    @traced("context.dispatch_preview_thread", cat="context")
     def _trigger_preview_with_thread(self):
         """使用线程模式触发预览（原有实现）"""
-        print("[DEBUG] _trigger_preview_with_thread() 开始执行", flush=True)
+        _log.debug("_trigger_preview_with_thread() 开始执行")
 
         if not self._current_proxy:
-            print("[WARNING] _trigger_preview_with_thread(): _current_proxy为None，提前返回", flush=True)
+            _log.debug("_trigger_preview_with_thread(): _current_proxy为None，提前返回")
             return
 
         if self._preview_busy:
-            print(f"[WARNING] _trigger_preview_with_thread(): preview忙碌中，设置pending标志", flush=True)
+            _log.debug("_trigger_preview_with_thread(): preview忙碌中，设置pending标志")
             self._preview_pending = True
             return
 
-        print("[DEBUG] _trigger_preview_with_thread(): 设置busy标志，准备创建worker", flush=True)
+        _log.debug("_trigger_preview_with_thread(): 设置busy标志，准备创建worker")
         self._preview_busy = True
 
         # 使用 view() 和 shallow_copy() 避免深拷贝
         try:
-            proxy_view = self._current_proxy.view()
+            output_size = None
+            preview_scale = self._get_interactive_preview_scale()
+            if preview_scale < 1.0:
+                # 拖动期间在降采样proxy上渲染，结果放大回全尺寸（旋转后）
+                full_h, full_w = self._current_proxy.array.shape[:2]
+                if (self.get_current_orientation() // 90) % 2 == 1:
+                    full_w, full_h = full_h, full_w
+                output_size = (full_w, full_h)
+                proxy_view = self._get_interactive_proxy(preview_scale).view()
+            else:
+                proxy_view = self._current_proxy.view()
             params_view = self._current_params.shallow_copy()
-            print(f"[DEBUG] _trigger_preview_with_thread(): proxy和params复制完成", flush=True)
+            _log.debug("_trigger_preview_with_thread(): proxy和params复制完成")
         except Exception as e:
-            print(f"[ERROR] _trigger_preview_with_thread(): 复制proxy/params失败: {e}", flush=True)
+            _log.error("_trigger_preview_with_thread(): 复制proxy/params失败: %s", e)
             self._preview_busy = False
             return
 
         # 获取 IDT gamma
         idt_gamma = self.get_current_idt_gamma()
-        print(f"[DEBUG] _trigger_preview_with_thread(): IDT gamma={idt_gamma}", flush=True)
+        _log.debug("_trigger_preview_with_thread(): IDT gamma=%s", idt_gamma)
 
         # 检测是否需要传递自定义色彩空间定义
         custom_colorspace_def = None
@@ -2934,9 +3836,9 @@ class ApplicationContext(QObject):
             if custom_colorspace_def:
                 # 添加色彩空间名称
                 custom_colorspace_def['name'] = cs_name
-                print(f"[DEBUG] _trigger_preview_with_thread(): 自定义色彩空间={cs_name}", flush=True)
+                _log.debug("_trigger_preview_with_thread(): 自定义色彩空间=%s", cs_name)
 
-        print("[DEBUG] _trigger_preview_with_thread(): 创建PreviewWorker...", flush=True)
+        _log.debug("_trigger_preview_with_thread(): 创建PreviewWorker...")
         worker = _PreviewWorker(
             image=proxy_view,
             params=params_view,
@@ -2945,47 +3847,149 @@ class ApplicationContext(QObject):
             convert_to_monochrome_in_idt=self.should_convert_to_monochrome(),
             orientation=self.get_current_orientation(),
             idt_gamma=idt_gamma,
-            custom_colorspace_def=custom_colorspace_def
+            custom_colorspace_def=custom_colorspace_def,
+            output_size=output_size,
+            analysis=dict(self._preview_analysis) or None,
+            stage_cache_key=(
+                'thread', self._proxy_generation, preview_scale,
+                self.get_current_orientation() % 360, float(idt_gamma), cs_name,
+                json.dumps(custom_colorspace_def, sort_keys=True, default=str) if custom_colorspace_def else None,
+            )
         )
         worker.signals.result.connect(self._on_preview_result)
         worker.signals.error.connect(self._on_preview_error)
         worker.signals.finished.connect(self._on_preview_finished)
-        print("[DEBUG] _trigger_preview_with_thread(): Worker创建完成，信号已连接", flush=True)
+        _log.debug("_trigger_preview_with_thread(): Worker创建完成，信号已连接")
 
         # 使用 ensure_thread_pool() 统一处理线程池创建
-        print("[DEBUG] _trigger_preview_with_thread(): 提交worker到线程池", flush=True)
+        _log.debug("_trigger_preview_with_thread(): 提交worker到线程池")
         try:
             self.ensure_thread_pool().start(worker)
-            print("[DEBUG] _trigger_preview_with_thread(): Worker已提交到线程池", flush=True)
+            _log.debug("_trigger_preview_with_thread(): Worker已提交到线程池")
         except Exception as e:
-            print(f"[ERROR] _trigger_preview_with_thread(): 提交worker失败: {e}", flush=True)
+            _log.error("_trigger_preview_with_thread(): 提交worker失败: %s", e)
             self._preview_busy = False
 
-    def _poll_preview_result(self):
-        """定期轮询结果队列（~60 FPS）"""
-        # print("[DEBUG] _poll_preview_result: 轮询结果定时触发")
+    def _setup_result_notifier(self):
+        """为 worker 的结果通知管道创建 QSocketNotifier（不支持时保持轮询模式）"""
+        self._teardown_result_notifier()
         if self._preview_worker_process is None:
+            return
+        fd = self._preview_worker_process.get_result_notify_fd()
+        if fd is None:
+            return
+        try:
+            from PySide6.QtCore import QSocketNotifier
+            notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+            notifier.activated.connect(self._on_result_notifier_activated)
+            notifier.setEnabled(True)
+            self._result_notifier = notifier
+            # 事件驱动生效后不再需要轮询
             self._result_poll_timer.stop()
+        except Exception as e:
+            _worker_log.debug("结果通知不可用，回退到轮询: %s", e)
+            self._result_notifier = None
+
+    def _teardown_result_notifier(self):
+        """停止监听结果通知管道"""
+        self._result_backlog = 0
+        notifier = getattr(self, '_result_notifier', None)
+        if notifier is None:
             return
+        try:
+            notifier.setEnabled(False)
+            notifier.activated.disconnect(self._on_result_notifier_activated)
+            notifier.deleteLater()
+        except (RuntimeError, TypeError):
+            pass
+        self._result_notifier = None
 
-        result = self._preview_worker_process.try_get_result()
+    def _start_result_polling(self):
+        """等待 worker 结果：事件驱动可用时无需操作，否则启动轮询定时器"""
+        if self._result_notifier is not None:
+            return
+        if not self._result_poll_timer.isActive():
+            self._result_poll_timer.start(16)  # ~60 FPS
 
-        if result is not None:
-            if isinstance(result, Exception):
-                # 错误处理
-                self._on_preview_error(str(result))
-            else:
-                # 正常结果
-                self._on_preview_result(result)
+    def _on_result_notifier_activated(self, *args):
+        """结果通知管道可读：立即取回所有已到达的结果"""
+        worker = self._preview_worker_process
+        if worker is None:
+            return
+        # GUI 线程上只做非阻塞读取：通知可能先于 Queue 后台线程写入管道到达，
+        # 这类消息记入 backlog，稍后由单次定时器重试
+        self._result_backlog += worker.drain_result_notifications()
+        while self._result_backlog > 0:
+            got, result = worker.take_result_nowait()
+            if not got:
+                break
+            self._result_backlog -= 1
+            if result is None:
+                continue  # 内部消息（proxy_reloaded、auto_color 等）
+            self._preview_busy = False
+            self._dispatch_worker_result(result)
+        if self._result_backlog > 0:
+            QTimer.singleShot(2, self._on_result_notifier_activated)
 
-        # 不管是正常还是异常，这一轮 preview 算是结束了
-        self._preview_busy = False
+        # 请求队列满时搁置的细节块
+        if self._detail_send_queue:
+            self._pump_detail_tiles()
 
+        # 看看有没有 pending 的请求
+        if not self._preview_busy and self._preview_pending:
+            self._preview_pending = False
+            self._trigger_preview_update()
+
+    @traced("context.worker_result", cat="context")
+    def _dispatch_worker_result(self, result):
+        """分发 worker 返回的预览结果或错误"""
+        if result is None:
+            return
         if isinstance(result, Exception):
+            # 错误处理
             self._on_preview_error(str(result))
         else:
+            # 正常结果
+            self._record_worker_first_frame()
             self._on_preview_result(result)
 
+    def get_preview_timing_report(self) -> dict:
+        """获取进程模式预览的逐帧计时（排队等待 / 渲染 / 投递，单位 ms）
+
+        worker_startup 为 worker 获取后首帧延迟统计（cold_start / hot_swap）
+        """
+        worker = getattr(self, '_preview_worker_process', None)
+        if worker is None:
+            return {}
+        report = worker.get_frame_timing()
+        startup = {}
+        for kind, stats in getattr(self, '_worker_startup_stats', {}).items():
+            count = stats['count']
+            startup[kind] = {
+                'last_ms': stats['last_ms'],
+                'avg_ms': stats['total_ms'] / count if count else 0.0,
+                'count': count,
+            }
+        report['worker_startup'] = startup
+        return report
+
+    def _poll_preview_result(self):
+        """定期轮询结果队列（~60 FPS，仅在事件驱动不可用时使用）"""
+        # print("[DEBUG] _poll_preview_result: 轮询结果定时触发")
+        if self._preview_worker_process is None:
+            self._result_poll_timer.stop()
+            return
+
+        result = self._preview_worker_process.try_get_result()
+
+        # 不管是正常还是异常，这一轮 preview 算是结束了
+        self._preview_busy = False
+
+        self._dispatch_worker_result(result)
+
+        if self._detail_send_queue:
+            self._pump_detail_tiles()
+
         # 看看有没有 pending 的请求
         if self._preview_pending:
             self._preview_pending = False
@@ -2999,6 +4003,7 @@ class ApplicationContext(QObject):
         try:
             if hasattr(self, '_preview_worker_process'):
                 self._shutdown_preview_worker_process()
+                self._shutdown_standby_worker()
         except:
             # atexit handler 中不应该抛出异常
             pass
@@ -3015,6 +4020,7 @@ class ApplicationContext(QObject):
         if self._use_process_isolation:
             try:
                 self._shutdown_preview_worker_process()
+                self._shutdown_standby_worker()
                 print("[DEBUG] preview_worker_process 清理完成")
             except Exception as e:
                 print(f"[WARNING] preview_worker_process 清理失败: {e}")
@@ -3038,6 +4044,15 @@ class ApplicationContext(QObject):
         except Exception as e:
             print(f"[WARNING] thread_pool 清理失败: {e}")
 
+        # 2.5 放弃未开始的细节块并等待进行中的块
+        try:
+            self.clear_detail_tiles()
+            if self._detail_thread_pool is not None:
+                self._detail_thread_pool.clear()
+                self._detail_thread_pool.waitForDone(1000)
+        except Exception as e:
+            print(f"[WARNING] detail_thread_pool 清理失败: {e}")
+
         # 3. 清理 ImageManager 缓存
         try:
             if hasattr(self, 'image_manager') and self.image_manager:
@@ -0,0 +1,311 @@
+"""
+运行时自动调优（python -m divere --autotune）
+
+调度参数原本是写死的：FilmMathOps 的线程数（上限 8）、分块大小与并行阈值，
+PreviewConfig.gpu_threshold，以及 FilmPipelineProcessor 的全精度分块尺寸。
+合适的取值在笔记本与 32 核渲染节点之间相差很大，这里用合成数据一次性校准：
+
+- 线程数：并行 LUT 密度反相在不同线程数下的耗时（相差 5% 以内取较少的线程）
+- 分块大小：同一负载在不同 block_size 下的耗时
+- 并行阈值：串行与并行版本随图像尺寸变化的交叉点
+- 融合管线阈值：Numba 融合密度管线与逐步 NumPy 管线的交叉点（仅 Numba CPU 引擎）
+- GPU 阈值：当前加速引擎（GPU 或 Numba CPU）与 CPU 路径的交叉点
+- 全精度分块尺寸：分块全精度管线在不同 tile 尺寸下的耗时
+
+结果按机器指纹（平台、CPU 型号与核数、Python/NumPy 版本）写入 <用户配置目录>/cache/autotune.json；
+FilmMathOps / FilmPipelineProcessor 初始化时通过 get_tuning() 读取（配置项 ui.autotune 可关闭），
+指纹不匹配（换了机器或库）时忽略，使用内置默认值。
+"""
+
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TUNING_FILE = "autotune.json"
+# 结果格式版本：字段含义变化时递增，旧结果自动作废
+_TUNING_FORMAT = 1
+# 加速引擎在任何尺寸下都不占优时的 GPU 阈值（等同于禁用）
+GPU_NEVER = 1 << 40
+
+_tuning: Optional[Dict[str, Any]] = None
+
+
+def _tuning_path() -> Path:
+    from .gpu_probe_cache import _cache_dir
+    return _cache_dir() / _TUNING_FILE
+
+
+def machine_fingerprint() -> Dict[str, Any]:
+    """校准结果适用的机器/环境（任何一项变化都需要重新校准）"""
+    return {
+        "format": _TUNING_FORMAT,
+        "os": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def autotune_enabled() -> bool:
+    """是否使用持久化的校准结果（配置项 ui.autotune，环境变量 DIVERE_NO_AUTOTUNE 可临时关闭）"""
+    if os.environ.get('DIVERE_NO_AUTOTUNE', '').lower() in ('1', 'true', 'yes'):
+        return False
+    try:
+        from ..utils.enhanced_config_manager import enhanced_config_manager
+        return bool(enhanced_config_manager.get_ui_setting("autotune", True))
+    except Exception:
+        return True
+
+
+def get_tuning() -> Dict[str, Any]:
+    """本机的校准结果（首次调用时读取并缓存）；未校准、已禁用或指纹不匹配时返回空字典"""
+    global _tuning
+    if _tuning is None:
+        _tuning = {}
+        if autotune_enabled():
+            try:
+                with open(_tuning_path(), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("fingerprint") == machine_fingerprint() and isinstance(data.get("results"), dict):
+                    _tuning = data["results"]
+                else:
+                    print("[WARNING] 自动调优结果与当前机器不匹配，使用默认调度参数（可重新运行 --autotune）")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[WARNING] 读取自动调优结果失败: {e}")
+    return _tuning
+
+
+def install_tuning(results: Dict[str, Any]) -> None:
+    """worker 中安装主进程已读取的校准结果（随配置快照传递），之后 get_tuning() 不再读取 autotune.json"""
+    global _tuning
+    _tuning = dict(results)
+
+
+def tuned_int(tuning: Dict[str, Any], name: str, minimum: int = 1) -> Optional[int]:
+    """校准结果中的正整数项；缺失或无效时返回 None"""
+    try:
+        value = int(tuning[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return value if value >= minimum else None
+
+
+def save_tuning(results: Dict[str, Any], timings: Optional[Dict[str, Any]] = None) -> Path:
+    """写入校准结果（原子替换）并立即生效于当前进程"""
+    global _tuning
+    path = _tuning_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "fingerprint": machine_fingerprint(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+        "timings": timings or {},
+    }
+    tmp = path.with_name(f"{_TUNING_FILE}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    _tuning = dict(results)
+    return path
+
+
+# ---- 校准 ----
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """预热一次后取 repeat 次中的最短耗时（秒）"""
+    fn()
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _pick_fastest(times: Dict[Any, float], tolerance: float = 0.05) -> Any:
+    """耗时最短的候选；与最短耗时相差 tolerance 以内时取排在前面（更保守）的候选"""
+    fastest = min(times.values())
+    for candidate, t in times.items():
+        if t <= fastest * (1.0 + tolerance):
+            return candidate
+    return min(times, key=times.get)
+
+
+def _crossover(sizes: Sequence[int], baseline: Sequence[float], candidate: Sequence[float]) -> Optional[int]:
+    """candidate 从该尺寸起（含更大的尺寸）始终快于 baseline 的最小尺寸；从不占优时返回 None"""
+    index = None
+    for i in range(len(sizes) - 1, -1, -1):
+        if candidate[i] < baseline[i]:
+            index = i
+        else:
+            break
+    return None if index is None else sizes[index]
+
+
+def _set_threads(math_ops, num_threads: int, block_size: Optional[int] = None) -> None:
+    if math_ops._thread_pool is not None:
+        math_ops._thread_pool.shutdown(wait=True)
+        math_ops._thread_pool = None
+    math_ops.num_threads = num_threads
+    math_ops.block_size = block_size or math_ops._get_optimal_block_size()
+
+
+def run_autotune(quick: bool = False, log: Callable[[str], None] = print) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """在合成数据上校准调度参数
+
+    Args:
+        quick: 使用更小的图像与更少的重复次数（约为完整校准耗时的四分之一）
+        log: 进度输出函数
+
+    Returns:
+        (results, timings)：results 为 get_tuning() 返回的参数，timings 为各候选的耗时（毫秒，供查看）
+    """
+    from .data_types import ColorGradingParams, ImageData
+    from .math_ops import FilmMathOps
+    from .pipeline_processor import FilmPipelineProcessor
+
+    repeat = 2 if quick else 4
+    rng = np.random.default_rng(0)
+    cpu_count = os.cpu_count() or 1
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Any] = {}
+
+    math_ops = FilmMathOps()
+    math_ops.gpu_accelerator = None
+    args = (2.0, 2.5, 0.7, True)
+
+    # 1. 线程数
+    side = 1536 if quick else 2560
+    image = rng.random((side, side, 3), dtype=np.float32)
+    thread_candidates = sorted({n for n in (1, 2, 4, 6, 8, 12, 16, 24, 32, 48, 64, cpu_count) if n <= cpu_count})
+    thread_times: Dict[int, float] = {}
+    for n in thread_candidates:
+        _set_threads(math_ops, n)
+        thread_times[n] = _best_time(lambda: math_ops._density_inversion_lut_parallel(image, *args), repeat)
+        log(f"[AUTOTUNE] 线程数 {n:>3}: {thread_times[n] * 1000.0:8.1f}ms")
+    num_threads = _pick_fastest(thread_times)
+    results["num_threads"] = num_threads
+    timings["num_threads"] = {str(k): v * 1000.0 for k, v in thread_times.items()}
+
+    # 2. 分块大小
+    block_times: Dict[int, float] = {}
+    for block in (128, 256, 512, 1024):
+        _set_threads(math_ops, num_threads, block)
+        block_times[block] = _best_time(lambda: math_ops._density_inversion_lut_parallel(image, *args), repeat)
+        log(f"[AUTOTUNE] 分块 {block:>5}: {block_times[block] * 1000.0:8.1f}ms")
+    block_size = _pick_fastest(block_times)
+    _set_threads(math_ops, num_threads, block_size)
+    results["block_size"] = block_size
+    timings["block_size"] = {str(k): v * 1000.0 for k, v in block_times.items()}
+
+    # 3. 并行阈值（与 _should_use_parallel 一致，按数组元素数计）
+    if num_threads > 1:
+        sides = [128, 256, 384, 512, 768, 1024, 1536]
+        sizes: List[int] = []
+        serial: List[float] = []
+        parallel: List[float] = []
+        for s in sides:
+            sample = image[:s, :s]
+            sizes.append(sample.size)
+            serial.append(_best_time(lambda: math_ops._density_inversion_lut_optimized(sample, *args), repeat + 1))
+            parallel.append(_best_time(lambda: math_ops._density_inversion_lut_parallel(sample, *args), repeat + 1))
+            log(f"[AUTOTUNE] {s:>4}²  串行 {serial[-1] * 1000.0:7.2f}ms  并行 {parallel[-1] * 1000.0:7.2f}ms")
+        crossover = _crossover(sizes, serial, parallel)
+        # 并行从 crossover 起占优，_should_use_parallel 判断的是 size > threshold
+        if crossover is None:
+            results["parallel_threshold"] = sizes[-1]
+        else:
+            index = sizes.index(crossover)
+            results["parallel_threshold"] = sizes[index - 1] if index > 0 else 0
+        timings["parallel_threshold"] = {
+            str(size): {"serial": a * 1000.0, "parallel": b * 1000.0}
+            for size, a, b in zip(sizes, serial, parallel)
+        }
+
+    # 4. 加速引擎阈值（与 PreviewConfig.should_use_gpu 一致，按数组元素数计）
+    from .gpu_accelerator import get_gpu_accelerator
+    accelerator = get_gpu_accelerator()
+    if accelerator.is_available():
+        backend = accelerator.get_device_info().get("type", "unknown")
+        results["gpu_backend"] = backend
+        sizes, cpu_times, accel_times = [], [], []
+        for s in sorted({s for s in (512, 1024, 1536, 2048) if s < side} | {side}):
+            sample = np.ascontiguousarray(image[:s, :s])
+            sizes.append(sample.size)
+            cpu_times.append(_best_time(lambda: math_ops.density_inversion(sample, *args, use_gpu=False), repeat))
+            try:
+                accel_times.append(_best_time(lambda: accelerator.density_inversion_accelerated(sample, *args), repeat))
+            except Exception as e:
+                log(f"[AUTOTUNE] 加速引擎 {backend} 执行失败: {e}")
+                accel_times.append(float('inf'))
+            log(f"[AUTOTUNE] {s:>4}²  CPU {cpu_times[-1] * 1000.0:7.2f}ms  {backend} {accel_times[-1] * 1000.0:7.2f}ms")
+        crossover = _crossover(sizes, cpu_times, accel_times)
+        results["gpu_threshold"] = GPU_NEVER if crossover is None else crossover
+        timings["gpu_threshold"] = {
+            str(size): {"cpu": a * 1000.0, backend: b * 1000.0}
+            for size, a, b in zip(sizes, cpu_times, accel_times)
+        }
+
+        # 4b. 融合密度管线阈值（与 _fused_density_pipeline 一致，按数组元素数计）
+        if hasattr(accelerator.active_engine, "density_pipeline_gpu"):
+            params = ColorGradingParams()
+            sizes, numpy_times, fused_times = [], [], []
+            for s in (128, 256, 384, 512, 768, 1024, 1536):
+                if s > side:
+                    continue
+                sample = image[:s, :s]
+                sizes.append(sample.size)
+                math_ops.gpu_accelerator = None
+                numpy_times.append(_best_time(
+                    lambda: math_ops.apply_full_math_pipeline(sample, params, include_curve=False), repeat))
+                math_ops.gpu_accelerator = accelerator
+                math_ops.fused_pipeline_threshold = 0
+                fused_times.append(_best_time(
+                    lambda: math_ops.apply_full_math_pipeline(sample, params, include_curve=False), repeat))
+                log(f"[AUTOTUNE] {s:>4}²  NumPy {numpy_times[-1] * 1000.0:7.2f}ms  融合 {fused_times[-1] * 1000.0:7.2f}ms")
+            math_ops.gpu_accelerator = None
+            crossover = _crossover(sizes, numpy_times, fused_times)
+            # 与并行阈值相同：_fused_density_pipeline 判断的是 size > threshold
+            if crossover is None:
+                results["fused_pipeline_threshold"] = GPU_NEVER
+            else:
+                index = sizes.index(crossover)
+                results["fused_pipeline_threshold"] = sizes[index - 1] if index > 0 else 0
+            timings["fused_pipeline_threshold"] = {
+                str(size): {"numpy": a * 1000.0, "fused": b * 1000.0}
+                for size, a, b in zip(sizes, numpy_times, fused_times)
+            }
+    del image
+
+    # 5. 全精度分块尺寸
+    h, w = (2048, 3072) if quick else (4096, 6144)
+    full = ImageData(array=rng.random((h, w, 3), dtype=np.float32), width=w, height=h, channels=3, dtype=np.float32)
+    processor = FilmPipelineProcessor(math_ops=math_ops)
+    params = ColorGradingParams()
+    tile_times: Dict[int, float] = {}
+    for tile in (512, 1024, 2048, 4096):
+        if tile > max(h, w):
+            continue
+        tile_times[tile] = _best_time(
+            lambda: processor.apply_full_precision_pipeline(
+                full, params, chunked=True, tile_size=(tile, tile), max_workers=num_threads
+            ),
+            1 if quick else 2,
+        )
+        log(f"[AUTOTUNE] 全精度分块 {tile:>4}: {tile_times[tile] * 1000.0:8.1f}ms")
+    tile = _pick_fastest(tile_times)
+    results["full_pipeline_tile_size"] = [tile, tile]
+    results["full_pipeline_max_workers"] = num_threads
+    timings["full_pipeline_tile_size"] = {str(k): v * 1000.0 for k, v in tile_times.items()}
+
+    _set_threads(math_ops, 1)
+    return results, timings
@@ -7,7 +7,6 @@ import numpy as np
 from typing import Optional, Tuple, Dict, Any
 from pathlib import Path
 from collections import OrderedDict
-import colour
 import json
 import os
 
@@ -84,6 +83,13 @@ class ColorSpaceManager:
 
     def _load_colorspaces_from_json(self):
         """从JSON文件加载色彩空间定义（支持用户配置优先）"""
+        # 优先使用已解析的配置快照（worker 中为主进程传来的冻结快照，不再读取文件）
+        from divere.utils.config_snapshot import get_config_snapshot
+        snapshot = get_config_snapshot()
+        if snapshot is not None:
+            self._color_spaces.update(snapshot.copy_colorspaces())
+            return
+        
         try:
             from divere.utils.enhanced_config_manager import enhanced_config_manager
             
@@ -605,8 +611,8 @@ class ColorSpaceManager:
         all_spaces = self.get_available_color_spaces()
         return [space for space in all_spaces if self.is_grayscale_colorspace(space)]
     
-    def set_image_color_space(self, image: ImageData, color_space: str) -> ImageData:
-        """设置图像的色彩空间"""
+    def _resolve_input_color_space(self, color_space: str) -> str:
+        """无效的色彩空间名回退到默认预设的输入变换"""
         if not self.validate_color_space(color_space):
             if self._verbose_logs:
                 print(f"无效的色彩空间: {color_space}，使用默认值")
@@ -615,6 +621,11 @@ class ColorSpaceManager:
                 color_space = load_default_preset().input_transformation.name or "KodakEnduraPremier"
             except Exception:
                 color_space = "KodakEnduraPremier"
+        return color_space
+    
+    def set_image_color_space(self, image: ImageData, color_space: str) -> ImageData:
+        """设置图像的色彩空间"""
+        color_space = self._resolve_input_color_space(color_space)
         # 创建新的图像数据对象，更新色彩空间信息
         new_image = ImageData(
             array=image.array.copy(),
@@ -678,6 +689,49 @@ class ColorSpaceManager:
         linear_image.color_space = self._working_space
         return linear_image
     
+    def input_to_working_space(self, image: ImageData, color_space: str, idt_gamma: float = 1.0,
+                               out: Optional[np.ndarray] = None, out_dtype=None,
+                               bits_per_sample: Optional[int] = None) -> Optional[ImageData]:
+        """融合的输入变换：IDT gamma → 输入色彩空间 → 工作空间，一次分块遍历（见 input_transform）
+        
+        等价于 apply_power(idt_gamma) + set_image_color_space + convert_to_working_space(skip_gamma_inverse=True)，
+        但不复制输入数组，结果直接写入 out（或新分配的数组）。
+        
+        Args:
+            image: 输入图像（数组可为 uint8/uint16 原始采样、float16 proxy、float32，可为视图）
+            color_space: 输入色彩变换名
+            idt_gamma: IDT gamma
+            out: 预分配的输出缓冲区
+            out_dtype: 未提供 out 时的输出类型；None 表示 float16 输入保持 float16，其余为 float32
+            bits_per_sample: 整型输入的实际位数
+        
+        Returns:
+            工作空间图像；输入布局不支持时返回 None（调用方回退到逐步变换）
+        """
+        from .input_transform import apply_input_transform
+        
+        color_space = self._resolve_input_color_space(color_space)
+        matrix = gain = None
+        if color_space != self._working_space:
+            matrix, gain = self.calculate_color_space_conversion(color_space, self._working_space)
+        if out_dtype is None:
+            out_dtype = np.float16 if image.array.dtype == np.float16 else np.float32
+        array = apply_input_transform(image.array, idt_gamma, matrix, gain, out=out,
+                                      out_dtype=out_dtype, bits_per_sample=bits_per_sample)
+        if array is None:
+            return None
+        return ImageData(
+            array=array,
+            color_space=self._working_space,
+            icc_profile=image.icc_profile,
+            metadata=image.metadata,
+            file_path=image.file_path,
+            is_proxy=image.is_proxy,
+            proxy_scale=image.proxy_scale,
+            original_channels=image.original_channels,
+            is_monochrome_source=image.is_monochrome_source
+        )
+    
     def convert_to_display_space(self, image: ImageData, target_space: str = "sRGB") -> ImageData:
         """转换到显示色彩空间"""
         import time
@@ -946,11 +1000,19 @@ class ColorSpaceManager:
                     # 其他情况，3个相同的luminance通道
                     result_array = np.stack([luminance, luminance, luminance], axis=2)
                 
-                return ImageData(
+                result = ImageData(
                     array=result_array,
                     file_path=image.file_path,
-                    color_space="Monochrome"
+                    color_space="Monochrome",
+                    # 保留随帧分析（black cut-off 等）与显示状态，避免界面回退到全分辨率重新检测
+                    metadata=dict(image.metadata),
+                    is_proxy=image.is_proxy,
+                    proxy_scale=image.proxy_scale
                 )
+                if image.display_rgb8 is not None:
+                    # 原图带有 8-bit 显示帧时，单色结果同样提供，显示端不必再量化
+                    result.build_display_rgb8()
+                return result
         
         return image
     
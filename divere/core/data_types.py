@@ -561,6 +561,8 @@ class ImageData:
     # 单色源图像标记
     original_channels: int = 3
     is_monochrome_source: bool = False
+    # 显示用 8-bit 帧（C 连续，与 array 逐像素对应；由预览 worker 在 GUI 线程外生成）
+    display_rgb8: Optional[np.ndarray] = None
     
     def __post_init__(self):
         if self.array is not None:
@@ -590,7 +592,8 @@ class ImageData:
             is_proxy=self.is_proxy,
             proxy_scale=self.proxy_scale,
             original_channels=self.original_channels,
-            is_monochrome_source=self.is_monochrome_source
+            is_monochrome_source=self.is_monochrome_source,
+            display_rgb8=self.display_rgb8.copy() if self.display_rgb8 is not None else None
         )
 
     def view(self):
@@ -629,9 +632,39 @@ class ImageData:
             is_proxy=self.is_proxy,
             proxy_scale=self.proxy_scale,
             original_channels=self.original_channels,
-            is_monochrome_source=self.is_monochrome_source
+            is_monochrome_source=self.is_monochrome_source,
+            display_rgb8=self.display_rgb8
         )
 
+    def build_display_rgb8(self) -> Optional[np.ndarray]:
+        """把 array 量化为显示用的 8-bit 帧并缓存到 display_rgb8
+
+        与 PreviewWidget 的转换规则一致：clip 到 [0, 1]，round(x * 255)。
+        通道对应 QImage 格式：3 → RGB888，4 → RGBA8888，单通道 → Grayscale8，
+        其他通道数取前 3 个通道。
+
+        Returns:
+            C 连续的 uint8 数组；array 为空时返回 None
+        """
+        array = self.array
+        if array is None:
+            self.display_rgb8 = None
+            return None
+        if array.ndim == 3:
+            if array.shape[2] == 1:
+                array = array[:, :, 0]
+            elif array.shape[2] not in (3, 4):
+                array = array[:, :, :3]
+        if array.dtype == np.uint8:
+            rgb8 = np.ascontiguousarray(array)
+        else:
+            scaled = np.multiply(array, 255.0, dtype=np.float32)
+            np.clip(scaled, 0.0, 255.0, out=scaled)
+            np.rint(scaled, out=scaled)
+            rgb8 = scaled.astype(np.uint8, order='C')
+        self.display_rgb8 = rgb8
+        return rgb8
+
     def copy_with_new_array(self, new_array: np.ndarray):
         """返回一个带有新图像数组的新ImageData实例，同时复制所有其他元数据"""
         return ImageData(
@@ -7,6 +7,7 @@ import numpy as np
 from typing import Optional, Dict, Any, List, Tuple
 import time
 import platform
+import threading
 from abc import ABC, abstractmethod
 
 # 导入debug logger
@@ -33,6 +34,10 @@ try:
 except ImportError:
     METAL_AVAILABLE = False
 
+# numba（可选）：只检查是否安装，导入推迟到 NumbaCPUEngine 初始化
+import importlib.util
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
 
 class GPUComputeEngine(ABC):
     """GPU计算引擎抽象基类"""
@@ -63,11 +68,14 @@ class GPUComputeEngine(ABC):
 class OpenCLEngine(GPUComputeEngine):
     """OpenCL计算引擎 - 跨平台支持"""
     
-    def __init__(self):
+    def __init__(self, probe_cache=None, cached_record: Optional[Dict[str, Any]] = None):
         self.context = None
         self.queue = None
         self.device = None
         self.program = None
+        # 探测缓存（gpu_probe_cache）：上次选中的设备与已编译的内核二进制
+        self._probe_cache = probe_cache
+        self._cached_record = cached_record
         self._initialize()
     
     def _is_problematic_windows_device(self, device, platform) -> bool:
@@ -113,9 +121,13 @@ class OpenCLEngine(GPUComputeEngine):
             platforms = cl.get_platforms()
             info(f"发现{len(platforms)}个OpenCL平台", "GPU")
             
-            best_device = None
+            best_device = self._find_cached_device(platforms)
             best_compute_units = 0
             best_memory_mb = 0
+            if best_device is not None:
+                best_compute_units = best_device.max_compute_units
+                best_memory_mb = best_device.global_mem_size // (1024 * 1024)
+                platforms = []  # 命中缓存，跳过设备遍历
             
             for i, platform in enumerate(platforms):
                 debug(f"平台[{i}]: {platform.name} ({platform.vendor})", "GPU")
@@ -185,6 +197,68 @@ class OpenCLEngine(GPUComputeEngine):
             import traceback
             debug(f"OpenCL初始化异常详情:\n{traceback.format_exc()}", "GPU")
     
+    def _find_cached_device(self, platforms) -> Optional[Any]:
+        """按探测缓存中记录的平台/设备名直接定位上次选中的设备；找不到时返回 None"""
+        record = self._cached_record
+        if not record or not record.get("available"):
+            return None
+        for platform in platforms:
+            if platform.name != record.get("platform_name"):
+                continue
+            try:
+                for device in platform.get_devices():
+                    if (device.name == record.get("device_name")
+                            and device.driver_version == record.get("driver_version")):
+                        debug(f"使用缓存的OpenCL设备: {device.name}", "GPU")
+                        return device
+            except cl.Error:
+                break
+        debug("缓存的OpenCL设备已不存在，重新遍历设备", "GPU")
+        return None
+
+    def probe_details(self) -> Dict[str, Any]:
+        """写入探测缓存的设备标识"""
+        if self.device is None:
+            return {}
+        return {
+            "platform_name": self.device.platform.name,
+            "device_name": self.device.name,
+            "driver_version": self.device.driver_version,
+        }
+
+    def _device_identity(self) -> str:
+        device = self.device
+        return "|".join(str(part) for part in (
+            device.platform.name, device.platform.version,
+            device.name, device.driver_version, cl.VERSION_TEXT,
+        ))
+
+    def _build_program(self, kernel_source: str):
+        """构建程序：优先使用缓存的二进制，失败时从源码编译并写入缓存"""
+        cache = self._probe_cache
+        key = None
+        if cache is not None:
+            key = cache.kernel_key(kernel_source, self._device_identity())
+            binary = cache.load_kernel_binary(key)
+            if binary is not None:
+                try:
+                    program = cl.Program(self.context, [self.device], [binary]).build()
+                    info("已从缓存加载OpenCL内核二进制", "GPU")
+                    return program
+                except Exception as e:
+                    warning(f"OpenCL内核缓存无效，重新编译: {e}", "GPU")
+                    cache.discard_kernel_binary(key)
+
+        program = cl.Program(self.context, kernel_source).build()
+        if key is not None:
+            try:
+                binaries = program.get_info(cl.program_info.BINARIES)
+                if binaries:
+                    cache.store_kernel_binary(key, bytes(binaries[0]))
+            except Exception as e:
+                debug(f"无法获取OpenCL内核二进制: {e}", "GPU")
+        return program
+
     def _build_kernels(self):
         """编译OpenCL内核"""
         kernel_source = '''
@@ -235,7 +309,7 @@ class OpenCLEngine(GPUComputeEngine):
             # 尝试编译内核
             debug("开始编译OpenCL内核", "GPU")
             info(f"为设备{self.device.name}编译OpenCL内核", "GPU")
-            self.program = cl.Program(self.context, kernel_source).build()
+            self.program = self._build_program(kernel_source)
             info("OpenCL内核编译成功", "GPU")
             
             # 验证内核函数是否可用
@@ -755,6 +829,224 @@ class MetalEngine(GPUComputeEngine):
         return result_array.reshape(original_shape)
 
 
+class NumbaCPUEngine(GPUComputeEngine):
+    """Numba CPU计算引擎 - 无GPU时的并行回退
+
+    内核见 numba_kernels：prange 多线程、逐像素 float64 计算，不产生逐阶段临时数组。
+    每个内核/数据类型组合首次调用时，先在小样本上与 FilmMathOps 的 NumPy 参考实现比对，
+    不一致时该内核停用（抛出异常，由 GPUAccelerator 回退到 NumPy）。
+    """
+
+    # 与 NumPy 参考实现比对的容差（相对误差，float32 输入时受 float32 舍入限制）
+    _CHECK_RTOL = {np.dtype(np.float32): 1e-5, np.dtype(np.float64): 1e-9}
+
+    # 并行内核同一时刻只允许一个线程启动（workqueue 线程层不是线程安全的）
+    _parallel_lock = threading.Lock()
+    _reference_ops = None
+
+    def __init__(self):
+        self._kernels = None
+        self._verified: Dict[Tuple[str, str], bool] = {}
+        self._initialize()
+
+    def _initialize(self):
+        if not NUMBA_AVAILABLE:
+            debug("numba未安装，跳过Numba CPU引擎", "GPU")
+            return
+        try:
+            import os
+            import numba
+            from . import numba_kernels
+            from .autotune import get_tuning, tuned_int
+            # 与 FilmMathOps 一致：优先使用本机校准的线程数，否则不超过 8
+            threads = tuned_int(get_tuning(), "num_threads") or min(os.cpu_count() or 1, 8)
+            numba.set_num_threads(max(1, min(numba.config.NUMBA_NUM_THREADS, threads)))
+            self._kernels = numba_kernels
+            info(f"Numba CPU引擎初始化成功（numba {numba.__version__}，{numba.get_num_threads()}线程）", "GPU")
+        except Exception as e:
+            warning(f"Numba CPU引擎初始化失败: {e}", "GPU")
+            self._kernels = None
+
+    def is_available(self) -> bool:
+        return self._kernels is not None
+
+    def get_device_info(self) -> Dict[str, Any]:
+        if not self.is_available():
+            return {"available": False}
+        import numba
+        return {
+            "available": True,
+            "name": platform.processor() or platform.machine(),
+            "type": "NumbaCPU",
+            "threads": numba.get_num_threads(),
+            "numba_version": numba.__version__,
+        }
+
+    @staticmethod
+    def _supported_dtype(array: np.ndarray) -> bool:
+        return array.dtype in (np.float32, np.float64)
+
+    def _verify(self, name: str, dtype: np.dtype, run, reference) -> None:
+        """首次调用时比对内核与参考实现；不一致时停用该内核"""
+        key = (name, np.dtype(dtype).str)
+        state = self._verified.get(key)
+        if state is None:
+            rng = np.random.default_rng(0)
+            # 取实际输入值域（透射率 1e-3~1.2）：钳到 1e-10 的样本经反相后可达 1e18 量级，
+            # float32 参考实现的舍入在该量级超出容差，会误停用正确的内核
+            sample = (rng.random((8, 16, 3)) * 1.2 + 1e-3).astype(dtype)
+            got = np.asarray(run(sample), dtype=np.float64)
+            expected = np.asarray(reference(sample), dtype=np.float64)
+            rtol = self._CHECK_RTOL.get(np.dtype(dtype), 1e-5)
+            state = bool(np.allclose(got, expected, rtol=rtol, atol=rtol))
+            self._verified[key] = state
+            if state:
+                debug(f"Numba内核 {name}[{key[1]}] 与NumPy参考实现一致", "GPU")
+            else:
+                error(f"Numba内核 {name}[{key[1]}] 与NumPy参考实现不一致，已停用", "GPU")
+        if not state:
+            raise RuntimeError(f"Numba内核 {name} 未通过一致性校验")
+
+    @classmethod
+    def _reference_math_ops(cls):
+        """一致性校验使用的 NumPy 参考实现（不带加速器，进程内只创建一次）"""
+        if cls._reference_ops is None:
+            from .math_ops import FilmMathOps
+            math_ops = FilmMathOps()
+            math_ops.gpu_accelerator = None
+            cls._reference_ops = math_ops
+        return cls._reference_ops
+
+    def _launch(self, name: str, *args) -> None:
+        """启动内核：拿到并行锁时用 prange 并行版本，否则（其他线程正在并行执行）用串行版本
+
+        全精度分块导出在线程池中并发处理 tile，若各线程同时启动并行区域，
+        workqueue 线程层会 abort（TBB 层则可能在退出时挂起）。拿不到锁时不等待，
+        直接在当前线程串行计算，tile 之间的并发仍然保留。
+        """
+        if self._parallel_lock.acquire(blocking=False):
+            try:
+                getattr(self._kernels, name)(*args)
+            finally:
+                self._parallel_lock.release()
+        else:
+            getattr(self._kernels, name + "_serial")(*args)
+
+    def _density_inversion(self, image: np.ndarray, gamma: float, dmax: float,
+                           pivot: float, invert: bool) -> np.ndarray:
+        src = np.ascontiguousarray(image)
+        out = np.empty_like(src)
+        self._launch("density_inversion_kernel", src.reshape(-1), out.reshape(-1),
+                     float(gamma), float(dmax), float(pivot), bool(invert))
+        return out
+
+    def density_inversion_gpu(self, image: np.ndarray, gamma: float,
+                             dmax: float, pivot: float, invert: bool = True) -> np.ndarray:
+        if not self.is_available():
+            raise RuntimeError("Numba不可用")
+        if not self._supported_dtype(image):
+            image = image.astype(np.float32)
+        self._verify(
+            "density_inversion", image.dtype,
+            lambda a: self._density_inversion(a, gamma, dmax, pivot, invert),
+            lambda a: self._reference_math_ops().density_inversion(
+                a, gamma, dmax, pivot, invert, use_optimization=False, use_parallel=False, use_gpu=False),
+        )
+        return self._density_inversion(image, gamma, dmax, pivot, invert)
+
+    def _curve_lut(self, density_array: np.ndarray, lut: np.ndarray) -> np.ndarray:
+        src = np.ascontiguousarray(density_array)
+        out = np.empty_like(src)
+        self._launch("curve_lut_kernel", src.reshape(-1), out.reshape(-1),
+                     np.ascontiguousarray(lut, dtype=np.float64), 1.0 / 6.5536)
+        return out
+
+    def curve_processing_gpu(self, density_array: np.ndarray,
+                           lut: np.ndarray) -> np.ndarray:
+        if not self.is_available():
+            raise RuntimeError("Numba不可用")
+        if not self._supported_dtype(density_array):
+            density_array = density_array.astype(np.float32)
+        check_lut = np.linspace(1.0, 0.0, 257) ** 2.2
+
+        def reference(a):
+            normalized = 1.0 - np.clip(a * (1.0 / 6.5536), 0.0, 1.0)
+            xp = np.linspace(0.0, 1.0, len(check_lut), dtype=np.float64)
+            return np.interp(normalized.ravel(), xp, check_lut).reshape(a.shape)
+
+        self._verify("curve_lut", density_array.dtype,
+                     lambda a: self._curve_lut(a * 6.0, check_lut), lambda a: reference(a * 6.0))
+        return self._curve_lut(density_array, lut)
+
+    def _density_pipeline(self, image: np.ndarray, gamma: float, dmax: float, pivot: float,
+                          invert: bool, matrix: Optional[np.ndarray], matrix_pivot: float,
+                          channel_gamma_r: float, channel_gamma_b: float,
+                          rgb_gains: Optional[Tuple[float, float, float]],
+                          to_linear: bool, glare: float,
+                          input_range: Optional[Tuple[float, float]]) -> np.ndarray:
+        out = np.empty(image.shape, dtype=image.dtype)
+        lo, hi = input_range if input_range is not None else (1e-10, np.inf)
+        use_matrix = matrix is not None
+        matrix_arr = np.ascontiguousarray(matrix if use_matrix else np.eye(3), dtype=np.float64)
+        channel_gamma = np.array([channel_gamma_r, 1.0, channel_gamma_b], dtype=np.float64)
+        gains = np.zeros(3, dtype=np.float64)
+        if rgb_gains:
+            gains[:min(3, len(rgb_gains))] = rgb_gains[:3]
+        self._launch(
+            "density_pipeline_kernel", image, out, float(gamma), float(dmax), float(pivot), bool(invert),
+            float(lo), float(hi), use_matrix, matrix_arr, float(matrix_pivot), channel_gamma,
+            gains, bool(to_linear), float(glare)
+        )
+        return out
+
+    def density_pipeline_gpu(self, image: np.ndarray, gamma: float, dmax: float, pivot: float,
+                             invert: bool = True, matrix: Optional[np.ndarray] = None,
+                             matrix_pivot: float = 4.8 - 0.7,
+                             channel_gamma_r: float = 1.0, channel_gamma_b: float = 1.0,
+                             rgb_gains: Optional[Tuple[float, float, float]] = None,
+                             to_linear: bool = False, glare: float = 0.0,
+                             input_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """融合的密度管线（FilmMathOps.apply_full_math_pipeline 的步骤 1-4，可选转线性）
+
+        Args:
+            image: [H, W, 3] 线性图像（float32/float64，可为非连续视图）
+            matrix: 密度校正矩阵，None 表示跳过矩阵与分层反差
+            rgb_gains: RGB 增益，None 表示不调整
+            to_linear: True 时输出 clip(10**-d, 0, 1)（减去 glare），否则输出密度
+            input_range: 输入值裁切范围，None 表示只有 1e-10 下限（与直接计算一致）
+
+        Returns:
+            与输入同类型的数组
+        """
+        if not self.is_available():
+            raise RuntimeError("Numba不可用")
+        if image.ndim != 3 or image.shape[2] != 3 or not self._supported_dtype(image):
+            raise ValueError(f"Numba密度管线只支持 float32/float64 的 [H, W, 3] 数组: {image.shape} {image.dtype}")
+
+        check_matrix = np.array([[1.05, -0.03, -0.02], [-0.04, 1.08, -0.04], [0.01, -0.06, 1.05]])
+
+        def reference(a):
+            math_ops = self._reference_math_ops()
+            result = math_ops.density_inversion(a, 1.3, 2.2, pivot, invert,
+                                                use_optimization=False, use_parallel=False, use_gpu=False)
+            density = math_ops.linear_to_density(result, use_parallel=False)
+            density = math_ops.apply_density_matrix(density, check_matrix, 2.2,
+                                                    channel_gamma_r=0.9, channel_gamma_b=1.1, use_parallel=False)
+            density = math_ops.apply_rgb_gains(density, (0.1, -0.05, 0.02))
+            linear = math_ops.density_to_linear(density, use_parallel=False)
+            return np.maximum(0.0, linear - 0.01)
+
+        self._verify(
+            "density_pipeline", image.dtype,
+            lambda a: self._density_pipeline(a, 1.3, 2.2, pivot, invert, check_matrix, 4.8 - 0.7,
+                                             0.9, 1.1, (0.1, -0.05, 0.02), True, 0.01, None),
+            reference,
+        )
+        return self._density_pipeline(image, gamma, dmax, pivot, invert, matrix, matrix_pivot,
+                                      channel_gamma_r, channel_gamma_b, rgb_gains, to_linear, glare,
+                                      input_range)
+
+
 class GPUAccelerator:
     """GPU加速器 - 统一的GPU加速接口"""
     
@@ -767,13 +1059,12 @@ class GPUAccelerator:
         """初始化所有可用的计算引擎"""
         import os
         
-        # 检查是否禁用GPU加速
+        # 检查是否禁用GPU加速（Numba CPU引擎不受影响）
         if os.environ.get('DIVERE_DISABLE_GPU', '').lower() in ('1', 'true', 'yes'):
             info("检测到DIVERE_DISABLE_GPU环境变量，禁用GPU加速", "GPU")
-            return
-        
+            engines_to_try = []
         # 根据平台调整引擎优先级
-        if platform.system() == 'Windows':
+        elif platform.system() == 'Windows':
             # Windows: CUDA > OpenCL > Metal（Metal在Windows上不可用）
             engines_to_try = [
                 ("CUDA", CUDAEngine),
@@ -798,13 +1089,39 @@ class GPUAccelerator:
             ]
             info("Linux平台：优先尝试OpenCL，然后CUDA", "GPU")
         
+        # 没有GPU时的首选回退：Numba CPU引擎（排在所有GPU引擎之后）
+        engines_to_try.append(("NumbaCPU", NumbaCPUEngine))
+        
         info("开始初始化GPU引擎", "GPU")
         
+        # 探测缓存：已知不可用的引擎直接跳过，OpenCL 复用上次选中的设备与内核二进制
+        from .gpu_probe_cache import get_probe_cache
+        probe_cache = get_probe_cache()
+        
         for name, engine_class in engines_to_try:
+            # Numba CPU引擎探测很廉价（只检查是否已安装），不写入探测缓存
+            engine_cache = probe_cache if engine_class is not NumbaCPUEngine else None
+            record = engine_cache.get_engine(name) if engine_cache is not None else None
+            if record is not None and not record.get("available"):
+                debug(f"{name}引擎不可用（探测缓存），跳过", "GPU")
+                continue
             try:
                 debug(f"尝试初始化{name}引擎", "GPU")
-                engine = engine_class()
-                if engine.is_available():
+                if engine_class is OpenCLEngine:
+                    engine = engine_class(probe_cache=probe_cache, cached_record=record)
+                else:
+                    engine = engine_class()
+                available = engine.is_available()
+                if engine_cache is not None:
+                    if available:
+                        details = engine.probe_details() if hasattr(engine, 'probe_details') else {}
+                        engine_cache.set_engine(name, True, device_info=engine.get_device_info(), **details)
+                    elif record is not None:
+                        # 缓存记录为可用但本次初始化失败：丢弃记录，下次重新探测
+                        engine_cache.forget_engine(name)
+                    else:
+                        engine_cache.set_engine(name, False)
+                if available:
                     self.engines.append((name, engine))
                     if self.active_engine is None:
                         self.active_engine = engine
@@ -818,6 +1135,9 @@ class GPUAccelerator:
                 warning(f"⚠️  {name}引擎初始化失败: {e}", "GPU")
                 debug(f"{name}引擎初始化异常详情: {e}", "GPU")
         
+        if probe_cache is not None:
+            probe_cache.save()
+        
         if not self.engines:
             warning("未找到可用的GPU引擎，将使用CPU计算", "GPU")
         else:
@@ -867,6 +1187,22 @@ class GPUAccelerator:
             debug(f"GPU失败详情: {e}", "GPU")
             return self._density_inversion_cpu(image, gamma, dmax, pivot, invert)
     
+    def density_pipeline_accelerated(self, image: np.ndarray, gamma: float, dmax: float,
+                                     pivot: float, invert: bool = True, **kwargs) -> Optional[np.ndarray]:
+        """融合的密度管线（见 NumbaCPUEngine.density_pipeline_gpu）
+
+        Returns:
+            结果数组；当前引擎不支持或执行失败时返回 None，调用方走逐步的 NumPy 实现
+        """
+        engine = self.active_engine
+        if engine is None or not hasattr(engine, 'density_pipeline_gpu'):
+            return None
+        try:
+            return engine.density_pipeline_gpu(image, gamma, dmax, pivot, invert, **kwargs)
+        except Exception as e:
+            error(f"融合密度管线失败，回退到NumPy: {e}", "GPU")
+            return None
+    
     def curve_processing_accelerated(self, density_array: np.ndarray, 
                                    lut: np.ndarray) -> np.ndarray:
         """GPU加速的曲线处理，自动回退到CPU"""
@@ -0,0 +1,277 @@
+"""
+GPU 探测缓存 - 持久化 GPU 引擎探测结果与已编译的内核二进制
+
+每次启动（以及每个预览 worker 进程）初始化 GPUAccelerator 时都要枚举平台/设备、
+创建上下文并编译内核，耗时可达数百毫秒到数秒。本模块把探测结果写入用户配置目录：
+
+- 引擎探测结果：每个引擎是否可用、选中的设备与设备信息。已知不可用的引擎直接跳过，
+  已知可用的 OpenCL 引擎直接定位到上次选中的设备，不再遍历全部平台
+- 内核二进制：OpenCL 程序编译后的二进制按 设备 + 驱动版本 + 内核源码 哈希保存，
+  之后直接从二进制构建，跳过源码编译
+
+缓存以指纹为键：操作系统版本、Python 版本、GPU 库版本（pyopencl/cupy/pyobjc）与
+可廉价获取的驱动信息。指纹变化时整个缓存作废；驱动升级但指纹未变时，
+可运行 python -m divere --clear-gpu-cache 手动清除。
+"""
+
+import hashlib
+import json
+import os
+import platform
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.debug_logger import debug, info, warning
+
+# 缓存格式版本：结构变化时递增，旧缓存自动作废
+_CACHE_FORMAT = 1
+_PROBE_FILE = "gpu_probe.json"
+_KERNEL_DIR = "opencl_kernels"
+
+_lock = threading.Lock()
+
+
+def _cache_dir() -> Path:
+    """缓存目录：<用户配置目录>/cache"""
+    from ..utils.enhanced_config_manager import enhanced_config_manager
+    return enhanced_config_manager.user_config_dir / "cache"
+
+
+def probe_cache_enabled() -> bool:
+    """是否启用探测缓存（配置项 ui.gpu_probe_cache，环境变量 DIVERE_NO_GPU_CACHE 可临时关闭）"""
+    if os.environ.get('DIVERE_NO_GPU_CACHE', '').lower() in ('1', 'true', 'yes'):
+        return False
+    try:
+        from ..utils.enhanced_config_manager import enhanced_config_manager
+        return bool(enhanced_config_manager.get_ui_setting("gpu_probe_cache", True))
+    except Exception:
+        return True
+
+
+def _module_version(name: str) -> Optional[str]:
+    """已导入模块的版本号（未导入时不主动导入）"""
+    module = sys.modules.get(name)
+    if module is None:
+        return None
+    version = getattr(module, 'VERSION_TEXT', None) or getattr(module, '__version__', None)
+    return str(version) if version is not None else "unknown"
+
+
+def _driver_hint() -> Dict[str, Any]:
+    """不需要创建设备即可获取的驱动信息"""
+    hint: Dict[str, Any] = {}
+    # Linux 的 OpenCL ICD 注册表：安装/卸载驱动时会变化
+    vendors = Path("/etc/OpenCL/vendors")
+    if platform.system() == 'Linux' and vendors.is_dir():
+        try:
+            hint["opencl_icd"] = sorted(
+                f"{p.name}:{int(p.stat().st_mtime)}" for p in vendors.glob("*.icd")
+            )
+        except OSError:
+            pass
+    cupy = sys.modules.get('cupy')
+    if cupy is not None:
+        try:
+            hint["cuda_driver"] = int(cupy.cuda.runtime.driverGetVersion())
+        except Exception:
+            pass
+    return hint
+
+
+def compute_fingerprint() -> str:
+    """当前环境的缓存指纹"""
+    payload = {
+        "format": _CACHE_FORMAT,
+        "os": [platform.system(), platform.release(), platform.machine()],
+        "python": platform.python_version(),
+        "pyopencl": _module_version('pyopencl'),
+        "cupy": _module_version('cupy'),
+        "pyobjc": _module_version('objc'),
+        "driver": _driver_hint(),
+    }
+    blob = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(blob).hexdigest()
+
+
+class GPUProbeCache:
+    """引擎探测结果缓存（JSON，写入时原子替换，多个进程并发写入也不会损坏）"""
+
+    def __init__(self, directory: Optional[Path] = None, preloaded: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            directory: 缓存目录，默认 <用户配置目录>/cache
+            preloaded: 主进程导出的探测结果（见 export_probe_data）；提供时不读取也不写回 gpu_probe.json
+        """
+        self.directory = Path(directory) if directory is not None else _cache_dir()
+        self._engines: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._persist = preloaded is None
+        if preloaded is not None:
+            self.fingerprint = preloaded.get("fingerprint")
+            self._engines = dict(preloaded.get("engines") or {})
+            return
+        self.fingerprint = compute_fingerprint()
+        self._load()
+
+    @property
+    def probe_file(self) -> Path:
+        return self.directory / _PROBE_FILE
+
+    @property
+    def kernel_dir(self) -> Path:
+        return self.directory / _KERNEL_DIR
+
+    def _load(self) -> None:
+        try:
+            with open(self.probe_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            warning(f"GPU探测缓存读取失败，将重新探测: {e}", "GPU")
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            debug("GPU探测缓存指纹不匹配（库或驱动已变化），将重新探测", "GPU")
+            return
+        engines = data.get("engines")
+        if isinstance(engines, dict):
+            self._engines = engines
+            debug(f"已加载GPU探测缓存: {sorted(engines)}", "GPU")
+
+    def get_engine(self, name: str) -> Optional[Dict[str, Any]]:
+        """引擎的缓存记录；None 表示尚未探测"""
+        return self._engines.get(name)
+
+    def set_engine(self, name: str, available: bool, **details: Any) -> None:
+        """记录引擎探测结果（details 须可 JSON 序列化）"""
+        record = {"available": bool(available)}
+        record.update(details)
+        if self._engines.get(name) != record:
+            self._engines[name] = record
+            self._dirty = True
+
+    def forget_engine(self, name: str) -> None:
+        """缓存记录与实际不符（如设备已拔除）时删除该记录"""
+        if self._engines.pop(name, None) is not None:
+            self._dirty = True
+
+    def export(self) -> Dict[str, Any]:
+        """探测结果的副本（可序列化，随配置快照传给 worker）"""
+        return {"fingerprint": self.fingerprint, "engines": json.loads(json.dumps(self._engines, default=str))}
+
+    def save(self) -> None:
+        if not self._dirty or not self._persist:
+            return
+        data = {"fingerprint": self.fingerprint, "engines": self._engines}
+        with _lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self.probe_file.with_name(f"{_PROBE_FILE}.{os.getpid()}.tmp")
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                os.replace(tmp, self.probe_file)
+                self._dirty = False
+            except Exception as e:
+                warning(f"GPU探测缓存写入失败: {e}", "GPU")
+
+    # ---- OpenCL 内核二进制 ----
+
+    def _kernel_path(self, key: str) -> Path:
+        return self.kernel_dir / f"{key}.bin"
+
+    @staticmethod
+    def kernel_key(source: str, device_identity: str) -> str:
+        """内核二进制键：内核源码 + 设备/驱动标识"""
+        digest = hashlib.sha1()
+        digest.update(source.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(device_identity.encode('utf-8'))
+        return digest.hexdigest()
+
+    def load_kernel_binary(self, key: str) -> Optional[bytes]:
+        try:
+            return self._kernel_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            warning(f"读取OpenCL内核缓存失败: {e}", "GPU")
+            return None
+
+    def store_kernel_binary(self, key: str, binary: bytes) -> None:
+        if not binary:
+            return
+        with _lock:
+            try:
+                self.kernel_dir.mkdir(parents=True, exist_ok=True)
+                path = self._kernel_path(key)
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(binary)
+                os.replace(tmp, path)
+            except Exception as e:
+                warning(f"写入OpenCL内核缓存失败: {e}", "GPU")
+
+    def discard_kernel_binary(self, key: str) -> None:
+        try:
+            self._kernel_path(key).unlink()
+        except OSError:
+            pass
+
+
+_probe_cache: Optional[GPUProbeCache] = None
+
+
+def get_probe_cache() -> Optional[GPUProbeCache]:
+    """全局探测缓存；禁用或缓存目录不可用时返回 None"""
+    global _probe_cache
+    if not probe_cache_enabled():
+        return None
+    if _probe_cache is None:
+        try:
+            _probe_cache = GPUProbeCache()
+        except Exception as e:
+            warning(f"GPU探测缓存不可用: {e}", "GPU")
+            return None
+    return _probe_cache
+
+
+def export_probe_data() -> Optional[Dict[str, Any]]:
+    """当前进程的探测结果（供配置快照使用）；缓存禁用或不可用时返回 None"""
+    cache = get_probe_cache()
+    return cache.export() if cache is not None else None
+
+
+def install_probe_data(data: Dict[str, Any]) -> None:
+    """worker 中安装主进程导出的探测结果：之后 get_probe_cache() 不再读写 gpu_probe.json"""
+    global _probe_cache
+    _probe_cache = GPUProbeCache(preloaded=data)
+
+
+def clear_gpu_probe_cache(directory: Optional[Path] = None) -> int:
+    """删除探测结果与内核二进制缓存（python -m divere --clear-gpu-cache）
+
+    Args:
+        directory: 缓存目录，默认 <用户配置目录>/cache
+
+    Returns:
+        删除的文件数
+    """
+    global _probe_cache
+    base = Path(directory) if directory is not None else _cache_dir()
+    removed = 0
+    targets = [base / _PROBE_FILE]
+    kernel_dir = base / _KERNEL_DIR
+    if kernel_dir.is_dir():
+        targets.extend(kernel_dir.iterdir())
+    for path in targets:
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            warning(f"无法删除GPU缓存文件 {path}: {e}", "GPU")
+    _probe_cache = None
+    info(f"已清除GPU探测缓存（{removed}个文件）", "GPU")
+    return removed
@@ -11,11 +11,11 @@ from collections import OrderedDict
 import numpy as np
 import cv2
 from PIL import Image
-import imageio
-import tifffile
 
 from .data_types import ImageData
 from ..utils.app_paths import get_data_dir
+from ..utils.tracing import traced
+from ..utils.debug_logger import get_logger
 
 # 配置PIL的图像大小限制
 # 默认情况下PIL限制为178,956,970像素以防止decompression bomb攻击
@@ -24,7 +24,8 @@ from ..utils.app_paths import get_data_dir
 #PIL_MAX_PIXELS = 500_000_000  # 500M像素，足够大但仍有安全边界
 Image.MAX_IMAGE_PIXELS = None
 #print(f"[ImageManager] PIL maximum image pixels set to: {PIL_MAX_PIXELS:,} ({PIL_MAX_PIXELS/1_000_000:.1f}M pixels)")
-print(f"[ImageManager] PIL maximum image pixels set to: Infinite pixels)")
+_log = get_logger("ImageManager")
+_log.debug("PIL maximum image pixels set to: Infinite pixels)")
 
 
 class ImageManager:
@@ -158,6 +159,7 @@ class ImageManager:
         Raises:
             Exception: 加载失败时抛出，供 fallback 捕获
         """
+        import tifffile
         with tifffile.TiffFile(file_path) as tif:
             page = tif.pages[0]
             bits_per_sample = page.bitspersample
@@ -197,16 +199,17 @@ class ImageManager:
                 # 检查是否有 alpha 通道 (值为 1 或 2)
                 if len(extrasamples) > 0 and extrasamples[0] in (1, 2):
                     alpha_type = "associated (premultiplied)" if extrasamples[0] == 1 else "unassociated (straight)"
-                    print(f"[ImageManager] 检测到 Alpha 通道 (ExtraSamples={extrasamples[0]}, {alpha_type})，已移除第4通道")
+                    _log.debug("检测到 Alpha 通道 (ExtraSamples=%s, %s)，已移除第4通道", extrasamples[0], alpha_type)
                     arr_normalized = arr_normalized[:, :, :3]  # 保留前3个通道
                 else:
-                    print(f"[ImageManager] ExtraSamples={extrasamples}，第4通道不是Alpha，保持4通道")
+                    _log.debug("ExtraSamples=%s，第4通道不是Alpha，保持4通道", extrasamples)
             else:
-                print(f"[ImageManager] ⚠️  4通道TIFF但无ExtraSamples标签，假定第4通道为Alpha并移除")
+                _log.warning("⚠️  4通道TIFF但无ExtraSamples标签，假定第4通道为Alpha并移除")
                 arr_normalized = arr_normalized[:, :, :3]
 
         return arr_normalized, bits
 
+    @traced("image.load", cat="io")
     def load_image(self, file_path: str) -> ImageData:
         """加载图像文件"""
         file_path = Path(file_path)
@@ -220,7 +223,7 @@ class ImageManager:
             tifffile_error = None
             try:
                 image, bits_per_sample = self._load_with_tifffile(file_path)
-                print(f"[ImageManager] 使用 tifffile 主路径加载: {file_path.name}")
+                _log.debug("使用 tifffile 主路径加载: %s", file_path.name)
 
                 # 灰度转为单通道形状 (H,W,1)
                 if image.ndim == 2:
@@ -247,23 +250,25 @@ class ImageManager:
                 # 输出加载成功的信息
                 h, w = image.shape[:2]
                 total_pixels = h * w
-                print(f"[ImageManager] Successfully loaded via tifffile: {file_path.name}")
-                print(f"[ImageManager]   Size: {w}x{h} ({total_pixels:,} pixels = {total_pixels/1_000_000:.1f}M)")
-                print(f"[ImageManager]   Channels: {original_channels}, Monochrome: {is_monochrome_source}")
-                print(f"[ImageManager]   Data range: [{image.min():.4f}, {image.max():.4f}]")
+                _log.debug("Successfully loaded via tifffile: %s", file_path.name)
+                _log.debug(lambda: f"  Size: {w}x{h} ({total_pixels:,} pixels = {total_pixels/1_000_000:.1f}M)")
+                _log.debug("  Channels: %s, Monochrome: %s", original_channels, is_monochrome_source)
+                # 整幅 min/max 要遍历全部像素，只在 DEBUG 级别计算
+                if _log.debug_enabled:
+                    _log.debug("  Data range: [%.4f, %.4f]", image.min(), image.max())
 
                 return image_data
 
             except Exception as e:
                 tifffile_error = e
-                print(f"[ImageManager] tifffile 加载失败，fallback 到 PIL: {type(e).__name__}: {str(e)[:200]}")
+                _log.warning("tifffile 加载失败，fallback 到 PIL: %s: %s", type(e).__name__, str(e)[:200])
 
             # Fallback 路径：PIL（保留原有逻辑 + 加强校验）
             try:
-                print(f"[ImageManager] 尝试使用 PIL fallback 加载: {file_path.name}")
+                _log.debug("尝试使用 PIL fallback 加载: %s", file_path.name)
                 pil_image = Image.open(file_path)
                 mode = pil_image.mode  # 例如: 'RGB', 'RGBA', 'CMYK', 'I;16', 'F', 'LA' 等
-                print(f"[ImageManager]: 图片已加载{mode}")
+                _log.debug("图片已加载%s", mode)
                 bands = pil_image.getbands()  # 例如: ('R','G','B','A') 或 ('A','R','G','B') 或 ('C','M','Y','K')
 
                 # 若为CMYK或其它非RGB空间，先转换到RGB
@@ -295,7 +300,7 @@ class ImageManager:
 
                 # 处理4通道的通道顺序：基于PIL bands元数据确定性识别Alpha
                 if image.ndim == 3 and image.shape[2] == 4:
-                    print(f"[ImageManager] 检测到4通道TIFF: {file_path.name}, mode={mode}, bands={bands}")
+                    _log.debug("检测到4通道TIFF: %s, mode=%s, bands=%s", file_path.name, mode, bands)
 
                     # 使用PIL的bands元数据确定性识别并移除Alpha通道
                     if bands is not None and 'A' in list(bands):
@@ -304,10 +309,10 @@ class ImageManager:
                         # 移除Alpha通道，保留其他通道
                         rgb_indices = [i for i in range(4) if i != alpha_idx]
                         image = image[..., rgb_indices]
-                        print(f"[ImageManager] 检测到Alpha通道(bands index={alpha_idx})，已确定性移除。当前shape={image.shape}")
+                        _log.debug("检测到Alpha通道(bands index=%s)，已确定性移除。当前shape=%s", alpha_idx, image.shape)
                     else:
                         # 无bands元数据或不包含'A'，假定第4通道为Alpha并移除
-                        print(f"[ImageManager] ⚠️  4通道但bands={bands}，假定第4通道为Alpha并移除")
+                        _log.warning("⚠️  4通道但bands=%s，假定第4通道为Alpha并移除", bands)
                         image = image[:, :, :3]
 
                 # 检测单/双通道图像并标记
@@ -327,37 +332,37 @@ class ImageManager:
                 return image_data
             except Exception as e:
                 # 回退到OpenCV路径
-                print(f"[ImageManager] PIL TIFF loading failed, falling back to OpenCV: {type(e).__name__}: {str(e)[:200]}")
+                _log.warning("PIL TIFF loading failed, falling back to OpenCV: %s: %s", type(e).__name__, str(e)[:200])
                 pass
         
         # 尝试使用OpenCV加载（非TIFF优先走此分支）
         opencv_error = None
         try:
-            print(f"[ImageManager] Attempting to load image with OpenCV: {file_path.name}")
+            _log.debug("Attempting to load image with OpenCV: %s", file_path.name)
             image = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
             if image is None:
                 raise ValueError("OpenCV无法加载图像")
-            print(f"[ImageManager] OpenCV successfully loaded image: {image.shape}, dtype={image.dtype}")
+            _log.debug("OpenCV successfully loaded image: %s, dtype=%s", image.shape, image.dtype)
 
             # PNG 严格校验 dtype（防止意外降采样）
             if ext == ".png":
                 if image.dtype == np.uint8:
-                    print(f"[ImageManager] PNG 加载为 8-bit: {file_path.name}")
+                    _log.debug("PNG 加载为 8-bit: %s", file_path.name)
                 elif image.dtype == np.uint16:
-                    print(f"[ImageManager] PNG 加载为 16-bit: {file_path.name}")
+                    _log.debug("PNG 加载为 16-bit: %s", file_path.name)
                 else:
-                    print(f"[ImageManager] ⚠️  PNG 加载为非预期 dtype: {image.dtype}")
+                    _log.warning("⚠️  PNG 加载为非预期 dtype: %s", image.dtype)
             
             # OpenCV使用BGR(A)格式，转换为RGB(A)
             if len(image.shape) == 3:
                 if image.shape[2] == 3:
                     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
                 elif image.shape[2] == 4:
-                    print(f"[ImageManager] 检测到4通道图像(BGRA→RGBA): {file_path.name}")
+                    _log.debug("检测到4通道图像(BGRA→RGBA): %s", file_path.name)
                     image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
                     # OpenCV不提供元数据，假定第4通道为Alpha并移除
                     # 注意：这无法区分RGBA和RGB+IR，若需保留IR通道请使用TIFF格式
-                    print(f"[ImageManager] ⚠️  OpenCV无元数据，假定第4通道为Alpha并移除（若为RGB+IR请使用TIFF格式）")
+                    _log.warning("⚠️  OpenCV无元数据，假定第4通道为Alpha并移除（若为RGB+IR请使用TIFF格式）")
                     image = image[:, :, :3]
             
             # 转换为float32并归一化到[0,1]（使用精确的元数据驱动归一化）
@@ -379,13 +384,13 @@ class ImageManager:
         except Exception as e:
             # 如果OpenCV失败，尝试使用PIL
             opencv_error = e
-            print(f"[ImageManager] OpenCV loading failed: {type(e).__name__}: {str(e)[:200]}")
+            _log.warning("OpenCV loading failed: %s: %s", type(e).__name__, str(e)[:200])
             max_pixels_str = f"{Image.MAX_IMAGE_PIXELS:,}" if Image.MAX_IMAGE_PIXELS else "Unlimited"
-            print(f"[ImageManager] Attempting to load image with PIL (MAX_IMAGE_PIXELS={max_pixels_str})")
+            _log.debug("Attempting to load image with PIL (MAX_IMAGE_PIXELS=%s)", max_pixels_str)
             try:
                 pil_image = Image.open(file_path)
                 original_mode = pil_image.mode
-                print(f"[ImageManager] PIL successfully opened image: size={pil_image.size}, mode={original_mode}")
+                _log.debug("PIL successfully opened image: size=%s, mode=%s", pil_image.size, original_mode)
                 image = np.array(pil_image)
 
                 # 从 PIL mode 推断 bit depth
@@ -421,7 +426,7 @@ class ImageManager:
                     error_msg += f"  2. 检查图像文件是否损坏\n"
                     error_msg += f"  3. 如果是Windows系统，可能需要更新OpenCV版本\n"
 
-                print(f"[ImageManager] FATAL: {error_msg}")
+                _log.error("FATAL: %s", error_msg)
                 raise RuntimeError(error_msg)
         
         # 检测单/双通道图像并标记
@@ -446,13 +451,16 @@ class ImageManager:
         # 输出加载成功的信息
         h, w = image.shape[:2]
         total_pixels = h * w
-        print(f"[ImageManager] Successfully loaded image: {file_path.name}")
-        print(f"[ImageManager]   Size: {w}x{h} ({total_pixels:,} pixels = {total_pixels/1_000_000:.1f}M)")
-        print(f"[ImageManager]   Channels: {original_channels}, Monochrome: {is_monochrome_source}")
-        print(f"[ImageManager]   Data range: [{image.min():.4f}, {image.max():.4f}]")
+        _log.debug("Successfully loaded image: %s", file_path.name)
+        _log.debug(lambda: f"  Size: {w}x{h} ({total_pixels:,} pixels = {total_pixels/1_000_000:.1f}M)")
+        _log.debug("  Channels: %s, Monochrome: %s", original_channels, is_monochrome_source)
+        # 整幅 min/max 要遍历全部像素，只在 DEBUG 级别计算
+        if _log.debug_enabled:
+            _log.debug("  Data range: [%.4f, %.4f]", image.min(), image.max())
 
         return image_data
     
+    @traced("image.proxy", cat="io")
     def generate_proxy(self, image: ImageData, max_size: Tuple[int, int] = (2000, 2000)) -> ImageData:
         """生成代理图像"""
         # 移除这个检查，允许对代理图像进行进一步缩放
@@ -465,18 +473,18 @@ class ImageManager:
             if image.array.ndim == 2:
                 # 2D灰度图像 → 3通道
                 source_array = np.stack([image.array, image.array, image.array], axis=2)
-                print(f"[ImageManager] 单通道图像转换为3通道代理: {image.array.shape} → {source_array.shape}")
+                _log.debug("单通道图像转换为3通道代理: %s → %s", image.array.shape, source_array.shape)
             elif image.array.ndim == 3 and image.original_channels == 1:
                 # 3D单通道 → 3通道（复制）
                 gray_channel = image.array[:, :, 0]
                 source_array = np.stack([gray_channel, gray_channel, gray_channel], axis=2)
-                print(f"[ImageManager] 单通道图像转换为3通道代理: {image.array.shape} → {source_array.shape}")
+                _log.debug("单通道图像转换为3通道代理: %s → %s", image.array.shape, source_array.shape)
             elif image.array.ndim == 3 and image.original_channels == 2:
                 # 双通道（L+IR）→ 4通道（L,L,L,IR）
                 gray_channel = image.array[:, :, 0]
                 ir_channel = image.array[:, :, 1]
                 source_array = np.stack([gray_channel, gray_channel, gray_channel, ir_channel], axis=2)
-                print(f"[ImageManager] 双通道图像转换为4通道代理: {image.array.shape} → {source_array.shape}")
+                _log.debug("双通道图像转换为4通道代理: %s → %s", image.array.shape, source_array.shape)
         
         # 计算缩放比例
         h, w = source_array.shape[:2]
@@ -497,12 +505,16 @@ class ImageManager:
             # 检查是不是C_contiguous，可以尽可能优化
             if not source_array.flags['C_CONTIGUOUS']:
                 source_array = np.ascontiguousarray(source_array)
+            # OpenCV 的 resize 不支持 float16；最近邻只复制采样值，按 uint16 位模式缩放结果完全一致
+            is_half = source_array.dtype == np.float16
             # 使用OpenCV进行高质量缩放
             proxy_array = cv2.resize(
-                source_array, 
+                source_array.view(np.uint16) if is_half else source_array,
                 (new_w, new_h), 
                 interpolation = cv2.INTER_NEAREST #INTER_LINEAR  # INTER_AREA
             )
+            if is_half:
+                proxy_array = proxy_array.view(np.float16)
         # 落到float16
         proxy_array = proxy_array.astype(np.float16, copy=False)
 
@@ -579,6 +591,7 @@ class ImageManager:
         content = f"{file_path}_{stat.st_mtime}_{stat.st_size}"
         return hashlib.md5(content.encode()).hexdigest()
     
+    @traced("image.save", cat="io")
     def save_image(self, image_data: ImageData, output_path: str, quality: int = 95, bit_depth: int = 8, export_color_space: str = None):
         """保存图像
         - 统一归一化通道形状（灰度 squeeze，JPEG 限制为3通道）
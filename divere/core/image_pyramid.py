@@ -0,0 +1,92 @@
+"""
+Image Pyramid - 原图的多分辨率金字塔（1/2、1/4、1/8）
+
+每张图加载后在后台构建一次。聚焦裁剪、调整裁剪框、切回接触印相时，
+_prepare_proxy 从最接近 proxy 分辨率（且不低于它）的级别上切片生成 proxy，
+不再裁剪复制全分辨率原图。
+
+级别 L 的图像尺寸为原图的 1/2**L，逐级隔行隔列取样，以 float16 存储
+（与 proxy 精度一致，内存约为原图 float32 的 1/6）。取样规则与
+ImageManager.generate_proxy 的 INTER_NEAREST 相同（OpenCV 缩小一半时取偶数行列），
+从金字塔生成的 proxy 与从原图直接生成的 proxy 采样一致，切换来源时预览不会跳变。
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# 最粗的级别（1/8）
+PYRAMID_MAX_LEVEL = 3
+
+
+def _resize_half(array: np.ndarray) -> np.ndarray:
+    """长宽各减半，取偶数行列（等价于 cv2.INTER_NEAREST 缩小一半），落到 float16"""
+    h, w = array.shape[:2]
+    return array[:max(1, h // 2) * 2:2, :max(1, w // 2) * 2:2].astype(np.float16)
+
+
+def build_pyramid_levels(array: np.ndarray, proxy_size: Tuple[int, int],
+                         should_continue: Optional[Callable[[], bool]] = None) -> Dict[int, np.ndarray]:
+    """构建金字塔级别
+
+    只构建对 proxy 有用的级别：级别 L 至少有一边不小于 proxy 尺寸，
+    否则任何裁剪都无法从该级别以足够分辨率生成 proxy。
+
+    Args:
+        array: 全分辨率原图数组（只读）
+        proxy_size: proxy 最大尺寸 (max_w, max_h)
+        should_continue: 每级之间调用，返回 False 时放弃构建（如已切换图片）
+
+    Returns:
+        {level: float16 数组}；放弃构建时返回空 dict
+    """
+    max_w, max_h = proxy_size
+    levels: Dict[int, np.ndarray] = {}
+    # 取样不改变数值，下一级直接从上一级的 float16 数组取样
+    current = array
+    for level in range(1, PYRAMID_MAX_LEVEL + 1):
+        h, w = current.shape[:2]
+        if w // 2 < max_w and h // 2 < max_h:
+            break
+        if should_continue is not None and not should_continue():
+            return {}
+        current = _resize_half(current)
+        levels[level] = current
+    return levels
+
+
+def select_pyramid_slice(levels: Dict[int, np.ndarray], full_size: Tuple[int, int],
+                         crop_px: Tuple[int, int, int, int],
+                         proxy_size: Tuple[int, int]) -> Optional[Tuple[int, np.ndarray]]:
+    """为裁剪区域选择最粗但仍不低于 proxy 分辨率的级别，并返回该级别上的切片
+
+    Args:
+        levels: build_pyramid_levels() 的结果
+        full_size: 原图尺寸 (width, height)
+        crop_px: 原图像素坐标下的裁剪范围 (x0, y0, x1, y1)
+        proxy_size: proxy 最大尺寸 (max_w, max_h)
+
+    Returns:
+        (level, 切片视图)；没有合适级别（裁剪区域太小，需要全分辨率）时返回 None
+    """
+    if not levels:
+        return None
+    x0, y0, x1, y1 = crop_px
+    crop_w, crop_h = x1 - x0, y1 - y0
+    max_w, max_h = proxy_size
+    scale = min(max_w / crop_w, max_h / crop_h, 1.0)
+
+    full_w, full_h = full_size
+    for level in sorted(levels, reverse=True):
+        if 2.0 ** -level < scale:
+            continue
+        array = levels[level]
+        lh, lw = array.shape[:2]
+        # 级别坐标按实际尺寸比例换算（奇数尺寸减半时会截断）
+        sx, sy = lw / full_w, lh / full_h
+        lx0 = max(0, min(lw - 1, int(round(x0 * sx))))
+        lx1 = max(lx0 + 1, min(lw, int(round(x1 * sx))))
+        ly0 = max(0, min(lh - 1, int(round(y0 * sy))))
+        ly1 = max(ly0 + 1, min(lh, int(round(y1 * sy))))
+        return level, array[ly0:ly1, lx0:lx1]
+    return None
@@ -0,0 +1,153 @@
+"""
+Input Transform - 输入端融合变换：采样值 → 归一化 → IDT gamma → 3×3 矩阵 × 白点增益
+
+原来的输入链是多次整幅遍历：归一化、apply_power、convert_to_working_space 的 copy、
+_apply_color_conversion 的 reshape/dot（float64 中间结果）/增益乘法/再 copy。
+这里按行分块一次完成，结果写入预先分配的输出缓冲区：
+
+- uint8/uint16：按整数采样值查 LUT，LUT[v] = (v / max) ** gamma（max 由 bit depth 决定）
+- float16：按位模式查 65536 项 LUT（覆盖全部输入值，LUT 在 float64 上计算）
+- float32/float64：逐块 clip + power（gamma 为 1 时不裁切）
+- 矩阵与白点增益合并为一个 3×3 矩阵：(x @ M.T) * gain == x @ (diag(gain) @ M).T
+
+每块的中间结果只有块大小，峰值内存约为输出缓冲区本身。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+# 每块的像素数（中间结果约 块像素 × 3 × 4 字节）
+INPUT_TILE_PIXELS = 1 << 16
+
+_LUT_CACHE: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_LUT_CACHE_MAX = 16
+_lut_lock = threading.Lock()
+
+
+def _cached_lut(key: tuple, build) -> np.ndarray:
+    with _lut_lock:
+        lut = _LUT_CACHE.get(key)
+        if lut is not None:
+            _LUT_CACHE.move_to_end(key)
+            return lut
+    lut = build()
+    with _lut_lock:
+        _LUT_CACHE[key] = lut
+        while len(_LUT_CACHE) > _LUT_CACHE_MAX:
+            _LUT_CACHE.popitem(last=False)
+    return lut
+
+
+def input_lut(dtype: np.dtype, gamma: float, bits_per_sample: Optional[int] = None) -> Optional[np.ndarray]:
+    """采样值 → 线性值的 float32 LUT；dtype 不支持查表时返回 None
+
+    Args:
+        dtype: 输入数组类型（uint8/uint16/float16）
+        gamma: IDT gamma（1.0 时仅归一化）
+        bits_per_sample: 整型采样的实际位数（如 12-bit 数据存放在 uint16 中），None 表示按 dtype 满量程
+    """
+    dtype = np.dtype(dtype)
+    g = round(float(gamma), 6)
+    if dtype == np.float16 and abs(g - 1.0) > 1e-6:
+        def build():
+            with np.errstate(all='ignore'):
+                xs = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float64)
+                return np.power(np.clip(np.nan_to_num(xs), 0.0, 1.0), g).astype(np.float32)
+        return _cached_lut(("half", g), build)
+    if dtype in (np.uint8, np.uint16):
+        levels = np.iinfo(dtype).max + 1
+        max_val = float((1 << bits_per_sample) - 1) if bits_per_sample else float(levels - 1)
+
+        def build():
+            xs = np.arange(levels, dtype=np.float64) / max_val
+            return np.power(np.clip(xs, 0.0, 1.0), g).astype(np.float32)
+        return _cached_lut((dtype.str, max_val, g), build)
+    return None
+
+
+def _linearize_tile(tile: np.ndarray, gamma: float, lut: Optional[np.ndarray]) -> np.ndarray:
+    """一块输入 → float32 线性值（新数组，可原地修改）
+
+    gamma 为 1 的浮点输入不裁切（与跳过 apply_power 的逐步变换一致）。
+    """
+    if lut is not None:
+        index = tile.view(np.uint16) if tile.dtype == np.float16 else tile
+        return np.take(lut, index)
+    if abs(gamma - 1.0) <= 1e-6:
+        return tile.astype(np.float32)
+    linear = np.clip(tile, 0.0, 1.0).astype(np.float32, copy=False)
+    np.power(linear, np.float32(gamma), out=linear)
+    return linear
+
+
+def apply_input_transform(array: np.ndarray, gamma: float = 1.0, matrix: Optional[np.ndarray] = None,
+                          gain: Optional[np.ndarray] = None, out: Optional[np.ndarray] = None,
+                          out_dtype=np.float32, bits_per_sample: Optional[int] = None) -> Optional[np.ndarray]:
+    """融合输入变换：归一化 + IDT gamma + 3×3 矩阵 + 白点增益，一次分块遍历
+
+    语义与 apply_power（clip 到 [0,1] 后取幂，只作用于前 3 通道）
+    + ColorSpaceManager._apply_color_conversion 一致：
+    单通道图像按 R=G=B 变换后取绿色通道，超过 3 个通道时其余通道原样保留。
+
+    Args:
+        array: [H,W] 或 [H,W,C] 输入（uint8/uint16 原始采样、float16 proxy 或 float32），可为非连续视图
+        gamma: IDT gamma
+        matrix: 3×3 色彩空间转换矩阵，None 表示不转换
+        gain: 白点增益向量 (3,)，None 表示 1
+        out: 预分配的输出缓冲区（形状与 array 相同），None 时按 out_dtype 分配
+        out_dtype: 未提供 out 时输出数组的类型
+        bits_per_sample: 整型输入的实际位数
+
+    Returns:
+        变换结果；通道数为 2 等不支持的布局返回 None（调用方回退到逐步变换）
+    """
+    squeeze = array.ndim == 2
+    src = array[..., np.newaxis] if squeeze else array
+    if src.ndim != 3 or src.shape[2] == 2:
+        return None
+    if np.issubdtype(src.dtype, np.integer) and src.dtype not in (np.uint8, np.uint16):
+        return None
+    h, w, c = src.shape
+
+    if matrix is None and gain is None:
+        fused = None
+    else:
+        fused = np.eye(3) if matrix is None else np.asarray(matrix, dtype=np.float64)
+        if gain is not None:
+            fused = np.asarray(gain, dtype=np.float64).reshape(3, 1) * fused
+    if c == 1 and fused is not None:
+        # R=G=B 输入经矩阵后的绿色通道 = 值 × 第 2 行之和
+        fused = np.array([[fused[1].sum()]])
+    fused_t = None if fused is None else fused.T.astype(np.float32)
+
+    if out is None:
+        out = np.empty(array.shape, dtype=out_dtype)
+    dst = out[..., np.newaxis] if squeeze else out
+    if dst.shape != src.shape:
+        raise ValueError(f"输出缓冲区形状不匹配: {dst.shape} != {src.shape}")
+
+    lut = input_lut(src.dtype, gamma, bits_per_sample)
+    # 整型输入的额外通道（如非 Alpha 的第 4 通道）只做归一化
+    extra_scale = None
+    if c > 3 and np.issubdtype(src.dtype, np.integer):
+        extra_scale = 1.0 / float((1 << bits_per_sample) - 1 if bits_per_sample else np.iinfo(src.dtype).max)
+    k = min(c, 3)
+    rows = max(1, INPUT_TILE_PIXELS // max(1, w))
+    for r0 in range(0, h, rows):
+        r1 = min(h, r0 + rows)
+        linear = _linearize_tile(src[r0:r1, :, :k], gamma, lut)
+        if fused_t is not None:
+            if k == 1:
+                linear *= fused_t[0, 0]
+            else:
+                linear = np.matmul(linear.reshape(-1, 3), fused_t).reshape(r1 - r0, w, 3)
+        dst[r0:r1, :, :k] = linear
+        if c > 3:
+            if extra_scale is None:
+                dst[r0:r1, :, 3:] = src[r0:r1, :, 3:]
+            else:
+                dst[r0:r1, :, 3:] = src[r0:r1, :, 3:] * np.float32(extra_scale)
+    return out
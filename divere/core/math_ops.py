@@ -8,15 +8,26 @@ import numpy as np
 from typing import List, Tuple, Optional, Dict, Any, Union
 from concurrent.futures import ThreadPoolExecutor
 import time
+import threading
 from collections import OrderedDict
 
 from .data_types import ImageData, ColorGradingParams, PreviewConfig
-from .gpu_accelerator import get_gpu_accelerator
+from ..utils.tracing import tracer
 
 # 注意：之前实验的SIMD/Numba/NumExpr优化已移除
 # 实测发现这些技术在当前场景下反而降低性能
 # 保持简洁的NumPy + 多线程并行方案，现在加上GPU加速
 
+# float16 全部 65536 个位模式对应的值（半精度位模式 LUT 的定义域，首次使用时生成）
+_HALF_DOMAIN: Optional[np.ndarray] = None
+
+
+def _half_domain() -> np.ndarray:
+    global _HALF_DOMAIN
+    if _HALF_DOMAIN is None:
+        _HALF_DOMAIN = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float64)
+    return _HALF_DOMAIN
+
 
 class FilmMathOps:
     """胶片数学操作核心引擎 - 多线程并行优化版"""
@@ -32,8 +43,9 @@ class FilmMathOps:
         # 预览配置（统一管理）
         self.preview_config = preview_config or PreviewConfig()
         
-        # GPU加速器
-        self.gpu_accelerator = get_gpu_accelerator()
+        # GPU加速器：首次需要时才导入并探测 OpenCL/CUDA/Metal（见 gpu_accelerator 属性）
+        self._gpu_accelerator = None
+        self._gpu_accelerator_resolved = False
         
         # 多线程并行参数
         self.num_threads = self._get_optimal_threads()  # 自动检测最优线程数
@@ -48,13 +60,50 @@ class FilmMathOps:
         
         # 数据类型优化
         self.use_float32_everywhere = True  # 强制使用float32减少内存带宽
+
+        # float16 输入（proxy）按位模式直接索引 65536 项 LUT，省去逐像素的 clip/log/round
+        self.use_half_lut = True
+
+        # 预览（use_optimization=True）的转密度/转线性使用快速模式，见 linear_to_density_fast
+        self.fast_transcendentals = True
+
+        # 无GPU时由 Numba CPU 引擎执行融合的密度管线（步骤1-3，可连同增益与转线性），
+        # 逐像素一次完成，不产生逐阶段的整幅临时数组；引擎不可用时走逐步的 NumPy 实现
+        self.use_fused_cpu_pipeline = True
+        # 融合密度管线的启用阈值（数组元素数）；与 parallel_threshold 分开，由 --autotune 单独校准
+        self.fused_pipeline_threshold = 512 * 512
         
         # 注意：移除了SIMD相关配置（实验证明效果不佳）
         
         # 线程池复用（避免频繁创建销毁）
         self._thread_pool: Optional[ThreadPoolExecutor] = None
+
+        # 密度阶段缓存：矩阵之后的密度数组（按字节数限制的LRU）
+        # 只改 RGB增益/曲线/反光补偿时直接复用，跳过密度反相、转密度和矩阵
+        self.density_stage_cache_max_bytes: int = 192 * 1024 * 1024
+        self._density_stage_cache: "OrderedDict[Any, np.ndarray]" = OrderedDict()
+        self._density_stage_cache_bytes: int = 0
+        self._density_stage_cache_lock = threading.Lock()
+        self._density_stage_stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        # 本机校准结果（python -m divere --autotune）覆盖上面的默认调度参数
+        self._apply_autotune()
         
 
+    @property
+    def gpu_accelerator(self):
+        """GPU加速器（首次访问时初始化，启动时不探测设备）"""
+        if not self._gpu_accelerator_resolved:
+            from .gpu_accelerator import get_gpu_accelerator
+            self._gpu_accelerator = get_gpu_accelerator()
+            self._gpu_accelerator_resolved = True
+        return self._gpu_accelerator
+
+    @gpu_accelerator.setter
+    def gpu_accelerator(self, accelerator) -> None:
+        self._gpu_accelerator = accelerator
+        self._gpu_accelerator_resolved = True
+
     def _get_optimal_threads(self) -> int:
         """自动检测最优线程数"""
         import os
@@ -68,6 +117,29 @@ class FilmMathOps:
         base_size = 256
         return max(base_size, 1024 // self.num_threads)
     
+    def _apply_autotune(self) -> None:
+        """读取本机校准结果：线程数、分块大小、并行阈值、融合管线阈值与 GPU 阈值（未校准时保持默认值）"""
+        from .autotune import get_tuning, tuned_int
+        tuning = get_tuning()
+        if not tuning:
+            return
+        num_threads = tuned_int(tuning, "num_threads")
+        if num_threads is not None:
+            self.num_threads = num_threads
+            self.block_size = self._get_optimal_block_size()
+        block_size = tuned_int(tuning, "block_size")
+        if block_size is not None:
+            self.block_size = block_size
+        parallel_threshold = tuned_int(tuning, "parallel_threshold", minimum=0)
+        if parallel_threshold is not None:
+            self.parallel_threshold = parallel_threshold
+        fused_threshold = tuned_int(tuning, "fused_pipeline_threshold", minimum=0)
+        if fused_threshold is not None:
+            self.fused_pipeline_threshold = fused_threshold
+        gpu_threshold = tuned_int(tuning, "gpu_threshold", minimum=0)
+        if gpu_threshold is not None:
+            self.preview_config.gpu_threshold = gpu_threshold
+
     def _get_thread_pool(self) -> ThreadPoolExecutor:
         """获取线程池（懒加载+复用）"""
         if self._thread_pool is None:
@@ -86,6 +158,13 @@ class FilmMathOps:
         """清空内部缓存"""
         self._lut1d_cache.clear()
         self._curve_lut_cache.clear()
+        self.clear_density_stage_cache()
+
+    def clear_density_stage_cache(self) -> None:
+        """清空密度阶段缓存（输入图像更换时调用；统计计数保留）"""
+        with self._density_stage_cache_lock:
+            self._density_stage_cache.clear()
+            self._density_stage_cache_bytes = 0
     
     def __del__(self):
         """析构函数，确保线程池被正确关闭"""
@@ -99,6 +178,70 @@ class FilmMathOps:
         if len(cache) > self._max_cache_size:
             cache.popitem(last=False)
 
+    def _get_half_lut(self, key: tuple, fn) -> np.ndarray:
+        """按 float16 位模式索引的 LUT：对全部 65536 个半精度值预先用 float64 计算 fn，结果落到 float16
+
+        Args:
+            key: 缓存键（不含前缀）
+            fn: 作用于 float64 数组的逐元素函数
+        """
+        key = ("half",) + tuple(key)
+        lut = self._lut1d_cache.get(key)
+        if lut is None:
+            # NaN/Inf 位模式也会被计算，忽略其浮点警告
+            with np.errstate(all='ignore'):
+                lut = np.asarray(fn(_half_domain()), dtype=np.float64).astype(np.float16)
+            self._cache_put(self._lut1d_cache, key, lut)
+        return lut
+
+    def _use_half_lut(self, image_array: np.ndarray, use_optimization: bool) -> bool:
+        return self.use_half_lut and use_optimization and image_array.dtype == np.float16
+
+    @staticmethod
+    def _take_half(lut: np.ndarray, image_array: np.ndarray) -> np.ndarray:
+        """以 float16 数组的位模式为索引查表（无逐像素运算）"""
+        return np.take(lut, image_array.view(np.uint16))
+
+    def _density_stage_get(self, key: Any) -> Optional[np.ndarray]:
+        """查询密度阶段缓存（命中时返回只读数组）"""
+        with self._density_stage_cache_lock:
+            value = self._density_stage_cache.get(key)
+            if value is None:
+                self._density_stage_stats['misses'] += 1
+                return None
+            self._density_stage_cache.move_to_end(key)
+            self._density_stage_stats['hits'] += 1
+            return value
+
+    def _density_stage_put(self, key: Any, value: np.ndarray) -> None:
+        """写入密度阶段缓存，超出字节上限时按LRU淘汰"""
+        nbytes = value.nbytes
+        if nbytes > self.density_stage_cache_max_bytes:
+            return
+        # 下游各步骤都返回新数组；设为只读防止意外原地修改缓存
+        value.setflags(write=False)
+        with self._density_stage_cache_lock:
+            old = self._density_stage_cache.pop(key, None)
+            if old is not None:
+                self._density_stage_cache_bytes -= old.nbytes
+            self._density_stage_cache[key] = value
+            self._density_stage_cache_bytes += nbytes
+            while self._density_stage_cache_bytes > self.density_stage_cache_max_bytes:
+                _, evicted = self._density_stage_cache.popitem(last=False)
+                self._density_stage_cache_bytes -= evicted.nbytes
+                self._density_stage_stats['evictions'] += 1
+
+    def get_density_stage_cache_stats(self) -> Dict[str, Any]:
+        """密度阶段缓存统计：hits / misses / evictions / hit_rate / entries / bytes"""
+        with self._density_stage_cache_lock:
+            stats: Dict[str, Any] = dict(self._density_stage_stats)
+            stats['entries'] = len(self._density_stage_cache)
+            stats['bytes'] = self._density_stage_cache_bytes
+            stats['max_bytes'] = self.density_stage_cache_max_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
     # =======================
     # 0. 前置幂次变换（IDT Gamma）
     # =======================
@@ -123,11 +266,23 @@ class FilmMathOps:
             return image_array
 
         original_shape = image_array.shape
+
+        # float16：按位模式查 65536 项 LUT（覆盖全部输入值，无插值误差）
+        if self._use_half_lut(image_array, use_optimization):
+            lut = self._get_half_lut(
+                ("pow", round(exp_f, 6)),
+                lambda xs: np.power(np.clip(np.nan_to_num(xs), 0.0, 1.0), exp_f)
+            )
+            if len(original_shape) == 2 or original_shape[2] <= 3:
+                return self._take_half(lut, image_array)
+            result = image_array.copy()
+            result[:, :, :3] = self._take_half(lut, image_array[:, :, :3])
+            return result
         
         # 处理单通道图像
         if len(original_shape) == 2:
             # 2D灰度图像
-            rgb_clipped = np.clip(image_array, 0.0, 1.0)
+            rgb_clipped = np.clip(image_array.astype(np.float32, copy=False), 0.0, 1.0)
             if use_optimization:
                 lut_size = 32768
                 lut = self._get_power_lut(exp_f, lut_size)
@@ -138,7 +293,7 @@ class FilmMathOps:
         
         elif len(original_shape) == 3 and original_shape[2] == 1:
             # 单通道3D图像
-            rgb_clipped = np.clip(image_array, 0.0, 1.0)
+            rgb_clipped = np.clip(image_array.astype(np.float32, copy=False), 0.0, 1.0)
             if use_optimization:
                 lut_size = 32768
                 lut = self._get_power_lut(exp_f, lut_size)
@@ -159,7 +314,8 @@ class FilmMathOps:
                 result = image_array.copy()
                 if original_shape[2] >= 3:
                     rgb = result[:, :, :3]
-                    rgb = np.clip(rgb, 0.0, 1.0)
+                    # float16 先升到 float32，避免 rgb * (lut_size - 1) 舍入到 32768 越界
+                    rgb = np.clip(rgb.astype(np.float32, copy=False), 0.0, 1.0)
                     indices = np.round(rgb * (lut_size - 1)).astype(np.uint16)
                     # 调试：检测有没有越界
                     bad = (indices < 0) | (indices >= lut_size)
@@ -220,10 +376,14 @@ class FilmMathOps:
         if image_array is None or image_array.size == 0:
             return image_array
 
+        # float16（proxy）：65536 项位模式 LUT，比 GPU 往返和对数空间 LUT 都快
+        if self._use_half_lut(image_array, use_optimization):
+            return self._take_half(self._get_density_inversion_half_lut(gamma, dmax, pivot, invert), image_array)
+
         # GPU加速（仅在优化模式下启用，导出时强制使用CPU保证精度）
         if (use_gpu and use_optimization and
-            self.gpu_accelerator and
-            self.preview_config.should_use_gpu(image_array.size)):
+            self.preview_config.should_use_gpu(image_array.size) and
+            self.gpu_accelerator):
             try:
                 return self.gpu_accelerator.density_inversion_accelerated(
                     image_array, gamma, dmax, pivot, invert
@@ -277,7 +437,8 @@ class FilmMathOps:
         LOG_MAX = 0.0   # 对应 img = 10^0 = 1.0
 
         # 将图像值 clip 到对数空间范围
-        img_clipped = np.clip(image_array, 10**LOG_MIN, 1.0)
+        # （float16 输入先升到 float32：否则 normalized * (lut_size - 1) 会舍入到 32768 越界）
+        img_clipped = np.clip(image_array.astype(np.float32, copy=False), 10**LOG_MIN, 1.0)
 
         # 转换到对数空间
         log_img = np.log10(img_clipped)
@@ -321,7 +482,7 @@ class FilmMathOps:
             block = image_array[start_h:end_h, start_w:end_w, :]
 
             # 对数空间LUT查表处理
-            img_clipped = np.clip(block, 10**LOG_MIN, 1.0)
+            img_clipped = np.clip(block.astype(np.float32, copy=False), 10**LOG_MIN, 1.0)
             log_img = np.log10(img_clipped)
             normalized = (log_img - LOG_MIN) / (LOG_MAX - LOG_MIN)
             indices = np.round(normalized * (lut_size - 1)).astype(np.uint16)
@@ -414,6 +575,35 @@ class FilmMathOps:
 
         return lut
     
+    @staticmethod
+    def _density_inversion_math(xs: np.ndarray, gamma: float, dmax: float, pivot: float,
+                                invert: bool) -> np.ndarray:
+        """密度反相的逐元素数学（float64，供半精度 LUT 使用，与 _density_inversion_direct 一致）"""
+        log_img = np.log10(np.maximum(xs, 1e-10))
+        original_density = -log_img if invert else log_img
+        return np.power(10.0, pivot + (original_density - pivot) * gamma - dmax)
+
+    def _get_density_inversion_half_lut(self, gamma: float, dmax: float, pivot: float,
+                                        invert: bool = True) -> np.ndarray:
+        """float16 位模式索引的密度反相 LUT"""
+        key = ("dens_inv", round(float(gamma), 6), round(float(dmax), 6), round(float(pivot), 6), bool(invert))
+        return self._get_half_lut(
+            key, lambda xs: self._density_inversion_math(np.nan_to_num(xs), gamma, dmax, pivot, invert)
+        )
+
+    def _get_inversion_to_density_half_lut(self, gamma: float, dmax: float, pivot: float,
+                                           invert: bool = True) -> np.ndarray:
+        """float16 位模式索引的 密度反相 → 转密度 融合 LUT
+
+        中间的线性值全程为 float64，不会像分步计算那样在 float16 中溢出为 inf。
+        """
+        def fn(xs):
+            linear = self._density_inversion_math(np.nan_to_num(xs), gamma, dmax, pivot, invert)
+            return -np.log10(np.maximum(linear, 1e-10))
+        key = ("dens_inv_to_density", round(float(gamma), 6), round(float(dmax), 6),
+               round(float(pivot), 6), bool(invert))
+        return self._get_half_lut(key, fn)
+
     # =======================
     # 2. Gamma和Dmax调整（图片级别）
     # =======================
@@ -765,7 +955,9 @@ class FilmMathOps:
                                                                channel_curves, lut_size)
         
         # 第2步：转换到线性空间
-        linear_result = self.density_to_linear(density_result)
+        linear_result = self.density_to_linear(
+            density_result, fast=use_optimization and self.fast_transcendentals
+        )
         
         # 第3步：应用屏幕反光补偿（在线性空间）
         if screen_glare_compensation > 0.0:
@@ -954,7 +1146,11 @@ class FilmMathOps:
         return y_values.astype(np.float64)
     
     def _should_use_3d_lut(self, image_shape: tuple) -> bool:
-        """判断是否应该使用3D LUT（智能决策）"""
+        """判断是否应该使用3D LUT（智能决策）
+
+        注意：目前没有调用方（_apply_curves_3d_lut 未接入曲线管线），是未使用的代码，
+        --autotune 因此不校准这里的阈值。
+        """
         pixel_count = image_shape[0] * image_shape[1]
         # 只对超大图像（4MP+）且参数复杂时使用3D LUT
         # 因为3D LUT生成成本高，只有重复使用时才值得
@@ -1364,12 +1560,19 @@ class FilmMathOps:
     # 6. 转线性
     # =======================
     
-    def density_to_linear(self, density_array: np.ndarray, use_parallel: bool = True) -> np.ndarray:
+    def density_to_linear(self, density_array: np.ndarray, use_parallel: bool = True,
+                          fast: bool = False) -> np.ndarray:
         """
         将密度空间转换为线性空间（支持并行）
         
         使用NumPy优化的exp函数，比LUT查表更快
+
+        Args:
+            fast: 使用快速模式（见 density_to_linear_fast，仅 float16/float32 输入）
         """
+        if fast and density_array.dtype in (np.float16, np.float32):
+            return self.density_to_linear_fast(density_array, use_parallel)
+
         should_parallel = self._should_use_parallel(density_array.size, use_parallel)
         
         if should_parallel:
@@ -1427,17 +1630,22 @@ class FilmMathOps:
         
         return result
     
-    def linear_to_density(self, linear_array: np.ndarray, use_parallel: bool = True) -> np.ndarray:
+    def linear_to_density(self, linear_array: np.ndarray, use_parallel: bool = True,
+                          fast: bool = False) -> np.ndarray:
         """
         将线性空间转换为密度空间（支持并行）
         
         Args:
             linear_array: 线性空间图像
             use_parallel: 是否使用并行处理
+            fast: 使用快速模式（见 linear_to_density_fast，仅 float16/float32 输入）
             
         Returns:
             密度空间图像
         """
+        if fast and linear_array.dtype in (np.float16, np.float32):
+            return self.linear_to_density_fast(linear_array, use_parallel)
+
         should_parallel = self._should_use_parallel(linear_array.size, use_parallel)
         
         if should_parallel:
@@ -1490,6 +1698,61 @@ class FilmMathOps:
         
         return result
     
+    # =======================
+    # 快速转密度/转线性（预览）
+    # =======================
+    #
+    # 误差界（相对 float64 计算后舍入到输出精度）：
+    # - float16：按位模式查 65536 项 LUT，LUT 用 float64 计算后舍入，结果为正确舍入（≤ 0.5 ulp），
+    #   不劣于逐像素 float16 运算
+    # - float32：全程 float32 原地运算（NumPy 的 SIMD exp/log10），不升到 float64；
+    #   工作范围内（线性 [1e-6, 1]、密度 [-0.5, 7]）转密度绝对误差 ≤ 2e-6、
+    #   转线性相对误差 ≤ 2e-6（误差来自 float32 的 d·ln10 舍入），远低于 16 位量化步长 1/65535
+    #   （tests/test_fast_log_exp.py 校验上述误差界）
+    # 导出（use_optimization=False）不使用快速模式。
+
+    _LN10_F32 = np.float32(np.log(10.0))
+
+    def _map_row_bands(self, fn, array: np.ndarray, use_parallel: bool) -> np.ndarray:
+        """按行带把逐元素函数 fn(src, out) 分到线程池（ufunc 运算期间释放 GIL）"""
+        out = np.empty(array.shape, dtype=np.float32 if array.dtype != np.float16 else np.float16)
+        if not self._should_use_parallel(array.size, use_parallel) or array.shape[0] < 2:
+            fn(array, out)
+            return out
+        bounds = np.linspace(0, array.shape[0], min(self.num_threads, array.shape[0]) + 1).astype(int)
+        executor = self._get_thread_pool()
+        list(executor.map(lambda i: fn(array[bounds[i]:bounds[i + 1]], out[bounds[i]:bounds[i + 1]]),
+                          range(len(bounds) - 1)))
+        return out
+
+    def linear_to_density_fast(self, linear_array: np.ndarray, use_parallel: bool = True) -> np.ndarray:
+        """快速线性转密度：density = -log10(max(linear, 1e-10))，误差界见上"""
+        if linear_array.dtype == np.float16:
+            lut = self._get_half_lut(("to_density",), lambda xs: -np.log10(np.maximum(xs, 1e-10)))
+
+            def fn(src, out):
+                np.take(lut, src.view(np.uint16), out=out)
+        else:
+            def fn(src, out):
+                np.maximum(src, np.float32(1e-10), out=out)
+                np.log10(out, out=out)
+                np.negative(out, out=out)
+        return self._map_row_bands(fn, linear_array, use_parallel)
+
+    def density_to_linear_fast(self, density_array: np.ndarray, use_parallel: bool = True) -> np.ndarray:
+        """快速密度转线性：linear = clip(10^(-density), 0, 1)，误差界见上"""
+        if density_array.dtype == np.float16:
+            lut = self._get_half_lut(("to_linear",), lambda xs: np.clip(np.power(10.0, -xs), 0.0, 1.0))
+
+            def fn(src, out):
+                np.take(lut, src.view(np.uint16), out=out)
+        else:
+            def fn(src, out):
+                np.multiply(src, -self._LN10_F32, out=out)
+                np.exp(out, out=out)
+                np.clip(out, np.float32(0.0), np.float32(1.0), out=out)
+        return self._map_row_bands(fn, density_array, use_parallel)
+
     # =======================
     # 完整数学管线
     # =======================
@@ -1498,7 +1761,8 @@ class FilmMathOps:
                                include_curve: bool = True, 
                                enable_density_inversion: bool = True,
                                use_optimization: bool = True,
-                               profile: Optional[Dict[str, float]] = None) -> np.ndarray:
+                               profile: Optional[Dict[str, float]] = None,
+                               stage_cache_key: Optional[Any] = None) -> np.ndarray:
         """
         应用完整的数学处理管线
         
@@ -1509,6 +1773,9 @@ class FilmMathOps:
             enable_density_inversion: 是否启用密度反相
             use_optimization: 是否使用优化版本
             profile: 性能分析字典
+            stage_cache_key: 输入图像的标识（可哈希，由调用方保证相同标识对应相同输入）。
+                提供时缓存矩阵之后的密度数组，只改增益/曲线时跳过前面的步骤；
+                None 表示不缓存（导出等一次性处理）
             
         Returns:
             处理后的图像数组
@@ -1520,8 +1787,6 @@ class FilmMathOps:
         if profile is not None:
             profile.clear()
 
-        result_array = image_array.copy()
-
         # 如果密度反相未启用，检查是否需要完全跳过密度处理
         if not enable_density_inversion:
             # 检查是否有任何密度空间处理需要执行
@@ -1539,41 +1804,111 @@ class FilmMathOps:
                     profile['density_matrix_ms'] = 0.0
                     profile['rgb_gains_ms'] = 0.0
                     profile['density_curves_ms'] = 0.0
-                return result_array
-
-        # 1. 密度反相（始终执行，通过 invert 参数控制正负号）
-        t0 = time.time()
-        result_array = self.density_inversion(
-            result_array, params.density_gamma, params.density_dmax,
-            invert=enable_density_inversion,
-            use_optimization=use_optimization
-        )
-        if profile is not None:
-            profile['density_inversion_ms'] = (time.time() - t0) * 1000.0
+                return image_array.copy()
 
-        # 2. 转为密度空间
-        t1 = time.time()
-        density_array = self.linear_to_density(result_array)
-        if profile is not None:
-            profile['to_density_ms'] = (time.time() - t1) * 1000.0
-        
-        # 3. 密度校正矩阵
+        # 密度校正矩阵（单位矩阵视为不启用）
+        matrix = None
         if params.enable_density_matrix:
-            t2 = time.time()
             matrix = self._get_density_matrix(params)
-            if matrix is not None and not np.allclose(matrix, np.eye(3)):
-                density_array = self.apply_density_matrix(
-                    density_array, matrix, params.density_dmax,
-                    channel_gamma_r=params.channel_gamma_r,
-                    channel_gamma_b=params.channel_gamma_b
-                )
+            if matrix is not None and np.allclose(matrix, np.eye(3)):
+                matrix = None
+
+        # 密度阶段缓存：键覆盖 步骤1-3 的全部依赖
+        stage_key = None
+        density_array = None
+        if stage_cache_key is not None:
+            stage_key = (
+                stage_cache_key, image_array.shape, image_array.dtype.str,
+                float(params.density_gamma), float(params.density_dmax),
+                bool(enable_density_inversion), bool(use_optimization),
+                None if matrix is None else (
+                    np.asarray(matrix, dtype=np.float64).tobytes(),
+                    float(params.channel_gamma_r), float(params.channel_gamma_b)
+                ),
+            )
+            density_array = self._density_stage_get(stage_key)
             if profile is not None:
-                profile['density_matrix_ms'] = (time.time() - t2) * 1000.0
+                profile['stage_cache_hit'] = 1.0 if density_array is not None else 0.0
+
+        if density_array is None:
+            fused = None
+            if self._use_half_lut(image_array, use_optimization):
+                # 1+2. float16：密度反相与转密度融合为一次位模式查表
+                t0 = time.time()
+                lut = self._get_inversion_to_density_half_lut(
+                    params.density_gamma, params.density_dmax, 0.7, invert=enable_density_inversion
+                )
+                density_array = self._take_half(lut, image_array)
+                tracer.complete("math.density_inversion", t0, cat="math", half_lut=True)
+                if profile is not None:
+                    profile['density_inversion_ms'] = (time.time() - t0) * 1000.0
+                    profile['to_density_ms'] = 0.0
+            else:
+                # 1-3（可至5）. 融合密度管线：没有缓存、没有曲线时连同增益与转线性一次完成
+                fused_to_linear = stage_key is None and not (
+                    include_curve and params.enable_density_curve and self._has_active_curves(params)
+                )
+                t0 = time.time()
+                fused = self._fused_density_pipeline(
+                    image_array, params, matrix, enable_density_inversion, fused_to_linear,
+                    include_glare=include_curve and params.enable_density_curve,
+                    use_optimization=use_optimization
+                )
+                if fused is not None:
+                    tracer.complete("math.fused_pipeline", t0, cat="math", to_linear=fused_to_linear)
+                    if profile is not None:
+                        profile['density_inversion_ms'] = (time.time() - t0) * 1000.0
+                        profile['to_density_ms'] = 0.0
+                        profile['density_matrix_ms'] = 0.0
+                        profile['fused_pipeline'] = 1.0
+                    if fused_to_linear:
+                        if profile is not None:
+                            profile['rgb_gains_ms'] = 0.0
+                            profile['density_curves_ms'] = 0.0
+                        return fused
+                    density_array = fused
+            if density_array is None:
+                # 1. 密度反相（始终执行，通过 invert 参数控制正负号）
+                t0 = time.time()
+                result_array = self.density_inversion(
+                    image_array.copy(), params.density_gamma, params.density_dmax,
+                    invert=enable_density_inversion,
+                    use_optimization=use_optimization
+                )
+                tracer.complete("math.density_inversion", t0, cat="math")
+                if profile is not None:
+                    profile['density_inversion_ms'] = (time.time() - t0) * 1000.0
+
+                # 2. 转为密度空间
+                t1 = time.time()
+                density_array = self.linear_to_density(
+                    result_array, fast=use_optimization and self.fast_transcendentals
+                )
+                tracer.complete("math.to_density", t1, cat="math")
+                if profile is not None:
+                    profile['to_density_ms'] = (time.time() - t1) * 1000.0
+
+            # 3. 密度校正矩阵（融合管线已包含）
+            if params.enable_density_matrix and fused is None:
+                t2 = time.time()
+                if matrix is not None:
+                    density_array = self.apply_density_matrix(
+                        density_array, matrix, params.density_dmax,
+                        channel_gamma_r=params.channel_gamma_r,
+                        channel_gamma_b=params.channel_gamma_b
+                    )
+                tracer.complete("math.density_matrix", t2, cat="math")
+                if profile is not None:
+                    profile['density_matrix_ms'] = (time.time() - t2) * 1000.0
+
+            if stage_key is not None:
+                self._density_stage_put(stage_key, density_array)
         
         # 4. RGB增益调整
         if params.enable_rgb_gains:
             t3 = time.time()
             density_array = self.apply_rgb_gains(density_array, params.rgb_gains)
+            tracer.complete("math.rgb_gains", t3, cat="math")
             if profile is not None:
                 profile['rgb_gains_ms'] = (time.time() - t3) * 1000.0
         
@@ -1602,22 +1937,63 @@ class FilmMathOps:
                 )
             else:
                 # 没有曲线时，需要手动转换到线性空间并应用屏幕反光补偿
-                result_array = self.density_to_linear(density_array)
+                result_array = self.density_to_linear(
+                    density_array, fast=use_optimization and self.fast_transcendentals
+                )
                 if params.screen_glare_compensation > 0.0:
                     result_array = np.maximum(0.0, result_array - params.screen_glare_compensation)
         else:
             # 密度曲线被禁用时，仍需要将density_array转换回线性空间
             # 这确保了RGB增益等在密度空间的处理结果能正确返回
-            result_array = self.density_to_linear(density_array)
+            result_array = self.density_to_linear(
+                density_array, fast=use_optimization and self.fast_transcendentals
+            )
             # 没有密度曲线时，应同时关闭反光校正。
             # if params.screen_glare_compensation > 0.0:
             #     result_array = np.maximum(0.0, result_array - params.screen_glare_compensation)
         
+        tracer.complete("math.curves_to_linear", t4, cat="math")
         if profile is not None:
             profile['density_curves_ms'] = (time.time() - t4) * 1000.0
         
         return result_array
 
+    def _fused_density_pipeline(self, image_array: np.ndarray, params: ColorGradingParams,
+                                matrix: Optional[np.ndarray], invert: bool, to_linear: bool,
+                                include_glare: bool, use_optimization: bool) -> Optional[np.ndarray]:
+        """由加速引擎执行融合的密度管线（步骤1-3；to_linear 时连同增益、转线性与反光补偿）
+
+        Returns:
+            结果数组；引擎不支持（GPU/未安装 numba）、输入不适用或执行失败时返回 None
+        """
+        if not (self.use_fused_cpu_pipeline and
+                image_array.ndim == 3 and image_array.shape[2] == 3 and
+                image_array.dtype in (np.float32, np.float64) and
+                image_array.size > self.fused_pipeline_threshold):
+            return None
+        accelerator = self.gpu_accelerator
+        if accelerator is None:
+            return None
+        rgb_gains = params.rgb_gains if (to_linear and params.enable_rgb_gains) else None
+        glare = params.screen_glare_compensation if (to_linear and include_glare) else 0.0
+        return accelerator.density_pipeline_accelerated(
+            image_array, params.density_gamma, params.density_dmax, 0.7, invert,
+            matrix=matrix,
+            channel_gamma_r=params.channel_gamma_r,
+            channel_gamma_b=params.channel_gamma_b,
+            rgb_gains=rgb_gains,
+            to_linear=to_linear,
+            glare=glare,
+            # 预览的对数空间 LUT 把输入裁切到 [1e-6, 1]，融合管线保持相同的裁切
+            input_range=(1e-6, 1.0) if use_optimization else None,
+        )
+
+    def _has_active_curves(self, params: ColorGradingParams) -> bool:
+        """是否有非默认的密度曲线（RGB 或单通道）"""
+        return any(not self._is_default_curve(points) for points in (
+            params.curve_points, params.curve_points_r, params.curve_points_g, params.curve_points_b
+        ))
+
     def _is_default_curve(self, points: list) -> bool:
         """检查曲线是否为默认直线"""
         return points == [(0.0, 0.0), (1.0, 1.0)] or not points
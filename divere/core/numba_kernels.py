@@ -0,0 +1,142 @@
+"""
+Numba CPU 内核 - NumbaCPUEngine 使用的 prange 并行内核
+
+仅在 numba 可用时由 gpu_accelerator.NumbaCPUEngine 导入（导入 numba 本身约数百毫秒）。
+所有内核逐像素在 float64 下计算、直接写入输出数组，不产生逐阶段的整幅临时数组；
+cache=True 把编译结果缓存到磁盘，之后的进程不再重新编译。
+
+每个内核有 prange 并行版本与 *_serial 串行版本（共用逐元素/逐行的计算函数）。
+numba 的 workqueue 线程层不允许多个 Python 线程同时启动并行区域（会直接 abort），
+因此并行版本同一时刻只能由一个线程调用；其余线程（如全精度分块导出的 tile 线程）
+使用串行版本，见 NumbaCPUEngine._launch。
+
+公式与 FilmMathOps 的 NumPy 参考实现（use_optimization=False 的直接计算版本）一致：
+- 密度反相：10 ** (pivot + (±log10(max(x, 1e-10)) - pivot) * gamma - dmax)
+- 转密度：-log10(max(x, 1e-10))
+- 密度矩阵：pivot + ((d + dmax) - pivot) @ M.T，再按分层反差缩放，减去 dmax
+- RGB 增益：d - gain
+- 转线性：clip(10 ** -d, 0, 1)，可选减去屏幕反光补偿
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+_LN10 = math.log(10.0)
+# -log10(1e-10)：转密度时 1e-10 下限对应的最大密度
+_MAX_DENSITY = 10.0
+
+
+@njit(cache=True)
+def _inversion_value(v, gamma, dmax, pivot, invert):
+    log_v = math.log10(max(v, 1e-10))
+    density = -log_v if invert else log_v
+    return math.exp((pivot + (density - pivot) * gamma - dmax) * _LN10)
+
+
+@njit(parallel=True, cache=True)
+def density_inversion_kernel(src, out, gamma, dmax, pivot, invert):
+    """密度反相（src/out 为一维数组）"""
+    for i in prange(src.shape[0]):
+        out[i] = _inversion_value(src[i], gamma, dmax, pivot, invert)
+
+
+@njit(cache=True)
+def density_inversion_kernel_serial(src, out, gamma, dmax, pivot, invert):
+    """密度反相（串行版本）"""
+    for i in range(src.shape[0]):
+        out[i] = _inversion_value(src[i], gamma, dmax, pivot, invert)
+
+
+@njit(cache=True)
+def _curve_value(v, lut, last, inv_range):
+    x = v * inv_range
+    if x < 0.0:
+        x = 0.0
+    elif x > 1.0:
+        x = 1.0
+    pos = (1.0 - x) * last
+    i0 = int(pos)
+    if i0 >= last:
+        return lut[last]
+    frac = pos - i0
+    return lut[i0] + (lut[i0 + 1] - lut[i0]) * frac
+
+
+@njit(parallel=True, cache=True)
+def curve_lut_kernel(src, out, lut, inv_range):
+    """密度 → 曲线 LUT 线性插值（与 np.interp(1 - clip(d * inv_range, 0, 1), linspace(0, 1, n), lut) 一致）"""
+    last = lut.shape[0] - 1
+    for i in prange(src.shape[0]):
+        out[i] = _curve_value(src[i], lut, last, inv_range)
+
+
+@njit(cache=True)
+def curve_lut_kernel_serial(src, out, lut, inv_range):
+    """曲线 LUT 插值（串行版本）"""
+    last = lut.shape[0] - 1
+    for i in range(src.shape[0]):
+        out[i] = _curve_value(src[i], lut, last, inv_range)
+
+
+@njit(cache=True)
+def _density_pipeline_row(src, out, y, d, gamma, dmax, pivot, invert, lo, hi,
+                          use_matrix, matrix, matrix_pivot, channel_gamma,
+                          gains, to_linear, glare):
+    """融合密度管线的一行；d 为调用方提供的 3 元素暂存"""
+    for x in range(src.shape[1]):
+        for c in range(3):
+            log_v = math.log10(min(max(src[y, x, c], lo), hi))
+            density = -log_v if invert else log_v
+            # 反相结果 10**adj 再转密度即 -adj（含 1e-10 下限）
+            d[c] = min(-(pivot + (density - pivot) * gamma - dmax), _MAX_DENSITY)
+        if use_matrix:
+            x0 = d[0] + dmax - matrix_pivot
+            x1 = d[1] + dmax - matrix_pivot
+            x2 = d[2] + dmax - matrix_pivot
+            for c in range(3):
+                adjusted = matrix[c, 0] * x0 + matrix[c, 1] * x1 + matrix[c, 2] * x2
+                d[c] = matrix_pivot + adjusted * channel_gamma[c] - dmax
+        for c in range(3):
+            value = d[c] - gains[c]
+            if to_linear:
+                value = math.exp(-value * _LN10)
+                if value > 1.0:
+                    value = 1.0
+                if glare > 0.0:
+                    value = max(0.0, value - glare)
+            out[y, x, c] = value
+
+
+@njit(parallel=True, cache=True)
+def density_pipeline_kernel(src, out, gamma, dmax, pivot, invert, lo, hi,
+                            use_matrix, matrix, matrix_pivot, channel_gamma,
+                            gains, to_linear, glare):
+    """融合的密度管线：密度反相 → 转密度 → 密度矩阵 → RGB 增益 →（可选）转线性
+
+    Args:
+        src/out: [H, W, 3] 数组（可为非连续视图）
+        lo/hi: 输入值裁切范围（预览的对数空间 LUT 裁切到 [1e-6, 1]，直接计算只有 1e-10 下限）
+        use_matrix: 是否应用 matrix（3×3）与 channel_gamma（分层反差，长度 3）
+        gains: RGB 增益（长度 3）
+        to_linear: True 输出线性值，False 输出密度
+        glare: 转线性后减去的屏幕反光补偿（0 表示不补偿）
+    """
+    for y in prange(src.shape[0]):
+        d = np.empty(3)  # 每行一个 3 元素暂存，不随像素分配
+        _density_pipeline_row(src, out, y, d, gamma, dmax, pivot, invert, lo, hi,
+                              use_matrix, matrix, matrix_pivot, channel_gamma,
+                              gains, to_linear, glare)
+
+
+@njit(cache=True)
+def density_pipeline_kernel_serial(src, out, gamma, dmax, pivot, invert, lo, hi,
+                                   use_matrix, matrix, matrix_pivot, channel_gamma,
+                                   gains, to_linear, glare):
+    """融合的密度管线（串行版本，参数同 density_pipeline_kernel）"""
+    d = np.empty(3)
+    for y in range(src.shape[0]):
+        _density_pipeline_row(src, out, y, d, gamma, dmax, pivot, invert, lo, hi,
+                              use_matrix, matrix, matrix_pivot, channel_gamma,
+                              gains, to_linear, glare)
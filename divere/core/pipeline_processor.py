@@ -12,8 +12,13 @@ import cv2
 from .data_types import ImageData, ColorGradingParams, PreviewConfig
 from .math_ops import FilmMathOps
 from ..utils.enhanced_config_manager import enhanced_config_manager
+from ..utils.tracing import tracer
+from ..utils import metrics
+from ..utils.debug_logger import get_logger
 from pathlib import Path
 
+_log = get_logger()
+
 
 class FilmPipelineProcessor:
     """胶片处理管线处理器"""
@@ -25,9 +30,6 @@ class FilmPipelineProcessor:
         # 预览配置（统一管理）
         self.preview_config = preview_config or PreviewConfig()
         
-        # GPU加速器（共享math_ops的实例）
-        self.gpu_accelerator = self.math_ops.gpu_accelerator
-
         # 性能监控
         self._last_profile: Dict[str, float] = {}
 
@@ -40,9 +42,45 @@ class FilmPipelineProcessor:
         self.full_pipeline_chunk_threshold: int = 4096 * 4096  # 约16MP
         self.full_pipeline_tile_size: Tuple[int, int] = (2048, 2048)
         self.full_pipeline_max_workers: int = self.math_ops.num_threads
+        self._apply_autotune()
+
+        # 预览密度阶段缓存的字节上限（MB，0 表示禁用）
+        try:
+            cache_mb = float(enhanced_config_manager.get_ui_setting("preview_stage_cache_mb", 192))
+            self.math_ops.density_stage_cache_max_bytes = max(0, int(cache_mb * 1024 * 1024))
+        except (TypeError, ValueError):
+            pass
+        # float16 proxy 的位模式 LUT 快速路径
+        self.math_ops.use_half_lut = bool(enhanced_config_manager.get_ui_setting("preview_half_float_lut", True))
+        # 预览的快速转密度/转线性（导出不受影响）
+        self.math_ops.fast_transcendentals = bool(enhanced_config_manager.get_ui_setting("preview_fast_log_exp", True))
     
+    def _apply_autotune(self) -> None:
+        """读取本机校准结果中的全精度分块尺寸与并发数（python -m divere --autotune）"""
+        from .autotune import get_tuning, tuned_int
+        tuning = get_tuning()
+        try:
+            tile_h, tile_w = (int(v) for v in tuning["full_pipeline_tile_size"])
+            if tile_h > 0 and tile_w > 0:
+                self.full_pipeline_tile_size = (tile_h, tile_w)
+        except (KeyError, TypeError, ValueError):
+            pass
+        max_workers = tuned_int(tuning, "full_pipeline_max_workers")
+        if max_workers is not None:
+            self.full_pipeline_max_workers = max_workers
+
+    @property
+    def gpu_accelerator(self):
+        """GPU加速器（共享math_ops的实例，首次访问时探测）"""
+        return self.math_ops.gpu_accelerator
+
     def _load_default_matrices(self):
         """加载默认的校正矩阵"""
+        from ..utils.config_snapshot import get_config_snapshot
+        snapshot = get_config_snapshot()
+        if snapshot is not None:
+            self._density_matrices.update(snapshot.copy_matrices())
+            return
         config_files = enhanced_config_manager.get_config_files("matrices")
         for matrix_file in config_files:
             try:
@@ -62,10 +100,10 @@ class FilmPipelineProcessor:
     def get_density_matrix_array(self, key: str) -> Optional[np.ndarray]:
         """获取校正矩阵的numpy数组"""
         matrix_data = self.get_matrix_data(key)
-        print(f"Debug: get_density_matrix_array({key}) - data found: {matrix_data is not None}")
+        _log.debug("get_density_matrix_array(%s) - data found: %s", key, matrix_data is not None)
         if matrix_data:
-            print(f"Debug: matrix_data keys: {list(matrix_data.keys())}")
-            print(f"Debug: matrix_space: {matrix_data.get('matrix_space')}")
+            _log.debug(lambda: f"matrix_data keys: {list(matrix_data.keys())}")
+            _log.debug("matrix_space: %s", matrix_data.get('matrix_space'))
             
             # 检查matrix_space（兼容没有该字段的旧格式）
             matrix_space = matrix_data.get("matrix_space", "density")  # 默认为density
@@ -74,22 +112,22 @@ class FilmPipelineProcessor:
                     matrix_array = matrix_data.get("matrix")
                     if matrix_array is not None:
                         result = np.array(matrix_array, dtype=np.float64)
-                        print(f"Debug: converted matrix shape: {result.shape}, values: {result.tolist()}")
+                        _log.debug(lambda: f"converted matrix shape: {result.shape}, values: {result.tolist()}")
                         # 验证矩阵有效性
                         if result.shape != (3, 3):
-                            print(f"Error: invalid matrix shape {result.shape}, expected (3,3)")
+                            _log.error("invalid matrix shape %s, expected (3,3)", result.shape)
                             return None
                         if not np.isfinite(result).all():
-                            print(f"Warning: matrix contains invalid values, cleaning up")
+                            _log.warning("matrix contains invalid values, cleaning up")
                             result = np.where(np.isfinite(result), result, 0.0)
                         return result
                     else:
-                        print(f"Error: no 'matrix' field in matrix_data for {key}")
+                        _log.error("no 'matrix' field in matrix_data for %s", key)
                 except Exception as e:
-                    print(f"Error: failed to convert matrix for {key}: {e}")
+                    _log.error("failed to convert matrix for %s: %s", key, e)
                     return None
             else:
-                print(f"Debug: skipping matrix {key} - wrong matrix_space: {matrix_space}")
+                _log.debug("skipping matrix %s - wrong matrix_space: %s", key, matrix_space)
         return None
 
     def reload_matrices(self):
@@ -136,12 +174,14 @@ class FilmPipelineProcessor:
         t0 = time.time()
         proxy_array, scale_factor = self._create_preview_proxy(image.array)
         profile['early_downsample_ms'] = (time.time() - t0) * 1000.0
+        tracer.complete("preview.early_downsample", t0, cat="pipeline", scale=scale_factor)
         
         # 2. 输入色彩科学（在较小的图像上）
         t1 = time.time()
         if input_colorspace_transform is not None:
             proxy_array = self._apply_colorspace_transform(proxy_array, input_colorspace_transform)
         profile['input_colorspace_ms'] = (time.time() - t1) * 1000.0
+        tracer.complete("preview.input_colorspace", t1, cat="pipeline")
         
         # 2.5 IDT阶段monochrome转换（移除 - 现在在显示阶段处理）
         profile['idt_monochrome_ms'] = 0.0
@@ -154,12 +194,14 @@ class FilmPipelineProcessor:
             use_optimization=True
         )
         profile['gamma_dmax_ms'] = (time.time() - t2) * 1000.0
+        tracer.complete("preview.density_inversion", t2, cat="pipeline")
         
         # 4. 套LUT（完整数学管线的其余部分，强制禁用并行）
         t3 = time.time()
         lut_profile = {}
         proxy_array = self._apply_preview_lut_pipeline_optimized(proxy_array, params, include_curve, lut_profile)
         profile['lut_pipeline_ms'] = (time.time() - t3) * 1000.0
+        tracer.complete("preview.lut_pipeline", t3, cat="pipeline")
         profile.update({f"lut/{k}": v for k, v in lut_profile.items()})
         
         # 5. 输出色彩转换
@@ -167,9 +209,12 @@ class FilmPipelineProcessor:
         if output_colorspace_transform is not None:
             proxy_array = self._apply_colorspace_transform(proxy_array, output_colorspace_transform)
         profile['output_colorspace_ms'] = (time.time() - t4) * 1000.0
+        tracer.complete("preview.output_colorspace", t4, cat="pipeline")
 
         # 记录总时间和性能分析
         profile['total_preview_ms'] = (time.time() - t_start) * 1000.0
+        tracer.complete("pipeline.preview", t_start, cat="pipeline",
+                        shape=list(proxy_array.shape))
         profile['scale_factor'] = scale_factor
         self._last_profile = profile
 
@@ -219,7 +264,7 @@ class FilmPipelineProcessor:
             
         # 转为密度空间
         t0 = time.time()
-        density_array = self.math_ops.linear_to_density(proxy_array)
+        density_array = self.math_ops.linear_to_density(proxy_array, fast=self.math_ops.fast_transcendentals)
         profile['to_density_ms'] = (time.time() - t0) * 1000.0
         
         # 密度校正矩阵（强制禁用并行）
@@ -267,7 +312,7 @@ class FilmPipelineProcessor:
                 )
             else:
                 # 没有曲线时，需要手动转换到线性空间并应用屏幕反光补偿
-                result_array = self.math_ops.density_to_linear(density_array)
+                result_array = self.math_ops.density_to_linear(density_array, fast=self.math_ops.fast_transcendentals)
                 if params.screen_glare_compensation > 0.0:
                     result_array = np.maximum(0.0, result_array - params.screen_glare_compensation)
             profile['density_curves_ms'] = (time.time() - t3) * 1000.0
@@ -285,7 +330,7 @@ class FilmPipelineProcessor:
             
         # 转为密度空间
         t0 = time.time()
-        density_array = self.math_ops.linear_to_density(proxy_array)
+        density_array = self.math_ops.linear_to_density(proxy_array, fast=self.math_ops.fast_transcendentals)
         profile['to_density_ms'] = (time.time() - t0) * 1000.0
         
         # 密度校正矩阵
@@ -333,7 +378,7 @@ class FilmPipelineProcessor:
                 )
             else:
                 # 没有曲线时，需要手动转换到线性空间并应用屏幕反光补偿
-                result_array = self.math_ops.density_to_linear(density_array)
+                result_array = self.math_ops.density_to_linear(density_array, fast=self.math_ops.fast_transcendentals)
                 if params.screen_glare_compensation > 0.0:
                     result_array = np.maximum(0.0, result_array - params.screen_glare_compensation)
             profile['density_curves_ms'] = (time.time() - t3) * 1000.0
@@ -353,7 +398,8 @@ class FilmPipelineProcessor:
                                      tile_size: Optional[Tuple[int, int]] = None,
                                      max_workers: Optional[int] = None,
                                      convert_to_monochrome_in_idt: bool = False,
-                                     monochrome_converter: Optional[callable] = None) -> ImageData:
+                                     monochrome_converter: Optional[callable] = None,
+                                     stage_cache_key: Optional[Any] = None) -> ImageData:
         """
         全精度版本管线：完整数学过程套在原图上
         
@@ -369,6 +415,7 @@ class FilmPipelineProcessor:
             max_workers: 最大工作线程数
             convert_to_monochrome_in_idt: 是否在IDT阶段转换为单色
             monochrome_converter: 单色转换函数
+            stage_cache_key: 输入图像标识，提供时复用矩阵之后的密度数组（见 FilmMathOps.apply_full_math_pipeline，仅非分块路径）
             
         Returns:
             处理后的全精度图像
@@ -394,6 +441,7 @@ class FilmPipelineProcessor:
             if input_colorspace_transform is not None:
                 working_array = self._apply_colorspace_transform(working_array, input_colorspace_transform)
             profile['input_colorspace_ms'] = (time.time() - t0) * 1000.0
+            tracer.complete("full.input_colorspace", t0, cat="pipeline")
             
             # 1.5 IDT阶段monochrome转换（移除 - 现在在显示阶段处理）
             profile['idt_monochrome_ms'] = 0.0
@@ -409,7 +457,8 @@ class FilmPipelineProcessor:
             try:
                 working_array = self.math_ops.apply_full_math_pipeline(
                     working_array, params, include_curve, 
-                    params.enable_density_inversion, use_optimization, math_profile
+                    params.enable_density_inversion, use_optimization, math_profile,
+                    stage_cache_key=stage_cache_key if input_colorspace_transform is None else None
                 )
             finally:
                 # 恢复原函数
@@ -418,12 +467,14 @@ class FilmPipelineProcessor:
                 
             profile['math_pipeline_ms'] = (time.time() - t1) * 1000.0
             profile.update({f"math/{k}": v for k, v in math_profile.items()})
+            tracer.complete("full.math_pipeline", t1, cat="pipeline")
             
             # 3. 输出色彩转换
             t2 = time.time()
             if output_colorspace_transform is not None:
                 working_array = self._apply_colorspace_transform(working_array, output_colorspace_transform)
             profile['output_colorspace_ms'] = (time.time() - t2) * 1000.0
+            tracer.complete("full.output_colorspace", t2, cat="pipeline")
         else:
             # 分块并行路径
             h, w = image.height, image.width
@@ -481,6 +532,10 @@ class FilmPipelineProcessor:
                 if output_colorspace_transform is not None:
                     block = self._apply_colorspace_transform(block, output_colorspace_transform)
                 prof_local['output_ms'] = (time.time() - t2_local) * 1000.0
+                # 每个 tile 一个 span（带线程号，可看出并行度与长尾 tile）
+                tracer.complete("full.tile", t0_local, cat="pipeline", rows=[sh, eh], cols=[sw, ew],
+                                input_ms=prof_local['input_ms'], math_ms=prof_local['math_ms'],
+                                output_ms=prof_local['output_ms'])
 
                 return (sh, eh, sw, ew), block, prof_local
 
@@ -501,6 +556,16 @@ class FilmPipelineProcessor:
 
         # 记录总时间和性能分析
         profile['total_full_precision_ms'] = (time.time() - t_start) * 1000.0
+        tracer.complete("pipeline.full_precision", t_start, cat="pipeline", chunked=bool(chunked),
+                        shape=list(working_array.shape), tiles=len(tiles) if chunked else 1)
+        elapsed = profile['total_full_precision_ms'] / 1000.0
+        pixels = working_array.shape[0] * working_array.shape[1]
+        # 导出（use_optimization=False）与线程模式预览共用此管线，按 mode 区分
+        mode = "preview" if use_optimization else "export"
+        metrics.full_pipeline_duration.observe(elapsed, mode=mode, chunked="true" if chunked else "false")
+        metrics.full_pipeline_pixels.inc(pixels, mode=mode)
+        if elapsed > 0 and not use_optimization:
+            metrics.export_throughput.set(pixels / 1e6 / elapsed)
         self._last_profile = profile
 
         return image.copy_with_new_array(working_array)
@@ -0,0 +1,177 @@
+"""
+Preview Analysis - 随预览帧一起计算的逐帧分析
+
+分析在预览 worker（进程或线程池）中、在显示色彩空间转换之后完成，
+结果以紧凑形式放在结果图像的 metadata['analysis'] 中返回，GUI 线程只负责显示：
+
+- black_cutoff: 屏幕反光补偿导致的 black cut-off 像素
+  按行打包的位图，行宽按 32 位对齐，可直接包装为 QImage.Format_Mono
+- histogram: 显示空间的逐通道 RGB 直方图 + 工作空间（胶片扫描）的逐通道密度直方图
+  固定 HISTOGRAM_BINS 个 bin 的 uint32 数组，按 histogram_stride() 隔行隔列采样
+
+分带渲染时每条带分别分析，再由 merge_band_analyses() 合并（位图按行拼接、直方图相加）。
+"""
+
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+# 直方图 bin 数与密度直方图范围（D = -log10(透过率)）
+HISTOGRAM_BINS = 256
+DENSITY_RANGE = (0.0, 4.0)
+# 每帧直方图的目标采样像素数（超过时按步长隔行隔列采样）
+HISTOGRAM_SAMPLE_TARGET = 256 * 1024
+
+
+def compute_black_cutoff_mask(array: np.ndarray, compensation: float,
+                              monochrome: bool = False) -> Optional[np.ndarray]:
+    """检测应用补偿后会变成负值的像素（任一通道 pixel - compensation < 0）
+
+    Args:
+        array: 显示空间的结果图像（H, W[, C]）
+        compensation: 屏幕反光补偿量
+        monochrome: 是否按 BT.709 luminance 检测（与黑白显示一致）
+
+    Returns:
+        bool mask (H, W)；compensation <= 0 时返回 None
+    """
+    if compensation <= 0.0:
+        return None
+    if array.ndim == 3 and monochrome and array.shape[2] >= 3:
+        luminance = (0.2126 * array[:, :, 0] +
+                     0.7152 * array[:, :, 1] +
+                     0.0722 * array[:, :, 2])
+        return luminance < compensation
+    if array.ndim == 3:
+        return np.any(array < compensation, axis=2)
+    return array < compensation
+
+
+def pack_mask(mask: np.ndarray) -> Dict[str, Any]:
+    """把 bool mask 按行打包（MSB 在前，行宽补齐到 4 字节）
+
+    Returns:
+        dict: width / height / stride（每行字节数）/ bits（bytes）
+    """
+    height, width = mask.shape
+    stride = ((width + 31) // 32) * 4
+    packed = np.zeros((height, stride), dtype=np.uint8)
+    packed[:, :(width + 7) // 8] = np.packbits(mask, axis=1)
+    return {'width': width, 'height': height, 'stride': stride, 'bits': packed.tobytes()}
+
+
+def unpack_mask(packed: Dict[str, Any]) -> np.ndarray:
+    """pack_mask() 的逆操作，返回 bool mask (H, W)"""
+    rows = np.frombuffer(packed['bits'], dtype=np.uint8).reshape(packed['height'], packed['stride'])
+    return np.unpackbits(rows, axis=1, count=packed['width']).astype(bool)
+
+
+def histogram_stride(height: int, width: int) -> int:
+    """整帧尺寸对应的直方图采样步长（分带渲染时各带使用整帧的步长）"""
+    return max(1, int(np.ceil(np.sqrt(height * width / HISTOGRAM_SAMPLE_TARGET))))
+
+
+def _sample_pixels(array: np.ndarray, stride: int, row_offset: int) -> np.ndarray:
+    """按整帧坐标对齐的隔行隔列采样，返回 (N, C) 的颜色通道（最多 3 个）"""
+    start = (-row_offset) % stride
+    sample = array[start::stride, ::stride]
+    if sample.ndim == 2:
+        sample = sample[..., np.newaxis]
+    return sample[..., :3].reshape(-1, min(3, sample.shape[-1]))
+
+
+def _bin_counts(values: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """把 (N, C) 的值分到 HISTOGRAM_BINS 个 bin，返回 (C, HISTOGRAM_BINS) uint32"""
+    scale = HISTOGRAM_BINS / (hi - lo)
+    index = np.clip((values - lo) * scale, 0, HISTOGRAM_BINS - 1).astype(np.int32)
+    return np.stack([
+        np.bincount(index[:, c], minlength=HISTOGRAM_BINS) for c in range(index.shape[1])
+    ]).astype(np.uint32)
+
+
+def rgb_histograms(array: np.ndarray, stride: int = 1, row_offset: int = 0) -> np.ndarray:
+    """显示空间 [0, 1] 的逐通道直方图，(C, HISTOGRAM_BINS) uint32"""
+    values = _sample_pixels(array, stride, row_offset).astype(np.float32, copy=False)
+    return _bin_counts(values, 0.0, 1.0)
+
+
+def density_histograms(array: np.ndarray, stride: int = 1, row_offset: int = 0) -> np.ndarray:
+    """工作空间线性值的逐通道密度直方图（D = -log10(v)，范围 DENSITY_RANGE）"""
+    values = _sample_pixels(array, stride, row_offset).astype(np.float32)
+    lo, hi = DENSITY_RANGE
+    np.maximum(values, 10.0 ** (-hi), out=values)
+    np.log10(values, out=values)
+    np.negative(values, out=values)
+    return _bin_counts(values, lo, hi)
+
+
+def analyze_preview_frame(array: np.ndarray, analysis: Optional[Dict[str, Any]], params,
+                          monochrome: bool = False,
+                          density: Optional[np.ndarray] = None,
+                          stride: Optional[int] = None,
+                          row_offset: int = 0) -> Dict[str, Any]:
+    """按请求计算逐帧分析
+
+    Args:
+        array: 显示空间的结果图像
+        analysis: 请求的分析项，如 {'black_cutoff': True, 'histogram': True}；None 或空表示不分析
+        params: 本帧的 ColorGradingParams（black_cutoff 使用其 screen_glare_compensation）
+        monochrome: 是否按黑白显示检测
+        density: 渲染过程中已算好的密度直方图（见 density_histograms）
+        stride: 直方图采样步长（None 表示按 array 尺寸计算）
+        row_offset: array 第一行在整帧中的行号（分带渲染）
+
+    Returns:
+        dict: 可直接放入 metadata['analysis'] 的结果（可 pickle）
+    """
+    result: Dict[str, Any] = {}
+    if not analysis:
+        return result
+
+    if analysis.get('black_cutoff'):
+        compensation = float(getattr(params, 'screen_glare_compensation', 0.0))
+        mask = compute_black_cutoff_mask(array, compensation, monochrome)
+        entry: Dict[str, Any] = {'compensation': compensation}
+        if mask is not None:
+            entry.update(pack_mask(mask))
+        result['black_cutoff'] = entry
+
+    if analysis.get('histogram'):
+        if stride is None:
+            stride = histogram_stride(*array.shape[:2])
+        result['histogram'] = {
+            'rgb': rgb_histograms(array, stride, row_offset),
+            'density': density,
+            'density_range': DENSITY_RANGE,
+        }
+
+    return result
+
+
+def merge_band_analyses(band_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """按带序合并分带分析结果（位图按行拼接、直方图相加）"""
+    if not band_results:
+        return {}
+    merged: Dict[str, Any] = {}
+
+    cutoff_bands = [r.get('black_cutoff') for r in band_results]
+    if all(c is not None for c in cutoff_bands):
+        entry: Dict[str, Any] = {'compensation': cutoff_bands[0]['compensation']}
+        if all('bits' in c for c in cutoff_bands):
+            entry.update({
+                'width': cutoff_bands[0]['width'],
+                'height': sum(c['height'] for c in cutoff_bands),
+                'stride': cutoff_bands[0]['stride'],
+                'bits': b''.join(c['bits'] for c in cutoff_bands),
+            })
+        merged['black_cutoff'] = entry
+
+    histogram_bands = [r.get('histogram') for r in band_results]
+    if all(h is not None for h in histogram_bands):
+        merged_histogram = dict(histogram_bands[0])
+        for key in ('rgb', 'density'):
+            parts = [h.get(key) for h in histogram_bands]
+            merged_histogram[key] = None if any(p is None for p in parts) else np.sum(parts, axis=0, dtype=np.uint32)
+        merged['histogram'] = merged_histogram
+
+    return merged
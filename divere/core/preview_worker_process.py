@@ -8,6 +8,7 @@ Preview Worker Process - 独立进程预览处理
 - 所有预览处理（density conversion, matrix, curves 等）在 worker 进程中进行
 - 切换图片时销毁旧进程，操作系统强制回收所有 heap 内存
 - 通过 shared_memory 传递大数组（proxy, result），通过 Queue 传递参数
+- 多核机器上由 PreviewWorkerPool 把每帧按水平带分给多个进程并行渲染
 
 无后效性保证：
 - 配置开关可以禁用进程隔离
@@ -17,28 +18,38 @@ Preview Worker Process - 独立进程预览处理
 参考文档：PROCESS_ISOLATION_ANALYSIS.md
 """
 
+import json
 import multiprocessing
 from multiprocessing import shared_memory, Queue, Process
 import queue
 import numpy as np
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import time
 import traceback
 import logging
 
+from divere.utils.tracing import traced, tracer
+from divere.utils import metrics
+from divere.utils.debug_logger import get_logger
+
 logger = logging.getLogger(__name__)
+_log = get_logger("WORKER")
 
 
-def _load_proxy_from_shm(shm_name: str, shape: tuple, dtype: str):
+def _load_proxy_from_shm(shm_name: str, shape: tuple, dtype: str, shared: bool = False):
     """从 shared memory 加载 proxy 图像
 
     Args:
         shm_name: shared memory 名称
         shape: 数组形状
         dtype: 数据类型
+        shared: True 时不拷贝，proxy 以只读视图直接映射 shared memory（分带渲染的 pool 成员：
+                每个成员只读取自己那条带，拷贝整幅会让内存随成员数成倍增长）。
+                主进程每次重载都新建 shm、只 unlink 旧的，映射期间内容不会变化。
 
     Returns:
-        ImageData: proxy 图像
+        (ImageData, SharedMemory 或 None)：shared=True 时返回仍打开的 shm，
+        由调用方在不再使用 proxy 后用 _release_proxy_shm() 关闭
 
     Raises:
         FileNotFoundError: 当 shared memory 不存在时（可能已被删除）
@@ -56,31 +67,353 @@ def _load_proxy_from_shm(shm_name: str, shape: tuple, dtype: str):
             f"The request will be skipped."
         ) from e
 
+    keep_open = False
     try:
         proxy_array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
 
+        if shared:
+            proxy_array.flags.writeable = False
+            keep_open = True
+            return ImageData(array=proxy_array, metadata={}), shm
+
         # 拷贝到 worker 进程内存（避免依赖主进程的 shm）
         proxy_image = ImageData(
             array=proxy_array.copy(),
             metadata={},
         )
 
-        return proxy_image
+        return proxy_image, None
     finally:
         # 确保 shared memory 被关闭（即使出错）
+        if not keep_open:
+            try:
+                shm.close()  # 不 unlink，主进程负责清理
+            except:
+                pass
+
+
+def _release_proxy_shm(shm) -> None:
+    """关闭 _load_proxy_from_shm(shared=True) 保持打开的 shm（调用前先丢弃 proxy 数组的引用）"""
+    if shm is None:
+        return
+    try:
+        shm.close()  # 不 unlink，主进程负责清理
+    except BufferError:
+        # 仍有视图引用映射（如尚未回收的中间结果），随 shm 对象回收时关闭
+        pass
+    except Exception:
+        pass
+
+
+def _shared_memory_rss_bytes(pid: int) -> int:
+    """进程 RSS 中属于 shared memory 映射的部分（Linux 的 RssShmem；其他平台返回 0）"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("RssShmem:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _band_rows(total_rows: int, index: int, count: int) -> tuple:
+    """把输出图像的 total_rows 行均分为 count 条水平带，返回第 index 条的 [r0, r1)"""
+    return total_rows * index // count, total_rows * (index + 1) // count
+
+
+def _band_source_view(array: np.ndarray, orientation: int, r0: int, r1: int) -> np.ndarray:
+    """返回旋转后输出行 [r0, r1) 对应的源数组视图（未旋转）
+
+    np.rot90(view, k) 与 np.rot90(array, k)[r0:r1] 完全一致，
+    因此每条带只需处理自己的源区域。
+    """
+    k = (orientation // 90) % 4 if orientation % 360 != 0 else 0
+    h, w = array.shape[:2]
+    if k == 0:
+        return array[r0:r1]
+    if k == 1:
+        return array[:, w - r1:w - r0]
+    if k == 2:
+        return array[h - r1:h - r0]
+    return array[:, r0:r1]
+
+
+def _stage_cache_key(source_token, request: dict, params, band_rows: Optional[tuple]) -> Optional[tuple]:
+    """密度阶段缓存的输入标识：源 proxy + 管线之前的全部变换（crop/带/IDT/色彩空间/旋转）"""
+    if source_token is None:
+        return None
+    crop_rect_norm = request.get('crop_rect_norm')
+    custom_colorspace_def = request.get('custom_colorspace_def')
+    return (
+        source_token,
+        tuple(float(v) for v in crop_rect_norm) if crop_rect_norm else None,
+        tuple(band_rows) if band_rows is not None else None,
+        int(request.get('orientation', 0)) % 360,
+        float(request.get('idt_gamma', 1.0)),
+        params.input_color_space_name,
+        json.dumps(custom_colorspace_def, sort_keys=True, default=str) if custom_colorspace_def else None,
+    )
+
+
+def _last_stage_cache_hit(the_enlarger) -> Optional[bool]:
+    """最近一次管线是否命中密度阶段缓存（未查询缓存时为 None）"""
+    hit = the_enlarger.pipeline_processor.get_last_profile().get('math/stage_cache_hit')
+    return None if hit is None else bool(hit)
+
+
+@traced("worker.render_preview", cat="worker")
+def _render_preview_image(source_image, request: dict, params, the_enlarger, color_space_manager,
+                          band_rows: Optional[tuple] = None, on_working_image=None,
+                          source_token=None):
+    """在 worker 进程中执行完整预览变换链，返回 DisplayP3 图像
+
+    Crop → IDT Gamma + 色彩空间变换（融合） → 旋转 → 胶片管线 → DisplayP3。
+    供 preview 与 auto_color 请求共用。
+
+    Args:
+        source_image: proxy 图像（不会被修改）
+        request: 请求字典（crop_rect_norm/orientation/idt_gamma 等）
+        params: ColorGradingParams 实例
+        the_enlarger: worker 内的 TheEnlarger
+        color_space_manager: worker 内的 ColorSpaceManager
+        band_rows: 只渲染输出图像的 [r0, r1) 行（多进程分带渲染），None 表示整幅
+        on_working_image: 可选回调，旋转后、胶片管线前以工作空间数组调用（用于密度直方图）
+        source_token: source_image 的标识（proxy 代次等）；提供时启用密度阶段缓存
+
+    Returns:
+        ImageData: DisplayP3 空间的结果图像
+    """
+    from divere.core.data_types import ImageData
+
+    crop_rect_norm = request.get('crop_rect_norm')
+    orientation = request.get('orientation', 0)
+    idt_gamma = request.get('idt_gamma', 1.0)
+    convert_to_monochrome = request.get('convert_to_monochrome', False)
+    custom_colorspace_def = request.get('custom_colorspace_def')
+
+    # === Step A: Crop ===
+    source_array = source_image.array
+    if crop_rect_norm:
+        x, y, w, h = crop_rect_norm
+        h_orig, w_orig = source_array.shape[:2]
+        x0 = int(round(x * w_orig))
+        y0 = int(round(y * h_orig))
+        x1 = int(round((x + w) * w_orig))
+        y1 = int(round((y + h) * h_orig))
+        x0 = max(0, min(w_orig - 1, x0))
+        x1 = max(x0 + 1, min(w_orig, x1))
+        y0 = max(0, min(h_orig - 1, y0))
+        y1 = max(y0 + 1, min(h_orig, y1))
+        source_array = source_array[y0:y1, x0:x1, :]
+
+    # === Step A.5: Band（只拷贝本带对应的源区域）===
+    if band_rows is not None:
+        source_array = _band_source_view(source_array, orientation, band_rows[0], band_rows[1])
+
+    # === Step B: 注册自定义色彩空间（如果需要）===
+    if custom_colorspace_def:
         try:
-            shm.close()  # 不 unlink，主进程负责清理
-        except:
+            cs_name = custom_colorspace_def.get('name')
+            primaries_xy = np.array(custom_colorspace_def.get('primaries_xy'), dtype=float)
+            white_point_xy = np.array(custom_colorspace_def.get('white_point_xy'), dtype=float)
+            gamma = float(custom_colorspace_def.get('gamma', 1.0))
+
+            # 在worker进程的ColorSpaceManager中注册自定义色彩空间
+            color_space_manager.register_custom_colorspace(
+                name=cs_name,
+                primaries_xy=primaries_xy,
+                white_point_xy=white_point_xy,
+                gamma=gamma
+            )
+        except Exception as e:
+            # 注册失败不应导致预览失败，记录错误并继续
+            logger.warning(f"Failed to register custom colorspace in worker: {e}")
+
+    # === Step C: IDT Gamma + 色彩空间变换（融合为一次分块遍历，直接读取 proxy 视图）===
+    source_view = ImageData(array=source_array, metadata=source_image.metadata.copy())
+    working_image = color_space_manager.input_to_working_space(
+        source_view, params.input_color_space_name, idt_gamma
+    )
+    if working_image is None:
+        # 不支持的通道布局：逐步变换
+        working_image = ImageData(array=source_array.copy(), metadata=source_view.metadata)
+        if abs(idt_gamma - 1.0) > 1e-6:
+            working_image.array = the_enlarger.pipeline_processor.math_ops.apply_power(
+                working_image.array, idt_gamma, use_optimization=True
+            )
+        working_image = color_space_manager.set_image_color_space(
+            working_image, params.input_color_space_name
+        )
+        working_image = color_space_manager.convert_to_working_space(
+            working_image, skip_gamma_inverse=True
+        )
+
+    # === Step D: Rotate ===
+    if orientation % 360 != 0:
+        k = (orientation // 90) % 4
+        if k != 0:
+            working_image.array = np.rot90(working_image.array, k=int(k))
+
+    if on_working_image is not None:
+        on_working_image(working_image.array)
+
+    # === Step E: Pipeline处理 ===
+    monochrome_converter = None
+    if convert_to_monochrome:
+        monochrome_converter = color_space_manager.convert_to_monochrome
+
+    result_image = the_enlarger.apply_full_pipeline(
+        working_image,
+        params,
+        convert_to_monochrome_in_idt=convert_to_monochrome,
+        monochrome_converter=monochrome_converter,
+        stage_cache_key=_stage_cache_key(source_token, request, params, band_rows),
+    )
+    return color_space_manager.convert_to_display_space(
+        result_image, "DisplayP3"
+    )
+
+
+def _downsample_proxy(proxy_image, max_size: int):
+    """将 proxy 缩小到最长边不超过 max_size（用于 auto_color 等分析型请求）"""
+    import cv2
+    from divere.core.data_types import ImageData
+
+    arr = proxy_image.array
+    h, w = arr.shape[:2]
+    scale = min(1.0, float(max_size) / float(max(h, w)))
+    if scale >= 1.0:
+        return proxy_image
+
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    # OpenCV 的 resize 不支持 float16
+    src = arr.astype(np.float32) if arr.dtype == np.float16 else arr
+    if not src.flags['C_CONTIGUOUS']:
+        src = np.ascontiguousarray(src)
+    small = cv2.resize(src, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    if small.ndim == 2:
+        small = small[..., np.newaxis]
+    return ImageData(array=small.astype(arr.dtype, copy=False), metadata=proxy_image.metadata.copy())
+
+
+def _full_output_size(proxy_shape: tuple, request: dict) -> tuple:
+    """计算全分辨率 proxy 经 crop/旋转 后的预览输出尺寸 (width, height)"""
+    h_orig, w_orig = proxy_shape[:2]
+    out_w, out_h = w_orig, h_orig
+    crop_rect_norm = request.get('crop_rect_norm')
+    if crop_rect_norm:
+        # 与 _render_preview_image 的 Step A 保持一致的取整规则
+        x, y, w, h = crop_rect_norm
+        x0 = max(0, min(w_orig - 1, int(round(x * w_orig))))
+        x1 = max(x0 + 1, min(w_orig, int(round((x + w) * w_orig))))
+        y0 = max(0, min(h_orig - 1, int(round(y * h_orig))))
+        y1 = max(y0 + 1, min(h_orig, int(round((y + h) * h_orig))))
+        out_w, out_h = x1 - x0, y1 - y0
+    if ((request.get('orientation', 0) // 90) % 4) % 2 == 1:
+        out_w, out_h = out_h, out_w
+    return out_w, out_h
+
+
+def _run_auto_color_iterations(small_proxy, request: dict, params, the_enlarger, color_space_manager,
+                               source_token=None) -> dict:
+    """在 worker 进程内执行 AI 自动校色的不动点迭代
+
+    与 ApplicationContext._perform_auto_color_iteration 的更新规则一致：
+    delta = gains × (gamma / 2)，rgb_gains 限制在 [-3, 3]，变化量小于 1e-3 视为收敛。
+    每次迭代只渲染小尺寸 proxy，不经过 shared memory 和 Qt 信号；
+    迭代间只有 rgb_gains 变化，提供 source_token 时复用密度阶段缓存。
+
+    Returns:
+        dict: auto_color_result 消息
+    """
+    t0 = time.time()
+    max_iterations = int(request.get('max_iterations', 10))
+    current_gains = np.array(params.rgb_gains, dtype=float)
+    gamma = float(params.density_gamma)
+    iterations = 0
+    converged = False
+
+    for _ in range(max_iterations):
+        iter_params = params.shallow_copy()
+        iter_params.rgb_gains = tuple(float(g) for g in current_gains)
+        preview = _render_preview_image(small_proxy, request, iter_params, the_enlarger, color_space_manager,
+                                        source_token=source_token)
+
+        gains_t = the_enlarger.calculate_auto_gain_learning_based(preview)
+        delta = np.array(gains_t[:3], dtype=float) * (gamma / 2.0)
+        new_gains = np.clip(current_gains + delta, -3.0, 3.0)
+        iterations += 1
+
+        if np.allclose(current_gains, new_gains, atol=1e-3):
+            converged = True
+            break
+        current_gains = new_gains
+
+    return {
+        'status': 'auto_color_result',
+        'rgb_gains': [float(g) for g in current_gains],
+        'iterations': iterations,
+        'converged': converged,
+        'elapsed_ms': (time.time() - t0) * 1000.0,
+    }
+
+
+def _band_buffer_layout(shape: tuple) -> tuple:
+    """分带共享结果缓冲区布局：float32 数组后紧跟同形状的 uint8 显示帧
+
+    Returns:
+        (float 区字节数, 总字节数)
+    """
+    count = int(np.prod(shape))
+    return count * 4, count * 5
+
+
+def _write_band_result(band: dict, band_array: np.ndarray, band_rgb8: np.ndarray):
+    """把一条带的渲染结果与 8-bit 显示帧写入共享结果缓冲区（通道数为上限）"""
+    shape = tuple(band['shape'])
+    float_nbytes, _ = _band_buffer_layout(shape)
+    shm = shared_memory.SharedMemory(name=band['shm_name'])
+    try:
+        buf = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        buf8 = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=float_nbytes)
+        if band_array.ndim == 2:
+            band_array = band_array[..., np.newaxis]
+        if band_rgb8.ndim == 2:
+            band_rgb8 = band_rgb8[..., np.newaxis]
+        r0, r1 = band['rows']
+        buf[r0:r1, :, :band_array.shape[2]] = band_array
+        buf8[r0:r1, :, :band_rgb8.shape[2]] = band_rgb8
+        del buf, buf8
+    finally:
+        shm.close()
+
+
+def _put_result(queue_result: Queue, notify_conn, message: dict):
+    """放入结果并通知主进程
+
+    通知失败不影响结果本身，主进程仍可通过轮询取回。
+    启用追踪时附带本进程自上一条消息以来的 span（主进程合并导出）。
+    """
+    if tracer.enabled:
+        message['trace_events'] = tracer.drain()
+    queue_result.put(message)
+    if notify_conn is not None:
+        try:
+            notify_conn.send_bytes(b'\x01')
+        except Exception:
             pass
 
 
 def _worker_main_loop(
     queue_request: Queue,
     queue_result: Queue,
-    proxy_shm_name: str,
+    proxy_shm_name: Optional[str],
     proxy_shape: tuple,
     proxy_dtype: str,
     init_config: dict,
+    notify_conn=None,
 ):
     """Worker 进程的主循环（在独立进程中运行）
 
@@ -90,14 +423,26 @@ def _worker_main_loop(
     Args:
         queue_request: 请求队列（主进程 → worker）
         queue_result: 结果队列（worker → 主进程）
-        proxy_shm_name: proxy 图片的 shared memory 名称
+        proxy_shm_name: proxy 图片的 shared memory 名称（None 表示备用 worker，等待 reload_proxy）
         proxy_shape: proxy 数组形状
         proxy_dtype: proxy 数据类型
-        init_config: 初始化配置（色彩空间、管线配置等）
+        init_config: 初始化配置（config_snapshot: 序列化的配置快照，见 divere.utils.config_snapshot）
+        notify_conn: 结果通知管道的写端（可选，每放入一条结果写入一条消息）
     """
+    t_start = time.time()
     try:
         # ============ Step 1: 初始化（在 worker 进程中） ============
+        # 安装主进程传来的配置快照：之后创建的 ColorSpaceManager/TheEnlarger 不再扫描、解析配置文件
+        snapshot_blob = init_config.get('config_snapshot')
+        if snapshot_blob is not None:
+            from divere.utils.config_snapshot import install_config_snapshot
+            install_config_snapshot(snapshot_blob)
+        if init_config.get('trace'):
+            import os
+            tracer.start(process_name=f"preview worker {os.getpid()}")
+
         from divere.core.the_enlarger import TheEnlarger
+        from divere.core.preview_analysis import analyze_preview_frame, histogram_stride, density_histograms
         from divere.core.color_space import ColorSpaceManager
         from divere.core.data_types import ImageData, ColorGradingParams
 
@@ -108,18 +453,25 @@ def _worker_main_loop(
         # ============ Step 2: 加载 proxy 从 shared memory ============
         # 增加容错和重试机制：快速切换图片时，初始 proxy 可能已被删除
         proxy_image = None
+        # pool 成员以只读视图映射 proxy（见 _load_proxy_from_shm），持有的 shm 在重载/退出时关闭
+        share_proxy = bool(init_config.get('share_proxy'))
+        proxy_shm = None
         max_retries = 2
         retry_delay = 0.1  # 100ms
 
+        # 备用 worker（standby）启动时没有 proxy，直接等待 reload_proxy 请求
+        if proxy_shm_name is None:
+            max_retries = 0
+
         for attempt in range(max_retries):
             try:
-                proxy_image = _load_proxy_from_shm(proxy_shm_name, proxy_shape, proxy_dtype)
+                proxy_image, proxy_shm = _load_proxy_from_shm(proxy_shm_name, proxy_shape, proxy_dtype,
+                                                              shared=share_proxy)
                 break  # 加载成功，退出重试循环
             except FileNotFoundError as e:
                 if attempt < max_retries - 1:
                     # 还有重试机会，等待后重试
                     logger.info(f"Initial proxy not found (attempt {attempt + 1}/{max_retries}), retrying after {retry_delay}s...")
-                    import time
                     time.sleep(retry_delay)
                 else:
                     # 最后一次尝试也失败，进入优雅降级模式
@@ -128,10 +480,25 @@ def _worker_main_loop(
                                    f"This is normal during rapid image switching.")
                     # proxy_image 保持为 None，等待 reload_proxy 请求
 
+        # 通知主进程初始化完成（用于冷启动耗时统计）
+        _put_result(queue_result, notify_conn, {
+            'status': 'worker_ready',
+            'init_ms': (time.time() - t_start) * 1000.0,
+        })
+
+        # auto_color 使用的小尺寸 proxy 缓存（reload_proxy 时失效）
+        auto_color_proxy = None
+        # 交互拖动期间使用的降采样 proxy 缓存（reload_proxy 或缩放比例变化时失效）
+        interactive_proxy = None
+        interactive_proxy_scale = 1.0
+        # proxy 代次（reload_proxy 时递增），作为密度阶段缓存的输入标识
+        proxy_generation = 0
+
         # ============ Step 3: 主循环：处理预览请求 ============
         while True:
             # 3.1 接收请求
             request = queue_request.get()  # 阻塞等待
+            t_dequeue = time.time()
 
             # 3.2 停止信号
             if request is None:
@@ -150,22 +517,29 @@ def _worker_main_loop(
                     # 释放旧 proxy 内存
                     if proxy_image is not None and hasattr(proxy_image, 'array'):
                         proxy_image.array = None
+                    auto_color_proxy = None
+                    interactive_proxy = None
+                    the_enlarger.pipeline_processor.math_ops.clear_density_stage_cache()
+                    _release_proxy_shm(proxy_shm)
+                    proxy_shm = None
 
                     # 重新加载 proxy
-                    proxy_image = _load_proxy_from_shm(new_shm_name, new_shape, new_dtype)
-                    queue_result.put({'status': 'proxy_reloaded'})
+                    proxy_image, proxy_shm = _load_proxy_from_shm(new_shm_name, new_shape, new_dtype,
+                                                                  shared=share_proxy)
+                    proxy_generation += 1
+                    _put_result(queue_result, notify_conn, {'status': 'proxy_reloaded'})
                 except FileNotFoundError as e:
                     # Shared memory 不存在（已被删除）—— 这是快速切换图片时的正常情况
                     # 跳过这个过时的请求，不报错给用户（避免干扰体验）
                     logger.info(f"Skipping stale reload_proxy request: {e}")
-                    queue_result.put({
+                    _put_result(queue_result, notify_conn, {
                         'status': 'proxy_reload_skipped',
                         'message': 'Stale reload request skipped (shared memory already deleted)'
                     })
                 except Exception as e:
                     # 其他错误（真正的问题）
                     logger.error(f"Failed to reload proxy: {e}")
-                    queue_result.put({
+                    _put_result(queue_result, notify_conn, {
                         'status': 'error',
                         'message': f"Failed to reload proxy: {e}",
                         'traceback': traceback.format_exc()
@@ -179,23 +553,72 @@ def _worker_main_loop(
                     import os
                     process = psutil.Process(os.getpid())
                     mem_info = process.memory_info()
-                    queue_result.put({
+                    _put_result(queue_result, notify_conn, {
                         'status': 'memory_info',
                         'rss_mb': mem_info.rss / 1024 / 1024,
                         'vms_mb': mem_info.vms / 1024 / 1024
                     })
                 except ImportError:
-                    queue_result.put({
+                    _put_result(queue_result, notify_conn, {
                         'status': 'error',
                         'message': 'psutil not available'
                     })
                 except Exception as e:
-                    queue_result.put({
+                    _put_result(queue_result, notify_conn, {
                         'status': 'error',
                         'message': f"Failed to get memory: {e}"
                     })
                 continue
 
+            # === 处理 auto_color 请求（整个迭代在 worker 内完成）===
+            if action == 'auto_color':
+                if proxy_image is None:
+                    _put_result(queue_result, notify_conn, {
+                        'status': 'error',
+                        'message': 'Proxy image not loaded. Waiting for reload_proxy request.',
+                        'skippable': True
+                    })
+                    continue
+                try:
+                    if auto_color_proxy is None:
+                        auto_color_proxy = _downsample_proxy(
+                            proxy_image, int(request.get('proxy_size', 256))
+                        )
+                    params = ColorGradingParams.from_dict(request['params'])
+                    _put_result(queue_result, notify_conn, _run_auto_color_iterations(
+                        auto_color_proxy, request, params, the_enlarger, color_space_manager,
+                        source_token=('auto_color', proxy_generation)
+                    ))
+                except Exception as e:
+                    _put_result(queue_result, notify_conn, {
+                        'status': 'error',
+                        'message': f"Auto color failed: {e}",
+                        'traceback': traceback.format_exc()
+                    })
+                continue
+
+            # === 处理 detail_tile 请求（放大查看时的全分辨率细节块，源区域由主进程随请求传来）===
+            if action == 'detail_tile':
+                rgb8 = None
+                message = None
+                try:
+                    from divere.core.viewport_tiles import render_detail_tile
+                    rgb8 = render_detail_tile(
+                        request['source'], request, ColorGradingParams.from_dict(request['params']),
+                        the_enlarger, color_space_manager, monochrome=request.get('monochrome', False)
+                    )
+                    tracer.complete("worker.detail_tile", t_dequeue, cat="worker")
+                except Exception as e:
+                    message = f"Detail tile failed: {e}"
+                    logger.warning(message)
+                _put_result(queue_result, notify_conn, {
+                    'status': 'detail_tile_result',
+                    'ticket': request.get('ticket'),
+                    'rgb8': rgb8,
+                    'message': message,
+                })
+                continue
+
             # === 处理 preview 请求 ===
             if action != 'preview':
                 # 未知 action，忽略
@@ -204,7 +627,7 @@ def _worker_main_loop(
             # 检查 proxy_image 是否已加载（可能在快速切换时还未加载）
             if proxy_image is None:
                 logger.info("Preview request received but proxy not loaded yet. Skipping...")
-                queue_result.put({
+                _put_result(queue_result, notify_conn, {
                     'status': 'error',
                     'message': 'Proxy image not loaded. Waiting for reload_proxy request.',
                     'skippable': True  # 标记为可跳过的错误（不需要显示给用户）
@@ -212,87 +635,106 @@ def _worker_main_loop(
                 continue
 
             params = ColorGradingParams.from_dict(request['params'])
-            crop_rect_norm = request.get('crop_rect_norm')
             orientation = request.get('orientation', 0)
-            idt_gamma = request.get('idt_gamma', 1.0)
-            convert_to_monochrome = request.get('convert_to_monochrome', False)
             display_metadata = request.get('display_metadata', {})
-            custom_colorspace_def = request.get('custom_colorspace_def')
+
+            # 交互拖动期间：在降采样 proxy 上渲染，再放大回全尺寸（保证UI坐标一致）
+            preview_scale = float(request.get('preview_scale', 1.0))
 
             # 3.4 动态准备proxy（每次根据请求参数执行完整变换链）
             try:
-                # === Step A: Crop ===
-                working_image = ImageData(
-                    array=proxy_image.array.copy(),
-                    metadata=proxy_image.metadata.copy()
+                source_image = proxy_image
+                if preview_scale < 1.0:
+                    if interactive_proxy is None or interactive_proxy_scale != preview_scale:
+                        long_edge = max(proxy_image.array.shape[:2])
+                        interactive_proxy = _downsample_proxy(
+                            proxy_image, max(16, int(long_edge * preview_scale))
+                        )
+                        interactive_proxy_scale = preview_scale
+                    source_image = interactive_proxy
+
+                band = request.get('band')
+                analysis = request.get('analysis') or {}
+
+                # 直方图按整帧坐标采样，分带结果相加后与单进程一致
+                hist_stride = None
+                row_offset = 0
+                density_result = {}
+                on_working_image = None
+                if analysis.get('histogram'):
+                    if band:
+                        full_h, full_w = band['shape'][:2]
+                        row_offset = band['rows'][0]
+                    else:
+                        full_w, full_h = _full_output_size(source_image.array.shape, request)
+                    hist_stride = histogram_stride(full_h, full_w)
+
+                    def on_working_image(working_array):
+                        density_result['density'] = density_histograms(working_array, hist_stride, row_offset)
+
+                source_token = ('preview', proxy_generation,
+                                preview_scale if source_image is not proxy_image else 1.0)
+                result_image = _render_preview_image(
+                    source_image, request, params, the_enlarger, color_space_manager,
+                    band_rows=tuple(band['rows']) if band else None,
+                    on_working_image=on_working_image,
+                    source_token=source_token
                 )
 
-                if crop_rect_norm:
-                    x, y, w, h = crop_rect_norm
-                    h_orig, w_orig = working_image.array.shape[:2]
-                    x0 = int(round(x * w_orig))
-                    y0 = int(round(y * h_orig))
-                    x1 = int(round((x + w) * w_orig))
-                    y1 = int(round((y + h) * h_orig))
-                    x0 = max(0, min(w_orig - 1, x0))
-                    x1 = max(x0 + 1, min(w_orig, x1))
-                    y0 = max(0, min(h_orig - 1, y0))
-                    y1 = max(y0 + 1, min(h_orig, y1))
-                    working_image.array = working_image.array[y0:y1, x0:x1, :].copy()
-
-                # === Step B: IDT Gamma ===
-                if abs(idt_gamma - 1.0) > 1e-6:
-                    working_image.array = the_enlarger.pipeline_processor.math_ops.apply_power(
-                        working_image.array, idt_gamma, use_optimization=True
+                # 随帧分析（black cut-off、直方图等），结果放在 metadata['analysis']
+                if analysis:
+                    result_image.metadata['analysis'] = analyze_preview_frame(
+                        result_image.array, analysis, params,
+                        request.get('convert_to_monochrome', False),
+                        density=density_result.get('density'),
+                        stride=hist_stride,
+                        row_offset=row_offset
                     )
 
-                # === Step B.5: 注册自定义色彩空间（如果需要）===
-                if custom_colorspace_def:
-                    try:
-                        cs_name = custom_colorspace_def.get('name')
-                        primaries_xy = np.array(custom_colorspace_def.get('primaries_xy'), dtype=float)
-                        white_point_xy = np.array(custom_colorspace_def.get('white_point_xy'), dtype=float)
-                        gamma = float(custom_colorspace_def.get('gamma', 1.0))
-
-                        # 在worker进程的ColorSpaceManager中注册自定义色彩空间
-                        color_space_manager.register_custom_colorspace(
-                            name=cs_name,
-                            primaries_xy=primaries_xy,
-                            white_point_xy=white_point_xy,
-                            gamma=gamma
-                        )
-                    except Exception as e:
-                        # 注册失败不应导致预览失败，记录错误并继续
-                        logger.warning(f"Failed to register custom colorspace in worker: {e}")
-
-                # === Step C: Color Transform ===
-                working_image = color_space_manager.set_image_color_space(
-                    working_image, params.input_color_space_name
-                )
-                working_image = color_space_manager.convert_to_working_space(
-                    working_image, skip_gamma_inverse=True
-                )
-
-                # === Step D: Rotate ===
-                if orientation % 360 != 0:
-                    k = (orientation // 90) % 4
-                    if k != 0:
-                        working_image.array = np.rot90(working_image.array, k=int(k))
-
-                # === Step E: Pipeline处理 ===
-                monochrome_converter = None
-                if convert_to_monochrome:
-                    monochrome_converter = color_space_manager.convert_to_monochrome
-
-                result_image = the_enlarger.apply_full_pipeline(
-                    working_image,
-                    params,
-                    convert_to_monochrome_in_idt=convert_to_monochrome,
-                    monochrome_converter=monochrome_converter,
-                )
-                result_image = color_space_manager.convert_to_display_space(
-                    result_image, "DisplayP3"
-                )
+                # 分带渲染：直接写入主进程分配的共享结果缓冲区
+                if band:
+                    result_image.metadata['orientation'] = orientation
+                    result_image.metadata['global_orientation'] = orientation
+                    result_image.metadata.update(display_metadata)
+                    band_array = result_image.array
+                    band_rgb8 = result_image.build_display_rgb8()
+                    _write_band_result(band, band_array, band_rgb8)
+                    t_rendered = time.time()
+                    tracer.complete("worker.preview_request", t_dequeue, t_rendered, cat="worker",
+                                    band=band['index'], frame_id=band['frame_id'],
+                                    queue_wait_ms=(t_dequeue - request.get('timestamp', t_dequeue)) * 1000.0)
+                    _put_result(queue_result, notify_conn, {
+                        'status': 'band_done',
+                        'frame_id': band['frame_id'],
+                        'band': band['index'],
+                        'ndim': band_array.ndim,
+                        'channels': band_array.shape[2] if band_array.ndim == 3 else 1,
+                        'dtype': str(band_array.dtype),
+                        'rgb8_ndim': band_rgb8.ndim,
+                        'rgb8_channels': band_rgb8.shape[2] if band_rgb8.ndim == 3 else 1,
+                        'color_space': result_image.color_space,
+                        'metadata': result_image.metadata,
+                        'timing': {
+                            'requested_at': request.get('timestamp', t_dequeue),
+                            'dequeued_at': t_dequeue,
+                            'render_ms': (t_rendered - t_dequeue) * 1000.0,
+                            'sent_at': time.time(),
+                            'stage_cache_hit': _last_stage_cache_hit(the_enlarger),
+                        }
+                    })
+                    continue
+
+                if source_image is not proxy_image:
+                    import cv2
+                    out_w, out_h = _full_output_size(proxy_image.array.shape, request)
+                    coarse = result_image.array
+                    # OpenCV 的 resize 不支持 float16
+                    src = coarse.astype(np.float32) if coarse.dtype == np.float16 else np.ascontiguousarray(coarse)
+                    result_image.array = cv2.resize(
+                        src, (out_w, out_h), interpolation=cv2.INTER_LINEAR
+                    ).astype(coarse.dtype, copy=False)
+                    result_image.width, result_image.height = out_w, out_h
+                    result_image.metadata['preview_scale'] = preview_scale
 
                 # 添加orientation到metadata供UI使用（用于正确显示crop overlay）
                 result_image.metadata['orientation'] = orientation
@@ -301,10 +743,14 @@ def _worker_main_loop(
                 # 合并主进程传递的display_metadata（包含crop_focused, crop_overlay等显示状态）
                 result_image.metadata.update(display_metadata)
 
-                # 3.5 通过 shared memory 返回结果
+                # 3.5 量化为显示用 8-bit 帧（GUI 线程可直接包装成 QImage）
+                rgb8 = result_image.build_display_rgb8()
+
+                # 3.6 通过 shared memory 返回结果：float 数组后紧跟 8-bit 显示帧
+                float_nbytes = result_image.array.nbytes
                 result_shm = shared_memory.SharedMemory(
                     create=True,
-                    size=result_image.array.nbytes
+                    size=float_nbytes + rgb8.nbytes
                 )
                 result_shm_array = np.ndarray(
                     result_image.array.shape,
@@ -312,27 +758,52 @@ def _worker_main_loop(
                     buffer=result_shm.buf
                 )
                 np.copyto(result_shm_array, result_image.array)
-
-                # 3.6 发送结果元数据
-                queue_result.put({
+                rgb8_shm_array = np.ndarray(
+                    rgb8.shape, np.uint8, buffer=result_shm.buf, offset=float_nbytes
+                )
+                np.copyto(rgb8_shm_array, rgb8)
+                del result_shm_array, rgb8_shm_array
+                t_rendered = time.time()
+                tracer.complete("worker.preview_request", t_dequeue, t_rendered, cat="worker",
+                                preview_scale=preview_scale,
+                                queue_wait_ms=(t_dequeue - request.get('timestamp', t_dequeue)) * 1000.0)
+
+                # 3.7 发送结果元数据（附带逐帧计时：排队等待 / 渲染 / 投递）
+                _put_result(queue_result, notify_conn, {
                     'status': 'success',
                     'shm_name': result_shm.name,
                     'shape': list(result_image.array.shape),
                     'dtype': str(result_image.array.dtype),
-                    'metadata': result_image.metadata
+                    'rgb8_shape': list(rgb8.shape),
+                    'rgb8_offset': float_nbytes,
+                    'color_space': result_image.color_space,
+                    'metadata': result_image.metadata,
+                    'timing': {
+                        'requested_at': request.get('timestamp', t_dequeue),
+                        'dequeued_at': t_dequeue,
+                        'render_ms': (t_rendered - t_dequeue) * 1000.0,
+                        'sent_at': time.time(),
+                        'stage_cache_hit': _last_stage_cache_hit(the_enlarger),
+                    }
                 })
 
             except Exception as e:
-                # 发送错误
-                queue_result.put({
+                # 发送错误（分带请求附带 frame_id，过时帧的错误由主进程忽略）
+                band = request.get('band')
+                _put_result(queue_result, notify_conn, {
                     'status': 'error',
                     'message': str(e),
-                    'traceback': traceback.format_exc()
+                    'traceback': traceback.format_exc(),
+                    'frame_id': band['frame_id'] if band else None,
                 })
 
+        # 停止信号：关闭仍映射着的 proxy shm
+        proxy_image = auto_color_proxy = interactive_proxy = None
+        _release_proxy_shm(proxy_shm)
+
     except Exception as e:
         # Worker 初始化失败
-        queue_result.put({
+        _put_result(queue_result, notify_conn, {
             'status': 'error',
             'message': f"Worker initialization failed: {e}",
             'traceback': traceback.format_exc()
@@ -346,6 +817,8 @@ class PreviewWorkerProcess:
     1. 创建时初始化队列和配置，但不启动进程
     2. start() 启动进程
     3. request_preview() 发送预览请求（非阻塞）
+       request_auto_color() 在 worker 内完成自动校色迭代（非阻塞）
+       request_detail_tile() 渲染一个放大查看用的细节块（非阻塞）
     4. try_get_result() 获取结果（非阻塞）
     5. shutdown() 优雅停止进程
 
@@ -361,18 +834,22 @@ class PreviewWorkerProcess:
 
     def __init__(
         self,
-        proxy_shm_name: str,
-        proxy_shape: tuple,
-        proxy_dtype: str,
-        init_config: Optional[Dict[str, Any]] = None
+        proxy_shm_name: Optional[str],
+        proxy_shape: Optional[tuple],
+        proxy_dtype: Optional[str],
+        init_config: Optional[Dict[str, Any]] = None,
+        notify_pipe: Optional[tuple] = None
     ):
         """初始化但不启动进程
 
         Args:
-            proxy_shm_name: shared memory 名称（proxy 已写入）
+            proxy_shm_name: shared memory 名称（proxy 已写入）；
+                为 None 时作为备用 worker 启动，完成初始化后等待 reload_proxy
             proxy_shape: proxy 数组形状
             proxy_dtype: proxy 数据类型
             init_config: 初始化配置（可选）
+            notify_pipe: 共享的 (读端, 写端) 通知管道（PreviewWorkerPool 的成员共用一个），
+                None 时自行创建
         """
         self.proxy_shm_name = proxy_shm_name
         self.proxy_shape = proxy_shape
@@ -382,6 +859,19 @@ class PreviewWorkerProcess:
         # IPC 组件
         self.queue_request = Queue(maxsize=2)  # 参数队列（限制大小避免积压）
         self.queue_result = Queue(maxsize=2)   # 结果队列
+        # 结果到达通知管道：worker 每放入一条结果写一条消息，主进程监听读端 fd（事件驱动，无需轮询）
+        if notify_pipe is None:
+            notify_pipe = multiprocessing.Pipe(duplex=False)
+        self._notify_recv, self._notify_send = notify_pipe
+
+        # 逐帧计时统计（排队等待 / 渲染 / 投递）
+        self._last_frame_timing: Dict[str, float] = {}
+        self._frame_timing_totals: Dict[str, float] = {'queue_wait_ms': 0.0, 'render_ms': 0.0, 'delivery_ms': 0.0}
+        self._frame_count = 0
+        self._stage_cache_counts: Dict[str, int] = {'hits': 0, 'misses': 0}
+
+        # worker 初始化耗时（worker_ready 消息到达后可用）
+        self.init_ms: Optional[float] = None
 
         self.process: Optional[Process] = None
 
@@ -394,6 +884,12 @@ class PreviewWorkerProcess:
         # proxy_reloaded 回调机制（用于事件驱动的shared memory清理）
         self._on_proxy_reloaded_callback = None
 
+        # auto_color 结果回调（worker 内迭代完成后触发）
+        self._on_auto_color_result_callback = None
+
+        # detail_tile 结果回调（每个细节块渲染完成后触发）
+        self._on_detail_tile_result_callback = None
+
         # Shared memory 泄漏追踪
         self._active_result_shm = set()  # 追踪未清理的 result shared memory
 
@@ -412,10 +908,56 @@ class PreviewWorkerProcess:
                 self.proxy_shape,
                 self.proxy_dtype,
                 self.init_config,
+                self._notify_send,
             )
         )
         self.process.start()
 
+    def seconds_since_last_request(self) -> float:
+        """距离上一次发送请求的秒数（尚未发送过请求时返回无穷大）"""
+        if self._last_request_time <= 0:
+            return float('inf')
+        return time.time() - self._last_request_time
+
+    def get_result_notify_fd(self) -> Optional[int]:
+        """获取结果通知管道读端的文件描述符（用于 QSocketNotifier）
+
+        Windows 上管道不是 socket/fd，返回 None，调用方应回退到定时轮询。
+        """
+        import sys
+        if sys.platform == 'win32':
+            return None
+        try:
+            return self._notify_recv.fileno()
+        except (OSError, ValueError):
+            return None
+
+    def drain_result_notifications(self) -> int:
+        """读空通知管道，返回已到达的结果条数"""
+        count = 0
+        try:
+            while self._notify_recv.poll():
+                self._notify_recv.recv_bytes()
+                count += 1
+        except (EOFError, OSError):
+            pass
+        return count
+
+    def get_frame_timing(self) -> Dict[str, Any]:
+        """获取逐帧计时统计
+
+        Returns:
+            dict: last 为最近一帧，avg 为平均值，frames 为帧数（单位 ms）；
+                stage_cache 为 worker 密度阶段缓存的逐帧命中统计
+        """
+        frames = self._frame_count
+        avg = {k: (v / frames if frames else 0.0) for k, v in self._frame_timing_totals.items()}
+        hits = self._stage_cache_counts['hits']
+        lookups = hits + self._stage_cache_counts['misses']
+        stage_cache = dict(self._stage_cache_counts, hit_rate=hits / lookups if lookups else 0.0)
+        return {'last': dict(self._last_frame_timing), 'avg': avg, 'frames': frames,
+                'stage_cache': stage_cache}
+
     def is_alive(self) -> bool:
         """检查 worker 进程是否存活"""
         return self.process is not None and self.process.is_alive()
@@ -491,6 +1033,22 @@ class PreviewWorkerProcess:
         """
         self._on_proxy_reloaded_callback = callback
 
+    def set_on_auto_color_result_callback(self, callback):
+        """设置 auto_color 结果的回调函数
+
+        Args:
+            callback: 回调函数，参数为结果字典（rgb_gains/iterations/converged/elapsed_ms）
+        """
+        self._on_auto_color_result_callback = callback
+
+    def set_on_detail_tile_result_callback(self, callback):
+        """设置 detail_tile 结果的回调函数
+
+        Args:
+            callback: 回调函数，参数为结果字典（ticket/rgb8，失败时 rgb8 为 None）
+        """
+        self._on_detail_tile_result_callback = callback
+
     def get_memory_usage(self) -> Optional[float]:
         """获取 worker 进程内存使用量（MB）
 
@@ -546,19 +1104,22 @@ class PreviewWorkerProcess:
                 import psutil
                 proc = psutil.Process(pid)
                 mem_info = proc.memory_info()
-                mem_mb = mem_info.rss / 1024 / 1024
+                rss = mem_info.rss
+                if self.init_config.get('share_proxy'):
+                    # 映射的 proxy shm 属于主进程，不计入 worker 自身的内存（否则成员越多越早触发重启）
+                    rss = max(0, rss - _shared_memory_rss_bytes(pid))
+                mem_mb = rss / 1024 / 1024
                 logger.debug(f"Worker PID {pid} memory (psutil): {mem_mb:.1f} MB")
                 return mem_mb
             except ImportError:
-                print(f"[WORKER] ⚠️  psutil not installed, cannot monitor memory. Install with: pip install psutil")
+                _log.warning("psutil not installed, cannot monitor memory. Install with: pip install psutil")
                 return None
 
         except Exception as e:
             # 其他异常也输出，方便调试
-            print(f"[WORKER] ⚠️  Failed to get memory usage: {e}")
-            logger.debug(f"Failed to get memory usage: {e}")
-            import traceback
-            traceback.print_exc()
+            _log.warning("Failed to get memory usage: %s", e)
+            if _log.debug_enabled:
+                _log.debug(traceback.format_exc)
             return None
 
     def request_preview(self, params,
@@ -567,7 +1128,10 @@ class PreviewWorkerProcess:
                         idt_gamma: float = 1.0,
                         convert_to_monochrome: bool = False,
                         display_metadata: dict = None,
-                        custom_colorspace_def: dict = None):
+                        custom_colorspace_def: dict = None,
+                        preview_scale: float = 1.0,
+                        band: Optional[dict] = None,
+                        analysis: Optional[dict] = None):
         """请求预览（非阻塞）
 
         只保留最新请求，丢弃旧的未处理请求（预览去重）
@@ -580,6 +1144,9 @@ class PreviewWorkerProcess:
             convert_to_monochrome: 是否转换为单色
             display_metadata: 显示状态元数据（crop_focused, crop_overlay等）
             custom_colorspace_def: 自定义色彩空间定义（用于动态注册的primaries）
+            preview_scale: 渲染分辨率的线性缩放比例（< 1 时在降采样 proxy 上渲染）
+            band: 分带渲染描述（由 PreviewWorkerPool 填写：frame_id/index/rows/shm_name/shape）
+            analysis: 随帧计算的分析项（见 preview_analysis.analyze_preview_frame）
         """
         # 检查 worker 是否存活，如果崩溃则尝试重启
         if not self.is_alive():
@@ -589,12 +1156,21 @@ class PreviewWorkerProcess:
                 logger.error("Worker process not alive and restart failed")
                 return
 
-        # 清空旧请求（只保留最新）
+        # 清空旧的 preview 请求（只保留最新），其他类型请求放回队列
+        kept_requests = []
         while not self.queue_request.empty():
             try:
-                self.queue_request.get_nowait()
+                old_request = self.queue_request.get_nowait()
+                if old_request and old_request.get('action') != 'preview':
+                    kept_requests.append(old_request)
             except queue.Empty:
                 break
+        for old_request in kept_requests:
+            try:
+                self.queue_request.put_nowait(old_request)
+            except queue.Full:
+                logger.warning("Queue full when putting back non-preview request")
+                break
 
         # 构建请求字典
         request_dict = {
@@ -606,6 +1182,9 @@ class PreviewWorkerProcess:
             'convert_to_monochrome': convert_to_monochrome,
             'display_metadata': display_metadata or {},
             'custom_colorspace_def': custom_colorspace_def,
+            'preview_scale': preview_scale,
+            'band': band,
+            'analysis': analysis,
             'timestamp': time.time()
         }
 
@@ -623,6 +1202,107 @@ class PreviewWorkerProcess:
             except:
                 pass
 
+    def request_auto_color(self, params,
+                           orientation: int = 0,
+                           idt_gamma: float = 1.0,
+                           convert_to_monochrome: bool = False,
+                           custom_colorspace_def: dict = None,
+                           max_iterations: int = 10,
+                           proxy_size: int = 256):
+        """请求在 worker 内执行迭代式 AI 自动校色（非阻塞）
+
+        结果通过 set_on_auto_color_result_callback() 注册的回调返回，
+        只包含收敛后的 rgb_gains，不返回图像。
+
+        Args:
+            params: ColorGradingParams 实例（迭代起点）
+            orientation: 旋转角度（0/90/180/270）
+            idt_gamma: IDT gamma 值
+            convert_to_monochrome: 是否转换为单色
+            custom_colorspace_def: 自定义色彩空间定义
+            max_iterations: 最大迭代次数
+            proxy_size: 迭代使用的小尺寸 proxy 最长边
+
+        Returns:
+            bool: 请求是否已放入队列（队列满或 worker 不可用时为 False）
+        """
+        if not self.is_alive():
+            if self._try_restart():
+                logger.info("Worker process restarted successfully")
+            else:
+                logger.error("Worker process not alive and restart failed")
+                return False
+
+        request_dict = {
+            'action': 'auto_color',
+            'params': params.to_full_dict(),
+            'crop_rect_norm': None,
+            'orientation': orientation,
+            'idt_gamma': idt_gamma,
+            'convert_to_monochrome': convert_to_monochrome,
+            'custom_colorspace_def': custom_colorspace_def,
+            'max_iterations': max_iterations,
+            'proxy_size': proxy_size,
+            'timestamp': time.time()
+        }
+
+        # 与 preview 请求相同：短超时，队列满时丢弃最旧的请求再试一次，不阻塞 GUI 线程
+        try:
+            self.queue_request.put(request_dict, timeout=0.1)
+            self._last_request_time = time.time()
+            return True
+        except queue.Full:
+            logger.warning("Request queue full, dropping old request")
+            try:
+                self.queue_request.get_nowait()
+                self.queue_request.put(request_dict, timeout=0.1)
+                self._last_request_time = time.time()
+                return True
+            except Exception:
+                logger.warning("Request queue full, cannot request auto color")
+                return False
+
+    def request_detail_tile(self, ticket, source: np.ndarray, params,
+                            orientation: int = 0,
+                            idt_gamma: float = 1.0,
+                            convert_to_monochrome: bool = False,
+                            custom_colorspace_def: dict = None,
+                            monochrome: bool = False) -> bool:
+        """请求渲染一个细节块（非阻塞）
+
+        结果通过 set_on_detail_tile_result_callback() 注册的回调返回（显示用 8-bit 帧）。
+
+        Args:
+            ticket: 调用方的请求标识，随结果原样返回
+            source: 细节块的源区域（viewport_tiles.detail_tile_source，随请求 pickle 传递）
+            params: ColorGradingParams 实例
+            monochrome: 显示端是否转为黑白
+
+        Returns:
+            bool: 请求是否已放入队列（队列满或 worker 不可用时为 False）
+        """
+        if not self.is_alive():
+            return False
+        request_dict = {
+            'action': 'detail_tile',
+            'ticket': ticket,
+            'source': source,
+            'params': params.to_full_dict(),
+            'crop_rect_norm': None,
+            'orientation': orientation,
+            'idt_gamma': idt_gamma,
+            'convert_to_monochrome': convert_to_monochrome,
+            'custom_colorspace_def': custom_colorspace_def,
+            'monochrome': monochrome,
+            'timestamp': time.time()
+        }
+        try:
+            self.queue_request.put_nowait(request_dict)
+        except queue.Full:
+            return False
+        self._last_request_time = time.time()
+        return True
+
     def _try_restart(self) -> bool:
         """尝试重启 worker 进程
 
@@ -651,6 +1331,7 @@ class PreviewWorkerProcess:
             # 验证启动成功
             if self.is_alive():
                 self._restart_count += 1
+                metrics.worker_restarts.inc(reason="crash")
                 return True
             else:
                 logger.error("Worker process failed to start after restart")
@@ -660,8 +1341,12 @@ class PreviewWorkerProcess:
             logger.error(f"Worker restart exception: {e}")
             return False
 
-    def try_get_result(self):
-        """尝试获取结果（非阻塞）
+    def try_get_result(self, timeout: float = 0.0):
+        """尝试获取结果
+
+        Args:
+            timeout: 等待时间（秒）。0 为非阻塞；收到通知后可给一个很短的超时，
+                     以覆盖 Queue 后台线程写入管道的延迟
 
         Returns:
             ImageData: 预览结果
@@ -677,11 +1362,39 @@ class PreviewWorkerProcess:
                 # 不自动重启，只记录警告（避免频繁重启）
                 # 用户下次操作时会触发重启
 
+        result_info = self._get_result_message(timeout)
+        if result_info is None:
+            return None
+        return self._handle_result_message(result_info)
+
+    def take_result_nowait(self):
+        """非阻塞地处理一条消息（供 GUI 线程在收到通知后调用）
+
+        Returns:
+            (是否取到消息, 与 try_get_result() 相同的返回值)。
+            通知先于 Queue 后台线程写入管道到达时返回 (False, None)，由调用方稍后重试。
+        """
+        result_info = self._get_result_message()
+        if result_info is None:
+            return False, None
+        return True, self._handle_result_message(result_info)
+
+    def _get_result_message(self, timeout: float = 0.0) -> Optional[dict]:
+        """从结果队列取出一条原始消息（没有消息时返回 None）"""
         try:
-            result_info = self.queue_result.get_nowait()
+            if timeout > 0:
+                message = self.queue_result.get(timeout=timeout)
+            else:
+                message = self.queue_result.get_nowait()
         except queue.Empty:
             return None
+        # worker 附带的追踪事件并入主进程
+        if isinstance(message, dict) and 'trace_events' in message:
+            tracer.merge(message.pop('trace_events'))
+        return message
 
+    def _handle_result_message(self, result_info: dict):
+        """处理一条结果消息，返回值同 try_get_result()"""
         # 处理错误消息
         if result_info['status'] == 'error':
             return Exception(result_info['message'])
@@ -693,6 +1406,24 @@ class PreviewWorkerProcess:
                 self._on_proxy_reloaded_callback()
             return None
 
+        # worker 初始化完成
+        if result_info['status'] == 'worker_ready':
+            self.init_ms = result_info.get('init_ms')
+            logger.info(f"Preview worker initialized in {self.init_ms:.0f}ms")
+            return None
+
+        # 处理 auto_color 结果（不是预览图像）
+        if result_info['status'] == 'auto_color_result':
+            if self._on_auto_color_result_callback is not None:
+                self._on_auto_color_result_callback(result_info)
+            return None
+
+        # 处理 detail_tile 结果（不是预览图像）
+        if result_info['status'] == 'detail_tile_result':
+            if self._on_detail_tile_result_callback is not None:
+                self._on_detail_tile_result_callback(result_info)
+            return None
+
         # 过滤其他内部消息（不是预览结果）
         if result_info['status'] in ('proxy_reload_skipped', 'memory_info'):
             # 内部状态消息，忽略并继续等待预览结果
@@ -713,6 +1444,7 @@ class PreviewWorkerProcess:
             self._active_result_shm.add(shm_name)
 
             shm = shared_memory.SharedMemory(name=shm_name)
+            metrics.shm_transferred.inc(shm.size)
             result_array = np.ndarray(
                 tuple(result_info['shape']),
                 dtype=result_info['dtype'],
@@ -724,6 +1456,14 @@ class PreviewWorkerProcess:
                 array=result_array.copy(),  # 拷贝到主进程内存
                 metadata=result_info['metadata']
             )
+            if 'color_space' in result_info:
+                result_image.color_space = result_info['color_space']
+            if 'rgb8_shape' in result_info:
+                result_image.display_rgb8 = np.ndarray(
+                    tuple(result_info['rgb8_shape']), dtype=np.uint8,
+                    buffer=shm.buf, offset=result_info['rgb8_offset']
+                ).copy()
+            del result_array
 
             # 立即清理 shared memory
             shm.close()
@@ -732,6 +1472,8 @@ class PreviewWorkerProcess:
             # 从追踪集合中移除
             self._active_result_shm.discard(shm_name)
 
+            self._record_frame_timing(result_info.get('timing'))
+
             return result_image
 
         except Exception as e:
@@ -746,6 +1488,32 @@ class PreviewWorkerProcess:
                 pass
             return Exception(f"Failed to read result: {e}")
 
+    def _record_frame_timing(self, timing: Optional[Dict[str, float]]):
+        """记录一帧的排队等待 / 渲染 / 投递耗时"""
+        if not timing:
+            return
+        now = time.time()
+        frame = {
+            'queue_wait_ms': max(0.0, (timing['dequeued_at'] - timing['requested_at']) * 1000.0),
+            'render_ms': timing['render_ms'],
+            'delivery_ms': max(0.0, (now - timing['sent_at']) * 1000.0),
+        }
+        self._last_frame_timing = frame
+        for k, v in frame.items():
+            self._frame_timing_totals[k] += v
+        self._frame_count += 1
+        metrics.preview_queue_wait_process.observe(frame['queue_wait_ms'] / 1000.0)
+        metrics.preview_render_process.observe(frame['render_ms'] / 1000.0)
+        metrics.preview_delivery.observe(frame['delivery_ms'] / 1000.0)
+        metrics.preview_latency_process.observe(max(0.0, now - timing['requested_at']))
+        stage_cache_hit = timing.get('stage_cache_hit')
+        if stage_cache_hit is not None:
+            self._stage_cache_counts['hits' if stage_cache_hit else 'misses'] += 1
+            (metrics.stage_cache_hits if stage_cache_hit else metrics.stage_cache_misses).inc()
+        # 每帧执行：% 参数延迟到 DEBUG 级别开启时才格式化
+        logger.debug("Preview frame timing: queue_wait=%.1fms, render=%.1fms, delivery=%.1fms",
+                     frame['queue_wait_ms'], frame['render_ms'], frame['delivery_ms'])
+
     def shutdown(self):
         """优雅停止进程（幂等操作）"""
         if self.process is None:
@@ -778,6 +1546,7 @@ class PreviewWorkerProcess:
         # 清理残留资源
         self._cleanup_queues()
         self._cleanup_leaked_shm()
+        self.drain_result_notifications()
 
     def _cleanup_queues(self):
         """清理队列和残留的 shared memory"""
@@ -819,3 +1588,338 @@ class PreviewWorkerProcess:
                 logger.debug(f"Failed to cleanup shared memory {shm_name}: {e}")
 
         self._active_result_shm.clear()
+
+
+class PreviewWorkerPool:
+    """多进程分带预览：每个成员进程渲染输出图像的一条水平带
+
+    对外接口与 PreviewWorkerProcess 一致（ApplicationContext 可直接替换使用）：
+    - 预览请求按输出行均分为 N 条带，分发给 N 个成员进程
+    - 主进程为每帧分配一块共享结果缓冲区，各成员直接写入自己的带
+    - 所有带完成后拼好的整帧从 try_get_result() 返回
+    - 交互拖动（preview_scale < 1）与 auto_color 请求只交给第一个成员处理
+    - 细节块请求轮流交给各成员
+
+    管线的每一步都是逐像素运算（与 PipelineProcessor 的分块路径相同），
+    因此分带结果与单进程结果完全一致。
+    """
+
+    # 同时等待中的帧上限（超过后丢弃最旧的帧）
+    MAX_PENDING_FRAMES = 4
+
+    def __init__(
+        self,
+        proxy_shm_name: Optional[str],
+        proxy_shape: Optional[tuple],
+        proxy_dtype: Optional[str],
+        init_config: Optional[Dict[str, Any]] = None,
+        num_workers: int = 2
+    ):
+        """初始化但不启动进程
+
+        Args:
+            proxy_shm_name: shared memory 名称（None 表示备用 pool，等待 reload_proxy）
+            proxy_shape: proxy 数组形状
+            proxy_dtype: proxy 数据类型
+            init_config: 初始化配置（可选）
+            num_workers: 成员进程数量（>= 1）
+        """
+        self.proxy_shape = proxy_shape
+        # 所有成员共用一个通知管道，主进程只需监听一个 fd
+        notify_pipe = multiprocessing.Pipe(duplex=False)
+        # 成员只读映射 proxy、不拷贝整幅（每个成员只渲染自己那条带）
+        member_config = dict(init_config or {}, share_proxy=True)
+        self._members: List[PreviewWorkerProcess] = [
+            PreviewWorkerProcess(proxy_shm_name, proxy_shape, proxy_dtype, member_config,
+                                 notify_pipe=notify_pipe)
+            for _ in range(max(1, int(num_workers)))
+        ]
+        for member in self._members:
+            member.set_on_proxy_reloaded_callback(self._on_member_proxy_reloaded)
+
+        self._frame_seq = 0
+        self._pending_frames: Dict[int, Dict[str, Any]] = {}
+        self._next_member = 0  # 轮询取结果的起始成员
+        self._next_detail_member = 0  # 下一个细节块交给的成员
+
+        self._on_proxy_reloaded_callback = None
+        self._proxy_reloaded_count = 0
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._members)
+
+    @property
+    def process(self) -> Optional[Process]:
+        """第一个成员的进程对象（用于日志中的 PID）"""
+        return self._members[0].process
+
+    @property
+    def init_ms(self) -> Optional[float]:
+        """所有成员初始化完成后的最长耗时"""
+        values = [m.init_ms for m in self._members]
+        if any(v is None for v in values):
+            return None
+        return max(values)
+
+    def start(self):
+        """启动所有成员进程"""
+        for member in self._members:
+            member.start()
+
+    def is_alive(self) -> bool:
+        return all(m.is_alive() for m in self._members)
+
+    def seconds_since_last_request(self) -> float:
+        return min(m.seconds_since_last_request() for m in self._members)
+
+    def get_result_notify_fd(self) -> Optional[int]:
+        return self._members[0].get_result_notify_fd()
+
+    def drain_result_notifications(self) -> int:
+        return self._members[0].drain_result_notifications()
+
+    def get_frame_timing(self) -> Dict[str, Any]:
+        # 整帧计时统一记录在第一个成员上
+        return self._members[0].get_frame_timing()
+
+    def get_memory_usage(self) -> Optional[float]:
+        """成员进程中最大的内存使用量（MB），与单进程的重启阈值语义一致"""
+        usages = [m.get_memory_usage() for m in self._members]
+        usages = [u for u in usages if u is not None]
+        return max(usages) if usages else None
+
+    def reload_proxy(self, proxy_shm_name: str, proxy_shape: tuple, proxy_dtype: str):
+        """所有成员重新加载 proxy；全部完成后触发 proxy_reloaded 回调"""
+        self.proxy_shape = proxy_shape
+        self._proxy_reloaded_count = 0
+        for member in self._members:
+            member.reload_proxy(proxy_shm_name, proxy_shape, proxy_dtype)
+
+    def set_on_proxy_reloaded_callback(self, callback):
+        self._on_proxy_reloaded_callback = callback
+
+    def set_on_auto_color_result_callback(self, callback):
+        self._members[0].set_on_auto_color_result_callback(callback)
+
+    def set_on_detail_tile_result_callback(self, callback):
+        for member in self._members:
+            member.set_on_detail_tile_result_callback(callback)
+
+    def _on_member_proxy_reloaded(self):
+        self._proxy_reloaded_count += 1
+        if self._proxy_reloaded_count >= len(self._members):
+            self._proxy_reloaded_count = 0
+            if self._on_proxy_reloaded_callback is not None:
+                self._on_proxy_reloaded_callback()
+
+    def request_auto_color(self, params, **kwargs) -> bool:
+        return self._members[0].request_auto_color(params, **kwargs)
+
+    def request_detail_tile(self, ticket, source: np.ndarray, params, **kwargs) -> bool:
+        """细节块轮流交给各成员渲染（从下一个成员开始，队列满时换下一个）"""
+        for offset in range(len(self._members)):
+            index = (self._next_detail_member + offset) % len(self._members)
+            if self._members[index].request_detail_tile(ticket, source, params, **kwargs):
+                self._next_detail_member = (index + 1) % len(self._members)
+                return True
+        return False
+
+    def request_preview(self, params,
+                        crop_rect_norm=None,
+                        orientation: int = 0,
+                        idt_gamma: float = 1.0,
+                        convert_to_monochrome: bool = False,
+                        display_metadata: dict = None,
+                        custom_colorspace_def: dict = None,
+                        preview_scale: float = 1.0,
+                        analysis: Optional[dict] = None):
+        """请求预览（非阻塞），参数同 PreviewWorkerProcess.request_preview()"""
+        kwargs = dict(
+            crop_rect_norm=crop_rect_norm,
+            orientation=orientation,
+            idt_gamma=idt_gamma,
+            convert_to_monochrome=convert_to_monochrome,
+            display_metadata=display_metadata,
+            custom_colorspace_def=custom_colorspace_def,
+            analysis=analysis,
+        )
+
+        # 降采样预览本身很快，分带的调度开销不划算
+        if preview_scale < 1.0 or self.proxy_shape is None or len(self._members) == 1:
+            self._members[0].request_preview(params, preview_scale=preview_scale, **kwargs)
+            return
+
+        out_w, out_h = _full_output_size(
+            self.proxy_shape, {'crop_rect_norm': crop_rect_norm, 'orientation': orientation}
+        )
+        channels = self.proxy_shape[2] if len(self.proxy_shape) == 3 else 1
+        shape = (out_h, out_w, channels)
+        count = min(len(self._members), out_h)
+
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=_band_buffer_layout(shape)[1])
+        except Exception as e:
+            logger.warning(f"Failed to allocate band result buffer, rendering in one worker: {e}")
+            self._members[0].request_preview(params, preview_scale=preview_scale, **kwargs)
+            return
+
+        self._frame_seq += 1
+        frame_id = self._frame_seq
+        self._pending_frames[frame_id] = {
+            'shm': shm,
+            'shape': shape,
+            'bands_left': set(range(count)),
+            'band_count': count,
+            'band_info': None,
+            'band_analyses': {},
+            'timings': [],
+        }
+        while len(self._pending_frames) > self.MAX_PENDING_FRAMES:
+            self._release_frame(min(self._pending_frames))
+
+        for index in range(count):
+            band = {
+                'frame_id': frame_id,
+                'index': index,
+                'rows': _band_rows(out_h, index, count),
+                'shm_name': shm.name,
+                'shape': shape,
+            }
+            self._members[index].request_preview(params, preview_scale=preview_scale, band=band, **kwargs)
+
+    def try_get_result(self, timeout: float = 0.0):
+        """处理一条成员消息，返回值同 PreviewWorkerProcess.try_get_result()
+
+        每次最多处理一条消息（与通知管道中的消息条数一一对应），
+        整帧只有在最后一条带到达时才返回。
+        """
+        deadline = time.time() + timeout
+        while True:
+            for offset in range(len(self._members)):
+                member = self._members[(self._next_member + offset) % len(self._members)]
+                message = member._get_result_message()
+                if message is None:
+                    continue
+                self._next_member = (self._next_member + offset + 1) % len(self._members)
+                return self._handle_member_message(member, message)
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.001)
+
+    def take_result_nowait(self):
+        """非阻塞地处理一条成员消息，返回值同 PreviewWorkerProcess.take_result_nowait()"""
+        for offset in range(len(self._members)):
+            member = self._members[(self._next_member + offset) % len(self._members)]
+            message = member._get_result_message()
+            if message is None:
+                continue
+            self._next_member = (self._next_member + offset + 1) % len(self._members)
+            return True, self._handle_member_message(member, message)
+        return False, None
+
+    def _handle_member_message(self, member: PreviewWorkerProcess, message: dict):
+        status = message.get('status')
+        if status == 'band_done':
+            return self._on_band_done(message)
+        if status == 'error' and message.get('frame_id') is not None:
+            frame_id = message['frame_id']
+            if frame_id not in self._pending_frames:
+                return None  # 过时帧的错误
+            self._release_frame(frame_id)
+            return Exception(message['message'])
+        return member._handle_result_message(message)
+
+    def _on_band_done(self, message: dict):
+        """记录一条带完成；整帧完成时拼出结果图像"""
+        frame_id = message['frame_id']
+        frame = self._pending_frames.get(frame_id)
+        if frame is None:
+            return None  # 过时帧（已被更新的帧取代）
+
+        frame['bands_left'].discard(message['band'])
+        frame['timings'].append(message.get('timing'))
+        band_analysis = message.get('metadata', {}).get('analysis')
+        if band_analysis is not None:
+            frame['band_analyses'][message['band']] = band_analysis
+        if frame['band_info'] is None:
+            frame['band_info'] = message
+        if frame['bands_left']:
+            return None
+
+        from divere.core.data_types import ImageData
+
+        info = frame['band_info']
+        shm = frame['shm']
+        try:
+            float_nbytes, _ = _band_buffer_layout(frame['shape'])
+            buf = np.ndarray(frame['shape'], dtype=np.float32, buffer=shm.buf)
+            buf8 = np.ndarray(frame['shape'], dtype=np.uint8, buffer=shm.buf, offset=float_nbytes)
+            result_array = buf[..., :info['channels']].astype(info['dtype'])
+            if info['ndim'] == 2:
+                result_array = result_array[..., 0]
+            # copy() 而不是 ascontiguousarray()：后者在切片已连续时返回视图，缓冲区释放后失效
+            if info['rgb8_ndim'] == 2:
+                rgb8 = buf8[..., 0].copy()
+            else:
+                rgb8 = buf8[..., :info['rgb8_channels']].copy()
+            del buf, buf8
+        finally:
+            self._release_frame(frame_id)
+
+        # 更早的帧已不再需要
+        for old_id in [fid for fid in self._pending_frames if fid < frame_id]:
+            self._release_frame(old_id)
+
+        timings = [t for t in frame['timings'] if t]
+        if timings:
+            self._members[0]._record_frame_timing({
+                'requested_at': min(t['requested_at'] for t in timings),
+                'dequeued_at': max(t['dequeued_at'] for t in timings),
+                'render_ms': max(t['render_ms'] for t in timings),
+                'sent_at': max(t['sent_at'] for t in timings),
+                # 所有带都命中才算整帧命中
+                'stage_cache_hit': (None if any(t.get('stage_cache_hit') is None for t in timings)
+                                    else all(t['stage_cache_hit'] for t in timings)),
+            })
+
+        metadata = dict(info['metadata'])
+        metadata['preview_bands'] = frame['band_count']
+        if frame['band_analyses']:
+            from divere.core.preview_analysis import merge_band_analyses
+            band_analyses = frame['band_analyses']
+            metadata['analysis'] = merge_band_analyses(
+                [band_analyses.get(i, {}) for i in range(frame['band_count'])]
+            )
+        result_image = ImageData(array=result_array, metadata=metadata, display_rgb8=rgb8)
+        result_image.color_space = info.get('color_space', result_image.color_space)
+        return result_image
+
+    def _release_frame(self, frame_id: int):
+        frame = self._pending_frames.pop(frame_id, None)
+        if frame is None:
+            return
+        try:
+            frame['shm'].close()
+            frame['shm'].unlink()
+        except Exception as e:
+            logger.debug(f"Failed to release band result buffer: {e}")
+
+    def shutdown(self):
+        """停止所有成员进程并释放结果缓冲区（幂等操作）"""
+        for member in self._members:
+            member.shutdown()
+        for frame_id in list(self._pending_frames):
+            self._release_frame(frame_id)
+
+
+def create_preview_worker(proxy_shm_name: Optional[str],
+                          proxy_shape: Optional[tuple],
+                          proxy_dtype: Optional[str],
+                          init_config: Optional[Dict[str, Any]] = None,
+                          num_workers: int = 1):
+    """创建预览 worker：num_workers > 1 时返回分带渲染的 PreviewWorkerPool"""
+    if num_workers > 1:
+        return PreviewWorkerPool(proxy_shm_name, proxy_shape, proxy_dtype, init_config,
+                                 num_workers=num_workers)
+    return PreviewWorkerProcess(proxy_shm_name, proxy_shape, proxy_dtype, init_config)
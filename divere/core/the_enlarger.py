@@ -6,8 +6,6 @@
 
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any, Union
-from scipy.ndimage import gaussian_filter
-from scipy.ndimage import binary_dilation
 import json
 from pathlib import Path
 import time
@@ -17,20 +15,28 @@ from .data_types import ImageData, ColorGradingParams, LUT3D, PreviewConfig
 from .math_ops import FilmMathOps
 from .pipeline_processor import FilmPipelineProcessor
 
-# 尝试导入深度学习白平衡相关模块（启动时静默，除非显式开启详细日志）
-try:
-    from ..models.deep_wb_wrapper import create_deep_wb_wrapper
-    DEEP_WB_AVAILABLE = True
-except ImportError:
-    try:
-        import os
-        _VERBOSE = bool(int(os.environ.get('DIVERE_VERBOSE', '0')))
-    except Exception:
-        _VERBOSE = False
-    if _VERBOSE:
-        print("Failed to import deep_wb_wrapper (optional dependency)")
-        traceback.print_exc()
-    DEEP_WB_AVAILABLE = False
+# 深度学习白平衡（onnxruntime）在首次使用时才导入，不拖慢启动
+_DEEP_WB_AVAILABLE: Optional[bool] = None
+
+
+def _deep_wb_available() -> bool:
+    """尝试导入深度学习白平衡相关模块（静默，除非显式开启详细日志），结果缓存"""
+    global _DEEP_WB_AVAILABLE
+    if _DEEP_WB_AVAILABLE is None:
+        try:
+            from ..models import deep_wb_wrapper  # noqa: F401
+            _DEEP_WB_AVAILABLE = True
+        except ImportError:
+            try:
+                import os
+                _VERBOSE = bool(int(os.environ.get('DIVERE_VERBOSE', '0')))
+            except Exception:
+                _VERBOSE = False
+            if _VERBOSE:
+                print("Failed to import deep_wb_wrapper (optional dependency)")
+                traceback.print_exc()
+            _DEEP_WB_AVAILABLE = False
+    return _DEEP_WB_AVAILABLE
 
 
 
@@ -45,15 +51,13 @@ class TheEnlarger:
             preview_config=self.preview_config
         )
         
-        # GPU加速器
-        self.gpu_accelerator = self.pipeline_processor.gpu_accelerator
-        
-        # 深度白平衡相关
+        # 深度白平衡相关（首次自动校色时加载）
         self._deep_wb_wrapper = None
 
-        # Deep WB 可选，不可用时保持静默，避免启动期噪声
-        if not DEEP_WB_AVAILABLE:
-            pass
+    @property
+    def gpu_accelerator(self):
+        """GPU加速器（首次访问时探测，见 FilmMathOps.gpu_accelerator）"""
+        return self.pipeline_processor.gpu_accelerator
 
     # =======================
     # 主要处理接口
@@ -64,7 +68,8 @@ class TheEnlarger:
                            for_export: bool = False,
                            chunked: Optional[bool] = None,
                            convert_to_monochrome_in_idt: bool = False,
-                           monochrome_converter: Optional[callable] = None) -> ImageData:
+                           monochrome_converter: Optional[callable] = None,
+                           stage_cache_key: Optional[Any] = None) -> ImageData:
         """
         应用完整处理管线（保持向后兼容的接口）
         
@@ -76,6 +81,7 @@ class TheEnlarger:
             chunked: 是否使用分块处理
             convert_to_monochrome_in_idt: 是否在IDT阶段转换为单色
             monochrome_converter: 单色转换函数
+            stage_cache_key: 预览输入图像的标识，用于复用密度阶段中间结果（导出时忽略）
             
         Returns:
             处理后的图像
@@ -93,7 +99,8 @@ class TheEnlarger:
             use_optimization=use_optimization,
             chunked=chunked_arg,
             convert_to_monochrome_in_idt=convert_to_monochrome_in_idt,
-            monochrome_converter=monochrome_converter
+            monochrome_converter=monochrome_converter,
+            stage_cache_key=None if for_export else stage_cache_key
         )
 
     def apply_preview_pipeline(self, image: ImageData, params: ColorGradingParams,
@@ -153,65 +160,128 @@ class TheEnlarger:
     def calculate_auto_gain_learning_based(self, image: ImageData) -> Tuple[float, float, float, float, float, float]:
         """
         使用深度学习模型计算自动白平衡的RGB增益。 cr: https://github.com/mahmoudnafifi/Deep_White_Balance/tree/master
-        
+
+        单张路径保持原有数值：PIL LANCZOS 缩放推理，结果缩放回原尺寸后在 uint8 图上比较均值。
+        整卷批量推理见 calculate_auto_gain_learning_based_batch()（letterbox，数值与此略有差异）。
+
         返回: (r_gain, g_gain, b_gain, r_illuminant, g_illuminant, b_illuminant)
         """
-        if not DEEP_WB_AVAILABLE:
-            return (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+        fallback = (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+        if not _deep_wb_available():
+            return fallback
 
         if image.array is None or image.array.size == 0:
-            return (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+            return fallback
 
         try:
-            # 确保图像数据在 [0, 255] 范围内
-            t0 = time.time()
-            img_uint8 = image.array.copy()
+            # 确保图像数据在 [0, 255] 范围内（只读，无需先复制）
+            img_uint8 = image.array
             if img_uint8.max() <= 1.0:
                 img_uint8 = np.round(img_uint8 * 255).astype(np.uint8)
 
-            # 使用深度学习模型进行白平衡
             # 缓存与复用模型，避免每次加载
-            if self._deep_wb_wrapper is None:
-                # 优先尝试GPU
-                try:
-                    deep_wb_wrapper = create_deep_wb_wrapper(device='cuda')
-                except Exception:
-                    deep_wb_wrapper = create_deep_wb_wrapper(device='cpu')
-                self._deep_wb_wrapper = deep_wb_wrapper
-            deep_wb_wrapper = self._deep_wb_wrapper
+            deep_wb_wrapper = self._get_deep_wb_wrapper()
             if deep_wb_wrapper is None:
-                return (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+                return fallback
 
-            # 应用深度学习白平衡
-            # 降低推理输入最大边长以提升速度（例如512），保持效果可用
+            # 降低推理输入最大边长以提升速度
             inference_size = 128
-            t1 = time.time()
             result = deep_wb_wrapper.process_image(img_uint8, max_size=inference_size)
-            t2 = time.time()
-            
             if result is None:
-                return (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+                return fallback
 
             # 计算增益（原始图像与校正后图像的比值）
             original_mean = np.mean(img_uint8, axis=(0, 1))
             corrected_mean = np.mean(result, axis=(0, 1))
-            
+
             # 避免除以零
             corrected_mean = np.maximum(corrected_mean, 1e-10)
-            
+
             # 计算增益
             gains = np.log10(original_mean / corrected_mean)
-            
+
             # 裁剪增益值，并计算相对于G通道的调整
             gains = -np.clip(gains, -3.0, 3.0) + gains[1]
-            
+
             # 计算光源估计（归一化的原始均值）
             illuminant = original_mean / np.sum(original_mean)
 
             return (gains[0], gains[1], gains[2], illuminant[0], illuminant[1], illuminant[2])
 
-        except Exception as e:
-            return (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+        except Exception:
+            return fallback
+
+    def calculate_auto_gain_learning_based_batch(
+        self, images: List[ImageData], inference_size: int = 128
+    ) -> List[Tuple[float, float, float, float, float, float]]:
+        """
+        批量计算自动白平衡增益（整卷胶片一次推理）
+
+        每张代理图像保持宽高比缩放一次后 letterbox 到 inference_size，堆叠为一个 batch
+        送入同一个 ONNX 会话；增益只在有效区域上统计。耗时统计见 get_auto_gain_profile()。
+
+        Args:
+            images: 代理图像列表
+            inference_size: 推理尺寸
+
+        Returns:
+            每张图像一个 (r_gain, g_gain, b_gain, r_illuminant, g_illuminant, b_illuminant)
+        """
+        fallback = (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+        if not images:
+            return []
+        if not _deep_wb_available():
+            return [fallback] * len(images)
+
+        valid_indices = [i for i, img in enumerate(images)
+                         if img is not None and img.array is not None and img.array.size > 0]
+        results = [fallback] * len(images)
+        if not valid_indices:
+            return results
+
+        try:
+            deep_wb_wrapper = self._get_deep_wb_wrapper()
+            if deep_wb_wrapper is None:
+                return results
+
+            arrays = [images[i].array for i in valid_indices]
+            # 输入与输出在同一推理分辨率下比较均值，无需把结果缩放回原图尺寸
+            originals, corrected = deep_wb_wrapper.process_batch(arrays, size=inference_size)
+
+            original_mean = np.stack([np.mean(o, axis=(0, 1)) for o in originals]) * 255.0
+            corrected_mean = np.stack([np.mean(c, axis=(0, 1)) for c in corrected]) * 255.0
+            corrected_mean = np.maximum(corrected_mean, 1e-10)
+            original_mean = np.maximum(original_mean, 1e-10)
+
+            gains = np.log10(original_mean / corrected_mean)
+            gains = -np.clip(gains, -3.0, 3.0) + gains[:, 1:2]
+            illuminant = original_mean / np.sum(original_mean, axis=1, keepdims=True)
+
+            for k, i in enumerate(valid_indices):
+                results[i] = (float(gains[k, 0]), float(gains[k, 1]), float(gains[k, 2]),
+                              float(illuminant[k, 0]), float(illuminant[k, 1]), float(illuminant[k, 2]))
+            return results
+
+        except Exception:
+            return results
+
+    def get_auto_gain_profile(self) -> Dict[str, float]:
+        """获取最近一次批量自动白平衡推理的耗时统计（毫秒）"""
+        if self._deep_wb_wrapper is None:
+            return {}
+        return self._deep_wb_wrapper.get_last_profile()
+
+    def _get_deep_wb_wrapper(self):
+        """获取（并缓存）深度白平衡推理包装器，避免每次加载模型"""
+        if self._deep_wb_wrapper is None:
+            from ..models.deep_wb_wrapper import create_deep_wb_wrapper
+            # 优先尝试GPU
+            try:
+                deep_wb_wrapper = create_deep_wb_wrapper(device='cuda')
+            except Exception:
+                deep_wb_wrapper = create_deep_wb_wrapper(device='cpu')
+            self._deep_wb_wrapper = deep_wb_wrapper
+        return self._deep_wb_wrapper
 
     # =======================
     # 中性点自动增益（已废弃，移至ApplicationContext的迭代模式）
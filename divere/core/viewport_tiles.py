@@ -0,0 +1,180 @@
+"""
+Viewport Tiles - 放大查看时按视口渲染的高分辨率细节块
+
+预览默认显示 ≤ proxy_max_size 的 proxy；放大超过 1:1 显示后，proxy 只是被插值放大。
+本模块把"细节空间"（全分辨率原图 → 聚焦裁剪 → 旋转）划分为固定大小的块，
+只渲染视口内可见的块，并按需降到 1/2、1/4 … 分辨率（最高 1:1，不超过屏幕所需）。
+
+每块走与预览完全相同的变换链（preview_worker_process._render_preview_image），
+所有步骤均为逐像素运算，块与整幅渲染结果一致。
+
+坐标约定：
+- 显示坐标：当前预览图像（proxy 渲染结果）的像素坐标
+- 细节坐标：细节空间（全分辨率、已裁剪、已旋转）的像素坐标
+- 级别 level：细节空间按 2**level 降采样后的图像，块网格定义在级别坐标上
+"""
+
+import math
+from typing import Optional, Tuple, List, Dict, Any
+
+import numpy as np
+
+# 块边长（级别坐标下的像素数）
+DETAIL_TILE_SIZE = 512
+# 细节分辨率至少比 proxy 高出这个比例才值得渲染
+DETAIL_MIN_GAIN = 1.25
+
+
+def crop_pixel_rect(rect_norm: Optional[tuple], width: int, height: int) -> Tuple[int, int, int, int]:
+    """归一化裁剪框 → 像素范围 (x0, y0, x1, y1)，取整规则与 _prepare_proxy 一致"""
+    if not rect_norm:
+        return 0, 0, width, height
+    x, y, w, h = rect_norm
+    x0 = max(0, min(width - 1, int(round(x * width))))
+    x1 = max(x0 + 1, min(width, int(round((x + w) * width))))
+    y0 = max(0, min(height - 1, int(round(y * height))))
+    y1 = max(y0 + 1, min(height, int(round((y + h) * height))))
+    return x0, y0, x1, y1
+
+
+def detail_size(crop_px: Tuple[int, int, int, int], orientation: int) -> Tuple[int, int]:
+    """细节空间尺寸 (width, height)"""
+    x0, y0, x1, y1 = crop_px
+    w, h = x1 - x0, y1 - y0
+    if ((orientation // 90) % 4) % 2 == 1:
+        w, h = h, w
+    return w, h
+
+
+def choose_detail_level(screen_zoom: float, display_w: int, detail_w: int) -> Optional[int]:
+    """根据屏幕缩放选择细节级别
+
+    Args:
+        screen_zoom: 显示图像像素 → 屏幕像素的缩放
+        display_w: 显示图像宽度
+        detail_w: 细节空间宽度
+
+    Returns:
+        级别（0 表示 1:1）；proxy 已足够清晰时返回 None
+    """
+    if display_w <= 0 or detail_w <= 0 or screen_zoom <= 1.0:
+        return None
+    # 屏幕像素 / 细节像素
+    zoom_full = screen_zoom * display_w / detail_w
+    level = 0 if zoom_full >= 1.0 else int(math.floor(-math.log2(zoom_full)))
+    if detail_w / (2 ** level) < display_w * DETAIL_MIN_GAIN:
+        return None
+    return level
+
+
+def visible_tiles(view_rect: Tuple[float, float, float, float], display_size: Tuple[int, int],
+                  detail_wh: Tuple[int, int], level: int) -> List[Dict[str, Any]]:
+    """计算与视口相交的块
+
+    Args:
+        view_rect: 视口在显示坐标中的范围 (x0, y0, x1, y1)
+        display_size: 显示图像尺寸 (width, height)
+        detail_wh: 细节空间尺寸 (width, height)
+        level: 细节级别
+
+    Returns:
+        块描述列表：index=(tx, ty)，rows/cols 为细节坐标范围，
+        size 为级别坐标下的块尺寸 (w, h)，display_rect 为显示坐标 (x, y, w, h)
+    """
+    disp_w, disp_h = display_size
+    det_w, det_h = detail_wh
+    scale = 2 ** level
+    tile = DETAIL_TILE_SIZE * scale  # 块在细节坐标下的边长
+    sx, sy = det_w / disp_w, det_h / disp_h
+
+    vx0 = max(0.0, view_rect[0]) * sx
+    vy0 = max(0.0, view_rect[1]) * sy
+    vx1 = min(float(disp_w), view_rect[2]) * sx
+    vy1 = min(float(disp_h), view_rect[3]) * sy
+    if vx1 <= vx0 or vy1 <= vy0:
+        return []
+
+    tiles = []
+    for ty in range(int(vy0 // tile), int(math.ceil(vy1 / tile))):
+        r0, r1 = ty * tile, min(det_h, (ty + 1) * tile)
+        if r1 <= r0:
+            continue
+        for tx in range(int(vx0 // tile), int(math.ceil(vx1 / tile))):
+            c0, c1 = tx * tile, min(det_w, (tx + 1) * tile)
+            if c1 <= c0:
+                continue
+            tiles.append({
+                'index': (tx, ty),
+                'rows': (r0, r1),
+                'cols': (c0, c1),
+                'size': (max(1, int(math.ceil((c1 - c0) / scale))), max(1, int(math.ceil((r1 - r0) / scale)))),
+                'display_rect': (c0 / sx, r0 / sy, (c1 - c0) / sx, (r1 - r0) / sy),
+            })
+    return tiles
+
+
+def tile_source_view(array: np.ndarray, crop_px: Tuple[int, int, int, int], orientation: int,
+                     rows: Tuple[int, int], cols: Tuple[int, int]) -> np.ndarray:
+    """返回细节坐标 [r0, r1) × [c0, c1) 对应的原图视图（未旋转）
+
+    np.rot90(view, k) 与 np.rot90(cropped, k)[r0:r1, c0:c1] 完全一致。
+    """
+    x0, y0, x1, y1 = crop_px
+    cropped = array[y0:y1, x0:x1]
+    h, w = cropped.shape[:2]
+    r0, r1 = rows
+    c0, c1 = cols
+    k = (orientation // 90) % 4 if orientation % 360 != 0 else 0
+    if k == 0:
+        return cropped[r0:r1, c0:c1]
+    if k == 1:
+        return cropped[c0:c1, w - r1:w - r0]
+    if k == 2:
+        return cropped[h - r1:h - r0, w - c1:w - c0]
+    return cropped[h - c1:h - c0, r0:r1]
+
+
+def detail_tile_source(source_array: np.ndarray, crop_px: Tuple[int, int, int, int], tile: Dict[str, Any],
+                       orientation: int) -> np.ndarray:
+    """取出一个细节块对应的源区域（未旋转），非 1:1 级别时降采样到块尺寸
+
+    只读 source_array，返回独立的连续数组（可跨进程传递）。
+    """
+    view = tile_source_view(source_array, crop_px, orientation, tile['rows'], tile['cols'])
+
+    # 非 1:1 级别：先在源区域上降采样再走管线（与 proxy 的处理顺序一致）
+    tw, th = tile['size']
+    if ((orientation // 90) % 4) % 2 == 1:
+        tw, th = th, tw
+    if view.shape[:2] != (th, tw):
+        import cv2
+        # OpenCV 的 resize 不支持 float16
+        src = view.astype(np.float32) if view.dtype == np.float16 else np.ascontiguousarray(view)
+        resized = cv2.resize(src, (tw, th), interpolation=cv2.INTER_AREA)
+        if resized.ndim == 2 and view.ndim == 3:
+            resized = resized[..., np.newaxis]
+        return resized
+    return np.ascontiguousarray(view)
+
+
+def render_detail_tile(tile_source: np.ndarray, request: dict, params, the_enlarger, color_space_manager,
+                       monochrome: bool = False) -> np.ndarray:
+    """渲染一个细节块，返回显示用 8-bit 帧
+
+    预览 worker 进程内执行；线程模式下由细节线程用自己的 TheEnlarger/ColorSpaceManager 执行。
+
+    Args:
+        tile_source: detail_tile_source() 返回的源区域
+        request: 与预览请求相同的变换参数（orientation/idt_gamma/convert_to_monochrome/custom_colorspace_def）
+        params: ColorGradingParams
+        monochrome: 显示端是否转为黑白
+    """
+    from divere.core.data_types import ImageData
+    from divere.core.preview_worker_process import _render_preview_image
+
+    result = _render_preview_image(
+        ImageData(array=tile_source, metadata={}), request, params, the_enlarger, color_space_manager
+    )
+    if monochrome:
+        result = color_space_manager.convert_to_monochrome(result, preserve_ir=True)
+    return result.build_display_rgb8()
@@ -4,9 +4,11 @@ Independent implementation without Deep_White_Balance submodule dependency
 """
 
 import os
+import time
 import numpy as np
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Dict
 from PIL import Image
+import cv2
 class _LinearRegression:
     """轻量线性回归实现，使用最小二乘，不依赖 sklearn。
     拟合 X @ W ≈ Y，其中 X 为 (N, F)，Y 为 (N, 3)，W 为 (F, 3)。
@@ -112,6 +114,51 @@ def preprocess_image_for_onnx(image: np.ndarray, max_size: int = 656) -> tuple:
     return img_batch, (image.shape[1], image.shape[0])  # 返回原始尺寸 (width, height)
 
 
+def preprocess_batch_for_onnx(images: List[np.ndarray], size: int = 128) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """
+    批量预处理图像用于 ONNX 推理
+
+    每张图像只缩放一次（INTER_AREA 面积平均，保持宽高比，长边为 size），
+    放在 size x size 画布左上角，其余区域以边缘像素填充（letterbox），以便堆叠成一个 batch。
+    计算增益时只统计有效区域，填充区域不参与。
+
+    Args:
+        images: 图像数组列表 (H, W, 3)，uint8 [0, 255] 或浮点 [0, 1]
+        size: 推理尺寸（会向上取整到 16 的倍数）
+
+    Returns:
+        ((N, 3, size, size) float32 张量，范围 [0, 1]；每张图像有效区域的 (h, w) 列表)
+    """
+    size = int(size)
+    if size % 16 != 0:
+        size = size + (16 - size % 16)
+
+    batch = np.empty((len(images), size, size, 3), dtype=np.float32)
+    content_sizes: List[Tuple[int, int]] = []
+    for i, image in enumerate(images):
+        arr = image[..., :3]
+        if arr.dtype == np.float16:
+            # OpenCV 的 resize 不支持 float16
+            arr = arr.astype(np.float32)
+        if not arr.flags['C_CONTIGUOUS']:
+            arr = np.ascontiguousarray(arr)
+        h, w = arr.shape[:2]
+        scale = size / float(max(h, w))
+        new_h = max(1, min(size, int(round(h * scale))))
+        new_w = max(1, min(size, int(round(w * scale))))
+        resized = cv2.resize(arr, (new_w, new_h), interpolation=cv2.INTER_AREA).astype(np.float32, copy=False)
+        # 整型输入除以 255；浮点输入 >1 时视为 [0, 255]（与单张路径一致），在缩小后的图上判断
+        if np.issubdtype(arr.dtype, np.integer) or resized.max() > 1.0:
+            resized = resized * (1.0 / 255.0)
+        batch[i] = cv2.copyMakeBorder(resized, 0, size - new_h, 0, size - new_w, cv2.BORDER_REPLICATE)
+        content_sizes.append((new_h, new_w))
+
+    np.clip(batch, 0.0, 1.0, out=batch)
+
+    # NHWC -> NCHW
+    return np.ascontiguousarray(batch.transpose(0, 3, 1, 2)), content_sizes
+
+
 def postprocess_onnx_output(output: np.ndarray, original_size: tuple) -> np.ndarray:
     """
     后处理 ONNX 输出
@@ -144,13 +191,17 @@ def postprocess_onnx_output(output: np.ndarray, original_size: tuple) -> np.ndar
 class DeepWBWrapper:
     """ONNX-based Deep White Balance wrapper - Independent implementation"""
     
-    def __init__(self, model_dir: Optional[str] = None, device: str = 'cpu'):
+    def __init__(self, model_dir: Optional[str] = None, device: str = 'cpu',
+                 intra_op_num_threads: Optional[int] = None,
+                 inter_op_num_threads: Optional[int] = None):
         """
         Initialize Deep White Balance wrapper
         
         Args:
             model_dir: Directory containing the ONNX model
             device: Device to run the model on ('cpu' or 'cuda')
+            intra_op_num_threads: 单个算子内部的线程数（None 为自动，上限 8）
+            inter_op_num_threads: 算子间并行的线程数（None 为 1，即顺序执行）
         """
         if not ONNX_AVAILABLE:
             raise ImportError("ONNX Runtime is not available")
@@ -182,7 +233,14 @@ class DeepWBWrapper:
         
         # 创建推理会话
         providers = ['CUDAExecutionProvider', 'CPUExecutionProvider'] if device == 'cuda' else ['CPUExecutionProvider']
-        self.session = ort.InferenceSession(self.onnx_model_path, providers=providers)
+        self.session_options = self._create_session_options(intra_op_num_threads, inter_op_num_threads)
+        self.session = ort.InferenceSession(self.onnx_model_path,
+                                            sess_options=self.session_options,
+                                            providers=providers)
+        
+        # 批量推理状态：模型若固定了 batch 维度，首次失败后回退为逐张推理（复用同一会话）
+        self._batch_supported: Optional[bool] = None
+        self._last_profile: Dict[str, float] = {}
         
         # 获取输入输出信息
         self.input_name = self.session.get_inputs()[0].name
@@ -195,6 +253,78 @@ class DeepWBWrapper:
         except Exception:
             pass
     
+    @staticmethod
+    def _create_session_options(intra_op_num_threads: Optional[int],
+                                inter_op_num_threads: Optional[int]) -> "ort.SessionOptions":
+        """创建推理会话选项：开启全部图优化并限制线程数，避免与处理管线争抢CPU"""
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_num_threads is None:
+            intra_op_num_threads = min(os.cpu_count() or 1, 8)
+        if inter_op_num_threads is None:
+            inter_op_num_threads = 1
+        options.intra_op_num_threads = max(1, int(intra_op_num_threads))
+        options.inter_op_num_threads = max(1, int(inter_op_num_threads))
+        return options
+
+    def get_last_profile(self) -> Dict[str, float]:
+        """获取最近一次批量推理的耗时统计（毫秒）"""
+        return self._last_profile.copy()
+
+    def process_batch(self, images: List[np.ndarray], size: int = 128) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        批量处理多张图像（一次会话调用）
+
+        Args:
+            images: 图像数组列表 (H, W, 3)，uint8 [0, 255] 或浮点 [0, 1]
+            size: 推理尺寸
+
+        Returns:
+            (输入列表, 输出列表)：每张图像在推理分辨率下的有效区域 (h, w, 3)，float32 [0, 1]。
+            输入与输出同分辨率，可直接比较通道均值。
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError("ONNX Runtime is not available")
+        if not images:
+            return [], []
+
+        t0 = time.time()
+        input_tensor, content_sizes = preprocess_batch_for_onnx(images, size)
+        t1 = time.time()
+
+        output = None
+        if self._batch_supported is not False and len(images) > 1:
+            try:
+                output = self.session.run([self.output_name], {self.input_name: input_tensor})[0]
+                self._batch_supported = True
+            except Exception:
+                # 模型导出时固定了 batch=1
+                self._batch_supported = False
+                output = None
+        if output is None:
+            outputs = [
+                self.session.run([self.output_name], {self.input_name: input_tensor[i:i + 1]})[0]
+                for i in range(input_tensor.shape[0])
+            ]
+            output = np.concatenate(outputs, axis=0)
+        t2 = time.time()
+
+        inputs_hwc = input_tensor.transpose(0, 2, 3, 1)
+        outputs_hwc = np.clip(output.transpose(0, 2, 3, 1), 0.0, 1.0).astype(np.float32, copy=False)
+        originals = [inputs_hwc[i, :h, :w] for i, (h, w) in enumerate(content_sizes)]
+        corrected = [outputs_hwc[i, :h, :w] for i, (h, w) in enumerate(content_sizes)]
+        t3 = time.time()
+
+        self._last_profile = {
+            'batch_size': float(len(images)),
+            'preprocess_ms': (t1 - t0) * 1000.0,
+            'inference_ms': (t2 - t1) * 1000.0,
+            'postprocess_ms': (t3 - t2) * 1000.0,
+            'total_ms': (t3 - t0) * 1000.0,
+        }
+        return originals, corrected
+
     def process_image(self, image: np.ndarray, max_size: int = 656) -> np.ndarray:
         """
         Process an image using Deep White Balance AWB
@@ -290,13 +420,17 @@ class DeepWBWrapper:
         return (r_gain, g_gain, b_gain, r_illuminant, g_illuminant, b_illuminant)
 
 
-def create_deep_wb_wrapper(model_dir: Optional[str] = None, device: str = 'cpu') -> Optional[DeepWBWrapper]:
+def create_deep_wb_wrapper(model_dir: Optional[str] = None, device: str = 'cpu',
+                           intra_op_num_threads: Optional[int] = None,
+                           inter_op_num_threads: Optional[int] = None) -> Optional[DeepWBWrapper]:
     """
     Create Deep White Balance wrapper if available
     
     Args:
         model_dir: Directory containing the ONNX model
         device: Device to run the model on
+        intra_op_num_threads: 单个算子内部的线程数
+        inter_op_num_threads: 算子间并行的线程数
         
     Returns:
         DeepWBWrapper instance or None if not available
@@ -305,7 +439,9 @@ def create_deep_wb_wrapper(model_dir: Optional[str] = None, device: str = 'cpu')
         return None
     
     try:
-        return DeepWBWrapper(model_dir, device)
+        return DeepWBWrapper(model_dir, device,
+                             intra_op_num_threads=intra_op_num_threads,
+                             inter_op_num_threads=inter_op_num_threads)
     except Exception as e:
         print(f"Failed to create Deep White Balance wrapper: {e}")
         return None
@@ -21,6 +21,8 @@ class CurveEditWidget(QWidget):
     """曲线编辑画布"""
     
     curve_changed = Signal(list)  # 当曲线改变时发出信号，传递控制点列表
+    interaction_started = Signal()  # 开始拖动控制点
+    interaction_ended = Signal()  # 结束拖动控制点
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -327,6 +329,7 @@ class CurveEditWidget(QWidget):
                 self.add_point(curve_x, curve_y)
                 self.dragging = True
             
+            self.interaction_started.emit()
             self.update()
         
         elif event.button() == Qt.MouseButton.RightButton:
@@ -363,6 +366,8 @@ class CurveEditWidget(QWidget):
     
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
+            if self.dragging:
+                self.interaction_ended.emit()
             self.dragging = False
     
     def keyPressEvent(self, event):
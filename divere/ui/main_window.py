@@ -22,7 +22,6 @@ from divere.core.data_types import ImageData, ColorGradingParams, Preset, InputT
 from divere.utils.enhanced_config_manager import enhanced_config_manager
 from divere.utils.preset_manager import PresetManager, apply_preset_to_params
 from divere.utils.auto_preset_manager import AutoPresetManager
-from divere.utils.spectral_sharpening import run as run_spectral_sharpening
 from divere.i18n import tr, get_available_languages, set_language, get_current_language
 
 from .preview_widget import PreviewWidget
@@ -32,6 +31,7 @@ from .theme import apply_theme, current_theme
 from .cmaes_progress_dialog import CMAESProgressDialog
 from .shortcuts import ShortcutsBinder, install_ime_brackets_fallback
 from .shortcut_help_dialog import ShortcutHelpDialog
+from .scope_widget import ScopeWidget
 
 
 class MainWindow(QMainWindow):
@@ -125,6 +125,32 @@ class MainWindow(QMainWindow):
         self._binder.setup_default_shortcuts()
         self._ime_filter = install_ime_brackets_fallback(self._binder, install_on_app=True)
         
+    def _convert_to_working_space_for_export(self, image: ImageData) -> ImageData:
+        """导出链路的输入变换：IDT Gamma → 输入色彩变换 → 工作色彩空间（跳过逆伽马）
+
+        优先使用融合的分块变换（不复制原图，浮点输入逐块精确取幂）；
+        通道布局不支持时回退到逐步变换。
+        """
+        csm = self.context.color_space_manager
+        cs_name = self.context.get_input_color_space()
+        try:
+            cs_info = csm.get_color_space_info(cs_name) or {}
+            idt_gamma = float(cs_info.get("gamma", 1.0))
+        except Exception:
+            idt_gamma = 1.0
+        if image.array is not None:
+            working_image = csm.input_to_working_space(image, cs_name, idt_gamma, out_dtype=np.float32)
+            if working_image is not None:
+                return working_image
+
+        working_image = csm.set_image_color_space(image, cs_name)
+        if abs(idt_gamma - 1.0) > 1e-6 and working_image.array is not None:
+            arr = self.context.the_enlarger.pipeline_processor.math_ops.apply_power(
+                working_image.array, idt_gamma, use_optimization=False
+            )
+            working_image = working_image.copy_with_new_array(arr)
+        return csm.convert_to_working_space(working_image, skip_gamma_inverse=True)
+
     def _apply_crop_and_rotation_for_export(self, src_image: ImageData, rect_norm: Optional[tuple], orientation_deg: int) -> ImageData:
         """按导出标准链路应用裁剪与旋转：先裁剪再旋转。"""
         try:
@@ -227,6 +253,9 @@ class MainWindow(QMainWindow):
         # Proxy尺寸变化信号连接
         self.parameter_panel.proxy_size_changed.connect(self.context.update_proxy_max_size)
         self.parameter_panel.glare_compensation_realtime_update.connect(self._on_glare_compensation_realtime_update)
+        # 拖动期间使用低分辨率预览，松开后渲染全质量帧
+        self.parameter_panel.interaction_started.connect(self.context.begin_interactive_preview)
+        self.parameter_panel.interaction_ended.connect(self.context.end_interactive_preview)
         # 黑白预览信号连接
         self.parameter_panel.monochrome_preview_changed.connect(self._on_monochrome_preview_changed)
         # 当 UCS 三角拖动结束：注册/切换到一个临时 custom 输入空间，触发代理重建与预览
@@ -288,6 +317,15 @@ class MainWindow(QMainWindow):
         self.preview_widget = PreviewWidget(self.context)
         self.preview_widget.image_rotated.connect(self._on_image_rotated)
         splitter.addWidget(self.preview_widget)
+
+        # 右侧示波器面板（默认隐藏；可见时才让预览 worker 计算直方图）
+        self.scope_widget = ScopeWidget()
+        self.scope_dock = QDockWidget(tr("scope_widget.title"), self)
+        self.scope_dock.setObjectName("scope_dock")
+        self.scope_dock.setWidget(self.scope_widget)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.scope_dock)
+        self.scope_dock.hide()
+        self.scope_dock.visibilityChanged.connect(self._on_scope_visibility_changed)
         
         # 设置分割器比例
         splitter.setSizes([300, 800])
@@ -382,6 +420,11 @@ class MainWindow(QMainWindow):
         reset_view_action.triggered.connect(self._reset_view)
         view_menu.addAction(reset_view_action)
 
+        # 示波器面板（直方图 / 密度）
+        scope_action = self.scope_dock.toggleViewAction()
+        scope_action.setText(tr("main_window.menu.view_scopes"))
+        view_menu.addAction(scope_action)
+
         # 主题切换
         view_menu.addSeparator()
         dark_action = QAction(tr("main_window.menu.view_dark_mode"), self)
@@ -1162,6 +1205,7 @@ class MainWindow(QMainWindow):
             @Slot()
             def run(self):
                 try:
+                    from divere.utils.spectral_sharpening import run as run_spectral_sharpening
                     self.result = run_spectral_sharpening(
                         self.image_array,
                         self.corners,
@@ -1927,26 +1971,8 @@ class MainWindow(QMainWindow):
             print(f"  原始图像色彩空间: {final_image.color_space}")
             print(f"  输入色彩变换设置: {self.context.get_input_color_space()}")
             
-            # 先设置输入色彩变换
-            working_image = self.context.color_space_manager.set_image_color_space(
-                final_image, self.context.get_input_color_space()
-            )
-            # 前置IDT Gamma（导出走高精度pow）
-            try:
-                cs_name = self.context.get_input_color_space()
-                cs_info = self.context.color_space_manager.get_color_space_info(cs_name) or {}
-                idt_gamma = float(cs_info.get("gamma", 1.0))
-            except Exception:
-                idt_gamma = 1.0
-            if abs(idt_gamma - 1.0) > 1e-6 and working_image.array is not None:
-                arr = self.context.the_enlarger.pipeline_processor.math_ops.apply_power(
-                    working_image.array, idt_gamma, use_optimization=False
-                )
-                working_image = working_image.copy_with_new_array(arr)
-            # 转到工作色彩空间（ACEScg），跳过逆伽马
-            working_image = self.context.color_space_manager.convert_to_working_space(
-                working_image, skip_gamma_inverse=True
-            )
+            # 前置IDT Gamma + 输入色彩变换 → 工作色彩空间（跳过逆伽马）
+            working_image = self._convert_to_working_space_for_export(final_image)
             print(f"  转换后工作色彩空间: {working_image.color_space}")
             
             # 导出模式：提升为float64精度，确保全程高精度计算
@@ -2027,24 +2053,8 @@ class MainWindow(QMainWindow):
                     rect_norm = crop_instance.rect_norm if crop_instance is not None else None
                     orientation = crop_instance.orientation if crop_instance is not None else self.context.get_current_orientation()
                     final_image = self._apply_crop_and_rotation_for_export(current_image, rect_norm, orientation)
-                    working_image = self.context.color_space_manager.set_image_color_space(
-                        final_image, self.context.get_input_color_space()
-                    )
-                    # 前置IDT Gamma
-                    try:
-                        cs_name = self.context.get_input_color_space()
-                        cs_info = self.context.color_space_manager.get_color_space_info(cs_name) or {}
-                        idt_gamma = float(cs_info.get("gamma", 1.0))
-                    except Exception:
-                        idt_gamma = 1.0
-                    if abs(idt_gamma - 1.0) > 1e-6 and working_image.array is not None:
-                        arr = self.context.the_enlarger.pipeline_processor.math_ops.apply_power(
-                            working_image.array, idt_gamma, use_optimization=False
-                        )
-                        working_image = working_image.copy_with_new_array(arr)
-                    working_image = self.context.color_space_manager.convert_to_working_space(
-                        working_image, skip_gamma_inverse=True
-                    )
+                    # 前置IDT Gamma + 输入色彩变换 → 工作色彩空间（跳过逆伽马）
+                    working_image = self._convert_to_working_space_for_export(final_image)
                     result_image = self.context.the_enlarger.apply_full_pipeline(
                         working_image,
                         self.context.get_current_params(),
@@ -2091,24 +2101,8 @@ class MainWindow(QMainWindow):
                     rect_norm = self.context.get_contactsheet_crop_rect()
                     orientation = self.context.get_current_orientation()
                     final_image = self._apply_crop_and_rotation_for_export(current_image, rect_norm, orientation)
-                    working_image = self.context.color_space_manager.set_image_color_space(
-                        final_image, self.context.get_input_color_space()
-                    )
-                    # 前置IDT Gamma
-                    try:
-                        cs_name = self.context.get_input_color_space()
-                        cs_info = self.context.color_space_manager.get_color_space_info(cs_name) or {}
-                        idt_gamma = float(cs_info.get("gamma", 1.0))
-                    except Exception:
-                        idt_gamma = 1.0
-                    if abs(idt_gamma - 1.0) > 1e-6 and working_image.array is not None:
-                        arr = self.context.the_enlarger.pipeline_processor.math_ops.apply_power(
-                            working_image.array, idt_gamma, use_optimization=False
-                        )
-                        working_image = working_image.copy_with_new_array(arr)
-                    working_image = self.context.color_space_manager.convert_to_working_space(
-                        working_image, skip_gamma_inverse=True
-                    )
+                    # 前置IDT Gamma + 输入色彩变换 → 工作色彩空间（跳过逆伽马）
+                    working_image = self._convert_to_working_space_for_export(final_image)
                     result_image = self.context.the_enlarger.apply_full_pipeline(
                         working_image,
                         self.context.get_current_params(),
@@ -2463,7 +2457,10 @@ class MainWindow(QMainWindow):
                 preserve_ir=True  # 保留红外通道（如果有）
             )
 
+        self.preview_widget.set_detail_monochrome(self._monochrome_preview_enabled)
         self.preview_widget.set_image(result_image)
+        if self.scope_dock.isVisible():
+            self.scope_widget.set_image(result_image)
         # 图像加载后自动适应窗口（保持旧逻辑兼容）
         if self._fit_after_next_preview:
             self._fit_after_next_preview = False
@@ -2481,6 +2478,10 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def _on_scope_visibility_changed(self, visible: bool):
+        """示波器面板可见性变化：只在可见时随预览帧计算直方图"""
+        self.context.set_histogram_analysis(visible)
+
     def _schedule_fit_to_window(self):
         """延迟执行 fit_to_window，确保图像设置完成后再适应窗口
 
@@ -2958,6 +2959,8 @@ class MainWindow(QMainWindow):
     def _on_glare_compensation_interaction_started(self, compensation_value: float):
         """处理屏幕反光补偿交互开始"""
         try:
+            # 后续预览帧由 worker 附带 black cut-off 位图
+            self.context.set_black_cutoff_analysis(True)
             # 启用预览中的black cut-off显示
             self.preview_widget.set_black_cutoff_display(True, compensation_value)
         except Exception as e:
@@ -2966,6 +2969,7 @@ class MainWindow(QMainWindow):
     def _on_glare_compensation_interaction_ended(self):
         """处理屏幕反光补偿交互结束"""
         try:
+            self.context.set_black_cutoff_analysis(False)
             # 关闭预览中的black cut-off显示
             self.preview_widget.set_black_cutoff_display(False)
         except Exception as e:
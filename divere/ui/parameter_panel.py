@@ -118,6 +118,9 @@ class ParameterPanel(QWidget):
     glare_compensation_interaction_started = Signal(float)  # 当前补偿值
     glare_compensation_interaction_ended = Signal()
     glare_compensation_realtime_update = Signal(float)  # 实时更新补偿值
+    # 拖动交互信号（拖动期间预览使用较低分辨率）
+    interaction_started = Signal()
+    interaction_ended = Signal()
     # 读取并保存色卡颜色信号
     save_colorchecker_colors_requested = Signal()
     
@@ -811,6 +814,13 @@ class ParameterPanel(QWidget):
 
         # 曲线编辑器发出 (curve_name, points)，使用专用槽以丢弃参数并统一触发
         self.curve_editor.curve_changed.connect(self._on_curve_changed)
+
+        # 拖动交互：任意滑块按下/释放、曲线控制点拖动开始/结束
+        for slider in self.findChildren(QSlider):
+            slider.sliderPressed.connect(self.interaction_started.emit)
+            slider.sliderReleased.connect(self.interaction_ended.emit)
+        self.curve_editor.curve_edit_widget.interaction_started.connect(self.interaction_started.emit)
+        self.curve_editor.curve_edit_widget.interaction_ended.connect(self.interaction_ended.emit)
         
         for checkbox in [self.enable_density_inversion_checkbox, self.enable_density_matrix_checkbox,
                          self.enable_rgb_gains_checkbox, self.enable_density_curve_checkbox]:
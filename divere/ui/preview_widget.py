@@ -9,7 +9,7 @@ from enum import Enum
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea, QHBoxLayout, QPushButton, QCheckBox
 from PySide6.QtWidgets import QFrame, QApplication, QComboBox
-from PySide6.QtCore import Qt, QTimer, Signal, QPoint, QPointF, QRect, QEvent
+from PySide6.QtCore import Qt, QTimer, Signal, QPoint, QPointF, QRect, QRectF, QEvent
 from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QKeySequence, QCursor, QPolygonF, QAction
 
 from divere.core.data_types import ImageData, CropInstance, CropAddDirection
@@ -42,6 +42,16 @@ class PreviewCanvas(QLabel):
         self._scaled_zoom: float = 1.0
         # 叠加绘制回调
         self.overlay_drawer = None
+        # 放大查看时覆盖在 proxy 上的全分辨率细节块 [(QRectF 显示坐标, QPixmap)]
+        self._detail_tiles: List[Tuple[QRectF, QPixmap]] = []
+
+    def set_detail_tiles(self, tiles: List[Tuple[QRectF, QPixmap]]) -> None:
+        self._detail_tiles = list(tiles)
+        self.update()
+
+    def add_detail_tile(self, rect: QRectF, pixmap: QPixmap) -> None:
+        self._detail_tiles.append((rect, pixmap))
+        self.update()
 
     def set_source_pixmap(self, pixmap: QPixmap) -> None:
         """设置新的源 pixmap 并释放旧的资源
@@ -124,6 +134,8 @@ class PreviewCanvas(QLabel):
         # 为避免滚轮缩放时因缓存缩放尺寸取整导致的锚点漂移，这里统一走绘制时缩放路径
         painter.scale(self._zoom, self._zoom)
         painter.drawPixmap(0, 0, self._source_pixmap)
+        for rect, pixmap in self._detail_tiles:
+            painter.drawPixmap(rect, pixmap, QRectF(pixmap.rect()))
         if self.overlay_drawer is not None:
             try:
                 self.overlay_drawer(painter)
@@ -248,7 +260,17 @@ class PreviewWidget(QWidget):
         # 屏幕反光补偿：black cut-off检测与显示
         self._show_black_cutoff: bool = False
         self._cutoff_compensation: float = 0.0
-        self._cutoff_pixels: Optional[np.ndarray] = None  # 布尔mask，标记cut-off像素
+        self._cutoff_overlay: Optional[QPixmap] = None  # cut-off像素覆盖层（由打包位图生成）
+
+        # 放大查看：视口停止变化后向 context 请求全分辨率细节块
+        self._detail_generation: int = 0
+        self._detail_monochrome: bool = False
+        self._detail_timer = QTimer()
+        self._detail_timer.setSingleShot(True)
+        self._detail_timer.setInterval(120)
+        self._detail_timer.timeout.connect(self._request_detail_tiles)
+        if self.context is not None and hasattr(self.context, 'detail_tile_ready'):
+            self.context.detail_tile_ready.connect(self._on_detail_tile_ready)
 
     # ============ 内部工具 ============
     def _get_viewport_size(self):
@@ -1349,6 +1371,10 @@ class PreviewWidget(QWidget):
         # 挂上新图（同一对象就等于“重绘”）
         self.current_image = image_data
 
+        # 新帧的参数可能已变化：旧细节块立即失效，视口稳定后重新请求
+        if not same_object:
+            self.image_label.set_detail_tiles([])
+
         # 若图像元数据中已有裁剪（来自Preset或Context），并且本地未显式覆盖，则创建/同步虚线框
         try:
             md = getattr(image_data, 'metadata', {}) or {}
@@ -1390,10 +1416,11 @@ class PreviewWidget(QWidget):
         
         try:
             # 设置源图与视图参数，自绘中按 pan/zoom 绘制
-            pixmap = self._array_to_pixmap(self.current_image.array)
+            pixmap = self._image_to_pixmap(self.current_image)
             self._clamp_pan()
             self.image_label.set_source_pixmap(pixmap)
             self.image_label.set_view(self.zoom_factor, self.pan_x, self.pan_y)
+            self._detail_timer.start()
             
             # 如果正在显示cut-off，重新检测像素以同步最新图像数据
             if self._show_black_cutoff:
@@ -1403,6 +1430,74 @@ class PreviewWidget(QWidget):
             print(f"更新显示失败: {e}")
             self.image_label.setText(tr("preview_widget.labels.display_error", error=str(e)))
     
+    # ===== 放大查看：全分辨率细节块 =====
+    def set_detail_monochrome(self, enabled: bool):
+        """细节块是否按黑白显示（与 MainWindow 的黑白预览保持一致）"""
+        enabled = bool(enabled)
+        if enabled != self._detail_monochrome:
+            self._detail_monochrome = enabled
+            self.image_label.set_detail_tiles([])
+
+    def _request_detail_tiles(self):
+        """按当前视口请求细节块；缩放不超过 1:1 时 proxy 已足够，清空细节块"""
+        if self.context is None or not hasattr(self.context, 'request_detail_tiles'):
+            return
+        if not self.current_image or self.current_image.array is None:
+            return
+        disp_h, disp_w = self.current_image.array.shape[:2]
+        viewport = self._get_viewport_size()
+        zoom = float(self.zoom_factor)
+        view_rect = (
+            -float(self.pan_x) / zoom,
+            -float(self.pan_y) / zoom,
+            (viewport.width() - float(self.pan_x)) / zoom,
+            (viewport.height() - float(self.pan_y)) / zoom,
+        )
+        generation, ready = self.context.request_detail_tiles(
+            view_rect, (disp_w, disp_h), zoom, monochrome=self._detail_monochrome
+        )
+        self._detail_generation = generation
+        self.image_label.set_detail_tiles([self._detail_tile_entry(tile) for tile in ready])
+
+    def _on_detail_tile_ready(self, tile: dict):
+        if tile.get('generation') != self._detail_generation:
+            return
+        rect, pixmap = self._detail_tile_entry(tile)
+        self.image_label.add_detail_tile(rect, pixmap)
+
+    def _detail_tile_entry(self, tile: dict) -> Tuple[QRectF, QPixmap]:
+        x, y, w, h = tile['display_rect']
+        # rgb8 由 context 的块缓存持有，QPixmap.fromImage 同步拷贝
+        return QRectF(x, y, w, h), QPixmap.fromImage(self._rgb8_to_qimage(tile['rgb8']))
+
+    def _image_to_pixmap(self, image: ImageData) -> QPixmap:
+        """将 ImageData 转换为 QPixmap
+
+        优先使用 worker 预先量化好的 display_rgb8：GUI 线程不再做 clip/round/拷贝，
+        只剩 QPixmap 上传。display_rgb8 缺失或尺寸不匹配时回退到 _array_to_pixmap。
+        """
+        rgb8 = image.display_rgb8
+        if rgb8 is not None and rgb8.shape[:2] == image.array.shape[:2]:
+            # rgb8 由 current_image 持有，QPixmap.fromImage 同步拷贝，无需 QImage.copy()
+            return QPixmap.fromImage(self._rgb8_to_qimage(rgb8))
+        return self._array_to_pixmap(image.array)
+
+    def _rgb8_to_qimage(self, array: np.ndarray) -> QImage:
+        """用 C 连续的 uint8 数组构造 QImage（引用数组内存，不拷贝）"""
+        height, width = array.shape[:2]
+        if array.ndim == 3 and array.shape[2] == 4:
+            qimage = QImage(array.data, width, height, width * 4, QImage.Format.Format_RGBA8888)
+        elif array.ndim == 3:
+            qimage = QImage(array.data, width, height, width * 3, QImage.Format.Format_RGB888)
+        else:
+            qimage = QImage(array.data, width, height, width, QImage.Format.Format_Grayscale8)
+
+        # 为 DisplayP3 图像应用 Qt 内置色彩管理
+        if hasattr(self, 'current_image') and self.current_image and self.current_image.color_space == "DisplayP3":
+            from PySide6.QtGui import QColorSpace
+            qimage.setColorSpace(QColorSpace(QColorSpace.NamedColorSpace.DisplayP3))
+        return qimage
+
     def _array_to_pixmap(self, array: np.ndarray) -> QPixmap:
         """将 numpy 数组转换为 QPixmap
 
@@ -1423,38 +1518,11 @@ class PreviewWidget(QWidget):
         - Monochrome conversion现在统一由MainWindow中的checkbox机制控制
         - 移除了旧的基于film type的自动conversion，避免双重转换
         """
-        if array.dtype != np.uint8:
-            array = np.clip(array, 0, 1)
-            array = np.round(array * 255).astype(np.uint8)
-
-        # 确保数组是连续的内存布局（旋转后可能不连续）
-        if not array.flags['C_CONTIGUOUS']:
-            array = np.ascontiguousarray(array)
-
-        height, width = array.shape[:2]
+        # 量化规则与 ImageData.build_display_rgb8 一致（clip → round(x*255)，C 连续）
+        array = ImageData(array=array).build_display_rgb8()
 
         # 创建 QImage，此时 QImage 引用 numpy array 的数据指针
-        if len(array.shape) == 3:
-            channels = array.shape[2]
-            if channels == 3:
-                qimage = QImage(array.data, width, height, width * 3, QImage.Format.Format_RGB888)
-            elif channels == 4:
-                qimage = QImage(array.data, width, height, width * 4, QImage.Format.Format_RGBA8888)
-            else: # Fallback for other channel counts
-                array = array[:, :, :3]
-                if not array.flags['C_CONTIGUOUS']:
-                    array = np.ascontiguousarray(array)
-                qimage = QImage(array.data, width, height, width * 3, QImage.Format.Format_RGB888)
-        else:
-            qimage = QImage(array.data, width, height, width, QImage.Format.Format_Grayscale8)
-
-        # 为 DisplayP3 图像应用 Qt 内置色彩管理
-        if hasattr(self, 'current_image') and self.current_image and self.current_image.color_space == "DisplayP3":
-            from PySide6.QtGui import QColorSpace
-            # 创建色彩空间（DisplayP3）
-            displayp3_space = QColorSpace(QColorSpace.NamedColorSpace.DisplayP3)
-            # 应用色彩空间到 QImage
-            qimage.setColorSpace(displayp3_space)
+        qimage = self._rgb8_to_qimage(array)
 
         # 关键修复：使用 copy() 创建独立的 QImage
         # 这确保 QImage 拥有自己的数据副本，不依赖于 numpy array 的生命周期
@@ -1473,148 +1541,91 @@ class PreviewWidget(QWidget):
         if show:
             self._detect_black_cutoff_pixels()
         else:
-            self._cutoff_pixels = None
+            self._cutoff_overlay = None
         self.image_label.update()
     
     def update_cutoff_compensation(self, compensation: float):
         """实时更新补偿值（用于滑块拖动过程中）"""
         if self._show_black_cutoff:
             self._cutoff_compensation = compensation
-            self._detect_black_cutoff_pixels()
+            # 拖动期间不在 GUI 线程重新检测：新补偿值触发的预览帧会附带位图
+            self._detect_black_cutoff_pixels(allow_local=False)
             self.image_label.update()
     
-    def _detect_black_cutoff_pixels(self):
-        """检测因屏幕反光补偿导致的black cut-off像素"""
-        # 释放旧的mask以避免累积（~6MB if active）
-        if self._cutoff_pixels is not None:
-            self._cutoff_pixels = None
+    def _detect_black_cutoff_pixels(self, allow_local: bool = True):
+        """更新因屏幕反光补偿导致的black cut-off像素覆盖层
+
+        优先使用预览 worker 随帧返回的打包位图（metadata['analysis']['black_cutoff']），
+        GUI 线程只需把位图包装成 QPixmap。当前帧不带位图时（如刚开启显示），
+        才在本地检测一次。
 
+        Args:
+            allow_local: 为 False 时（补偿值刚改变、帧未更新）不在 GUI 线程检测，
+                保留上一张覆盖层，等待附带新位图的预览帧
+        """
         if not self.current_image or self.current_image.array is None:
-            self._cutoff_pixels = None
+            self._cutoff_overlay = None
             return
-        
+
         try:
             if self._cutoff_compensation <= 0.0:
-                self._cutoff_pixels = None
+                self._cutoff_overlay = None
                 return
-            
-            # 获取图像数据 - 这里使用代理图像进行检测以提高性能
-            image_array = self.current_image.array
-            
-            # 检查是否需要转换为黑白（与显示逻辑一致）
-            should_convert_to_mono = False
-            if self.context and hasattr(self.context, 'should_convert_to_monochrome'):
-                should_convert_to_mono = self.context.should_convert_to_monochrome()
-            
-            # 如果需要转换为黑白，先进行转换（与_array_to_pixmap逻辑一致）
-            if should_convert_to_mono and len(image_array.shape) == 3 and image_array.shape[2] >= 3:
-                # Convert RGB to luminance using ITU-R BT.709 weights
-                luminance = (0.2126 * image_array[:, :, 0] + 
-                            0.7152 * image_array[:, :, 1] + 
-                            0.0722 * image_array[:, :, 2])
-                # 对于cut-off检测，我们只需要单通道的luminance值
-                image_array = luminance
-            
-            # 为了提高性能，如果图像太大，进行降采样检测
-            h, w = image_array.shape[:2] if len(image_array.shape) >= 2 else (image_array.shape[0], 1)
-            max_size = 1000  # 最大检测尺寸
-            if max(h, w) > max_size:
-                scale = max_size / max(h, w)
-                new_h, new_w = int(h * scale), int(w * scale)
-                
-                # 使用OpenCV或numpy进行降采样
-                try:
-                    import cv2
-                    if len(image_array.shape) == 3:
-                        image_array = cv2.resize(image_array, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-                    else:
-                        image_array = cv2.resize(image_array, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-                except ImportError:
-                    # 如果没有OpenCV，使用简单的降采样
-                    step_h = max(1, h // new_h)
-                    step_w = max(1, w // new_w) 
-                    image_array = image_array[::step_h, ::step_w]
-                    new_h, new_w = image_array.shape[:2] if len(image_array.shape) >= 2 else (image_array.shape[0], 1)
-                
-                h, w = new_h, new_w
-            
-            # 使用固定0.0阈值检测cut-off像素：
-            # 模拟补偿效果，检测应用补偿后会变成负值的像素
-            cutoff_mask = np.zeros((h, w), dtype=bool)
-            
-            if len(image_array.shape) == 3:
-                # RGB图像：检查所有通道
-                for c in range(image_array.shape[2]):
-                    channel = image_array[:, :, c].astype(np.float64)
-                    # 模拟补偿：如果 pixel - compensation < 0.0，则会被cut-off
-                    channel_cutoff = (channel - self._cutoff_compensation) < 0.0
-                    cutoff_mask |= channel_cutoff
-            else:
-                # 灰度图或黑白模式转换后的单通道
-                channel = image_array.astype(np.float64)
-                # 模拟补偿：如果 pixel - compensation < 0.0，则会被cut-off
-                cutoff_mask = (channel - self._cutoff_compensation) < 0.0
-            
-            self._cutoff_pixels = cutoff_mask
-            
+
+            md = self.current_image.metadata or {}
+            packed = (md.get('analysis') or {}).get('black_cutoff')
+            if not allow_local:
+                if packed is None or abs(packed['compensation'] - self._cutoff_compensation) > 1e-7:
+                    return
+            elif packed is None:
+                from divere.core.preview_analysis import compute_black_cutoff_mask, pack_mask
+
+                # 检查是否需要按黑白检测（与显示逻辑一致）
+                should_convert_to_mono = False
+                if self.context and hasattr(self.context, 'should_convert_to_monochrome'):
+                    should_convert_to_mono = self.context.should_convert_to_monochrome()
+
+                packed = {'compensation': self._cutoff_compensation}
+                mask = compute_black_cutoff_mask(
+                    self.current_image.array, self._cutoff_compensation, should_convert_to_mono
+                )
+                if mask is not None:
+                    packed.update(pack_mask(mask))
+
+            self._cutoff_overlay = self._packed_mask_to_pixmap(packed)
+
         except Exception as e:
             print(f"检测black cut-off像素失败: {e}")
-            self._cutoff_pixels = None
-    
+            self._cutoff_overlay = None
+
+    def _packed_mask_to_pixmap(self, packed: dict) -> Optional[QPixmap]:
+        """把按行打包的位图包装为 QImage(Format_Mono)，cut-off 像素为半透明红色"""
+        if 'bits' not in packed:
+            return None
+        bits = packed['bits']
+        qimage = QImage(bits, packed['width'], packed['height'], packed['stride'],
+                        QImage.Format.Format_Mono)
+        qimage.setColorTable([QColor(0, 0, 0, 0).rgba(), QColor(255, 0, 0, 80).rgba()])
+        # fromImage 同步拷贝，bits 在此之前保持引用
+        return QPixmap.fromImage(qimage)
+
     def _draw_black_cutoff_overlay(self, painter: QPainter):
         """绘制black cut-off像素覆盖层"""
-        if not self._show_black_cutoff or self._cutoff_pixels is None:
+        if not self._show_black_cutoff or self._cutoff_overlay is None:
             return
-        
+
         try:
             if not self.current_image or self.current_image.array is None:
                 return
-            
-            # 获取cut-off mask的尺寸
-            mask_h, mask_w = self._cutoff_pixels.shape
-            
-            # 获取当前显示的图像尺寸（考虑代理图像）
+
+            # 覆盖层可能来自降采样渲染，按当前图像尺寸拉伸
+            # painter已经应用了transform（translate + scale），所以这里直接用图像坐标
             image_h, image_w = self.current_image.array.shape[:2]
-            
-            # 计算从mask坐标到图像坐标的映射比例
-            # 如果cut-off检测时进行了降采样，需要恢复到原图像尺寸
-            scale_x = image_w / mask_w
-            scale_y = image_h / mask_h
-            
-            # 设置绘制参数：半透明红色覆盖
             painter.save()
-            painter.setPen(QPen(QColor(255, 0, 0, 100), 0))  # 红色边框
-            painter.setBrush(QColor(255, 0, 0, 80))  # 半透明红色填充
-            
-            # 根据当前缩放级别动态调整绘制密度，避免性能问题
-            zoom = self.zoom_factor
-            if zoom < 0.25:
-                step = 8  # 缩放很小时，大幅降采样
-            elif zoom < 0.5:
-                step = 4
-            elif zoom < 1.0:
-                step = 2
-            else:
-                step = 1  # 放大时精细绘制
-            
-            # 在图像坐标系中绘制像素
-            # painter已经应用了transform（translate + scale），所以这里直接用图像坐标
-            for mask_y in range(0, mask_h, step):
-                for mask_x in range(0, mask_w, step):
-                    if self._cutoff_pixels[mask_y, mask_x]:
-                        # 将mask坐标映射回图像坐标
-                        img_x = int(mask_x * scale_x)
-                        img_y = int(mask_y * scale_y)
-                        
-                        # 计算像素块大小（考虑步长和缩放比例）
-                        pixel_w = max(1, int(scale_x * step))
-                        pixel_h = max(1, int(scale_y * step))
-                        
-                        # 直接在图像坐标系中绘制，让painter的transform处理缩放和平移
-                        painter.drawRect(img_x, img_y, pixel_w, pixel_h)
-            
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+            painter.drawPixmap(QRect(0, 0, image_w, image_h), self._cutoff_overlay)
             painter.restore()
-            
+
         except Exception as e:
             print(f"绘制black cut-off覆盖层失败: {e}")
 
@@ -3632,7 +3643,7 @@ class PreviewWidget(QWidget):
         # 停止 black cutoff 显示
         self._show_black_cutoff = False
         self._cutoff_compensation = 0.0
-        self._cutoff_pixels = None
+        self._cutoff_overlay = None
 
         # 释放当前图像
         if self.current_image is not None:
@@ -3643,6 +3654,7 @@ class PreviewWidget(QWidget):
             print("Debug: preview清空，current_image")
 
         # 清空 UI
+        self.image_label.set_detail_tiles([])
         self.image_label.clear()
         # 如果有其它 per-image 状态（裁剪 overlay 等），也可以在这里顺手清掉
         self._crop_overlay_norm = None
@@ -3680,6 +3692,14 @@ class PreviewWidget(QWidget):
         except Exception as e:
             print(f"[WARNING] _ants_timer 清理失败: {e}")
 
+        try:
+            if hasattr(self, '_detail_timer') and self._detail_timer:
+                self._detail_timer.stop()
+                self._detail_timer.deleteLater()
+                self._detail_timer = None
+        except Exception as e:
+            print(f"[WARNING] _detail_timer 清理失败: {e}")
+
     def __del__(self):
         """析构函数：确保资源被清理
 
@@ -0,0 +1,114 @@
+"""
+示波器面板：显示预览 worker 随帧计算的 RGB 直方图与逐通道密度直方图
+
+直方图由 ApplicationContext 在面板可见时开启计算（见 set_histogram_analysis），
+本控件只负责绘制 metadata['analysis']['histogram'] 中的数据。
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from divere.i18n import tr
+
+
+class ScopeWidget(QtWidgets.QWidget):
+    """上下两栏：显示空间 RGB 直方图（0–1）与工作空间密度直方图（D）"""
+
+    _CHANNEL_COLORS = (
+        QtGui.QColor(230, 70, 70),
+        QtGui.QColor(70, 200, 70),
+        QtGui.QColor(80, 130, 240),
+    )
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._rgb: Optional[np.ndarray] = None
+        self._density: Optional[np.ndarray] = None
+        self._density_range = (0.0, 4.0)
+        self.setMinimumSize(220, 200)
+
+    def sizeHint(self) -> QtCore.QSize:  # type: ignore[override]
+        return QtCore.QSize(300, 260)
+
+    def set_image(self, image) -> None:
+        """从预览帧的 metadata 中读取直方图；帧中没有直方图时保留上一帧的显示"""
+        metadata = getattr(image, 'metadata', None) or {}
+        histogram = (metadata.get('analysis') or {}).get('histogram')
+        if histogram is not None:
+            self.set_histograms(histogram)
+
+    def set_histograms(self, histogram: Optional[dict]) -> None:
+        if not histogram:
+            self._rgb = None
+            self._density = None
+        else:
+            self._rgb = histogram.get('rgb')
+            self._density = histogram.get('density')
+            self._density_range = tuple(histogram.get('density_range', self._density_range))
+        self.update()
+
+    def clear(self) -> None:
+        self.set_histograms(None)
+
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.fillRect(self.rect(), QtGui.QColor(28, 28, 28))
+
+        margin = 6
+        title_h = 16
+        panel_h = (self.height() - 3 * margin) // 2
+        rgb_rect = QtCore.QRect(margin, margin, self.width() - 2 * margin, panel_h)
+        density_rect = QtCore.QRect(margin, 2 * margin + panel_h, self.width() - 2 * margin, panel_h)
+
+        self._draw_panel(painter, rgb_rect, title_h, tr("scope_widget.rgb_title"),
+                         self._rgb, ("0", "1"))
+        lo, hi = self._density_range
+        self._draw_panel(painter, density_rect, title_h, tr("scope_widget.density_title"),
+                         self._density, (f"{lo:g} D", f"{hi:g} D"))
+        painter.end()
+
+    def _draw_panel(self, painter: QtGui.QPainter, rect: QtCore.QRect, title_h: int, title: str,
+                    counts: Optional[np.ndarray], axis_labels: tuple) -> None:
+        painter.setPen(QtGui.QColor(170, 170, 170))
+        painter.drawText(rect.adjusted(2, 0, 0, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, title)
+        plot = rect.adjusted(0, title_h, 0, -title_h)
+        painter.setPen(QtGui.QColor(70, 70, 70))
+        painter.drawRect(plot)
+        painter.setPen(QtGui.QColor(130, 130, 130))
+        painter.drawText(rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignBottom, axis_labels[0])
+        painter.drawText(rect, QtCore.Qt.AlignRight | QtCore.Qt.AlignBottom, axis_labels[1])
+
+        if counts is None or counts.size == 0 or plot.width() < 2 or plot.height() < 2:
+            painter.drawText(plot, QtCore.Qt.AlignCenter, tr("scope_widget.no_data"))
+            return
+
+        counts = np.asarray(counts, dtype=np.float64)
+        if counts.ndim == 1:
+            counts = counts[np.newaxis, :]
+        bins = counts.shape[1]
+        # 端点 bin 常被裁切值占满，归一化时只看内部 bin
+        peak = counts[:, 1:-1].max() if bins > 2 else counts.max()
+        if peak <= 0:
+            peak = max(1.0, counts.max())
+
+        xs = plot.left() + (np.arange(bins) + 0.5) * (plot.width() / bins)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Plus)
+        for channel in range(min(3, counts.shape[0])):
+            color = self._CHANNEL_COLORS[channel] if counts.shape[0] > 1 else QtGui.QColor(200, 200, 200)
+            ys = plot.bottom() - np.minimum(counts[channel] / peak, 1.0) * (plot.height() - 1)
+            path = QtGui.QPainterPath(QtCore.QPointF(plot.left(), plot.bottom()))
+            for x, y in zip(xs, ys):
+                path.lineTo(float(x), float(y))
+            path.lineTo(plot.right(), plot.bottom())
+            path.closeSubpath()
+            fill = QtGui.QColor(color)
+            fill.setAlpha(90)
+            painter.fillPath(path, fill)
+            painter.setPen(QtGui.QPen(color, 1))
+            painter.drawPath(path)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
@@ -2,25 +2,6 @@
 DiVERE 工具模块
 """
 
-# 从lut_generator包导入所有LUT相关功能
-from .lut_generator import (
-    # 核心LUT生成器
-    LUT3DGenerator,
-    LUT1DGenerator,
-    LUTManager,
-    
-    # 便捷函数
-    create_3d_lut,
-    create_1d_lut,
-    save_lut_to_file,
-    
-    # DiVERE接口
-    DiVERELUTInterface,
-    generate_pipeline_lut,
-    generate_curve_lut,
-    generate_identity_lut
-)
-
 __all__ = [
     # LUT生成器核心类
     "LUT3DGenerator",
@@ -37,4 +18,12 @@ __all__ = [
     "generate_pipeline_lut",
     "generate_curve_lut",
     "generate_identity_lut"
-] 
\ No newline at end of file
+] 
+
+
+def __getattr__(name):
+    """LUT相关功能在首次访问时才从lut_generator包导入（避免启动时加载）"""
+    if name in __all__:
+        from . import lut_generator
+        return getattr(lut_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -35,6 +35,10 @@ except ImportError as e:
     print(f"Warning: 无法导入divere模块: {e}")
     print("请确保在DiVERE项目根目录下运行")
 
+from divere.utils.debug_logger import get_logger
+
+_log = get_logger()
+
 class DiVEREPipelineSimulator:
     """DiVERE色彩处理管线模拟器"""
     
@@ -159,8 +163,8 @@ class DiVEREPipelineSimulator:
         ws_info = self._working_space_info
         working_primaries = ws_info['primaries']  # 已经是numpy数组格式
         working_white_point = np.array(ws_info['white_point'])
-        print(working_primaries)
-        print(working_white_point)
+        # 每次目标函数评估都会执行，只在 DEBUG 级别输出
+        _log.debug("工作空间基色: %s, 白点: %s", working_primaries, working_white_point)
         
         # 计算转换矩阵
         input_to_xyz = self.primaries_to_xyz_matrix(primaries_xy, white_point_xy)
@@ -19,7 +19,6 @@ import json
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any, Union
-from divere.core.color_science import bradford_chromatic_adaptation
 from divere.utils.app_paths import resolve_data_path
 
 
@@ -161,6 +160,9 @@ def _process_xyz_type(
     处理XYZ类型的ColorChecker数据
     从源白点执行Bradford CAT变换到目标白点，然后转换为工作色彩空间RGB
     """
+    # colour-science 导入较慢，仅在需要色适应时加载
+    from divere.core.color_science import bradford_chromatic_adaptation
+
     # 从JSON文件中读取源白点
     src_illuminant = data["white_point"]
     
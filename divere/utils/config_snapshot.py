@@ -0,0 +1,193 @@
+"""
+配置快照 - 一次解析、按文件修改时间版本化、可整体传给 worker 进程
+
+ColorSpaceManager（色彩空间 JSON）、FilmPipelineProcessor（校正矩阵 JSON）与
+EnhancedConfigManager（app_settings.json）各自扫描目录并解析 JSON；主进程与每个预览
+worker 都要做一遍。快照把这些配置解析一次（primaries/white_point 转为 NumPy 数组），
+以所有源文件的 (路径, mtime_ns, size) 作为版本号：
+
+- 主进程：get_config_snapshot() 只 stat 源文件比对版本，未变化时复用已解析的结果
+- worker：启动参数里带上 to_bytes() 的结果，install_config_snapshot() 安装后
+  不再扫描目录、不再解析 JSON（快照已冻结，不再 stat 源文件）
+
+序列化时还会附上主进程已读取的运行时缓存：自动调优结果（autotune.json）与
+GPU 探测结果（gpu_probe.json）。二者在主进程中随时可能更新（探测完成、重新校准），
+因此不参与版本比对，而是在每次 get_config_snapshot_bytes() 时取当前值。
+
+曲线（curves，体积大且 worker 不需要）不在快照中。
+"""
+
+import copy
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# 快照覆盖的配置子目录
+_SNAPSHOT_DIRS = ("colorspace", "matrices")
+
+_snapshot: Optional["ConfigSnapshot"] = None
+# worker 中安装的快照：冻结，不再检查源文件
+_frozen = False
+
+
+def _parse_colorspace(data: Dict[str, Any]) -> Dict[str, Any]:
+    """色彩空间定义：primaries/white_point 转为 NumPy 数组（与 ColorSpaceManager 的加载规则一致）"""
+    if "primaries" in data and isinstance(data["primaries"], dict):
+        data["primaries"] = np.array([
+            data["primaries"]["R"],
+            data["primaries"]["G"],
+            data["primaries"]["B"]
+        ])
+    if "white_point" in data:
+        data["white_point"] = np.array(data["white_point"])
+    return data
+
+
+def _source_files(config_manager) -> Dict[str, list]:
+    return {name: sorted(config_manager.get_config_files(name)) for name in _SNAPSHOT_DIRS}
+
+
+def _file_version(path: Path) -> Tuple[str, int, int]:
+    try:
+        stat = path.stat()
+        return str(path), stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return str(path), -1, -1
+
+
+def _compute_version(config_manager, files: Dict[str, list]) -> tuple:
+    paths = [config_manager.app_settings_file]
+    for name in _SNAPSHOT_DIRS:
+        paths.extend(files[name])
+    return tuple(_file_version(Path(p)) for p in paths)
+
+
+class ConfigSnapshot:
+    """已解析的配置集合"""
+
+    def __init__(self, version: tuple, app_settings: Dict[str, Any],
+                 colorspaces: Dict[str, Dict[str, Any]], matrices: Dict[str, Dict[str, Any]]):
+        self.version = version
+        self.app_settings = app_settings
+        self.colorspaces = colorspaces
+        self.matrices = matrices
+        # 运行时缓存（get_config_snapshot_bytes 时填入）：None 表示未提供，worker 按原方式读取文件
+        self.tuning: Optional[Dict[str, Any]] = None
+        self.gpu_probe: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def build(cls, config_manager=None, version: Optional[tuple] = None,
+              files: Optional[Dict[str, list]] = None) -> "ConfigSnapshot":
+        """扫描并解析全部配置文件"""
+        if config_manager is None:
+            from .enhanced_config_manager import enhanced_config_manager as config_manager
+        if files is None:
+            files = _source_files(config_manager)
+        if version is None:
+            version = _compute_version(config_manager, files)
+
+        colorspaces: Dict[str, Dict[str, Any]] = {}
+        for json_file in files["colorspace"]:
+            data = config_manager.load_config_file(json_file)
+            if data is None:
+                continue
+            try:
+                colorspaces[Path(json_file).stem] = _parse_colorspace(data)
+            except Exception as e:
+                print(f"加载色彩空间配置文件 {json_file} 时出错: {e}")
+
+        matrices: Dict[str, Dict[str, Any]] = {}
+        for matrix_file in files["matrices"]:
+            data = config_manager.load_config_file(matrix_file)
+            if data:
+                matrices[Path(matrix_file).stem] = data
+
+        return cls(version, copy.deepcopy(config_manager.app_settings), colorspaces, matrices)
+
+    def copy_colorspaces(self) -> Dict[str, Dict[str, Any]]:
+        """色彩空间定义的副本（调用方可能就地修改 gamma 等字段）"""
+        return copy.deepcopy(self.colorspaces)
+
+    def copy_matrices(self) -> Dict[str, Dict[str, Any]]:
+        return copy.deepcopy(self.matrices)
+
+    def to_bytes(self) -> bytes:
+        """序列化为单个 blob（随 worker 启动参数传递）"""
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_bytes(blob: bytes) -> "ConfigSnapshot":
+        return pickle.loads(blob)
+
+
+def get_config_snapshot() -> Optional[ConfigSnapshot]:
+    """当前配置快照
+
+    主进程中每次调用都会 stat 源文件（不解析），版本变化时重建；
+    worker 中返回安装的冻结快照。构建失败时返回 None，调用方回退到直接读取文件。
+    """
+    global _snapshot
+    if _frozen:
+        return _snapshot
+    try:
+        from .enhanced_config_manager import enhanced_config_manager
+        files = _source_files(enhanced_config_manager)
+        version = _compute_version(enhanced_config_manager, files)
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = ConfigSnapshot.build(enhanced_config_manager, version, files)
+        return _snapshot
+    except Exception as e:
+        print(f"[WARNING] 配置快照构建失败，回退到逐个读取配置文件: {e}")
+        return None
+
+
+def _runtime_caches() -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """主进程当前的 (自动调优结果, GPU 探测结果)；获取失败的一项为 None"""
+    tuning = gpu_probe = None
+    try:
+        from ..core.autotune import get_tuning
+        tuning = dict(get_tuning())
+    except Exception as e:
+        print(f"[WARNING] 配置快照：读取自动调优结果失败: {e}")
+    try:
+        from ..core.gpu_probe_cache import export_probe_data
+        gpu_probe = export_probe_data()
+    except Exception as e:
+        print(f"[WARNING] 配置快照：读取GPU探测缓存失败: {e}")
+    return tuning, gpu_probe
+
+
+def get_config_snapshot_bytes() -> Optional[bytes]:
+    """当前快照的序列化结果（供 worker 启动参数使用，附带自动调优与 GPU 探测结果）"""
+    snapshot = get_config_snapshot()
+    if snapshot is None:
+        return None
+    snapshot.tuning, snapshot.gpu_probe = _runtime_caches()
+    return snapshot.to_bytes()
+
+
+def install_config_snapshot(blob: bytes) -> ConfigSnapshot:
+    """在 worker 中安装主进程传来的快照（冻结，之后不再访问配置文件）
+
+    Args:
+        blob: get_config_snapshot_bytes() 的结果
+
+    Returns:
+        安装的快照
+    """
+    global _snapshot, _frozen
+    snapshot = ConfigSnapshot.from_bytes(blob)
+    _snapshot = snapshot
+    _frozen = True
+    from .enhanced_config_manager import enhanced_config_manager
+    enhanced_config_manager.app_settings = copy.deepcopy(snapshot.app_settings)
+    # 自动调优与 GPU 探测结果：worker 不再读取 autotune.json / gpu_probe.json
+    if snapshot.tuning is not None:
+        from ..core.autotune import install_tuning
+        install_tuning(snapshot.tuning)
+    if snapshot.gpu_probe is not None:
+        from ..core.gpu_probe_cache import install_probe_data
+        install_probe_data(snapshot.gpu_probe)
+    return snapshot
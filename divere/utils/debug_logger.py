@@ -14,6 +14,20 @@ import time
 from datetime import datetime, timedelta
 
 
+# 日志级别：唯一的开关，同时作用于 get_logger() 与 debug()/info()/warning()/error()
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+_DEFAULT_LOG_LEVEL = "INFO"
+
+
+def _level_from_environment() -> int:
+    name = os.environ.get("DIVERE_LOG_LEVEL", _DEFAULT_LOG_LEVEL).upper()
+    return LOG_LEVELS.get(name, LOG_LEVELS[_DEFAULT_LOG_LEVEL])
+
+
+_log_level = _level_from_environment()
+_loggers: list = []
+
+
 class DiVEREDebugLogger:
     """Centralized debug logger for DiVERE application"""
     
@@ -43,14 +57,14 @@ class DiVEREDebugLogger:
         self._setup_logger()
         
         # Log initialization
-        self.info("=" * 60)
-        self.info(f"DiVERE Debug Logger initialized at {datetime.now()}")
-        self.info(f"Platform: {platform.system()} {platform.release()}")
-        self.info(f"Python: {sys.version}")
-        self.info(f"Working directory: {Path.cwd()}")
-        self.info(f"sys.argv[0]: {sys.argv[0]}")
-        self.info(f"__file__: {__file__}")
-        self.info("=" * 60)
+        self.debug("=" * 60)
+        self.debug(f"DiVERE Debug Logger initialized at {datetime.now()}")
+        self.debug(f"Platform: {platform.system()} {platform.release()}")
+        self.debug(f"Python: {sys.version}")
+        self.debug(f"Working directory: {Path.cwd()}")
+        self.debug(f"sys.argv[0]: {sys.argv[0]}")
+        self.debug(f"__file__: {__file__}")
+        self.debug("=" * 60)
     
     def _should_enable_debug(self) -> bool:
         """Check if debug logging should be enabled"""
@@ -121,7 +135,8 @@ class DiVEREDebugLogger:
     def _setup_logger(self):
         """Set up the logger with file and console handlers"""
         self._logger = logging.getLogger('divere_debug')
-        self._logger.setLevel(logging.DEBUG)
+        # 级别由 set_log_level() / DIVERE_LOG_LEVEL 统一控制（文件与控制台相同）
+        self._logger.setLevel(_log_level)
         
         # Clear any existing handlers
         self._logger.handlers.clear()
@@ -142,20 +157,19 @@ class DiVEREDebugLogger:
             except Exception as e:
                 print(f"Warning: Could not set up file logging: {e}")
         
-        # Console handler
-        # Windows: show INFO level when running from console
-        # Other platforms: only show ERROR to avoid spam
+        # Console handler：不单独设级别，与文件一样由 logger 级别过滤
         console_handler = logging.StreamHandler(sys.stderr)
-        if platform.system() == 'Windows':
-            console_handler.setLevel(logging.INFO)  # Windows显示更多信息
-        else:
-            console_handler.setLevel(logging.ERROR)
         console_handler.setFormatter(formatter)
         self._logger.addHandler(console_handler)
         
         # Prevent propagation to avoid duplicate messages
         self._logger.propagate = False
     
+    def set_level(self, level: int):
+        """设置日志级别（由 set_log_level() 调用）"""
+        if self._logger:
+            self._logger.setLevel(level)
+
     def debug(self, message: str, module: str = None):
         """Log debug message"""
         if self.debug_enabled and self._logger:
@@ -252,4 +266,89 @@ def is_debug_enabled() -> bool:
 
 def get_log_file_path() -> Optional[Path]:
     """Get the current log file path"""
-    return debug_logger.get_log_file_path()
\ No newline at end of file
+    return debug_logger.get_log_file_path()
+
+# ---------------------------------------------------------------------------
+# 分级日志（热路径）
+#
+# 预览、proxy 准备、worker 调度等每帧都会执行的代码不应无条件 print：
+# 字符串格式化、终端输出，以及只为打印而做的统计（如整幅图的 min/max）都会计入帧耗时。
+# get_logger() 返回的日志对象按级别过滤，消息用 % 参数或 callable 延迟求值；
+# 昂贵的诊断信息先判断 log.debug_enabled 再计算：
+#
+#     _log = get_logger("ImageManager")
+#     _log.debug("加载 %s", path)                      # 关闭时不格式化
+#     if _log.debug_enabled:
+#         _log.debug("数据范围 [%.4f, %.4f]", arr.min(), arr.max())
+#
+# 级别：DIVERE_LOG_LEVEL（DEBUG / INFO / WARNING / ERROR，默认 INFO），或 --debug / -v，
+# 或 ui 设置 log_level。set_log_level() 同步写入环境变量，之后启动的 worker 进程继承同一级别。
+# 与 debug()/info() 等函数共用同一个 logging 输出（日志文件 + stderr），消息前缀为 "[标签] "。
+# ---------------------------------------------------------------------------
+
+
+class LevelLogger:
+    """按级别过滤的日志对象（关闭的级别只有一次属性判断），输出写入 debug_logger"""
+
+    __slots__ = ("tag", "debug_enabled", "info_enabled")
+
+    def __init__(self, tag: Optional[str] = None):
+        self.tag = tag
+        self._update(_log_level)
+
+    def _update(self, level: int) -> None:
+        self.debug_enabled = level <= LOG_LEVELS["DEBUG"]
+        self.info_enabled = level <= LOG_LEVELS["INFO"]
+
+    def _emit(self, level_name: str, message, args) -> None:
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
+        getattr(debug_logger, level_name.lower())(message, self.tag)
+
+    def debug(self, message, *args) -> None:
+        if self.debug_enabled:
+            self._emit("DEBUG", message, args)
+
+    def info(self, message, *args) -> None:
+        if self.info_enabled:
+            self._emit("INFO", message, args)
+
+    def warning(self, message, *args) -> None:
+        if _log_level <= LOG_LEVELS["WARNING"]:
+            self._emit("WARNING", message, args)
+
+    def error(self, message, *args) -> None:
+        self._emit("ERROR", message, args)
+
+
+def get_logger(tag: Optional[str] = None) -> LevelLogger:
+    """获取分级日志对象
+
+    Args:
+        tag: 输出前缀（如 "ImageManager"、"WORKER"）；None 时使用级别名（"[DEBUG] ..."）
+    """
+    logger = LevelLogger(tag)
+    _loggers.append(logger)
+    return logger
+
+
+def set_log_level(level: str) -> None:
+    """设置控制台日志级别（DEBUG / INFO / WARNING / ERROR）"""
+    global _log_level
+    name = str(level).upper()
+    if name not in LOG_LEVELS:
+        return
+    _log_level = LOG_LEVELS[name]
+    os.environ["DIVERE_LOG_LEVEL"] = name
+    for logger in _loggers:
+        logger._update(_log_level)
+    debug_logger.set_level(_log_level)
+
+
+def get_log_level() -> str:
+    for name, value in LOG_LEVELS.items():
+        if value == _log_level:
+            return name
+    return _DEFAULT_LOG_LEVEL
@@ -64,7 +64,18 @@ class EnhancedConfigManager:
         self.app_settings_file = self.app_config_dir / "app_settings.json"
         debug(f"app_settings_file path: {self.app_settings_file}", "EnhancedConfigManager")
         debug(f"app_settings_file exists: {self.app_settings_file.exists()}", "EnhancedConfigManager")
-        self.app_settings = self._load_app_settings()
+        # 首次访问时才读取：worker 进程会直接安装主进程传来的配置快照（见 config_snapshot）
+        self._app_settings: Optional[Dict[str, Any]] = None
+    
+    @property
+    def app_settings(self) -> Dict[str, Any]:
+        if self._app_settings is None:
+            self._app_settings = self._load_app_settings()
+        return self._app_settings
+    
+    @app_settings.setter
+    def app_settings(self, settings: Dict[str, Any]) -> None:
+        self._app_settings = settings
     
     def _get_user_config_dir(self) -> Path:
         """获取用户配置目录"""
@@ -93,7 +104,22 @@ class EnhancedConfigManager:
                 "window_size": [1200, 800],
                 "window_position": [100, 100],
                 "proxy_max_size": 2000,
-                "use_process_isolation": "auto"
+                "use_process_isolation": "auto",
+                "interactive_preview_area_fraction": 0.25,
+                "preview_standby_worker": True,
+                "preview_worker_count": "auto",
+                "preview_stage_cache_mb": 192,
+                "preview_detail_tiles": True,
+                "preview_detail_cache_mb": 128,
+                "preview_image_pyramid": True,
+                "preview_half_float_lut": True,
+                "preview_fast_log_exp": True,
+                "startup_budget_ms": 2500,
+                "gpu_probe_cache": True,
+                "autotune": True,
+                "metrics_port": 0,
+                "metrics_file": "",
+                "log_level": "INFO"
             },
             "defaults": {
                 "input_color_space": "sRGB",
@@ -0,0 +1,428 @@
+"""
+常驻的轻量指标：计数器、仪表、固定分桶直方图，导出为 Prometheus 文本格式
+
+追踪（tracing.py）适合看单次操作的调用层次；长时间修图或无人值守批处理需要的是聚合数字：
+预览延迟的 p50/p95/p99、worker 重启次数、proxy 来源命中率、导出吞吐（MP/s）、共享内存占用等。
+
+- 始终开启：一次 observe 只有一次 bisect 与几次加法（持锁）；热路径用 labels() 预先绑定标签，亚微秒级
+- 数据来源：已有的 profile 字典与 worker 结果消息中的 timing，不额外计时
+- 导出：--metrics-port N（或 ui 设置 metrics_port）在 127.0.0.1 上提供 /metrics；
+  --metrics-file path（或 ui 设置 metrics_file）在退出时写出同样的文本
+- 分位数由直方图分桶线性插值估算（histogram_quantile 的算法），registry.summary() 可直接打印
+
+本模块只依赖标准库。
+"""
+
+import atexit
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 默认的延迟分桶（秒）：覆盖交互预览（几毫秒）到大图导出（几十秒）
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.02, 0.033, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in items)
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels) if labels else ()
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def labels(self, **labels: str) -> "_BoundCounter":
+        """绑定标签，热路径上省去每次构造标签键"""
+        return _BoundCounter(self, _label_key(labels))
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(v)}" for key, v in items]
+
+
+class _BoundCounter:
+    __slots__ = ("_counter", "_key")
+
+    def __init__(self, counter: Counter, key: LabelKey):
+        self._counter = counter
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        counter = self._counter
+        with counter._lock:
+            counter._values[self._key] = counter._values.get(self._key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值；set_function 可在导出时才读取（如当前共享内存大小）"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+        self._functions: Dict[LabelKey, Callable[[], Optional[float]]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = _label_key(labels) if labels else ()
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels) if labels else ()
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], Optional[float]], **labels: str) -> None:
+        self._functions[_label_key(labels)] = fn
+
+    def value(self, **labels: str) -> float:
+        key = _label_key(labels)
+        if key in self._functions:
+            return float(self._functions[key]() or 0.0)
+        return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = dict(self._values)
+        for key, fn in list(self._functions.items()):
+            try:
+                value = fn()
+            except Exception:
+                value = None
+            if value is not None:
+                items[key] = float(value)
+        return [f"{self.name}{_format_labels(key)} {_format_value(v)}" for key, v in items.items()]
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """固定分桶直方图（分桶上界含端点，最后一个桶为 +Inf）"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[LabelKey, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels) if labels else ()
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def labels(self, **labels: str) -> "_BoundHistogram":
+        """绑定标签，热路径上省去每次构造标签键"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+        return _BoundHistogram(self, series)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(_label_key(labels))
+        return series.count if series else 0
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """由分桶线性插值估算分位数（与 Prometheus histogram_quantile 一致），无数据时返回 None"""
+        series = self._series.get(_label_key(labels))
+        if series is None or series.count == 0:
+            return None
+        with self._lock:
+            counts = list(series.counts)
+            total = series.count
+        rank = q * total
+        cumulative = 0
+        for i, c in enumerate(counts):
+            if cumulative + c >= rank and c > 0:
+                upper = self.buckets[i]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / c
+            cumulative += c
+        return self.buckets[-2]
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            snapshot = [(key, list(s.counts), s.sum, s.count) for key, s in self._series.items()]
+        for key, counts, total_sum, total_count in snapshot:
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {total_count}")
+        return lines
+
+
+class _BoundHistogram:
+    __slots__ = ("_buckets", "_lock", "_series")
+
+    def __init__(self, histogram: Histogram, series: _HistogramSeries):
+        self._buckets = histogram.buckets
+        self._lock = histogram._lock
+        self._series = series
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._buckets, value)
+        series = self._series
+        with self._lock:
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+
+class MetricsRegistry:
+    """进程内的指标注册表（同名重复注册返回已有实例）"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._dump_path: Optional[Path] = None
+
+    def _register(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"指标 {name} 已注册为 {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 文本格式（version 0.0.4）"""
+        lines: List[str] = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    # ---- 导出 ----
+
+    def dump(self, path: Optional[str] = None) -> Optional[Path]:
+        """写出 Prometheus 文本文件（先写临时文件再替换，node_exporter textfile 收集器可直接读取）"""
+        target = Path(path) if path else self._dump_path
+        if target is None:
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(target)
+        return target
+
+    def dump_at_exit(self, path: str) -> None:
+        """退出时写出到 path"""
+        if self._dump_path is None:
+            atexit.register(self._dump_at_exit)
+        self._dump_path = Path(path)
+
+    def _dump_at_exit(self) -> None:
+        try:
+            path = self.dump()
+            if path is not None:
+                print(f"[METRICS] 已写入 {path}", flush=True)
+        except Exception as e:
+            print(f"[WARNING] 写入指标文件失败: {e}", flush=True)
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> int:
+        """在后台线程提供 GET /metrics（仅监听本机）
+
+        Returns:
+            实际监听的端口（port=0 时由系统分配）
+        """
+        if self._server is not None:
+            return self._server.server_address[1]
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        self._server = server
+        return server.server_address[1]
+
+    def stop_http_server(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, Dict[str, float]]:
+        """各直方图（按标签）的分位数（毫秒）与次数，便于打印"""
+        report: Dict[str, Dict[str, float]] = {}
+        for metric in self._metrics.values():
+            if not isinstance(metric, Histogram):
+                continue
+            for key in list(metric._series):
+                labels = dict(key)
+                if metric.count(**labels) == 0:
+                    continue
+                entry = {f"p{int(q * 100)}_ms": metric.quantile(q, **labels) * 1000.0 for q in quantiles}
+                entry["count"] = metric.count(**labels)
+                report[f"{metric.name}{_format_labels(key)}"] = entry
+        return report
+
+
+# 全局注册表
+registry = MetricsRegistry()
+
+# ---- 指标定义（集中在此，调用方只 import 需要的对象）----
+
+preview_latency = registry.histogram(
+    "divere_preview_latency_seconds", "预览从请求到结果到达主进程的端到端延迟")
+preview_render = registry.histogram(
+    "divere_preview_render_seconds", "预览渲染耗时（mode=process|thread）")
+preview_queue_wait = registry.histogram(
+    "divere_preview_queue_wait_seconds", "预览请求在 worker 队列中的等待时间")
+preview_delivery = registry.histogram(
+    "divere_preview_delivery_seconds", "预览结果从 worker 发出到主进程取回的时间")
+stage_cache_requests = registry.counter(
+    "divere_density_stage_cache_total", "密度阶段缓存查询次数（result=hit|miss）")
+proxy_source = registry.counter(
+    "divere_proxy_source_total", "proxy 生成的来源（source=pyramid|full）")
+worker_restarts = registry.counter(
+    "divere_worker_restarts_total", "预览 worker 重启次数（reason=memory|dead|crash）")
+worker_memory = registry.gauge(
+    "divere_worker_memory_bytes", "最近一次检查时预览 worker 的内存占用")
+shm_bytes = registry.gauge(
+    "divere_shm_bytes", "主进程持有的共享内存（kind=proxy）")
+shm_transferred = registry.counter(
+    "divere_shm_result_bytes_total", "经共享内存取回的预览结果字节数")
+full_pipeline_duration = registry.histogram(
+    "divere_full_pipeline_seconds", "全精度管线耗时（mode=export|preview，chunked=true|false）")
+full_pipeline_pixels = registry.counter(
+    "divere_full_pipeline_pixels_total", "全精度管线处理的像素总数（mode=export|preview）")
+# 每帧都会记录的指标预先绑定标签
+preview_latency_process = preview_latency.labels(mode="process")
+preview_latency_thread = preview_latency.labels(mode="thread")
+preview_render_process = preview_render.labels(mode="process")
+preview_render_thread = preview_render.labels(mode="thread")
+preview_queue_wait_process = preview_queue_wait.labels(mode="process")
+preview_queue_wait_thread = preview_queue_wait.labels(mode="thread")
+stage_cache_hits = stage_cache_requests.labels(result="hit")
+stage_cache_misses = stage_cache_requests.labels(result="miss")
+
+export_throughput = registry.gauge(
+    "divere_export_megapixels_per_second", "最近一次导出的全精度管线吞吐")
+
+
+def start_exporters(port: Optional[int] = None, path: Optional[str] = None) -> None:
+    """按命令行参数或 ui 设置（metrics_port / metrics_file）启动导出；两者都未设置时什么也不做"""
+    if port is None or path is None:
+        try:
+            from .enhanced_config_manager import enhanced_config_manager
+            if port is None:
+                port = int(enhanced_config_manager.get_ui_setting("metrics_port", 0) or 0)
+            if path is None:
+                path = enhanced_config_manager.get_ui_setting("metrics_file", "") or None
+        except Exception:
+            pass
+    if port:
+        try:
+            actual = registry.start_http_server(int(port))
+            print(f"[METRICS] http://127.0.0.1:{actual}/metrics", flush=True)
+        except OSError as e:
+            print(f"[WARNING] 指标端口 {port} 启动失败: {e}", flush=True)
+    if path:
+        registry.dump_at_exit(path)
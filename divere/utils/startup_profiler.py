@@ -0,0 +1,151 @@
+"""
+启动耗时分析（python -m divere --profile-startup）
+
+- 模块导入：在 sys.meta_path 最前面挂一个计时 finder，记录每个模块执行的总耗时与自身耗时
+  （自身耗时 = 总耗时 - 其导入的子模块耗时，与 python -X importtime 的口径一致）
+- 启动阶段：入口在关键节点调用 mark()，记录距分析开始的时间
+- 预算：从开始到首帧绘制的总耗时超过预算时 report() 返回 False，入口据此以非零状态退出，可直接用于 CI
+
+本模块只依赖标准库，必须在导入其余 divere 模块之前安装。
+"""
+
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional, Tuple
+
+
+class _TimingLoader:
+    """包装真实 loader，对 exec_module 计时；其余属性透传"""
+
+    def __init__(self, loader, fullname: str, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._fullname = fullname
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # 模块的 __loader__/__spec__.loader 指回真实 loader，避免影响资源读取
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        if threading.get_ident() != self._profiler._thread_id:
+            # 只统计主线程的导入（调用栈按线程嵌套）
+            self._loader.exec_module(module)
+            return
+        self._profiler._enter(self._fullname)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._fullname)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimingLoader(spec.loader, fullname, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """记录启动阶段与模块导入耗时"""
+
+    def __init__(self):
+        self._t0: Optional[float] = None
+        self._thread_id: Optional[int] = None
+        self._finder: Optional[_TimingFinder] = None
+        self._stack: List[Tuple[str, float, float]] = []  # (模块名, 开始时间, 子模块累计耗时)
+        self.modules: Dict[str, Tuple[float, float]] = {}  # 模块名 → (总耗时s, 自身耗时s)
+        self.phases: List[Tuple[str, float]] = []  # (阶段名, 距开始的时间s)
+
+    @property
+    def enabled(self) -> bool:
+        return self._t0 is not None
+
+    def install(self) -> None:
+        if self._finder is not None:
+            return
+        self._t0 = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def mark(self, phase: str) -> None:
+        """记录一个启动阶段（未安装时忽略）"""
+        if self._t0 is not None:
+            self.phases.append((phase, time.perf_counter() - self._t0))
+
+    def elapsed_ms(self) -> float:
+        return 0.0 if self._t0 is None else (time.perf_counter() - self._t0) * 1000.0
+
+    def _enter(self, fullname: str) -> None:
+        self._stack.append((fullname, time.perf_counter(), 0.0))
+
+    def _exit(self, fullname: str) -> None:
+        name, start, children = self._stack.pop()
+        total = time.perf_counter() - start
+        self.modules[name] = (total, total - children)
+        if self._stack:
+            parent, parent_start, parent_children = self._stack[-1]
+            self._stack[-1] = (parent, parent_start, parent_children + total)
+
+    def report(self, budget_ms: Optional[float] = None, top: int = 25) -> bool:
+        """打印启动分析报告
+
+        Args:
+            budget_ms: 启动预算（毫秒）；None 表示不检查
+            top: 列出的模块数
+
+        Returns:
+            是否在预算内
+        """
+        total_ms = self.phases[-1][1] * 1000.0 if self.phases else self.elapsed_ms()
+        print("[STARTUP] ===== 启动阶段 =====", flush=True)
+        previous = 0.0
+        for phase, at in self.phases:
+            print(f"[STARTUP] {phase:<28} +{(at - previous) * 1000.0:8.1f}ms  @ {at * 1000.0:8.1f}ms", flush=True)
+            previous = at
+
+        print(f"[STARTUP] ===== 模块导入（共 {len(self.modules)} 个，按自身耗时排序） =====", flush=True)
+        ranked = sorted(self.modules.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (total, self_time) in ranked[:top]:
+            print(f"[STARTUP] {self_time * 1000.0:8.1f}ms self {total * 1000.0:8.1f}ms total  {name}", flush=True)
+
+        # 顶层包汇总（第三方库一目了然）
+        packages: Dict[str, float] = {}
+        for name, (_total, self_time) in self.modules.items():
+            root = name.split('.')[0]
+            packages[root] = packages.get(root, 0.0) + self_time
+        print("[STARTUP] ===== 按顶层包汇总 =====", flush=True)
+        for root, self_time in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:12]:
+            print(f"[STARTUP] {self_time * 1000.0:8.1f}ms  {root}", flush=True)
+
+        within = budget_ms is None or total_ms <= budget_ms
+        budget_text = "" if budget_ms is None else f" / 预算 {budget_ms:.0f}ms{'' if within else '（超出）'}"
+        print(f"[STARTUP] 首帧总耗时 {total_ms:.1f}ms{budget_text}", flush=True)
+        return within
+
+
+# 全局实例（入口安装，其余模块可调用 startup_profiler.mark() 标记阶段）
+startup_profiler = StartupProfiler()
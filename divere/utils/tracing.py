@@ -0,0 +1,230 @@
+"""
+结构化追踪 - 嵌套 span，导出为 Chrome / Perfetto trace JSON
+
+原来的计时是分散的 time.time() 差值，只能打印汇总（分块导出时各 tile 的耗时相加，仅供粗略参考）。
+这里记录带开始时间、耗时、进程号与线程号的 span（Chrome trace 的 "X" 事件），
+同一线程内按时间自然嵌套，在 chrome://tracing 或 ui.perfetto.dev 中打开即可看到
+ApplicationContext → 预览 worker 进程 → FilmPipelineProcessor → FilmMathOps 的完整调用层次与每个 tile。
+
+- 默认关闭：span() 返回共享的空上下文，开销只有一次属性判断
+- 启用：python -m divere --trace out.json，或环境变量 DIVERE_TRACE=out.json（退出时写入文件）
+- 时间戳基于 time.time()（微秒），各进程的事件可直接合并；已有的 t0 = time.time() 计时点
+  可以用 complete(name, t0) 补记为 span，不必改动代码结构
+- 跨进程：预览 worker 在每条结果消息中附带 drain() 的事件，主进程 merge() 后统一导出
+- 缓冲区有上限（默认 50 万条），超出后丢弃最早的事件
+
+本模块只依赖标准库。
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_MAX_EVENTS = 500_000
+
+
+class _NullSpan:
+    """追踪关闭时的空上下文"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "cat", "args", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer.complete(self.name, self._start, cat=self.cat, **self.args)
+        return False
+
+    def set(self, **args: Any) -> None:
+        """补充 span 参数（如执行后才知道的缓存命中、输出尺寸）"""
+        self.args.update(args)
+
+
+class Tracer:
+    """进程内的追踪事件缓冲区"""
+
+    def __init__(self, max_events: int = _MAX_EVENTS):
+        self.enabled = False
+        self.output_path: Optional[Path] = None
+        self._events: "deque[Dict[str, Any]]" = deque(maxlen=max_events)
+        self._named_threads: set = set()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    # ---- 开关 ----
+
+    def start(self, output_path: Optional[str] = None, process_name: Optional[str] = None) -> None:
+        """开始记录
+
+        Args:
+            output_path: 退出时写入的 trace 文件；None 表示不自动写入（如 worker 进程，由主进程汇总）
+            process_name: 在 trace 查看器中显示的进程名
+        """
+        self.enabled = True
+        if process_name:
+            self._metadata("process_name", {"name": process_name}, tid=0)
+        if output_path:
+            self.output_path = Path(output_path)
+            if not self._atexit_registered:
+                atexit.register(self._export_at_exit)
+                self._atexit_registered = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    # ---- 记录 ----
+
+    def span(self, name: str, cat: str = "divere", **args: Any):
+        """嵌套 span 上下文：with tracer.span("export", cat="pipeline", tiles=12): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name: str, start: float, end: Optional[float] = None,
+                 cat: str = "divere", **args: Any) -> None:
+        """补记一个已结束的 span
+
+        Args:
+            start: 开始时间（time.time() 秒）
+            end: 结束时间，None 表示当前时间
+        """
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.time()
+        event = {
+            "name": name, "cat": cat, "ph": "X",
+            "ts": start * 1e6, "dur": max(0.0, (end - start) * 1e6),
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def instant(self, name: str, cat: str = "divere", **args: Any) -> None:
+        """瞬时事件（如请求丢弃、缓存失效）"""
+        if not self.enabled:
+            return
+        event = {
+            "name": name, "cat": cat, "ph": "i", "s": "t",
+            "ts": time.time() * 1e6, "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        tid = event["tid"]
+        key = (event["pid"], tid)
+        if key not in self._named_threads:
+            self._named_threads.add(key)
+            self._metadata("thread_name", {"name": threading.current_thread().name}, tid=tid)
+        self._events.append(event)
+
+    def _metadata(self, name: str, args: Dict[str, Any], tid: int) -> None:
+        self._events.append({"name": name, "ph": "M", "pid": os.getpid(), "tid": tid, "args": args})
+
+    # ---- 跨进程 ----
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """取出并清空当前缓冲区（worker 随结果消息发回主进程）"""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            # 线程名元数据已随事件发出，之后的事件需要重新发送
+            self._named_threads.clear()
+        return events
+
+    def merge(self, events: Optional[Iterable[Dict[str, Any]]]) -> None:
+        """合并其他进程的事件"""
+        if events and self.enabled:
+            self._events.extend(events)
+
+    # ---- 导出 ----
+
+    def export(self, path: Optional[str] = None) -> Optional[Path]:
+        """写出 Chrome trace JSON（{"traceEvents": [...]}）
+
+        Returns:
+            写入的文件路径；没有路径时返回 None
+        """
+        target = Path(path) if path else self.output_path
+        if target is None:
+            return None
+        with self._lock:
+            events = list(self._events)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return target
+
+    def _export_at_exit(self) -> None:
+        try:
+            path = self.export()
+            if path is not None:
+                print(f"[TRACE] 已写入 {path}（{len(self._events)} 个事件），可在 ui.perfetto.dev 打开", flush=True)
+        except Exception as e:
+            print(f"[WARNING] 写入 trace 失败: {e}", flush=True)
+
+
+# 全局实例
+tracer = Tracer()
+
+
+def span(name: str, cat: str = "divere", **args: Any):
+    """tracer.span 的快捷方式"""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def traced(name: Optional[str] = None, cat: str = "divere"):
+    """函数装饰器：整个调用记录为一个 span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_from_environment() -> None:
+    """环境变量 DIVERE_TRACE=<文件> 时开始记录（入口调用）"""
+    path = os.environ.get("DIVERE_TRACE")
+    if path and not tracer.enabled:
+        tracer.start(path, process_name="DiVERE")
@@ -0,0 +1,44 @@
+"""
+配置快照测试：worker 安装快照后不再读取 autotune.json / gpu_probe.json
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from divere.utils.config_snapshot import get_config_snapshot_bytes
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_snapshot_carries_tuning_and_gpu_probe():
+    snapshot = pickle.loads(get_config_snapshot_bytes())
+    assert isinstance(snapshot.tuning, dict)
+    assert snapshot.gpu_probe is None or "engines" in snapshot.gpu_probe
+
+
+def test_worker_does_not_read_tuning_or_probe_files():
+    """模拟 worker：安装快照后创建 TheEnlarger/ColorSpaceManager 并初始化加速器"""
+    script = textwrap.dedent("""
+        import sys
+        opened = []
+        sys.addaudithook(lambda event, args: opened.append(str(args[0])) if event == "open" else None)
+        blob = sys.stdin.buffer.read()
+        from divere.utils.config_snapshot import install_config_snapshot
+        install_config_snapshot(blob)
+        from divere.core.the_enlarger import TheEnlarger
+        from divere.core.color_space import ColorSpaceManager
+        enlarger = TheEnlarger()
+        ColorSpaceManager()
+        enlarger.pipeline_processor.math_ops.gpu_accelerator
+        print([p for p in opened if p.endswith(("autotune.json", "gpu_probe.json"))])
+    """)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    proc = subprocess.run([sys.executable, "-c", script], input=get_config_snapshot_bytes(), env=env,
+                          cwd=str(PROJECT_ROOT), capture_output=True, timeout=300)
+    assert proc.returncode == 0, proc.stderr.decode(errors="replace")[-2000:]
+    assert proc.stdout.decode().strip().splitlines()[-1] == "[]"
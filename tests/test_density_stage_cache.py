@@ -0,0 +1,123 @@
+"""
+密度阶段缓存（FilmMathOps.apply_full_math_pipeline 的 stage_cache_key）
+
+- 命中时结果与不缓存的计算一致（只改增益/曲线时跳过步骤 1-3）
+- density_gamma / density_dmax / 密度矩阵变化时不命中
+- 超出字节上限时按 LRU 淘汰；clear_density_stage_cache 清空缓存、保留统计
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.data_types import ColorGradingParams
+from divere.core.math_ops import FilmMathOps
+
+MATRIX = np.array([[1.05, -0.03, -0.02], [-0.04, 1.08, -0.04], [0.01, -0.06, 1.05]])
+
+
+@pytest.fixture
+def math_ops():
+    return FilmMathOps()
+
+
+def _sample(dtype, shape=(64, 96, 3)):
+    rng = np.random.default_rng(3)
+    return (rng.random(shape) * 0.9 + 0.02).astype(dtype)
+
+
+def _params(**changes) -> ColorGradingParams:
+    params = ColorGradingParams()
+    params.enable_density_curve = False
+    params.enable_density_matrix = True
+    params.density_matrix = MATRIX.copy()
+    params.rgb_gains = (0.1, 0.0, -0.05)
+    for name, value in changes.items():
+        setattr(params, name, value)
+    return params
+
+
+def _run(math_ops, image, params, key):
+    profile = {}
+    result = math_ops.apply_full_math_pipeline(image, params, stage_cache_key=key, profile=profile)
+    return result, profile.get('stage_cache_hit')
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float16])
+def test_hit_matches_uncached(math_ops, dtype):
+    image = _sample(dtype)
+    first, first_hit = _run(math_ops, image, _params(), "proxy")
+    # 只改增益：命中缓存
+    changed = _params(rgb_gains=(-0.2, 0.05, 0.15))
+    cached, cached_hit = _run(math_ops, image, changed, "proxy")
+    uncached, _ = _run(FilmMathOps(), image, changed, None)
+
+    assert first_hit == 0.0 and cached_hit == 1.0
+    assert math_ops.get_density_stage_cache_stats()['hits'] == 1
+    np.testing.assert_allclose(cached.astype(np.float64), uncached.astype(np.float64), rtol=1e-5, atol=1e-6)
+    # 缓存的密度数组只读，下游不会改动它：再次命中结果不变
+    again, _ = _run(math_ops, image, _params(), "proxy")
+    np.testing.assert_array_equal(again, first)
+
+
+@pytest.mark.parametrize("changes", [
+    {'density_gamma': 2.0},
+    {'density_dmax': 2.6},
+    {'density_matrix': np.eye(3) * 1.02},
+    {'enable_density_matrix': False},
+])
+def test_pipeline_parameters_miss(math_ops, changes):
+    image = _sample(np.float32)
+    _run(math_ops, image, _params(), "proxy")
+    result, hit = _run(math_ops, image, _params(**changes), "proxy")
+    uncached, _ = _run(FilmMathOps(), image, _params(**changes), None)
+
+    assert hit == 0.0
+    np.testing.assert_allclose(result, uncached, rtol=1e-5, atol=1e-6)
+
+
+def test_different_input_key_misses(math_ops):
+    image = _sample(np.float32)
+    _run(math_ops, image, _params(), "proxy-1")
+    _, hit = _run(math_ops, image, _params(), "proxy-2")
+    assert hit == 0.0
+
+
+def test_byte_bound_evicts_lru(math_ops):
+    value = np.zeros((32, 32, 3), dtype=np.float32)
+    math_ops.density_stage_cache_max_bytes = int(value.nbytes * 2.5)
+    for key in ("a", "b"):
+        math_ops._density_stage_put(key, value.copy())
+    assert math_ops._density_stage_get("a") is not None  # a 变为最近使用
+    math_ops._density_stage_put("c", value.copy())
+
+    stats = math_ops.get_density_stage_cache_stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] == 2 * value.nbytes <= stats['max_bytes']
+    assert math_ops._density_stage_get("b") is None
+    assert math_ops._density_stage_get("a") is not None and math_ops._density_stage_get("c") is not None
+
+
+def test_oversized_value_is_not_cached(math_ops):
+    value = np.zeros((32, 32, 3), dtype=np.float32)
+    math_ops.density_stage_cache_max_bytes = value.nbytes - 1
+    math_ops._density_stage_put("a", value)
+    assert math_ops._density_stage_get("a") is None
+    assert math_ops.get_density_stage_cache_stats()['entries'] == 0
+
+
+def test_cached_value_is_read_only(math_ops):
+    value = np.zeros((4, 4, 3), dtype=np.float32)
+    math_ops._density_stage_put("a", value)
+    with pytest.raises(ValueError):
+        math_ops._density_stage_get("a")[0, 0, 0] = 1.0
+
+
+def test_clear_keeps_stats(math_ops):
+    math_ops._density_stage_put("a", np.zeros((4, 4, 3), dtype=np.float32))
+    math_ops._density_stage_get("a")
+    math_ops.clear_density_stage_cache()
+
+    stats = math_ops.get_density_stage_cache_stats()
+    assert stats['entries'] == 0 and stats['bytes'] == 0
+    assert stats['hits'] == 1
+    assert math_ops._density_stage_get("a") is None
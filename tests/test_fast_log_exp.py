@@ -0,0 +1,89 @@
+"""
+快速转密度/转线性（FilmMathOps.linear_to_density_fast / density_to_linear_fast）的误差界
+
+参考值为 float64 计算；误差界与 math_ops 中“快速转密度/转线性”一节的注释一致。
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.math_ops import FilmMathOps
+
+# float32 误差界（工作范围：线性 [1e-6, 1]，密度 [-0.5, 7]）
+TO_DENSITY_MAX_ABS = 2e-6
+TO_LINEAR_MAX_REL = 2e-6
+# 16 位输出的量化步长，误差界须远小于它
+QUANT_STEP_16BIT = 1.0 / 65535
+
+
+@pytest.fixture(scope="module")
+def math_ops():
+    return FilmMathOps()
+
+
+def _as_image(values: np.ndarray) -> np.ndarray:
+    return np.repeat(values.reshape(-1, 1, 1), 3, axis=2)
+
+
+def _linear_samples(dtype):
+    return _as_image(np.concatenate([
+        np.geomspace(1e-6, 1.0, 200001),
+        np.linspace(1e-6, 1.0, 200001),
+    ]).astype(dtype))
+
+
+def _density_samples(dtype):
+    return _as_image(np.linspace(-0.5, 7.0, 300001).astype(dtype))
+
+
+def _to_density_reference(array):
+    return -np.log10(np.maximum(array.astype(np.float64), 1e-10))
+
+
+def _to_linear_reference(array):
+    return np.clip(np.power(10.0, -array.astype(np.float64)), 0.0, 1.0)
+
+
+def test_linear_to_density_fast_float32_error_bound(math_ops):
+    linear = _linear_samples(np.float32)
+    got = math_ops.linear_to_density_fast(linear)
+    assert got.dtype == np.float32
+    max_abs = np.max(np.abs(got.astype(np.float64) - _to_density_reference(linear)))
+    assert max_abs <= TO_DENSITY_MAX_ABS
+    assert TO_DENSITY_MAX_ABS < QUANT_STEP_16BIT / 5
+
+
+def test_density_to_linear_fast_float32_error_bound(math_ops):
+    density = _density_samples(np.float32)
+    got = math_ops.density_to_linear_fast(density)
+    assert got.dtype == np.float32
+    expected = _to_linear_reference(density)
+    max_rel = np.max(np.abs(got.astype(np.float64) - expected) / expected)
+    assert max_rel <= TO_LINEAR_MAX_REL
+    assert TO_LINEAR_MAX_REL < QUANT_STEP_16BIT / 5
+    assert got.min() >= 0.0 and got.max() <= 1.0
+
+
+@pytest.mark.parametrize("direction", ["to_density", "to_linear"])
+def test_fast_float16_is_correctly_rounded(math_ops, direction):
+    """float16 走 65536 项 LUT：结果等于 float64 计算后舍入到 float16"""
+    if direction == "to_density":
+        samples = _linear_samples(np.float16)
+        got = math_ops.linear_to_density_fast(samples)
+        expected = _to_density_reference(samples).astype(np.float16)
+    else:
+        samples = _density_samples(np.float16)
+        got = math_ops.density_to_linear_fast(samples)
+        expected = _to_linear_reference(samples).astype(np.float16)
+    assert got.dtype == np.float16
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_fast_parallel_matches_serial():
+    """按行带分到线程池时与单线程结果一致"""
+    math_ops = FilmMathOps()
+    math_ops.parallel_threshold = 0
+    linear = _linear_samples(np.float32)[:4096].reshape(64, 64, 3)
+    serial = math_ops.linear_to_density_fast(linear, use_parallel=False)
+    parallel = math_ops.linear_to_density_fast(linear, use_parallel=True)
+    np.testing.assert_array_equal(serial, parallel)
@@ -0,0 +1,84 @@
+"""
+原图金字塔（image_pyramid.build_pyramid_levels / select_pyramid_slice）
+
+- 级别取样规则与 generate_proxy 的 INTER_NEAREST 一致（取偶数行列）
+- 选择最粗但不低于 proxy 分辨率的级别，切片坐标与原图裁剪框对应
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.image_pyramid import PYRAMID_MAX_LEVEL, build_pyramid_levels, select_pyramid_slice
+
+FULL_W, FULL_H = 1600, 1200
+PROXY_SIZE = (200, 200)
+
+
+def _coordinate_image(width=FULL_W, height=FULL_H) -> np.ndarray:
+    """像素值为自身坐标 (x, y, 0)（float16 可精确表示 2048 以内的整数）"""
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    return np.stack([xs, ys, np.zeros_like(xs)], axis=2)
+
+
+@pytest.fixture(scope="module")
+def levels():
+    return build_pyramid_levels(_coordinate_image(), PROXY_SIZE)
+
+
+def test_levels_match_nearest_neighbour_sampling(levels):
+    cv2 = pytest.importorskip("cv2")
+    image = _coordinate_image()
+    assert sorted(levels) == list(range(1, PYRAMID_MAX_LEVEL + 1))
+    for level, array in levels.items():
+        step = 2 ** level
+        assert array.dtype == np.float16
+        assert array.shape == (FULL_H // step, FULL_W // step, 3)
+        np.testing.assert_array_equal(array, image[::step, ::step].astype(np.float16))
+        if level == 1:
+            nearest = cv2.resize(image, (FULL_W // 2, FULL_H // 2), interpolation=cv2.INTER_NEAREST)
+            np.testing.assert_array_equal(array, nearest.astype(np.float16))
+
+
+def test_only_levels_useful_for_proxy_are_built():
+    levels = build_pyramid_levels(_coordinate_image(800, 600), (300, 300))
+    # 1/4 级别为 200x150，两边都小于 proxy 尺寸：不构建
+    assert sorted(levels) == [1]
+
+
+def test_build_can_be_abandoned():
+    assert build_pyramid_levels(_coordinate_image(), PROXY_SIZE, should_continue=lambda: False) == {}
+
+
+@pytest.mark.parametrize("crop_px,expected_level", [
+    ((0, 0, FULL_W, FULL_H), 3),      # 整幅：1/8 级别 200x150 恰好满足 proxy
+    ((400, 300, 1200, 900), 2),       # 一半：1/4 级别
+    ((100, 100, 500, 400), 1),        # 四分之一：1/2 级别
+])
+def test_selects_coarsest_sufficient_level(levels, crop_px, expected_level):
+    level, array = select_pyramid_slice(levels, (FULL_W, FULL_H), crop_px, PROXY_SIZE)
+    assert level == expected_level
+
+    x0, y0, x1, y1 = crop_px
+    step = 2 ** level
+    # 切片不低于 proxy 分辨率，且与裁剪框对应（误差不超过一个级别像素）
+    scale = min(PROXY_SIZE[0] / (x1 - x0), PROXY_SIZE[1] / (y1 - y0), 1.0)
+    assert max(array.shape[1] / (x1 - x0), array.shape[0] / (y1 - y0)) >= scale * 0.99
+    assert abs(float(array[0, 0, 0]) - x0) < step and abs(float(array[0, 0, 1]) - y0) < step
+    assert abs(float(array[-1, -1, 0]) + step - x1) < step and abs(float(array[-1, -1, 1]) + step - y1) < step
+
+
+def test_small_crop_needs_full_resolution(levels):
+    assert select_pyramid_slice(levels, (FULL_W, FULL_H), (10, 10, 150, 150), PROXY_SIZE) is None
+
+
+def test_no_levels():
+    assert select_pyramid_slice({}, (FULL_W, FULL_H), (0, 0, FULL_W, FULL_H), PROXY_SIZE) is None
+
+
+def test_odd_sizes_stay_in_bounds():
+    width, height = 1001, 777
+    levels = build_pyramid_levels(_coordinate_image(width, height), (100, 100))
+    # 奇数尺寸减半时截断：贴右下角的裁剪框换算后仍在级别范围内
+    level, array = select_pyramid_slice(levels, (width, height), (201, 177, 1001, 777), (100, 100))
+    assert level == 3 and array.size > 0
+    assert float(array[-1, -1, 0]) < width and float(array[-1, -1, 1]) < height
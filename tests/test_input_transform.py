@@ -0,0 +1,101 @@
+"""
+融合输入变换（input_transform.apply_input_transform / ColorSpaceManager.input_to_working_space）
+与逐步变换的一致性
+
+逐步变换：整型采样归一化 → apply_power(idt_gamma) → set_image_color_space
+→ convert_to_working_space(skip_gamma_inverse=True)，即融合变换替换掉的预览/导出输入链。
+参考实现用 use_optimization=False 的直接 power（不经 32K LUT 插值），在 float32 输入上计算；
+float16 输入先无损升为 float32 再走参考链。
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.color_space import ColorSpaceManager
+from divere.core.data_types import ImageData
+from divere.core.input_transform import apply_input_transform
+from divere.core.math_ops import FilmMathOps
+
+# 矩阵与白点增益均非单位（KodakEnduraPremier 等到 ACEScg 为单位矩阵，覆盖不到矩阵）
+INPUT_COLOR_SPACE = "sRGB"
+
+# float32 输出：约 1 个 float32 ULP 的相对误差（矩阵为 float32，抵消时另加很小的绝对容差）
+# float16 输出：float16 的舍入（相对 2**-11）
+TOLERANCE = {
+    np.float32: dict(rtol=1e-6, atol=1e-7),
+    np.float16: dict(rtol=1e-3, atol=1e-4),
+}
+
+
+@pytest.fixture(scope="module")
+def color_space_manager():
+    return ColorSpaceManager()
+
+
+@pytest.fixture(scope="module")
+def math_ops():
+    return FilmMathOps()
+
+
+def _sample(dtype, channels: int) -> np.ndarray:
+    """确定性的随机采样（channels=0 表示 [H,W] 二维数组），包含 0 与满量程"""
+    rng = np.random.default_rng(7)
+    shape = (67, 53) if channels == 0 else (67, 53, channels)
+    if np.issubdtype(dtype, np.integer):
+        top = np.iinfo(dtype).max
+        array = rng.integers(0, top + 1, size=shape, dtype=np.int64).astype(dtype)
+        array.flat[0], array.flat[1] = 0, top
+        return array
+    array = rng.random(shape).astype(dtype)
+    array.flat[0], array.flat[1] = 0.0, 1.0
+    return array
+
+
+def _stepwise(color_space_manager, math_ops, array: np.ndarray, gamma: float) -> np.ndarray:
+    if np.issubdtype(array.dtype, np.integer):
+        linear = array.astype(np.float32) / np.float32(np.iinfo(array.dtype).max)
+    else:
+        linear = array.astype(np.float32)
+    linear = math_ops.apply_power(linear, gamma, use_optimization=False)
+    image = color_space_manager.set_image_color_space(ImageData(array=linear, metadata={}), INPUT_COLOR_SPACE)
+    image = color_space_manager.convert_to_working_space(image, skip_gamma_inverse=True)
+    return np.asarray(image.array, dtype=np.float64)
+
+
+@pytest.mark.parametrize("channels", [0, 1, 3, 4])
+@pytest.mark.parametrize("gamma", [1.0, 2.2])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float16, np.float32])
+def test_apply_input_transform_matches_stepwise(color_space_manager, math_ops, dtype, gamma, channels):
+    array = _sample(dtype, channels)
+    matrix, gain = color_space_manager.calculate_color_space_conversion(
+        INPUT_COLOR_SPACE, color_space_manager.get_current_working_space()
+    )
+    fused = apply_input_transform(array, gamma, matrix, gain, out_dtype=np.float32)
+
+    assert fused is not None
+    assert fused.shape == array.shape and fused.dtype == np.float32
+    np.testing.assert_allclose(fused, _stepwise(color_space_manager, math_ops, array, gamma),
+                               **TOLERANCE[np.float32])
+
+
+@pytest.mark.parametrize("channels", [0, 1, 3, 4])
+@pytest.mark.parametrize("gamma", [1.0, 2.2])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float16, np.float32])
+def test_input_to_working_space_matches_stepwise(color_space_manager, math_ops, dtype, gamma, channels):
+    array = _sample(dtype, channels)
+    result = color_space_manager.input_to_working_space(ImageData(array=array, metadata={}),
+                                                        INPUT_COLOR_SPACE, gamma)
+
+    assert result is not None
+    assert result.color_space == color_space_manager.get_current_working_space()
+    # float16 proxy 保持 float16，其余输出 float32
+    out_dtype = np.float16 if dtype == np.float16 else np.float32
+    assert result.array.dtype == out_dtype and result.array.shape == array.shape
+    np.testing.assert_allclose(result.array.astype(np.float64),
+                               _stepwise(color_space_manager, math_ops, array, gamma),
+                               **TOLERANCE[out_dtype])
+
+
+def test_unsupported_layout_falls_back():
+    """双通道（L+IR）等布局返回 None，由调用方走逐步变换"""
+    assert apply_input_transform(np.zeros((4, 4, 2), dtype=np.float32), 2.2, np.eye(3)) is None
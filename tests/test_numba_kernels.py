@@ -0,0 +1,158 @@
+"""
+Numba CPU 内核测试
+
+- 融合密度管线与 FilmMathOps 的 NumPy 参考实现（use_optimization=False 的直接计算）一致
+- 并行与串行版本结果相同
+- 全精度分块导出在多个 tile 线程上并发调用内核不崩溃（workqueue 线程层曾 abort）
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from divere.core.data_types import ColorGradingParams
+from divere.core.gpu_accelerator import NumbaCPUEngine
+from divere.core.math_ops import FilmMathOps
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 与 NumPy 参考实现比对的容差：内核逐像素以 float64 计算；
+# float32 输入时参考实现以 float32 计算，误差受 float32 舍入（约 6e-8 相对）累积限制
+TOLERANCE = {
+    np.float32: dict(rtol=1e-5, atol=1e-6),
+    np.float64: dict(rtol=1e-9, atol=1e-12),
+}
+
+MATRIX = np.array([[1.05, -0.03, -0.02], [-0.04, 1.08, -0.04], [0.01, -0.06, 1.05]])
+GAINS = (0.1, -0.05, 0.02)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = NumbaCPUEngine()
+    if not engine.is_available():
+        pytest.skip("Numba CPU引擎不可用")
+    return engine
+
+
+def _sample(dtype, shape=(96, 128, 3)):
+    rng = np.random.default_rng(42)
+    return (rng.random(shape) * 1.2 - 0.05).astype(dtype)
+
+
+def _reference(image, gamma, dmax, pivot, invert, to_linear, glare):
+    math_ops = FilmMathOps()
+    math_ops.gpu_accelerator = None
+    result = math_ops.density_inversion(image, gamma, dmax, pivot, invert,
+                                        use_optimization=False, use_parallel=False, use_gpu=False)
+    density = math_ops.linear_to_density(result, use_parallel=False)
+    density = math_ops.apply_density_matrix(density, MATRIX, dmax,
+                                            channel_gamma_r=0.9, channel_gamma_b=1.1, use_parallel=False)
+    density = math_ops.apply_rgb_gains(density, GAINS)
+    if not to_linear:
+        return density
+    linear = math_ops.density_to_linear(density, use_parallel=False)
+    return np.maximum(0.0, linear - glare)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("to_linear", [False, True])
+@pytest.mark.parametrize("invert", [True, False])
+def test_density_pipeline_matches_numpy(engine, dtype, to_linear, invert):
+    image = _sample(dtype)
+    glare = 0.01 if to_linear else 0.0
+    got = engine.density_pipeline_gpu(image, 1.3, 2.2, 0.7, invert, matrix=MATRIX,
+                                      channel_gamma_r=0.9, channel_gamma_b=1.1, rgb_gains=GAINS,
+                                      to_linear=to_linear, glare=glare)
+    expected = _reference(image, 1.3, 2.2, 0.7, invert, to_linear, glare)
+    assert got.dtype == image.dtype
+    np.testing.assert_allclose(got.astype(np.float64), expected.astype(np.float64), **TOLERANCE[dtype])
+
+
+@pytest.mark.parametrize("gamma,dmax", [(1.3, 2.2), (2.2, 2.3)])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_density_inversion_matches_numpy(engine, dtype, gamma, dmax):
+    # 一致性自检不能误伤常用参数（gamma=2.2/dmax=2.3 时曾因校验样本含负值而停用内核）
+    engine._verified.clear()
+    # 只比较实际值域：钳到 1e-10 的像素反相后达 1e18 量级，float32 参考实现本身超出容差
+    image = np.maximum(_sample(dtype), dtype(1e-3))
+    got = engine.density_inversion_gpu(image, gamma, dmax, 0.7, True)
+    expected = FilmMathOps().density_inversion(image, gamma, dmax, 0.7, True, use_optimization=False,
+                                               use_parallel=False, use_gpu=False)
+    np.testing.assert_allclose(got.astype(np.float64), expected.astype(np.float64), **TOLERANCE[dtype])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_full_math_pipeline_fused_matches_unfused(dtype):
+    """apply_full_math_pipeline 走融合内核与逐步 NumPy 计算的结果一致"""
+    image = _sample(dtype)
+    params = ColorGradingParams()
+    params.density_matrix = MATRIX
+    params.rgb_gains = GAINS
+
+    fused_ops = FilmMathOps()
+    fused_ops.fused_pipeline_threshold = 0
+    if not isinstance(getattr(fused_ops.gpu_accelerator, "active_engine", None), NumbaCPUEngine):
+        pytest.skip("当前加速引擎不是 Numba CPU")
+    plain_ops = FilmMathOps()
+    plain_ops.use_fused_cpu_pipeline = False
+
+    fused = fused_ops.apply_full_math_pipeline(image, params, include_curve=False, use_optimization=False)
+    plain = plain_ops.apply_full_math_pipeline(image, params, include_curve=False, use_optimization=False)
+    np.testing.assert_allclose(fused.astype(np.float64), plain.astype(np.float64), **TOLERANCE[dtype])
+
+
+def test_serial_kernel_matches_parallel(engine):
+    from divere.core import numba_kernels
+
+    image = _sample(np.float64)
+    args = (1.3, 2.2, 0.7, True, 1e-10, np.inf, True, MATRIX, 4.1,
+            np.array([0.9, 1.0, 1.1]), np.array(GAINS), True, 0.01)
+    parallel_out = np.empty_like(image)
+    serial_out = np.empty_like(image)
+    numba_kernels.density_pipeline_kernel(image, parallel_out, *args)
+    numba_kernels.density_pipeline_kernel_serial(image, serial_out, *args)
+    np.testing.assert_array_equal(parallel_out, serial_out)
+
+
+def test_reference_math_ops_is_cached():
+    assert NumbaCPUEngine._reference_math_ops() is NumbaCPUEngine._reference_math_ops()
+
+
+def test_chunked_export_tiles_on_multiple_threads():
+    """分块导出：4 个 tile 线程同时调用内核（workqueue 线程层下曾以 rc 134 abort）"""
+    script = textwrap.dedent("""
+        import numpy as np
+        from divere.core.data_types import ImageData, ColorGradingParams
+        from divere.core.gpu_accelerator import NumbaCPUEngine
+        from divere.core.pipeline_processor import FilmPipelineProcessor
+
+        processor = FilmPipelineProcessor()
+        assert isinstance(processor.math_ops.gpu_accelerator.active_engine, NumbaCPUEngine)
+        processor.math_ops.fused_pipeline_threshold = 0
+        image = ImageData(array=np.random.default_rng(1).random((256, 256, 3), dtype=np.float32))
+        reference = processor.apply_full_precision_pipeline(image, ColorGradingParams(), chunked=False)
+        for _ in range(3):
+            result = processor.apply_full_precision_pipeline(
+                image, ColorGradingParams(), chunked=True, tile_size=(32, 64), max_workers=4)
+            np.testing.assert_allclose(result.array, reference.array, rtol=1e-5, atol=1e-6)
+        print("OK")
+    """)
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(PROJECT_ROOT),
+        "NUMBA_THREADING_LAYER": "workqueue",
+        "NUMBA_NUM_THREADS": "4",
+        "DIVERE_DISABLE_GPU": "1",
+    })
+    proc = subprocess.run([sys.executable, "-c", script], env=env, cwd=str(PROJECT_ROOT),
+                          capture_output=True, text=True, timeout=600)
+    assert proc.returncode == 0, proc.stdout[-2000:] + proc.stderr[-2000:]
+    assert "OK" in proc.stdout
@@ -0,0 +1,43 @@
+"""
+black cut-off 位图打包（preview_analysis.pack_mask / unpack_mask）
+
+打包格式与 QImage.Format_Mono 一致：按行打包、MSB 在前、行宽补齐到 4 字节。
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.preview_analysis import pack_mask, unpack_mask
+
+
+@pytest.mark.parametrize("width", [1, 7, 8, 9, 31, 32, 33, 100])
+def test_pack_unpack_round_trip(width):
+    rng = np.random.default_rng(width)
+    mask = rng.random((13, width)) < 0.3
+
+    packed = pack_mask(mask)
+    assert (packed['width'], packed['height']) == (width, 13)
+    assert packed['stride'] % 4 == 0 and packed['stride'] * 8 >= width
+    assert len(packed['bits']) == packed['height'] * packed['stride']
+
+    unpacked = unpack_mask(packed)
+    assert unpacked.dtype == bool
+    np.testing.assert_array_equal(unpacked, mask)
+
+
+def test_msb_first_and_zero_padding():
+    mask = np.zeros((2, 9), dtype=bool)
+    mask[0, 0] = True
+    mask[1, 8] = True
+
+    packed = pack_mask(mask)
+    rows = np.frombuffer(packed['bits'], dtype=np.uint8).reshape(2, packed['stride'])
+    np.testing.assert_array_equal(rows[0], [0x80, 0x00, 0x00, 0x00])
+    np.testing.assert_array_equal(rows[1], [0x00, 0x80, 0x00, 0x00])
+
+
+def test_full_mask_leaves_padding_clear():
+    mask = np.ones((3, 10), dtype=bool)
+    rows = np.frombuffer(pack_mask(mask)['bits'], dtype=np.uint8).reshape(3, -1)
+    np.testing.assert_array_equal(rows[:, :2], [[0xFF, 0xC0]] * 3)
+    assert not rows[:, 2:].any()
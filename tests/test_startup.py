@@ -0,0 +1,58 @@
+"""
+启动路径测试
+
+- python -m divere --profile-startup 在启动预算内完成首帧绘制（超出预算时入口以退出码 1 结束）
+- 导入 divere 与主窗口模块不连带加载重型可选依赖（这些依赖在首次使用时才导入）
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 首次使用时才导入的重型依赖
+HEAVY_MODULES = ("onnxruntime", "numba", "scipy", "colour")
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(PROJECT_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def _loaded_heavy_modules(statement: str):
+    script = (
+        f"import sys, json\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], env=_env(), cwd=str(PROJECT_ROOT),
+                          capture_output=True, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_import_divere_does_not_load_heavy_modules():
+    assert _loaded_heavy_modules("import divere") == []
+
+
+def test_import_main_window_does_not_load_heavy_modules():
+    pytest.importorskip("PySide6")
+    assert _loaded_heavy_modules("import divere\nimport divere.ui.main_window") == []
+
+
+@pytest.mark.slow
+@pytest.mark.gui
+def test_profile_startup_within_budget():
+    pytest.importorskip("PySide6")
+    proc = subprocess.run([sys.executable, "-m", "divere", "--profile-startup"], env=_env(),
+                          cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=600)
+    match = re.search(r"\[STARTUP\] 首帧总耗时 ([\d.]+)ms(?: / 预算 (\d+)ms)?", proc.stdout)
+    assert match is not None, proc.stdout[-2000:] + proc.stderr[-2000:]
+    assert proc.returncode == 0, f"启动耗时 {match.group(1)}ms 超出预算 {match.group(2)}ms"
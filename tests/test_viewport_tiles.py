@@ -0,0 +1,46 @@
+"""
+细节块源区域映射（viewport_tiles.tile_source_view / detail_tile_source）
+
+细节坐标定义在 裁剪 → 逆时针旋转 之后的图像上；取出的源视图（未旋转）旋转后
+必须与整幅裁剪旋转后再切片完全一致，块才能与整幅预览逐像素对齐。
+"""
+
+import numpy as np
+import pytest
+
+from divere.core.viewport_tiles import detail_size, detail_tile_source, tile_source_view, visible_tiles
+
+SOURCE = np.arange(90 * 70 * 3, dtype=np.float32).reshape(90, 70, 3)
+CROP_PX = (5, 8, 61, 83)  # (x0, y0, x1, y1)
+
+
+@pytest.mark.parametrize("orientation", [0, 90, 180, 270, 360, -90])
+@pytest.mark.parametrize("rows,cols", [((0, 10), (0, 12)), ((3, 40), (17, 50)), ((20, 21), (0, 1))])
+def test_tile_source_view_matches_rotated_crop(orientation, rows, cols):
+    x0, y0, x1, y1 = CROP_PX
+    k = (orientation // 90) % 4
+    detailed = np.rot90(SOURCE[y0:y1, x0:x1], k)
+    det_w, det_h = detail_size(CROP_PX, orientation)
+    assert detailed.shape[:2] == (det_h, det_w)
+    rows = (rows[0], min(rows[1], det_h))
+    cols = (cols[0], min(cols[1], det_w))
+
+    view = tile_source_view(SOURCE, CROP_PX, orientation, rows, cols)
+    np.testing.assert_array_equal(np.rot90(view, k), detailed[rows[0]:rows[1], cols[0]:cols[1]])
+
+
+@pytest.mark.parametrize("orientation", [0, 90, 180, 270])
+def test_level0_tiles_cover_detail_space(orientation):
+    """1:1 级别的块拼起来等于整幅细节图像"""
+    x0, y0, x1, y1 = CROP_PX
+    k = (orientation // 90) % 4
+    detailed = np.rot90(SOURCE[y0:y1, x0:x1], k)
+    det_w, det_h = detail_size(CROP_PX, orientation)
+
+    mosaic = np.full_like(detailed, -1.0)
+    for tile in visible_tiles((0, 0, det_w, det_h), (det_w, det_h), (det_w, det_h), 0):
+        source = detail_tile_source(SOURCE, CROP_PX, tile, orientation)
+        assert source.flags['C_CONTIGUOUS']
+        (r0, r1), (c0, c1) = tile['rows'], tile['cols']
+        mosaic[r0:r1, c0:c1] = np.rot90(source, k)
+    np.testing.assert_array_equal(mosaic, detailed)